@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Mediciones del arranque de la ventana principal.
+
+Compara la construcción inmediata de todos los módulos con la construcción diferida de
+pestañas. Cada modo se mide en un proceso nuevo, para que las importaciones de uno no
+abaraten el otro, sobre un backend SQLite en memoria con datos sintéticos.
+
+Uso:
+    python -m benchmarks.bench_arranque [opciones]
+
+Opciones:
+    --repeticiones N: Procesos por modo; se informa la mediana (por defecto 3)
+    --turnos N: Turnos del catálogo sintético (por defecto 1000)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DIRECTORIO_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODOS = ("inmediata", "diferida")
+METRICAS = ("ventana_creada", "primer_pintado", "pestana_lista")
+# Tiempo máximo de espera del primer pintado en cada proceso (s)
+ESPERA_MAXIMA = 60
+
+
+def medir_proceso(modo: str, turnos: int) -> dict:
+    """
+    Mide un arranque en este proceso y devuelve los tiempos_arranque de la ventana.
+
+    Debe ejecutarse en un proceso nuevo: los módulos de la interfaz no deben estar importados.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, DIRECTORIO_RAIZ)
+    sys.path.insert(0, os.path.join(DIRECTORIO_RAIZ, "src"))
+    inicio = time.perf_counter()
+
+    from PyQt6.QtWidgets import QApplication
+    from database.sqlite_backend import SQLiteBackend, generar_datos
+    from database.oracle_connection import OracleConnection
+    from src.database.oracle_connection import OracleConnection as OracleConnectionSrc
+
+    app = QApplication([])
+    backend = SQLiteBackend()
+    generar_datos(backend, num_turnos=turnos)
+    # Los widgets importan la conexión por dos rutas (database.* y src.database.*)
+    OracleConnection().usar_backend(backend)
+    OracleConnectionSrc().usar_backend(backend)
+
+    from ui.main_window import MainWindow
+    MainWindow.check_first_run = lambda self: None
+
+    # El arranque se mide sin la preparación de los datos sintéticos
+    preparacion = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ventana = MainWindow(carga_diferida=(modo == "diferida"), preconstruir=False, inicio_arranque=inicio)
+    ventana.show()
+    limite = time.perf_counter() + ESPERA_MAXIMA
+    while 'pestana_lista' not in ventana.tiempos_arranque and time.perf_counter() < limite:
+        app.processEvents()
+
+    tiempos = {metrica: ventana.tiempos_arranque.get(metrica) for metrica in METRICAS}
+    tiempos["preparacion"] = preparacion
+    ventana.close()
+    return tiempos
+
+
+def ejecutar(repeticiones: int = 3, turnos: int = 1000) -> dict:
+    """
+    Mide cada modo en `repeticiones` procesos nuevos.
+
+    Returns:
+        Por modo, la mediana en segundos de cada métrica
+    """
+    resultados = {}
+    for modo in MODOS:
+        mediciones = []
+        for _ in range(repeticiones):
+            salida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_arranque", "--medir", modo, "--turnos", str(turnos)],
+                cwd=DIRECTORIO_RAIZ, capture_output=True, text=True, check=True
+            )
+            mediciones.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+        resultados[modo] = {
+            metrica: statistics.median(m[metrica] for m in mediciones) if all(m[metrica] is not None for m in mediciones)
+            else None
+            for metrica in METRICAS
+        }
+    return resultados
+
+
+def imprimir(resultados: dict) -> None:
+    """Muestra los tiempos de cada modo en milisegundos."""
+    print(f"{'modo':<10} " + " ".join(f"{metrica:>16}" for metrica in METRICAS))
+    for modo, tiempos in resultados.items():
+        print(f"{modo:<10} " + " ".join(
+            f"{tiempos[metrica] * 1000:>13.0f} ms" if tiempos[metrica] is not None else f"{'-':>16}"
+            for metrica in METRICAS
+        ))
+
+
+def main(argumentos=None) -> int:
+    """Mide el arranque en ambos modos y muestra la comparación."""
+    parser = argparse.ArgumentParser(description="Mediciones del arranque de la ventana principal")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--turnos", type=int, default=1000)
+    parser.add_argument("--medir", choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argumentos)
+
+    if args.medir:
+        print(json.dumps(medir_proceso(args.medir, args.turnos)))
+        return 0
+
+    imprimir(ejecutar(args.repeticiones, args.turnos))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
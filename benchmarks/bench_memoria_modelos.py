@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Medición de la memoria retenida por un catálogo de turnos en memoria.
+
+Construye el mismo catálogo sintético con los modelos actuales (__slots__, minutos
+enteros, jornadas internadas y salida calculada) y con la representación anterior
+(dataclass con __dict__, datetime.time por detalle y un texto de jornada por fila),
+y compara la memoria que queda asignada (tracemalloc) una vez construidos.
+
+Uso:
+    python -m benchmarks.bench_memoria_modelos [opciones]
+
+Opciones:
+    --detalles N: Detalles diarios del catálogo (por defecto 50000)
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Callable, Dict, List, Optional
+
+# Las importaciones del proyecto son relativas a src/, igual que en main.py
+DIRECTORIO_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(DIRECTORIO_RAIZ, "src"))
+
+from models.turno import Turno, TurnoDetalleDiario  # noqa: E402
+
+DETALLES_POR_DEFECTO = 50000
+DIAS = ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES", "SABADO", "DOMINGO")
+DIAS_POR_TURNO = 5
+
+
+@dataclass
+class DetalleAnterior:
+    """Representación anterior de TurnoDetalleDiario, como referencia de la medición."""
+    id_turno_detalle_diario: int
+    id_turno: int
+    jornada: str
+    hora_ingreso: time
+    duracion: int
+    hora_salida: Optional[time] = None
+
+
+class TurnoAnterior:
+    """Representación anterior de Turno (sin __slots__)."""
+
+    def __init__(self):
+        self.id_turno = None
+        self.nombre = ""
+        self.vigencia = 1
+        self.frecuencia = "Diarios"
+        self.detalles = []
+        self._total_horas_semanales = 0.0
+
+
+def generar_filas(num_detalles: int, semilla: int = 42) -> List[tuple]:
+    """
+    Genera filas con el formato de la consulta de turnos con detalles.
+
+    Cada jornada es un texto nuevo, como las que entrega el cursor de la base de datos.
+    """
+    aleatorio = random.Random(semilla)
+    filas = []
+    for i in range(num_detalles):
+        id_turno = i // DIAS_POR_TURNO + 1
+        jornada = "".join(list(DIAS[i % DIAS_POR_TURNO]))
+        ingreso = datetime(2025, 1, 1, aleatorio.randrange(24), aleatorio.choice((0, 15, 30, 45)))
+        filas.append((id_turno, f"Turno {id_turno}", 1, "Diarios", i + 1, jornada, ingreso,
+                      aleatorio.choice((240, 300, 480, 540, 600, 720))))
+    return filas
+
+
+def construir_actual(filas: List[tuple]) -> list:
+    """Construye el catálogo con los modelos actuales."""
+    turnos = {}
+    for id_turno, nombre, vigencia, frecuencia, id_detalle, jornada, ingreso, duracion in filas:
+        turno = turnos.get(id_turno)
+        if turno is None:
+            turno = turnos[id_turno] = Turno()
+            turno.id_turno, turno.nombre, turno.vigencia, turno.frecuencia = id_turno, nombre, vigencia, frecuencia
+        turno.detalles.append(TurnoDetalleDiario(id_detalle, id_turno, jornada, ingreso, duracion))
+    return list(turnos.values())
+
+
+def construir_anterior(filas: List[tuple]) -> list:
+    """Construye el catálogo con la representación anterior."""
+    turnos = {}
+    for id_turno, nombre, vigencia, frecuencia, id_detalle, jornada, ingreso, duracion in filas:
+        turno = turnos.get(id_turno)
+        if turno is None:
+            turno = turnos[id_turno] = TurnoAnterior()
+            turno.id_turno, turno.nombre, turno.vigencia, turno.frecuencia = id_turno, nombre, vigencia, frecuencia
+        minutos = ingreso.hour * 60 + ingreso.minute + duracion
+        turno.detalles.append(DetalleAnterior(
+            id_detalle, id_turno, jornada, time(ingreso.hour, ingreso.minute), duracion,
+            time((minutos // 60) % 24, minutos % 60)
+        ))
+    return list(turnos.values())
+
+
+def medir_retenida(construir: Callable[[List[tuple]], list], filas: List[tuple]) -> int:
+    """Devuelve los bytes que siguen asignados tras construir el catálogo."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        catalogo = construir(filas)
+        actual, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del catalogo
+    return actual
+
+
+def ejecutar(num_detalles: int = DETALLES_POR_DEFECTO) -> Dict[str, int]:
+    """
+    Mide la memoria retenida por ambas representaciones del mismo catálogo.
+
+    Returns:
+        Bytes retenidos por representación ("actual" y "anterior")
+    """
+    filas = generar_filas(num_detalles)
+    # Las filas son la entrada de ambas construcciones y no se cuentan
+    return {
+        "anterior": medir_retenida(construir_anterior, filas),
+        "actual": medir_retenida(construir_actual, filas),
+    }
+
+
+def main(argumentos=None) -> int:
+    """Mide ambas representaciones y muestra el ahorro."""
+    parser = argparse.ArgumentParser(description="Memoria retenida por un catálogo de turnos")
+    parser.add_argument("--detalles", type=int, default=DETALLES_POR_DEFECTO)
+    args = parser.parse_args(argumentos)
+
+    resultados = ejecutar(args.detalles)
+    for nombre, retenida in resultados.items():
+        print(f"{nombre:<10} {retenida / 1024 / 1024:>8.2f} MiB  {retenida / args.detalles:>6.0f} B/detalle")
+    ahorro = 1 - resultados["actual"] / resultados["anterior"]
+    print(f"ahorro     {ahorro:>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
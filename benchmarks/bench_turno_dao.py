@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+"""
+Mediciones de rendimiento de las rutas críticas de TurnoDAO.
+
+Genera catálogos sintéticos de tamaño creciente en un backend SQLite en memoria y mide
+tiempo, memoria (tracemalloc) y filas procesadas de cada ruta. Los resultados se comparan
+con una línea base en JSON y el proceso termina con código 1 si alguna ruta empeora más
+allá del umbral, o con código 2 si la línea base no existe (se crea con --guardar-base).
+
+Uso:
+    python -m benchmarks.bench_turno_dao [opciones]
+
+Opciones:
+    --tamanos N [N ...]: Números de turnos a generar (por defecto 1000 10000 100000)
+    --repeticiones N: Repeticiones de cada medición; se conserva el mejor tiempo (por defecto 3)
+    --base RUTA: Archivo JSON con la línea base (por defecto benchmarks/linea_base.json)
+    --guardar-base: Guarda los resultados como nueva línea base en lugar de comparar
+    --umbral X: Empeoramiento relativo tolerado, 0.25 = 25% (por defecto 0.25)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import time as hora
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Las importaciones del proyecto son relativas a src/, igual que en main.py
+DIRECTORIO_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(DIRECTORIO_RAIZ, "src"))
+
+from database import turno_dao as modulo_dao  # noqa: E402
+from database.id_allocator import IdAllocator  # noqa: E402
+from database.oracle_connection import OracleConnection  # noqa: E402
+from database.sqlite_backend import SQLiteBackend, generar_datos  # noqa: E402
+from database.turno_catalog import TurnoCatalog  # noqa: E402
+from models.turno import Turno, TurnoDetalleDiario  # noqa: E402
+
+TAMANOS_POR_DEFECTO = (1000, 10000, 100000)
+RUTA_BASE_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+UMBRAL_POR_DEFECTO = 0.25
+# Diferencias menores que estas se consideran ruido, aunque superen el umbral relativo
+TOLERANCIA_SEGUNDOS = 0.002
+TOLERANCIA_BYTES = 64 * 1024
+# Turnos nuevos para los que se genera script en cada medición
+TURNOS_POR_SCRIPT = 20
+# Códigos de salida de la comparación
+SALIDA_EMPEORA = 1
+SALIDA_SIN_BASE = 2
+
+CONSULTA_CATALOGO = """
+SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
+       tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, tdd.HORA_INGRESO, tdd.DURACION
+FROM ASISTENCIAS.TURNO t
+JOIN ASISTENCIAS.TURNO_DETALLE_DIARIO tdd ON t.ID_TURNO = tdd.ID_TURNO
+ORDER BY t.ID_TURNO, tdd.JORNADA
+"""
+
+# Resultado de una medición: función a medir, que devuelve el número de filas procesadas
+Caso = Callable[[], int]
+
+
+def crear_turno(dias: Tuple[str, ...], hora_ingreso: hora, duracion: int) -> Turno:
+    """Crea un turno nuevo (sin IDs) con el mismo horario en cada día indicado."""
+    turno = Turno()
+    for dia in dias:
+        turno.agregar_detalle(TurnoDetalleDiario(
+            id_turno_detalle_diario=None, id_turno=None, jornada=dia,
+            hora_ingreso=hora_ingreso, duracion=duracion
+        ))
+    return turno
+
+
+def medir(caso: Caso, repeticiones: int) -> Dict[str, float]:
+    """
+    Mide un caso: mejor tiempo de varias repeticiones y, en una ejecución aparte
+    (tracemalloc ralentiza el código), el pico de memoria asignada.
+
+    Returns:
+        Diccionario con segundos, memoria_pico_bytes y filas
+    """
+    tiempos = []
+    filas = 0
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        filas = caso()
+        tiempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        caso()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"segundos": round(min(tiempos), 6), "memoria_pico_bytes": pico, "filas": filas}
+
+
+def preparar_casos(dao: modulo_dao.TurnoDAO) -> Dict[str, Caso]:
+    """Arma los casos a medir sobre un DAO conectado al backend con el catálogo ya cargado."""
+    turno_buscado = crear_turno(("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES"), hora(8, 0), 480)
+    resultados_catalogo = dao.db.execute_query(CONSULTA_CATALOGO)
+    agrupados = dao._agrupar_resultados_turnos(resultados_catalogo)
+
+    def buscar_en_servidor() -> int:
+        modulo_dao.TurnoDAO._indice_horarios = None
+        dao.FIRMA_EN_SERVIDOR = True
+        return len(dao.buscar_turnos_similares(turno_buscado))
+
+    def buscar_indice_frio() -> int:
+        modulo_dao.TurnoDAO._indice_horarios = None
+        dao.FIRMA_EN_SERVIDOR = False
+        return len(dao.buscar_turnos_similares(turno_buscado))
+
+    def buscar_indice_caliente() -> int:
+        dao.FIRMA_EN_SERVIDOR = False
+        dao.obtener_indice_horarios()
+        return len(dao.buscar_turnos_similares(turno_buscado))
+
+    def agrupar_resultados() -> int:
+        dao._agrupar_resultados_turnos(resultados_catalogo)
+        return len(resultados_catalogo)
+
+    def convertir_detalles() -> int:
+        total = 0
+        for info in agrupados.values():
+            total += len(dao._convertir_detalles_para_comparacion(info['detalles']))
+        return total
+
+    catalogo = TurnoCatalog.desde_filas(resultados_catalogo)
+
+    def construir_catalogo() -> int:
+        return TurnoCatalog.desde_filas(resultados_catalogo).total_detalles
+
+    def consultar_catalogo() -> int:
+        # La matriz de horarios se rehace en cada medición para incluirla en el tiempo
+        catalogo._matriz_horarios = None
+        catalogo.filtrar(dia="LUNES", ingreso=8 * 60)
+        catalogo.turnos_con_horas_mayores(44)
+        return sum(len(grupo) for grupo in catalogo.grupos_duplicados()) + len(catalogo.buscar_duplicados(turno_buscado))
+
+    turno_parecido = crear_turno(("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES"), hora(8, 5), 475)
+
+    def buscar_cercanos() -> int:
+        return len(catalogo.buscar_cercanos(turno_parecido, tolerancia_minutos=15, similitud_minima=0.8))
+
+    # Los IDs se reservan una sola vez: los casos de script miden solo la generación
+    turnos_script = [crear_turno(("LUNES", "MIERCOLES"), hora(9, 0), 480) for _ in range(TURNOS_POR_SCRIPT)]
+    for turno in turnos_script:
+        dao.asignar_ids(turno)
+
+    def generar_script() -> int:
+        return sum(len(dao.generar_script_sql(turno)) for turno in turnos_script)
+
+    def generar_script_batch() -> int:
+        return sum(len(script) for script in dao.generar_script_sql_batch(turnos_script))
+
+    return {
+        "buscar_turnos_similares.servidor": buscar_en_servidor,
+        "buscar_turnos_similares.indice_frio": buscar_indice_frio,
+        "buscar_turnos_similares.indice_caliente": buscar_indice_caliente,
+        "_agrupar_resultados_turnos": agrupar_resultados,
+        "_convertir_detalles_para_comparacion": convertir_detalles,
+        "TurnoCatalog.desde_filas": construir_catalogo,
+        "TurnoCatalog.consultas": consultar_catalogo,
+        "TurnoCatalog.buscar_cercanos": buscar_cercanos,
+        "generar_script_sql": generar_script,
+        "generar_script_sql_batch": generar_script_batch,
+    }
+
+
+def ejecutar(tamanos=TAMANOS_POR_DEFECTO, repeticiones: int = 3,
+             semilla: int = 42) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Ejecuta todas las mediciones para cada tamaño de catálogo.
+
+    Args:
+        tamanos: Números de turnos a generar
+        repeticiones: Repeticiones de cada medición
+        semilla: Semilla del generador de datos
+
+    Returns:
+        Resultados por tamaño (como texto, para el JSON) y por caso
+    """
+    conexion = OracleConnection()
+    backend_anterior = conexion.backend
+    resultados = {}
+    try:
+        for tamano in tamanos:
+            backend = SQLiteBackend()
+            generar_datos(backend, num_turnos=tamano, semilla=semilla)
+            conexion.usar_backend(backend)
+            IdAllocator._instance = None
+            modulo_dao.TurnoDAO._indice_horarios = None
+            modulo_dao.TurnoDAO._catalogo = None
+
+            dao = modulo_dao.TurnoDAO()
+            casos = preparar_casos(dao)
+            resultados[str(tamano)] = {nombre: medir(caso, repeticiones) for nombre, caso in casos.items()}
+
+            conexion.usar_backend(backend_anterior)
+            backend.close()
+    finally:
+        conexion.usar_backend(backend_anterior)
+        IdAllocator._instance = None
+        modulo_dao.TurnoDAO._indice_horarios = None
+        modulo_dao.TurnoDAO._catalogo = None
+    return resultados
+
+
+def comparar(resultados: dict, base: dict, umbral: float = UMBRAL_POR_DEFECTO) -> List[str]:
+    """
+    Compara los resultados con la línea base.
+
+    Solo se comparan los tamaños y casos presentes en ambos. Un caso empeora si su tiempo
+    o su memoria superan la línea base en más del umbral relativo y de la tolerancia absoluta.
+
+    Returns:
+        Descripción de cada empeoramiento encontrado (vacía si no hay ninguno)
+    """
+    empeoramientos = []
+    for tamano, casos in resultados.items():
+        for nombre, medicion in casos.items():
+            referencia = base.get(tamano, {}).get(nombre)
+            if referencia is None:
+                continue
+            for metrica, tolerancia in (("segundos", TOLERANCIA_SEGUNDOS), ("memoria_pico_bytes", TOLERANCIA_BYTES)):
+                anterior, actual = referencia[metrica], medicion[metrica]
+                if actual > anterior * (1 + umbral) and actual - anterior > tolerancia:
+                    empeoramientos.append(
+                        f"{nombre} ({tamano} turnos): {metrica} {anterior} -> {actual} "
+                        f"(+{(actual / anterior - 1) * 100 if anterior else float('inf'):.0f}%)"
+                    )
+    return empeoramientos
+
+
+def cargar_base(ruta: str) -> Optional[dict]:
+    """Lee la línea base, o devuelve None si no existe."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)["resultados"]
+
+
+def guardar_base(ruta: str, resultados: dict) -> None:
+    """Guarda los resultados como línea base junto con datos del entorno."""
+    contenido = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(contenido, archivo, indent=2, ensure_ascii=False)
+
+
+def imprimir(resultados: dict) -> None:
+    """Muestra los resultados en forma de tabla."""
+    print(f"{'caso':<42} {'turnos':>8} {'segundos':>10} {'memoria KB':>11} {'filas':>9}")
+    for tamano, casos in resultados.items():
+        for nombre, medicion in casos.items():
+            print(f"{nombre:<42} {tamano:>8} {medicion['segundos']:>10.4f} "
+                  f"{medicion['memoria_pico_bytes'] / 1024:>11.1f} {medicion['filas']:>9}")
+
+
+def main(argumentos=None) -> int:
+    """Ejecuta las mediciones y las compara con la línea base (o la guarda)."""
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento de TurnoDAO")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS_POR_DEFECTO))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--base", default=RUTA_BASE_POR_DEFECTO)
+    parser.add_argument("--guardar-base", action="store_true")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_POR_DEFECTO)
+    args = parser.parse_args(argumentos)
+
+    resultados = ejecutar(args.tamanos, args.repeticiones)
+    imprimir(resultados)
+
+    if args.guardar_base:
+        guardar_base(args.base, resultados)
+        print(f"\nLínea base guardada en {args.base}")
+        return 0
+
+    base = cargar_base(args.base)
+    if base is None:
+        print(f"\nNo existe la línea base {args.base}; use --guardar-base para crearla")
+        return SALIDA_SIN_BASE
+
+    empeoramientos = comparar(resultados, base, args.umbral)
+    if empeoramientos:
+        print(f"\nEmpeoramientos respecto de la línea base (umbral {args.umbral:.0%}):")
+        for empeoramiento in empeoramientos:
+            print(f"  - {empeoramiento}")
+        return SALIDA_EMPEORA
+    print("\nSin empeoramientos respecto de la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Creación masiva de turnos sin interfaz gráfica.
+
+Lee turnos de archivos CSV o JSON, descarta los que ya existen y genera el script SQL
+combinado. Uso (desde src/): python -m carga_masiva turnos.csv --salida turnos.sql
+"""
+
+from .lectura import ErrorEntrada, TurnoLeido, leer_turnos
+from .carga import CargaMasiva, Duplicado, ResultadoCarga
+
+__all__ = ["ErrorEntrada", "TurnoLeido", "leer_turnos", "CargaMasiva", "Duplicado", "ResultadoCarga"]
@@ -0,0 +1,105 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from database.oracle_connection import OracleConnection
+from database.turno_dao import ConsultaError, TurnoDAO
+from .carga import TAMANO_LOTE, CargaMasiva
+from .lectura import FORMATOS, ErrorEntrada, leer_turnos
+
+logger = logging.getLogger(__name__)
+
+
+def main(argumentos=None) -> int:
+    """
+    Crea turnos en lote a partir de un archivo CSV o JSON y escribe el script SQL combinado.
+
+    Uso (desde src/):
+        python -m carga_masiva turnos.csv --salida turnos.sql
+        GESTION_TURNOS_SQLITE=datos_locales python -m carga_masiva turnos.jsonl --salida turnos.sql
+
+    Returns:
+        0 si todo se procesó, 1 si hubo registros inválidos (el resto se procesa igual),
+        2 si no se pudo leer el archivo o consultar la base de datos
+    """
+    parser = argparse.ArgumentParser(prog="python -m carga_masiva",
+                                     description="Genera el script SQL de creación de turnos leídos de un archivo")
+    parser.add_argument("entrada", help="Archivo CSV, JSON (lista) o JSON Lines con los turnos")
+    parser.add_argument("--formato", choices=FORMATOS, help="Formato de la entrada; por defecto según la extensión")
+    parser.add_argument("--salida", help="Archivo del script SQL; por defecto la salida estándar")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Turnos procesados por lote")
+    parser.add_argument("--incluir-duplicados", action="store_true",
+                        help="Crear también los turnos con el mismo horario que uno existente")
+    parser.add_argument("--sqlite", default=os.environ.get("GESTION_TURNOS_SQLITE"),
+                        help="Carpeta de una base SQLite local en lugar de Oracle "
+                             "(por defecto, la variable GESTION_TURNOS_SQLITE)")
+    args = parser.parse_args(argumentos)
+    if args.lote < 1:
+        parser.error("--lote debe ser mayor que cero")
+
+    logging.basicConfig(
+        level=getattr(logging, os.environ.get("GESTION_TURNOS_LOG", "WARNING").upper(), logging.WARNING),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    conexion = OracleConnection()
+    backend = None
+    if args.sqlite:
+        from database.sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(args.sqlite)
+        conexion.usar_backend(backend)
+
+    errores: List[ErrorEntrada] = []
+    carga = CargaMasiva(TurnoDAO(), tamano_lote=args.lote, omitir_duplicados=not args.incluir_duplicados)
+    inicio = time.perf_counter()
+    try:
+        entradas = leer_turnos(args.entrada, args.formato, al_error=errores.append)
+        if args.salida:
+            resultado = _escribir_archivo(carga, entradas, args.salida)
+        else:
+            resultado = carga.ejecutar(entradas, sys.stdout)
+    except (ErrorEntrada, OSError) as e:
+        print(f"Error en la entrada: {e}", file=sys.stderr)
+        return 2
+    except ConsultaError as e:
+        print(f"Error de base de datos: {e}", file=sys.stderr)
+        return 2
+    finally:
+        conexion.close()
+        if backend is not None:
+            conexion.usar_backend(None)
+            backend.close()
+
+    for error in errores:
+        print(f"Registro inválido, {error}", file=sys.stderr)
+    for duplicado in resultado.duplicados:
+        if duplicado.repetido_de:
+            detalle = f"mismo horario que {duplicado.repetido_de}"
+        else:
+            detalle = "mismo horario que " + ", ".join(f"{id_turno} ({nombre})" for id_turno, nombre in duplicado.existentes)
+        print(f"Duplicado, {duplicado.ubicacion}: {detalle}", file=sys.stderr)
+    print(f"{resultado.creados} turnos en el script, {len(resultado.duplicados)} duplicados, "
+          f"{len(errores)} registros inválidos ({time.perf_counter() - inicio:.2f} s)", file=sys.stderr)
+    return 1 if errores else 0
+
+
+def _escribir_archivo(carga: CargaMasiva, entradas, ruta: str):
+    """Escribe el script en un archivo temporal y lo reemplaza al terminar, para no dejarlo a medias."""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=".carga_masiva_", suffix=".sql", dir=directorio)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as destino:
+            resultado = carga.ejecutar(entradas, destino)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+    return resultado
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from database.turno_dao import TurnoDAO
+from models.turno import FirmaHorario
+from .lectura import TurnoLeido
+
+logger = logging.getLogger(__name__)
+
+# Turnos por lote: una búsqueda de duplicados, una reserva de IDs y dos consultas de script
+TAMANO_LOTE = 500
+
+
+class Duplicado(NamedTuple):
+    """Turno del archivo cuyo horario ya existe."""
+    ubicacion: str
+    nombre: str
+    # Turnos de la base de datos con el mismo horario (id_turno, nombre)
+    existentes: List[Tuple[int, str]]
+    # Ubicación del turno anterior del mismo archivo con el mismo horario, si lo hay
+    repetido_de: Optional[str] = None
+
+
+@dataclass
+class ResultadoCarga:
+    """Resumen de una carga masiva."""
+    creados: int = 0
+    lotes: int = 0
+    duplicados: List[Duplicado] = field(default_factory=list)
+
+
+def en_lotes(elementos: Iterable, tamano: int) -> Iterator[list]:
+    """Agrupa un iterable en listas de hasta `tamano` elementos, sin leerlo completo."""
+    iterador = iter(elementos)
+    while True:
+        lote = list(itertools.islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+class CargaMasiva:
+    """
+    Genera el script SQL de los turnos leídos de un archivo, por lotes.
+
+    Cada lote se compara con el catálogo mediante TurnoDAO.buscar_duplicados_lote (el
+    índice de horarios se lee una sola vez para toda la carga), recibe sus IDs en un
+    solo bloque (TurnoDAO.renumerar_turnos) y se escribe con generar_script_sql_batch.
+    Los turnos llegan de un iterador y el script se escribe lote a lote, de modo que la
+    memoria no depende del tamaño del archivo.
+
+    Un turno con el mismo horario que uno existente, o que otro anterior del mismo
+    archivo, se informa como duplicado y no se incluye en el script, salvo que se indique
+    omitir_duplicados=False (los repetidos dentro del archivo se omiten siempre).
+    """
+
+    def __init__(self, dao: TurnoDAO, tamano_lote: int = TAMANO_LOTE, omitir_duplicados: bool = True):
+        """
+        Args:
+            dao: DAO con el que se buscan duplicados, se reservan IDs y se generan los scripts
+            tamano_lote: Turnos procesados por lote
+            omitir_duplicados: Si es False, los turnos iguales a uno existente se crean igual
+        """
+        if tamano_lote < 1:
+            raise ValueError("El tamaño de lote debe ser mayor que cero")
+        self.dao = dao
+        self.tamano_lote = tamano_lote
+        self.omitir_duplicados = omitir_duplicados
+
+    def ejecutar(self, entradas: Iterable[TurnoLeido], destino: TextIO) -> ResultadoCarga:
+        """
+        Procesa los turnos y escribe el script combinado en `destino`.
+
+        Args:
+            entradas: Turnos leídos (ver carga_masiva.lectura.leer_turnos)
+            destino: Archivo de texto donde se escribe el script
+
+        Returns:
+            Resumen de la carga
+
+        Raises:
+            ConsultaError: Si falla alguna consulta a la base de datos
+        """
+        resultado = ResultadoCarga()
+        firmas_archivo: Dict[FirmaHorario, str] = {}
+
+        destino.write("-- Script SQL de carga masiva de turnos\n")
+        destino.write("-- Fecha de generación: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
+
+        for lote in en_lotes(entradas, self.tamano_lote):
+            nuevos = self._descartar_duplicados(lote, firmas_archivo, resultado)
+            if nuevos:
+                self._escribir_lote(nuevos, destino, resultado)
+            resultado.lotes += 1
+            logger.info("Lote %s procesado: %s turnos creados en total", resultado.lotes, resultado.creados)
+
+        destino.write(f"-- Total de turnos: {resultado.creados}\n")
+        destino.write("COMMIT;\n")
+        return resultado
+
+    def _descartar_duplicados(self, lote: List[TurnoLeido], firmas_archivo: Dict[FirmaHorario, str],
+                              resultado: ResultadoCarga) -> List[TurnoLeido]:
+        """Devuelve los turnos del lote que deben crearse y registra los duplicados."""
+        coincidencias = self.dao.buscar_duplicados_lote([entrada.turno for entrada in lote])
+
+        nuevos = []
+        for entrada, existentes in zip(lote, coincidencias):
+            firma = entrada.turno.firma_horario()
+            repetido_de = firmas_archivo.get(firma)
+            if repetido_de is not None or existentes:
+                resultado.duplicados.append(Duplicado(entrada.ubicacion, entrada.turno.nombre, existentes, repetido_de))
+                if repetido_de is not None or self.omitir_duplicados:
+                    continue
+            firmas_archivo[firma] = entrada.ubicacion
+            nuevos.append(entrada)
+        return nuevos
+
+    def _escribir_lote(self, nuevos: List[TurnoLeido], destino: TextIO, resultado: ResultadoCarga) -> None:
+        """Asigna IDs al lote en un solo bloque y escribe sus scripts."""
+        turnos = [entrada.turno for entrada in nuevos]
+        self.dao.renumerar_turnos(turnos)
+        for entrada in nuevos:
+            if not entrada.nombre_fijo:
+                entrada.turno.actualizar_nombre()
+
+        for entrada, script in zip(nuevos, self.dao.generar_script_sql_batch(turnos)):
+            resultado.creados += 1
+            destino.write(f"-- ======== TURNO {resultado.creados}: {entrada.turno.nombre} ({entrada.ubicacion}) ========\n")
+            destino.write(script + "\n\n")
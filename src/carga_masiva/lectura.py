@@ -0,0 +1,268 @@
+import csv
+import itertools
+import json
+import os
+import re
+from datetime import datetime, time
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from models.turno import DIAS_SEMANA, MINUTOS_POR_DIA, Turno, TurnoDetalleDiario, normalizar_jornada
+
+FORMATOS = ("csv", "json", "jsonl")
+_EXTENSIONES = {".csv": "csv", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Nombres de los días tal como los guarda la creación de turnos de la interfaz
+NOMBRES_DIAS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+# Días aceptados en la entrada: nombre completo o abreviatura de dos letras, sin tildes
+_DIAS_ENTRADA = {**{dia: i for i, dia in enumerate(DIAS_SEMANA)},
+                 **{dia[:2]: i for i, dia in enumerate(DIAS_SEMANA)}}
+_SEPARADOR_DIAS = re.compile(r"[;,/]")
+_SEPARADOR_RANGO = re.compile(r"\s*-\s*|\s+A\s+")
+
+# Caracteres leídos por vez al recorrer una lista JSON
+TAMANO_BLOQUE_JSON = 64 * 1024
+
+
+class ErrorEntrada(ValueError):
+    """Un registro del archivo de entrada no describe un turno válido."""
+    pass
+
+
+class TurnoLeido(NamedTuple):
+    """Turno leído del archivo, con su ubicación para los mensajes."""
+    ubicacion: str
+    turno: Turno
+    # Si el archivo trae el nombre; si no, se genera al asignar el ID
+    nombre_fijo: bool
+
+
+def detectar_formato(ruta: str) -> str:
+    """Deduce el formato de entrada a partir de la extensión del archivo."""
+    formato = _EXTENSIONES.get(os.path.splitext(ruta)[1].lower())
+    if formato is None:
+        raise ErrorEntrada(f"No se reconoce el formato de '{ruta}'; use --formato ({', '.join(FORMATOS)})")
+    return formato
+
+
+def parsear_dias(texto) -> List[int]:
+    """
+    Convierte una lista de días en sus posiciones (0 = lunes).
+
+    Acepta nombres completos o abreviaturas, con o sin tildes, separados por ';', ',' o
+    '/', y rangos con '-' o ' a '. Ejemplo: "Lunes a Jueves; Sa" -> [0, 1, 2, 3, 5]
+    En JSON también se acepta una lista de textos.
+    """
+    if isinstance(texto, (list, tuple)):
+        texto = ";".join(str(parte) for parte in texto)
+    dias = []
+    for parte in _SEPARADOR_DIAS.split(texto or ""):
+        parte = normalizar_jornada(parte)
+        if not parte:
+            continue
+        extremos = _SEPARADOR_RANGO.split(parte)
+        if len(extremos) > 2 or any(extremo not in _DIAS_ENTRADA for extremo in extremos):
+            raise ErrorEntrada(f"Día no reconocido: '{parte}'")
+        inicio, fin = _DIAS_ENTRADA[extremos[0]], _DIAS_ENTRADA[extremos[-1]]
+        if fin < inicio:
+            raise ErrorEntrada(f"Rango de días invertido: '{parte}'")
+        dias.extend(range(inicio, fin + 1))
+
+    if not dias:
+        raise ErrorEntrada("Falta la lista de días")
+    if len(set(dias)) != len(dias):
+        raise ErrorEntrada(f"Días repetidos en '{texto}'")
+    return dias
+
+
+def parsear_hora(texto) -> time:
+    """Convierte un texto HH:MM o HH:MM:SS en una hora."""
+    for formato in ("%H:%M", "%H:%M:%S"):
+        try:
+            return datetime.strptime(str(texto).strip(), formato).time()
+        except ValueError:
+            continue
+    raise ErrorEntrada(f"Hora no válida: '{texto}'")
+
+
+def _duracion(registro: dict, hora_ingreso: time) -> int:
+    """Duración en minutos: la columna duracion o, si falta, la diferencia hasta hora_salida."""
+    duracion = registro.get("duracion")
+    if duracion not in (None, ""):
+        try:
+            duracion = int(duracion)
+        except (TypeError, ValueError):
+            raise ErrorEntrada(f"Duración no válida: '{duracion}'")
+    elif registro.get("hora_salida") not in (None, ""):
+        hora_salida = parsear_hora(registro["hora_salida"])
+        ingreso = hora_ingreso.hour * 60 + hora_ingreso.minute
+        # Una salida anterior al ingreso corresponde al día siguiente (turno de noche)
+        duracion = (hora_salida.hour * 60 + hora_salida.minute - ingreso) % MINUTOS_POR_DIA
+    else:
+        raise ErrorEntrada("Falta hora_salida o duracion")
+
+    if not 0 < duracion < MINUTOS_POR_DIA:
+        raise ErrorEntrada(f"La duración debe estar entre 1 y {MINUTOS_POR_DIA - 1} minutos")
+    return duracion
+
+
+def construir_turno(ubicacion: str, registro: dict, detalles: Iterable[dict]) -> TurnoLeido:
+    """
+    Construye un turno sin IDs a partir de sus campos y de sus filas de detalle.
+
+    Args:
+        ubicacion: Posición en el archivo, para los mensajes
+        registro: Campos del turno (nombre, vigencia, frecuencia)
+        detalles: Filas con dias, hora_ingreso y hora_salida o duracion
+
+    Raises:
+        ErrorEntrada: Si algún campo no es válido o un día se repite
+    """
+    try:
+        turno = Turno()
+        for detalle in detalles:
+            if detalle.get("hora_ingreso") in (None, ""):
+                raise ErrorEntrada("Falta hora_ingreso")
+            hora_ingreso = parsear_hora(detalle["hora_ingreso"])
+            duracion = _duracion(detalle, hora_ingreso)
+            for dia in parsear_dias(detalle.get("dias") or detalle.get("jornada")):
+                if not turno.agregar_detalle(TurnoDetalleDiario(None, None, NOMBRES_DIAS[dia], hora_ingreso, duracion)):
+                    raise ErrorEntrada(f"El día {NOMBRES_DIAS[dia]} aparece más de una vez")
+        if not turno.detalles:
+            raise ErrorEntrada("El turno no tiene días")
+
+        vigencia = registro.get("vigencia")
+        if vigencia not in (None, ""):
+            if str(vigencia).strip() not in ("0", "1"):
+                raise ErrorEntrada(f"Vigencia no válida: '{vigencia}' (use 0 o 1)")
+            turno.vigencia = int(vigencia)
+        if registro.get("frecuencia"):
+            turno.frecuencia = str(registro["frecuencia"]).strip()
+
+        nombre = str(registro.get("nombre") or "").strip()
+        if nombre:
+            turno.nombre = nombre
+        return TurnoLeido(ubicacion, turno, bool(nombre))
+    except ErrorEntrada as e:
+        raise ErrorEntrada(f"{ubicacion}: {e}") from None
+
+
+def _leer_csv(archivo: TextIO, al_error: Callable[[ErrorEntrada], None]) -> Iterator[TurnoLeido]:
+    """
+    Lee un CSV con una fila por grupo de días con el mismo horario.
+
+    Las filas consecutivas con el mismo valor en la columna "turno" forman un solo turno
+    (por ejemplo, de lunes a jueves de 8 a 17 y el viernes de 8 a 14); sin esa columna,
+    cada fila es un turno. El separador (',', ';' o tabulador) se deduce del encabezado.
+    """
+    encabezado = archivo.readline()
+    separador = max((",", ";", "\t"), key=encabezado.count)
+    lector = csv.DictReader(itertools.chain([encabezado], archivo), delimiter=separador)
+    lector.fieldnames = [(campo or "").strip().lower() for campo in lector.fieldnames or []]
+    if "hora_ingreso" not in lector.fieldnames:
+        raise ErrorEntrada("El CSV debe tener encabezado con al menos dias, hora_ingreso y hora_salida o duracion")
+
+    filas = ((lector.line_num, fila) for fila in lector)
+    for _, grupo in itertools.groupby(filas, key=lambda par: (par[1].get("turno") or "").strip() or par[0]):
+        grupo = list(grupo)
+        try:
+            yield construir_turno(f"línea {grupo[0][0]}", grupo[0][1], (fila for _, fila in grupo))
+        except ErrorEntrada as e:
+            al_error(e)
+
+
+def _iterar_lista_json(archivo: TextIO) -> Iterator[object]:
+    """
+    Entrega uno a uno los elementos de una lista JSON, leyendo el archivo por bloques.
+
+    Con json.load habría que tener el archivo completo (y todos los turnos) en memoria.
+    """
+    decodificador = json.JSONDecoder()
+    bufer = archivo.read(TAMANO_BLOQUE_JSON).lstrip()
+    if not bufer.startswith("["):
+        raise ErrorEntrada("El archivo JSON debe contener una lista de turnos")
+    bufer = bufer[1:]
+    fin_archivo = False
+    while True:
+        bufer = bufer.lstrip()
+        if bufer.startswith(","):
+            bufer = bufer[1:].lstrip()
+        if bufer.startswith("]"):
+            return
+        try:
+            elemento, fin = decodificador.raw_decode(bufer)
+        except json.JSONDecodeError:
+            # El elemento puede estar cortado al final del bloque: se lee el siguiente
+            if fin_archivo:
+                raise ErrorEntrada("El archivo JSON está mal formado o incompleto")
+            bloque = archivo.read(TAMANO_BLOQUE_JSON)
+            fin_archivo = not bloque
+            bufer += bloque
+            continue
+        yield elemento
+        bufer = bufer[fin:]
+
+
+def _turno_desde_json(ubicacion: str, elemento) -> TurnoLeido:
+    """Convierte un objeto JSON en un turno; sin "detalles", el objeto es su único detalle."""
+    if not isinstance(elemento, dict):
+        raise ErrorEntrada(f"{ubicacion}: se esperaba un objeto")
+    detalles = elemento.get("detalles", [elemento])
+    if not isinstance(detalles, list) or not all(isinstance(detalle, dict) for detalle in detalles):
+        raise ErrorEntrada(f"{ubicacion}: detalles debe ser una lista de objetos")
+    return construir_turno(ubicacion, elemento, detalles)
+
+
+def _leer_json(archivo: TextIO, al_error: Callable[[ErrorEntrada], None]) -> Iterator[TurnoLeido]:
+    """Lee una lista JSON de turnos."""
+    for indice, elemento in enumerate(_iterar_lista_json(archivo), start=1):
+        try:
+            yield _turno_desde_json(f"registro {indice}", elemento)
+        except ErrorEntrada as e:
+            al_error(e)
+
+
+def _leer_jsonl(archivo: TextIO, al_error: Callable[[ErrorEntrada], None]) -> Iterator[TurnoLeido]:
+    """Lee un turno JSON por línea (JSON Lines); las líneas vacías se ignoran."""
+    for numero, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            try:
+                elemento = json.loads(linea)
+            except json.JSONDecodeError as e:
+                raise ErrorEntrada(f"línea {numero}: JSON no válido ({e.msg})")
+            yield _turno_desde_json(f"línea {numero}", elemento)
+        except ErrorEntrada as e:
+            al_error(e)
+
+
+_LECTORES = {"csv": _leer_csv, "json": _leer_json, "jsonl": _leer_jsonl}
+
+
+def _relanzar(error: ErrorEntrada) -> None:
+    raise error
+
+
+def leer_turnos(ruta: str, formato: Optional[str] = None,
+                al_error: Optional[Callable[[ErrorEntrada], None]] = None) -> Iterator[TurnoLeido]:
+    """
+    Lee turnos de un archivo CSV, JSON (lista) o JSON Lines a medida que se recorren.
+
+    Los turnos se construyen sin IDs: se asignan por lotes al generar el script.
+
+    Args:
+        ruta: Archivo de entrada (UTF-8, con o sin BOM)
+        formato: "csv", "json" o "jsonl"; por defecto se deduce de la extensión
+        al_error: Recibe los registros inválidos para seguir con los demás; si se omite,
+            el primer registro inválido detiene la lectura
+
+    Raises:
+        ErrorEntrada: Si el archivo no tiene el formato esperado, o ante un registro
+            inválido cuando no se indica al_error
+    """
+    formato = formato or detectar_formato(ruta)
+    if formato not in _LECTORES:
+        raise ErrorEntrada(f"Formato no soportado: '{formato}'")
+
+    with open(ruta, encoding="utf-8-sig", newline="" if formato == "csv" else None) as archivo:
+        yield from _LECTORES[formato](archivo, al_error or _relanzar)
@@ -0,0 +1,135 @@
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+import cx_Oracle
+
+logger = logging.getLogger(__name__)
+
+# Máximo de elementos en una lista IN de Oracle
+MAX_ELEMENTOS_IN = 1000
+
+
+def consultar_por_lista(db, query: str, valores: Sequence, tamano_bloque: int = MAX_ELEMENTOS_IN) -> List[tuple]:
+    """
+    Ejecuta una consulta con una lista IN de valores enlazados (:id0, :id1...), dividida
+    en bloques de tamano_bloque elementos.
+
+    Args:
+        db: Conexión sobre la que se ejecuta la consulta
+        query: Consulta con el marcador {ids} en el lugar de la lista IN
+        valores: Valores a consultar
+        tamano_bloque: Elementos por consulta
+
+    Returns:
+        Filas de todos los bloques
+
+    Raises:
+        cx_Oracle.DatabaseError: Si alguna consulta falla
+    """
+    filas = []
+    for inicio in range(0, len(valores), tamano_bloque):
+        bloque = valores[inicio:inicio + tamano_bloque]
+        params = {f"id{i}": valor for i, valor in enumerate(bloque)}
+        marcadores = ", ".join(f":{nombre}" for nombre in params)
+        result = db.execute_query(query.format(ids=marcadores), params)
+        if result is None:
+            raise cx_Oracle.DatabaseError("No se pudo consultar la base de datos por lista de valores")
+        filas.extend(result)
+    return filas
+
+
+class CargadorPorLotes:
+    """
+    Agrupa las búsquedas por clave de un mismo ciclo del bucle de eventos en una sola consulta.
+
+    Las claves pedidas con cargar() se acumulan hasta que el bucle de eventos vuelve a
+    quedar libre; entonces la función de lote recibe todas juntas y se ejecuta en un hilo
+    del QThreadPool (ver OracleConnection.ejecutar_async). Las claves repetidas, ya
+    pendientes o en curso, no se vuelven a consultar, y los resultados quedan en la caché
+    del cargador hasta llamar a limpiar(). Cada vista mantiene su propio cargador, de modo
+    que la caché no sobrevive a la vista que la usa.
+
+    Los callbacks se invocan en el hilo de la interfaz. Una clave que la función de lote
+    no devuelve se resuelve con None.
+    """
+
+    def __init__(self, db, funcion_lote: Callable[[List[Hashable]], Dict[Hashable, Any]]):
+        """
+        Args:
+            db: Conexión que ejecuta la función de lote en segundo plano
+            funcion_lote: Recibe la lista de claves y devuelve un diccionario clave -> valor
+        """
+        self.db = db
+        self.funcion_lote = funcion_lote
+        self._cache: Dict[Hashable, Any] = {}
+        # Callbacks (on_result, on_error) de cada clave a la espera del próximo lote
+        self._pendientes: Dict[Hashable, List[Tuple[Callable, Callable]]] = {}
+        # Callbacks de las claves cuyo lote ya se está consultando
+        self._en_curso: Dict[Hashable, List[Tuple[Callable, Callable]]] = {}
+        self._generacion = 0
+
+    def cargar(self, clave: Hashable, on_result: Callable[[Any], None], on_error: Callable[[str], None] = None) -> None:
+        """
+        Pide el valor de una clave; on_result lo recibe cuando se resuelve su lote.
+
+        Si la clave ya está en la caché, on_result se invoca de inmediato.
+
+        Args:
+            clave: Clave a buscar (por ejemplo, un ID)
+            on_result: Función que recibe el valor (o None si no existe)
+            on_error: Función que recibe el mensaje de error si falla la consulta
+        """
+        if clave in self._cache:
+            on_result(self._cache[clave])
+            return
+        if clave in self._en_curso:
+            self._en_curso[clave].append((on_result, on_error))
+            return
+
+        # La primera clave del ciclo programa el despacho para cuando el bucle quede libre
+        if not self._pendientes:
+            # Qt se importa al usarlo: TurnoDAO usa consultar_por_lista también sin interfaz
+            from PyQt6.QtCore import QTimer
+            QTimer.singleShot(0, self._despachar)
+        self._pendientes.setdefault(clave, []).append((on_result, on_error))
+
+    def limpiar(self) -> None:
+        """Descarta la caché; los lotes en curso entregan sus valores sin guardarlos."""
+        self._cache.clear()
+        self._en_curso = {}
+        self._generacion += 1
+
+    def _despachar(self) -> None:
+        """Resuelve todas las claves pendientes con una sola llamada a la función de lote."""
+        lote, self._pendientes = self._pendientes, {}
+        if not lote:
+            return
+        self._en_curso.update(lote)
+        claves = list(lote)
+        generacion = self._generacion
+        logger.debug("Cargando un lote de %s claves", len(claves))
+
+        self.db.ejecutar_async(
+            lambda: self.funcion_lote(claves),
+            on_result=lambda valores: self._al_resolver(lote, valores, generacion),
+            on_error=lambda mensaje: self._al_fallar(lote, mensaje, generacion)
+        )
+
+    def _al_resolver(self, lote, valores: Dict[Hashable, Any], generacion: int) -> None:
+        """Entrega a cada callback el valor de su clave y lo guarda en la caché."""
+        for clave, callbacks in lote.items():
+            valor = valores.get(clave)
+            if generacion == self._generacion:
+                self._cache[clave] = valor
+                self._en_curso.pop(clave, None)
+            for on_result, _ in callbacks:
+                on_result(valor)
+
+    def _al_fallar(self, lote, mensaje: str, generacion: int) -> None:
+        """Informa el error a todas las claves del lote; no se guarda nada en la caché."""
+        logger.error("Error al cargar un lote de %s claves: %s", len(lote), mensaje)
+        for clave, callbacks in lote.items():
+            if generacion == self._generacion:
+                self._en_curso.pop(clave, None)
+            for _, on_error in callbacks:
+                if on_error:
+                    on_error(mensaje)
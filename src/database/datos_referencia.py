@@ -0,0 +1,263 @@
+import bisect
+import logging
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+import cx_Oracle
+from .oracle_connection import OracleConnection
+from utils.indice_trigramas import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+TABLA_ORGANISMO = "DATOS_TRANSVERSALES.ORGANISMO"
+# Cada fila lleva también la firma de la tabla (ver ServicioDatosReferencia)
+CLAVE_CACHE_ORGANISMOS = "organismos_vigentes_con_firma"
+TEXTO_TODOS_ORGANISMOS = "Todos los organismos"
+
+QUERY_ORGANISMOS = f"""
+    SELECT o.ID_ORGANISMO, o.NOMBRE, f.FILAS, f.SCN
+    FROM {TABLA_ORGANISMO} o
+    CROSS JOIN (SELECT COUNT(*) AS FILAS, MAX(ORA_ROWSCN) AS SCN FROM {TABLA_ORGANISMO}) f
+    WHERE o.VIGENCIA = 1
+    ORDER BY o.NOMBRE
+"""
+
+
+class Organismo(NamedTuple):
+    """Organismo vigente, tal como se muestra en los filtros."""
+    id_organismo: int
+    nombre: str
+
+
+class ServicioDatosReferencia:
+    """
+    Datos de referencia (organismos) compartidos por todas las pestañas.
+
+    Los organismos se leen una vez por proceso y quedan indexados por ID y por prefijo
+    del nombre (sin distinguir mayúsculas ni acentos). Todos los combos de organismo usan
+    el mismo QStandardItemModel, que se actualiza en su lugar al recargar.
+
+    Para saber si la tabla cambió no se vuelve a leer: se compara una firma de una sola
+    fila (número de filas y MAX(ORA_ROWSCN), que avanza con cualquier cambio confirmado en
+    la tabla). La firma viaja en la misma consulta que los organismos, así que se guarda
+    y se revalida con ellos en la caché en disco, y la primera carga no hace otro viaje a
+    la base de datos. Una vez creado el modelo compartido, la firma se consulta en segundo
+    plano cada INTERVALO_VERIFICACION segundos; sin interfaz, cargar_organismos la consulta
+    como mucho con esa frecuencia. Solo si cambió se vuelven a leer los organismos.
+
+    Implementa el patrón Singleton, igual que OracleConnection.
+    """
+
+    _instance = None
+    INTERVALO_VERIFICACION = 60  # Segundos entre verificaciones de la firma
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ServicioDatosReferencia, cls).__new__(cls)
+            cls._instance.db = OracleConnection()
+            cls._instance._lock = threading.RLock()
+            cls._instance._organismos = None  # Ordenados por nombre; None hasta la primera carga
+            cls._instance._por_id = {}
+            cls._instance._nombres = []  # (nombre normalizado, posición en _organismos), ordenados
+            cls._instance._firma = None  # Firma de la tabla cuando se leyeron los organismos
+            cls._instance._verificado = 0.0
+            cls._instance._verificando = False
+            cls._instance._modelo = None
+            cls._instance._temporizador = None
+        return cls._instance
+
+    # --- Organismos ---
+
+    def cargar_organismos(self, forzar: bool = False) -> List[Organismo]:
+        """
+        Carga los organismos la primera vez y, después, solo si la tabla cambió.
+
+        Args:
+            forzar: Si es True, verifica la firma aunque no haya pasado el intervalo
+
+        Returns:
+            Organismos vigentes ordenados por nombre
+
+        Raises:
+            cx_Oracle.DatabaseError: Si no se pudo leer la tabla
+        """
+        with self._lock:
+            if self._organismos is None:
+                self._recargar_organismos()
+            elif forzar:
+                self.verificar_cambios()
+            elif self._temporizador is None and time.monotonic() - self._verificado >= self.INTERVALO_VERIFICACION:
+                # Con el modelo creado, la verificación la hace el temporizador en segundo plano
+                self.verificar_cambios()
+            return self._organismos
+
+    def verificar_cambios(self) -> bool:
+        """
+        Compara la firma de la tabla y recarga los organismos si cambió.
+
+        Returns:
+            True si se recargaron los organismos
+        """
+        with self._lock:
+            firma = self._consultar_firma()
+            self._verificado = time.monotonic()
+            if firma is None or firma == self._firma:
+                return False
+            logger.info("La tabla de organismos cambió, se vuelve a cargar")
+            self.db.invalidate_cache(cache_key=CLAVE_CACHE_ORGANISMOS)
+            self._recargar_organismos()
+            return True
+
+    def obtener_organismo(self, id_organismo: int) -> Optional[Organismo]:
+        """Devuelve el organismo con el ID indicado, o None si no está vigente."""
+        self.cargar_organismos()
+        return self._por_id.get(id_organismo)
+
+    def buscar_organismos(self, prefijo: str) -> List[Organismo]:
+        """
+        Devuelve los organismos cuyo nombre comienza con el prefijo, ordenados por nombre.
+
+        No distingue mayúsculas ni acentos ("muni" encuentra "Municipalidad").
+        """
+        organismos = self.cargar_organismos()
+        clave = normalizar_texto(prefijo)
+        if not clave:
+            return list(organismos)
+
+        inicio = bisect.bisect_left(self._nombres, (clave,))
+        encontrados = []
+        for nombre, posicion in self._nombres[inicio:]:
+            if not nombre.startswith(clave):
+                break
+            encontrados.append(posicion)
+        return [organismos[posicion] for posicion in sorted(encontrados)]
+
+    def modelo_organismos(self):
+        """
+        Devuelve el modelo compartido para los combos de organismo, creándolo la primera vez.
+
+        La primera fila es "Todos los organismos" (dato None); el resto tiene el ID en
+        Qt.ItemDataRole.UserRole, de modo que QComboBox.currentData() devuelve el ID.
+        Debe llamarse desde el hilo de la interfaz; desde entonces la firma de la tabla se
+        verifica en segundo plano cada INTERVALO_VERIFICACION segundos.
+        """
+        with self._lock:
+            if self._modelo is None:
+                from PyQt6.QtCore import QTimer
+                from PyQt6.QtGui import QStandardItemModel
+                self._modelo = QStandardItemModel()
+                self._llenar_modelo()
+                # Si la caché en disco se revalida o alguien modifica la tabla, el modelo se actualiza
+                senales_cache = self.db.senales_cache()
+                senales_cache.revalidada.connect(self._al_revalidar_cache)
+                senales_cache.invalidada.connect(self._al_invalidar_cache)
+                self._temporizador = QTimer()
+                self._temporizador.setInterval(self.INTERVALO_VERIFICACION * 1000)
+                self._temporizador.timeout.connect(self._verificar_en_segundo_plano)
+                self._temporizador.start()
+            return self._modelo
+
+    def _consultar_firma(self) -> Optional[Tuple]:
+        """Devuelve (filas, MAX(ORA_ROWSCN)) de la tabla de organismos, o None si falla."""
+        query = f"SELECT COUNT(*), MAX(ORA_ROWSCN) FROM {TABLA_ORGANISMO}"
+        resultado = self.db.execute_query(query)
+        return tuple(resultado[0]) if resultado else None
+
+    def _recargar_organismos(self) -> None:
+        """Lee los organismos vigentes, con la firma, y reconstruye los índices y el modelo."""
+        # Se sirven desde la caché en disco al iniciar y se revalidan en segundo plano
+        filas = self.db.execute_query(QUERY_ORGANISMOS, cache_key=CLAVE_CACHE_ORGANISMOS, persist=True)
+        if filas is None:
+            raise cx_Oracle.DatabaseError("No se pudieron leer los organismos")
+
+        self._establecer_organismos(filas)
+        self._verificado = time.monotonic()
+
+    def _verificar_en_segundo_plano(self) -> None:
+        """Consulta la firma en un hilo de trabajo; si cambió, también recarga en segundo plano."""
+        if self._organismos is None or self._verificando:
+            return
+        self._verificando = True
+        self.db.ejecutar_async(self._consultar_firma, on_result=self._al_recibir_firma,
+                               on_error=self._al_fallar_verificacion)
+
+    def _al_recibir_firma(self, firma) -> None:
+        """Compara la firma consultada en segundo plano y, si cambió, pide los organismos."""
+        self._verificando = False
+        self._verificado = time.monotonic()
+        if firma is None or firma == self._firma:
+            return
+        logger.info("La tabla de organismos cambió, se vuelve a cargar")
+        self.db.invalidate_cache(cache_key=CLAVE_CACHE_ORGANISMOS)
+        self.db.execute_query_async(QUERY_ORGANISMOS, on_result=self._establecer_organismos,
+                                    on_error=self._al_fallar_verificacion,
+                                    cache_key=CLAVE_CACHE_ORGANISMOS, persist=True)
+
+    def _al_fallar_verificacion(self, mensaje) -> None:
+        """Registra el fallo; se vuelve a intentar en la próxima verificación."""
+        self._verificando = False
+        logger.warning("No se pudo verificar la tabla de organismos: %s", mensaje)
+
+    def _establecer_organismos(self, filas) -> None:
+        """Indexa los organismos y actualiza el modelo compartido, si existe."""
+        with self._lock:
+            organismos = [Organismo(fila[0], fila[1]) for fila in filas]
+            self._organismos = organismos
+            # Sin organismos vigentes no hay firma: la próxima verificación los vuelve a leer
+            self._firma = (filas[0][2], filas[0][3]) if filas else None
+            self._por_id = {organismo.id_organismo: organismo for organismo in organismos}
+            self._nombres = sorted((normalizar_texto(organismo.nombre), posicion)
+                                   for posicion, organismo in enumerate(organismos))
+            logger.debug("%s organismos vigentes indexados", len(organismos))
+            if self._modelo is not None:
+                self._llenar_modelo()
+
+    def _llenar_modelo(self) -> None:
+        """
+        Actualiza las filas del modelo compartido con los organismos actuales.
+
+        El modelo no se vacía: solo se quitan, agregan, mueven o renombran las filas que
+        cambiaron, de modo que cada combo conserva el organismo seleccionado.
+        """
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtGui import QStandardItem
+
+        modelo = self._modelo
+        if modelo.rowCount() == 0:
+            todos = QStandardItem(TEXTO_TODOS_ORGANISMOS)
+            todos.setData(None, Qt.ItemDataRole.UserRole)
+            modelo.appendRow(todos)
+
+        def id_en_fila(fila):
+            return modelo.item(fila).data(Qt.ItemDataRole.UserRole)
+
+        organismos = self._organismos or []
+        vigentes = {organismo.id_organismo for organismo in organismos}
+        for fila in range(modelo.rowCount() - 1, 0, -1):
+            if id_en_fila(fila) not in vigentes:
+                modelo.removeRow(fila)
+
+        for fila, organismo in enumerate(organismos, start=1):
+            if fila >= modelo.rowCount() or id_en_fila(fila) != organismo.id_organismo:
+                actual = next((f for f in range(fila + 1, modelo.rowCount())
+                               if id_en_fila(f) == organismo.id_organismo), None)
+                if actual is None:
+                    item = QStandardItem(organismo.nombre)
+                    item.setData(organismo.id_organismo, Qt.ItemDataRole.UserRole)
+                    modelo.insertRow(fila, item)
+                else:
+                    # Un cambio de nombre lo movió en el orden alfabético
+                    modelo.insertRow(fila, modelo.takeRow(actual))
+            item = modelo.item(fila)
+            if item.text() != organismo.nombre:
+                item.setText(organismo.nombre)
+
+    def _al_revalidar_cache(self, cache_key, resultados):
+        """Actualiza los organismos cargados desde el disco cuando llegan los frescos."""
+        if cache_key == CLAVE_CACHE_ORGANISMOS and self._organismos is not None:
+            self._establecer_organismos(resultados)
+
+    def _al_invalidar_cache(self, tabla):
+        """Verifica la firma en segundo plano cuando alguien modifica la tabla de organismos."""
+        if tabla == TABLA_ORGANISMO:
+            self._verificar_en_segundo_plano()
@@ -0,0 +1,173 @@
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_APLICACION = "GestionTurnos"
+NOMBRE_ARCHIVO = "cache_consultas.sqlite3"
+
+
+def directorio_cache_usuario() -> str:
+    """
+    Obtiene el directorio de caché del usuario para la aplicación.
+
+    Usa %LOCALAPPDATA% en Windows, ~/Library/Caches en macOS y $XDG_CACHE_HOME
+    (o ~/.cache) en el resto de sistemas.
+    """
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, NOMBRE_APLICACION)
+
+
+class DiskCache:
+    """
+    Caché persistente de resultados de consultas en un archivo SQLite local.
+
+    Pensada para datos de referencia que cambian poco (organismos, catálogo de turnos):
+    sobrevive entre sesiones y permite mostrar datos al arrancar sin esperar a Oracle.
+    Cualquier error del archivo se registra y se trata como un fallo de caché, nunca
+    interrumpe la consulta original.
+    """
+
+    def __init__(self, ruta: Optional[str] = None, max_age: Optional[timedelta] = timedelta(days=7)):
+        """
+        Args:
+            ruta: Ruta del archivo SQLite (por defecto, en el directorio de caché del usuario)
+            max_age: Antigüedad máxima de una entrada para ser servida (None para no expirar)
+        """
+        self.ruta = ruta or os.path.join(directorio_cache_usuario(), NOMBRE_ARCHIVO)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conexion: Optional[sqlite3.Connection] = None
+
+    def _obtener_conexion(self) -> sqlite3.Connection:
+        """Abre el archivo de caché (creando la tabla si no existe) la primera vez que se usa."""
+        if self._conexion is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS CACHE_CONSULTAS (
+                    CLAVE TEXT PRIMARY KEY,
+                    VALOR BLOB NOT NULL,
+                    TABLAS TEXT NOT NULL,
+                    GUARDADO REAL NOT NULL
+                )
+            """)
+            conexion.commit()
+            self._conexion = conexion
+        return self._conexion
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Obtiene un valor de la caché persistente.
+
+        Args:
+            key: Clave de la entrada
+
+        Returns:
+            Tupla (valor, marca de tiempo en que se guardó) o None si no existe o expiró
+        """
+        try:
+            with self._lock:
+                fila = self._obtener_conexion().execute(
+                    "SELECT VALOR, GUARDADO FROM CACHE_CONSULTAS WHERE CLAVE = ?", (key,)
+                ).fetchone()
+            if fila is None:
+                return None
+
+            valor, guardado = fila
+            if self.max_age is not None and time.time() - guardado > self.max_age.total_seconds():
+                return None
+            return pickle.loads(valor), guardado
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning("Error al leer la caché persistente '%s': %s", key, e)
+            return None
+
+    def put(self, key: str, value: Any, tables: Iterable[str] = ()) -> bool:
+        """
+        Guarda un valor en la caché persistente.
+
+        Args:
+            key: Clave de la entrada
+            value: Valor a guardar (debe poder serializarse con pickle)
+            tables: Tablas (ESQUEMA.TABLA) de las que depende el valor
+
+        Returns:
+            True si se guardó correctamente
+        """
+        try:
+            datos = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            tablas = ",".join(sorted(tabla.upper() for tabla in tables))
+            with self._lock:
+                conexion = self._obtener_conexion()
+                conexion.execute(
+                    "INSERT OR REPLACE INTO CACHE_CONSULTAS (CLAVE, VALOR, TABLAS, GUARDADO) VALUES (?, ?, ?, ?)",
+                    (key, datos, tablas, time.time())
+                )
+                conexion.commit()
+            return True
+        except (sqlite3.Error, OSError, pickle.PicklingError, TypeError) as e:
+            logger.warning("Error al escribir la caché persistente '%s': %s", key, e)
+            return False
+
+    def invalidate(self, table: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        Descarta entradas de la caché persistente.
+
+        Args:
+            table: Descarta las entradas que dependen de esta tabla
+            key: Descarta la entrada con esta clave
+
+        Returns:
+            Número de entradas descartadas
+        """
+        try:
+            with self._lock:
+                conexion = self._obtener_conexion()
+                if table is None and key is None:
+                    cursor = conexion.execute("DELETE FROM CACHE_CONSULTAS")
+                else:
+                    condiciones = []
+                    params = []
+                    if key is not None:
+                        condiciones.append("CLAVE = ?")
+                        params.append(key)
+                    if table is not None:
+                        condiciones.append("instr(',' || TABLAS || ',', ?) > 0")
+                        params.append(f",{table.upper()},")
+                    cursor = conexion.execute(
+                        "DELETE FROM CACHE_CONSULTAS WHERE " + " OR ".join(condiciones), params
+                    )
+                conexion.commit()
+                return cursor.rowcount
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Error al invalidar la caché persistente: %s", e)
+            return 0
+
+    def existe(self) -> bool:
+        """Indica si el archivo de caché ya fue creado (por esta instancia o en otra sesión)."""
+        return self._conexion is not None or os.path.exists(self.ruta)
+
+    def clear(self) -> None:
+        """Descarta todas las entradas de la caché persistente."""
+        self.invalidate()
+
+    def close(self) -> None:
+        """Cierra el archivo de caché."""
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
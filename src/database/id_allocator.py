@@ -0,0 +1,214 @@
+import logging
+import threading
+from typing import Iterable, Set, Tuple
+import cx_Oracle
+from .oracle_connection import OracleConnection
+
+logger = logging.getLogger(__name__)
+
+TABLA_TURNO = "ASISTENCIAS.TURNO"
+TABLA_DETALLE = "ASISTENCIAS.TURNO_DETALLE_DIARIO"
+
+
+class ColisionIdsError(Exception):
+    """No se pudo obtener un bloque de IDs libre tras varios intentos."""
+    pass
+
+
+class IdAllocator:
+    """
+    Reparte IDs de turnos y detalles a partir de bloques reservados localmente.
+
+    En lugar de consultar MAX()+1 para cada turno, lee el máximo de ambas tablas en una
+    sola consulta y entrega IDs consecutivos desde memoria hasta agotar el bloque. Los IDs
+    entregados nunca se repiten durante la sesión. Como los turnos se crean mediante
+    scripts (sin inserción directa), antes de generar un script se verifica en una sola
+    consulta que ningún ID del lote haya sido ocupado entretanto.
+
+    Implementa el patrón Singleton, igual que OracleConnection.
+    """
+
+    _instance = None
+    TAMANO_BLOQUE = 50  # IDs que se entregan antes de volver a leer el máximo de la tabla
+    MAX_REINTENTOS = 3  # Intentos de renumeración ante colisiones
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IdAllocator, cls).__new__(cls)
+            cls._instance.db = OracleConnection()
+            cls._instance.tamano_bloque = cls.TAMANO_BLOQUE
+            cls._instance._lock = threading.RLock()
+            # Próximo ID libre y límite (exclusivo) del bloque reservado para cada tabla
+            cls._instance._siguiente = {TABLA_TURNO: None, TABLA_DETALLE: None}
+            cls._instance._limite = {TABLA_TURNO: 0, TABLA_DETALLE: 0}
+        return cls._instance
+
+    def sincronizar(self, minimo_turnos: int = 0, minimo_detalles: int = 0) -> None:
+        """
+        Lee el máximo ID de ambas tablas en una sola consulta y reserva un bloque nuevo.
+
+        Los IDs ya entregados en la sesión se respetan: el bloque nunca retrocede.
+
+        Args:
+            minimo_turnos: IDs de turno que el bloque debe poder cubrir como mínimo
+            minimo_detalles: IDs de detalle que el bloque debe poder cubrir como mínimo
+
+        Raises:
+            cx_Oracle.DatabaseError: Si no se pudo leer el máximo de las tablas
+        """
+        query = """
+            SELECT (SELECT NVL(MAX(ID_TURNO), 0) FROM ASISTENCIAS.TURNO),
+                   (SELECT NVL(MAX(ID_TURNO_DETALLE_DIARIO), 0) FROM ASISTENCIAS.TURNO_DETALLE_DIARIO)
+            FROM DUAL
+        """
+        with self._lock:
+            result = self.db.execute_query(query)
+            if not result:
+                raise cx_Oracle.DatabaseError("No se pudo obtener el máximo ID de turnos y detalles")
+
+            max_turno, max_detalle = result[0]
+            for tabla, maximo, minimo in ((TABLA_TURNO, max_turno, minimo_turnos),
+                                          (TABLA_DETALLE, max_detalle, minimo_detalles)):
+                siguiente = max(int(maximo) + 1, self._siguiente[tabla] or 0)
+                self._siguiente[tabla] = siguiente
+                self._limite[tabla] = siguiente + max(self.tamano_bloque, minimo)
+            logger.debug("Bloques de IDs reservados: turnos desde %s, detalles desde %s",
+                         self._siguiente[TABLA_TURNO], self._siguiente[TABLA_DETALLE])
+
+    def _reservar(self, tabla: str, cantidad: int) -> range:
+        with self._lock:
+            siguiente = self._siguiente[tabla]
+            if siguiente is None or siguiente + cantidad > self._limite[tabla]:
+                if tabla == TABLA_TURNO:
+                    self.sincronizar(minimo_turnos=cantidad)
+                else:
+                    self.sincronizar(minimo_detalles=cantidad)
+                siguiente = self._siguiente[tabla]
+            self._siguiente[tabla] = siguiente + cantidad
+            return range(siguiente, siguiente + cantidad)
+
+    def _proximo(self, tabla: str) -> int:
+        with self._lock:
+            if self._siguiente[tabla] is None or self._siguiente[tabla] >= self._limite[tabla]:
+                self.sincronizar()
+            return self._siguiente[tabla]
+
+    def reservar_turnos(self, cantidad: int = 1) -> range:
+        """Entrega `cantidad` IDs de turno consecutivos que no se volverán a entregar."""
+        return self._reservar(TABLA_TURNO, cantidad)
+
+    def reservar_detalles(self, cantidad: int = 1) -> range:
+        """Entrega `cantidad` IDs de detalle consecutivos que no se volverán a entregar."""
+        return self._reservar(TABLA_DETALLE, cantidad)
+
+    def proximo_id_turno(self) -> int:
+        """Devuelve el próximo ID de turno libre sin reservarlo."""
+        return self._proximo(TABLA_TURNO)
+
+    def proximo_id_detalle(self) -> int:
+        """Devuelve el próximo ID de detalle libre sin reservarlo."""
+        return self._proximo(TABLA_DETALLE)
+
+    def asignar(self, turno) -> None:
+        """
+        Asigna IDs a un turno (si no tiene uno válido) y a todos sus detalles.
+
+        Args:
+            turno: Turno al que se asignarán los IDs
+        """
+        if turno.id_turno is None or turno.id_turno <= 0:
+            turno.id_turno = self.reservar_turnos(1)[0]
+        for id_detalle, detalle in zip(self.reservar_detalles(len(turno.detalles)), turno.detalles):
+            detalle.id_turno_detalle_diario = id_detalle
+            detalle.id_turno = turno.id_turno
+
+    def buscar_colisiones(self, ids_turno: Iterable[int], ids_detalle: Iterable[int]) -> Tuple[Set[int], Set[int]]:
+        """
+        Obtiene, en una sola consulta, qué IDs de un lote ya existen en la base de datos.
+
+        Args:
+            ids_turno: IDs de turno a verificar
+            ids_detalle: IDs de detalle a verificar
+
+        Returns:
+            Tupla (IDs de turno ocupados, IDs de detalle ocupados)
+
+        Raises:
+            cx_Oracle.DatabaseError: Si no se pudo ejecutar la verificación
+        """
+        ids_turno = set(ids_turno)
+        ids_detalle = set(ids_detalle)
+        if not ids_turno and not ids_detalle:
+            return set(), set()
+
+        # Los lotes son rangos casi contiguos: basta un BETWEEN por tabla
+        partes = []
+        params = {}
+        if ids_turno:
+            partes.append("""
+                SELECT 'T', ID_TURNO FROM ASISTENCIAS.TURNO
+                WHERE ID_TURNO BETWEEN :turno_desde AND :turno_hasta
+            """)
+            params.update(turno_desde=min(ids_turno), turno_hasta=max(ids_turno))
+        if ids_detalle:
+            partes.append("""
+                SELECT 'D', ID_TURNO_DETALLE_DIARIO FROM ASISTENCIAS.TURNO_DETALLE_DIARIO
+                WHERE ID_TURNO_DETALLE_DIARIO BETWEEN :detalle_desde AND :detalle_hasta
+            """)
+            params.update(detalle_desde=min(ids_detalle), detalle_hasta=max(ids_detalle))
+
+        result = self.db.execute_query(" UNION ALL ".join(partes), params)
+        if result is None:
+            raise cx_Oracle.DatabaseError("No se pudo verificar la disponibilidad de los IDs")
+
+        ocupados_turno = {id_ for tipo, id_ in result if tipo == 'T'} & ids_turno
+        ocupados_detalle = {id_ for tipo, id_ in result if tipo == 'D'} & ids_detalle
+        return ocupados_turno, ocupados_detalle
+
+    def renumerar(self, turnos: list) -> bool:
+        """
+        Garantiza que los IDs de un lote de turnos sean únicos y estén libres en la base de datos.
+
+        Si los IDs actuales no colisionan se conservan; si alguno ya existe (o se repite
+        dentro del lote) se asignan IDs nuevos y consecutivos a todo el lote.
+
+        Args:
+            turnos: Turnos a verificar; se modifican en el lugar
+
+        Returns:
+            True si hubo que renumerar el lote
+
+        Raises:
+            ColisionIdsError: Si tras MAX_REINTENTOS no se encontró un bloque libre
+            cx_Oracle.DatabaseError: Si falló alguna consulta
+        """
+        renumerado = False
+        for intento in range(self.MAX_REINTENTOS + 1):
+            ids_turno = [t.id_turno for t in turnos]
+            ids_detalle = [d.id_turno_detalle_diario for t in turnos for d in t.detalles]
+            sin_asignar = any(not id_ or id_ <= 0 for id_ in ids_turno + ids_detalle)
+            repetidos = len(set(ids_turno)) != len(ids_turno) or len(set(ids_detalle)) != len(ids_detalle)
+
+            if not sin_asignar and not repetidos:
+                ocupados_turno, ocupados_detalle = self.buscar_colisiones(ids_turno, ids_detalle)
+                if not ocupados_turno and not ocupados_detalle:
+                    return renumerado
+                logger.info("IDs ocupados en la base de datos: turnos %s, detalles %s",
+                            sorted(ocupados_turno), sorted(ocupados_detalle))
+
+            if intento == self.MAX_REINTENTOS:
+                break
+
+            with self._lock:
+                # Releer el máximo real y asignar un bloque nuevo a todo el lote
+                self.sincronizar(minimo_turnos=len(ids_turno), minimo_detalles=len(ids_detalle))
+                nuevos_turnos = iter(self.reservar_turnos(len(ids_turno)))
+                nuevos_detalles = iter(self.reservar_detalles(len(ids_detalle)))
+                for turno in turnos:
+                    turno.id_turno = next(nuevos_turnos)
+                    for detalle in turno.detalles:
+                        detalle.id_turno_detalle_diario = next(nuevos_detalles)
+                        detalle.id_turno = turno.id_turno
+            renumerado = True
+
+        raise ColisionIdsError("No se encontró un bloque de IDs libre para el lote de turnos")
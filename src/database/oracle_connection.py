@@ -1,14 +1,37 @@
+import logging
 import cx_Oracle
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Iterable, Iterator, Callable
 import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from .disk_cache import DiskCache
+from .query_cache import QueryCache, extraer_tablas
+from .query_stats import QueryStats
+
+logger = logging.getLogger(__name__)
+
+# Marca para distinguir "sin valor en caché" de un resultado vacío
+_SIN_CACHE = object()
+
+# Estados de la conexión iniciada con conectar_en_segundo_plano
+ESTADO_DESCONECTADO = "desconectado"
+ESTADO_CONECTANDO = "conectando"
+ESTADO_CONECTADO = "conectado"
+ESTADO_ERROR = "error"
 
 class OracleConnection:
     _instance = None
-    _cache: Dict[str, Any] = {}
-    _cache_timestamp: Dict[str, datetime] = {}
     CACHE_DURATION = timedelta(minutes=10)  # Reducir a 10 minutos para evitar datos desactualizados
+    CACHE_MAX_ENTRIES = 256  # Número máximo de consultas en caché
+    CACHE_MAX_BYTES = 64 * 1024 * 1024  # Presupuesto de memoria de la caché (64 MB)
+    _cache = QueryCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_DURATION)
+    DISK_CACHE_MAX_AGE = timedelta(days=7)  # Antigüedad máxima de los datos de referencia guardados en disco
+    # Filas por viaje de red al leer resultados (los valores por defecto de cx_Oracle son 100 y 2)
+    DEFAULT_ARRAYSIZE = 500
+    DEFAULT_PREFETCHROWS = 500
     # Bandera para rastrear si la conexión ya ha sido informada como exitosa
     _connection_reported = False
 
@@ -25,17 +48,172 @@ class OracleConnection:
             cls._instance.max_connection_attempts = 3
             cls._instance._last_ping_time = datetime.now() - timedelta(minutes=20)  # Inicializar con un valor pasado
             cls._instance._ping_interval = timedelta(minutes=5)  # Verificar ping cada 5 minutos
+            # Configuración del modo pool de sesiones (desactivado por defecto)
+            cls._instance.use_pool = False
+            cls._instance.pool = None
+            cls._instance.pool_min = 1
+            cls._instance.pool_max = 4
+            cls._instance.pool_increment = 1
+            cls._instance._lock = threading.RLock()
+            # Serializa los intentos de conexión; distinto de _lock para que la interfaz no
+            # espere el handshake de Oracle al usar la caché o las señales
+            cls._instance._lock_conexion = threading.RLock()
+            # Serializa el uso de la conexión única; se toma siempre después de conectar
+            # (nunca se espera _lock_conexion con este candado tomado)
+            cls._instance._lock_consulta = threading.RLock()
+            # Conexión en segundo plano: estado, acciones a la espera y señales (creadas bajo demanda)
+            cls._instance._estado_conexion = ESTADO_DESCONECTADO
+            cls._instance._pendientes_conexion = []
+            cls._instance._senales_conexion = None
+            cls._instance._error_conexion = ""
+            # Ejecución asíncrona de consultas (QThreadPool creado bajo demanda)
+            cls._instance._thread_pool = None
+            cls._instance._workers_activos = set()
+            # Caché persistente en disco (creada bajo demanda) y su revalidación en segundo plano
+            cls._instance._disk_cache = None
+            cls._instance._revalidador = None
+            cls._instance._claves_revalidadas = set()
+            # Señales de revalidación e invalidación (SenalesCache, creado bajo demanda)
+            cls._instance._senales_cache = None
+            # Tamaños de lectura aplicados a cada cursor
+            cls._instance.arraysize = cls.DEFAULT_ARRAYSIZE
+            cls._instance.prefetchrows = cls.DEFAULT_PREFETCHROWS
+            # Backend alternativo (p. ej. SQLiteBackend); None para usar Oracle
+            cls._instance.backend = None
+            # Latencia, filas, uso de caché y sitio de llamada de cada consulta
+            cls._instance._stats = QueryStats()
         return cls._instance
     
     def is_connected(self) -> bool:
         """Verifica si hay una conexión activa a la base de datos."""
+        if self.backend is not None:
+            return True
+        if self.use_pool:
+            return self.pool is not None
         return self.connection is not None and self._is_connection_valid()
+
+    def enable_pool(self, min_sessions: int = 1, max_sessions: int = 4, increment: int = 1) -> None:
+        """
+        Activa el modo pool de sesiones respaldado por cx_Oracle.SessionPool.
+        
+        En este modo cada llamada a execute_query obtiene su propia sesión del pool,
+        de modo que varias consultas pueden ejecutarse a la vez desde distintos hilos
+        sin compartir la conexión única.
+        
+        Args:
+            min_sessions: Número mínimo de sesiones abiertas en el pool
+            max_sessions: Número máximo de sesiones simultáneas
+            increment: Sesiones que se abren cada vez que el pool necesita crecer
+            
+        Raises:
+            ValueError: Si los tamaños del pool no son coherentes
+        """
+        if min_sessions < 0 or max_sessions < 1 or increment < 0 or min_sessions > max_sessions:
+            raise ValueError(
+                f"Configuración de pool inválida: min={min_sessions}, max={max_sessions}, incremento={increment}"
+            )
+        
+        with self._lock:
+            configuracion_nueva = (min_sessions, max_sessions, increment)
+            configuracion_actual = (self.pool_min, self.pool_max, self.pool_increment)
+            # Si el pool ya existe con otra configuración, se cierra para recrearlo al conectar
+            if self.pool is not None and configuracion_nueva != configuracion_actual:
+                self._close_pool()
+            
+            self.pool_min, self.pool_max, self.pool_increment = configuracion_nueva
+            self.use_pool = True
+
+    def _create_pool(self) -> cx_Oracle.SessionPool:
+        """Crea el pool de sesiones si aún no existe y lo devuelve."""
+        with self._lock:
+            if self.pool is None:
+                logger.debug("Creando pool de sesiones (min=%s, max=%s, incremento=%s)",
+                             self.pool_min, self.pool_max, self.pool_increment)
+                dsn = cx_Oracle.makedsn(
+                    self.host,
+                    self.port,
+                    service_name=self.service_name
+                )
+                self.pool = cx_Oracle.SessionPool(
+                    user=self.username,
+                    password=self.password,
+                    dsn=dsn,
+                    min=self.pool_min,
+                    max=self.pool_max,
+                    increment=self.pool_increment,
+                    threaded=True,
+                    getmode=cx_Oracle.SPOOL_ATTRVAL_WAIT
+                )
+            return self.pool
+
+    def _close_pool(self) -> None:
+        """Cierra el pool de sesiones, si existe."""
+        if self.pool is not None:
+            try:
+                self.pool.close(force=True)
+                logger.info("Pool de sesiones cerrado exitosamente")
+            except cx_Oracle.Error as error:
+                logger.error("Error al cerrar el pool de sesiones: %s", error)
+            finally:
+                self.pool = None
+
+    @contextmanager
+    def acquire(self):
+        """
+        Obtiene una sesión de base de datos para usarla dentro de un bloque with.
+        
+        En modo pool la sesión se toma del pool y se devuelve al salir del bloque;
+        en modo conexión única se entrega la conexión compartida.
+        
+        Ejemplo:
+            with db.acquire() as conn:
+                cursor = conn.cursor()
+                
+        Raises:
+            cx_Oracle.DatabaseError: Si no se puede obtener una sesión
+        """
+        if self.backend is not None:
+            with self.backend.acquire() as conn:
+                yield conn
+            return
+        
+        if not self.use_pool:
+            # Se conecta antes de tomar _lock_consulta: la precarga que hace connect() en otro
+            # hilo usa la conexión mientras tiene _lock_conexion, y no debe esperar a esta consulta
+            connection = self.connect()
+            if connection is None:
+                raise cx_Oracle.DatabaseError("No se pudo establecer conexión a la base de datos")
+            # La conexión única no admite uso concurrente: se serializa entre hilos
+            with self._lock_consulta:
+                yield connection
+            return
+        
+        pool = self.pool if self.pool is not None else self.connect()
+        if pool is None:
+            raise cx_Oracle.DatabaseError("No se pudo crear el pool de sesiones")
+        
+        conn = pool.acquire()
+        try:
+            yield conn
+        except cx_Oracle.Error:
+            # La sesión puede haber quedado inválida: se descarta en lugar de devolverla
+            try:
+                pool.drop(conn)
+            finally:
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                pool.release(conn)
     
     def _initialize_cache(self):
         """Inicializa el caché con consultas comunes que se usan frecuentemente."""
         # Inicializar las estructuras de caché, pero no precargar consultas aún
-        self._cache = {}
-        self._cache_timestamp = {}
+        self._cache = QueryCache(
+            max_entries=self.CACHE_MAX_ENTRIES,
+            max_bytes=self.CACHE_MAX_BYTES,
+            ttl=self.CACHE_DURATION
+        )
 
     def _is_connection_valid(self) -> bool:
         """Verifica si la conexión es válida sin llamar a ping() con demasiada frecuencia."""
@@ -56,59 +234,98 @@ class OracleConnection:
         # Si el ping reciente fue exitoso, la conexión todavía es válida
         return True
 
-    def connect(self) -> Optional[cx_Oracle.Connection]:
-        """Establece la conexión con la base de datos Oracle."""
-        try:
-            if not self._is_connection_valid():
-                print("DEBUG: Conexión no válida, intentando conectar...")
-                # Limitar intentos de conexión
-                if self.connection_attempts >= self.max_connection_attempts:
-                    print("DEBUG: Máximo número de intentos de conexión alcanzado")
-                    return None
+    def connect(self) -> Optional[Union[cx_Oracle.Connection, cx_Oracle.SessionPool]]:
+        """
+        Establece la conexión con la base de datos Oracle.
+        
+        En modo pool crea el pool de sesiones (si no existe) y lo devuelve;
+        en modo conexión única devuelve la conexión compartida. Si otro hilo ya está
+        conectando (p. ej. conectar_en_segundo_plano), espera a que termine y reutiliza
+        su conexión en lugar de abrir otra.
+        """
+        if self.backend is not None:
+            return self.backend.conexion
+        
+        with self._lock_conexion:
+            if self.use_pool:
+                return self._connect_pool()
+            
+            try:
+                if not self._is_connection_valid():
+                    logger.debug("Conexión no válida, intentando conectar...")
+                    # Limitar intentos de conexión
+                    if self.connection_attempts >= self.max_connection_attempts:
+                        logger.error("Máximo número de intentos de conexión alcanzado")
+                        return None
                     
-                self.connection_attempts += 1
-                print(f"DEBUG: Intento de conexión #{self.connection_attempts}")
-                
-                # Si había una conexión previa, intentar cerrarla primero
-                if self.connection:
-                    try:
-                        print("DEBUG: Cerrando conexión previa...")
-                        self.connection.close()
-                    except Exception as e:
-                        print(f"DEBUG: Error al cerrar conexión previa: {str(e)}")
-                
-                print(f"DEBUG: Conectando a {self.host}:{self.port}/{self.service_name} con usuario {self.username}")
-                dsn = cx_Oracle.makedsn(
-                    self.host,
-                    self.port,
-                    service_name=self.service_name
-                )
-                self.connection = cx_Oracle.connect(
-                    user=self.username,
-                    password=self.password,
-                    dsn=dsn
-                )
-                
-                # Solo reportar la conexión exitosa la primera vez
-                if not self._connection_reported:
-                    print("DEBUG: Conexión establecida exitosamente")
-                    self._connection_reported = True
-                
-                self.connection_attempts = 0  # Resetear intentos si hay éxito
-                self._last_ping_time = datetime.now()  # Actualizar tiempo del último ping
-                print("DEBUG: Conexión establecida y validada")
-                
-                # Precargar consultas comunes después de establecer conexión exitosa
-                self._prefetch_common_queries()
-            else:
-                print("DEBUG: Usando conexión existente")
+                    self.connection_attempts += 1
+                    logger.debug("Intento de conexión #%s", self.connection_attempts)
+                    
+                    # Si había una conexión previa, intentar cerrarla primero
+                    if self.connection:
+                        try:
+                            logger.debug("Cerrando conexión previa...")
+                            self.connection.close()
+                        except Exception as e:
+                            logger.warning("Error al cerrar conexión previa: %s", e)
+                    
+                    logger.debug("Conectando a %s:%s/%s con usuario %s",
+                                 self.host, self.port, self.service_name, self.username)
+                    dsn = cx_Oracle.makedsn(
+                        self.host,
+                        self.port,
+                        service_name=self.service_name
+                    )
+                    self.connection = cx_Oracle.connect(
+                        user=self.username,
+                        password=self.password,
+                        dsn=dsn
+                    )
+                    
+                    # Solo reportar la conexión exitosa la primera vez
+                    if not self._connection_reported:
+                        logger.info("Conexión establecida exitosamente")
+                        self._connection_reported = True
+                    
+                    self.connection_attempts = 0  # Resetear intentos si hay éxito
+                    self._last_ping_time = datetime.now()  # Actualizar tiempo del último ping
+                    logger.debug("Conexión establecida y validada")
+                    
+                    # Precargar consultas comunes después de establecer conexión exitosa
+                    self._prefetch_common_queries()
+                else:
+                    logger.debug("Usando conexión existente")
                 
-            return self.connection
+                return self.connection
+            except cx_Oracle.Error as error:
+                logger.error("Error al conectar a Oracle: %s", error)
+                return None
+
+    def _connect_pool(self) -> Optional[cx_Oracle.SessionPool]:
+        """Crea el pool de sesiones respetando el límite de intentos de conexión."""
+        if self.pool is not None:
+            return self.pool
+        
+        if self.connection_attempts >= self.max_connection_attempts:
+            logger.error("Máximo número de intentos de conexión alcanzado")
+            return None
+        
+        self.connection_attempts += 1
+        try:
+            pool = self._create_pool()
+            self.connection_attempts = 0
+            if not self._connection_reported:
+                logger.info("Pool de sesiones establecido exitosamente")
+                self._connection_reported = True
+            
+            self._prefetch_common_queries()
+            return pool
         except cx_Oracle.Error as error:
-            print(f"DEBUG: Error al conectar a Oracle: {error}")
+            logger.error("Error al crear el pool de sesiones: %s", error)
             return None
 
-    def execute_query(self, query: str, params: Union[tuple, dict] = None, cache_key: str = None, retry_count: int = 1) -> Optional[list]:
+    def execute_query(self, query: str, params: Union[tuple, dict] = None, cache_key: str = None, retry_count: int = 1,
+                      cache_tables: Iterable[str] = None, persist: bool = False) -> Optional[list]:
         """
         Ejecuta una consulta SQL y devuelve los resultados.
         
@@ -117,94 +334,506 @@ class OracleConnection:
             params: Parámetros para la consulta (opcional)
             cache_key: Clave para almacenar en caché los resultados (opcional)
             retry_count: Número de intentos de reconexión en caso de error
+            cache_tables: Tablas de las que depende el resultado en caché; si se omite
+                se deducen de las cláusulas FROM/JOIN de la consulta
+            persist: Si es True (y hay cache_key) el resultado también se guarda en la caché
+                en disco; en la siguiente sesión se sirve desde allí y se revalida en segundo plano
             
         Returns:
             Lista de resultados o None si hay un error
         """
+        inicio = time.perf_counter()
+        medicion = {'cache': 'fallo' if cache_key else None, 'reintentos': 0}
+        results = None
+        try:
+            results = self._ejecutar_consulta(query, params, cache_key, retry_count, cache_tables, persist, medicion)
+            return results
+        finally:
+            self._stats.registrar(
+                query, params, time.perf_counter() - inicio,
+                filas=len(results) if results is not None else 0,
+                cache=medicion['cache'], reintentos=medicion['reintentos'], error=results is None
+            )
+
+    def _ejecutar_consulta(self, query: str, params: Union[tuple, dict], cache_key: str, retry_count: int,
+                           cache_tables: Iterable[str], persist: bool, medicion: dict) -> Optional[list]:
+        """Implementación de execute_query; anota en `medicion` el uso de la caché y los reintentos."""
+        # La caché en disco guarda datos de Oracle: no se mezcla con los de un backend local
+        persist = persist and self.backend is None
+        
         # Si hay una clave de caché y los resultados están en caché y no han expirado, devolverlos
-        if cache_key and cache_key in self._cache and cache_key in self._cache_timestamp:
-            if datetime.now() - self._cache_timestamp[cache_key] < self.CACHE_DURATION:
-                print(f"DEBUG: Usando resultados en caché para la clave '{cache_key}'")
-                return self._cache[cache_key]
+        if cache_key:
+            cached = self._cache.get(cache_key, _SIN_CACHE)
+            if cached is not _SIN_CACHE:
+                logger.debug("Usando resultados en caché para la clave '%s'", cache_key)
+                medicion['cache'] = 'memoria'
+                return cached
+            
+            if persist:
+                en_disco = self._get_disk_cache().get(cache_key)
+                if en_disco is not None:
+                    results = en_disco[0]
+                    tablas = cache_tables if cache_tables is not None else extraer_tablas(query)
+                    logger.debug("Usando resultados de la caché en disco para la clave '%s'", cache_key)
+                    medicion['cache'] = 'disco'
+                    self._cache.put(cache_key, results, tables=tablas)
+                    self._revalidar_en_segundo_plano(query, params, cache_key, tablas)
+                    return results
         
         # Verificar si hay conexión, si no, intentar conectar
         if not self.is_connected():
-            print("DEBUG: No hay conexión activa, intentando conectar...")
+            logger.debug("No hay conexión activa, intentando conectar...")
             if not self.connect():
-                print("DEBUG: No se pudo establecer conexión a la base de datos")
+                logger.error("No se pudo establecer conexión a la base de datos")
                 return None
         
         try:
-            print(f"DEBUG: Ejecutando consulta: {query[:100]}...")
+            logger.debug("Ejecutando consulta: %.100s...", query)
             if params:
-                print(f"DEBUG: Con parámetros: {params}")
+                logger.debug("Con parámetros: %s", params)
             
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or {})
-            results = cursor.fetchall()
-            cursor.close()
+            # Cada llamada obtiene su propia sesión (en modo pool) y su propio cursor
+            with self.acquire() as conn:
+                cursor = self._crear_cursor(conn)
+                try:
+                    cursor.execute(query, params or {})
+                    results = cursor.fetchall()
+                finally:
+                    cursor.close()
             
-            print(f"DEBUG: Consulta ejecutada con éxito. Filas obtenidas: {len(results)}")
+            logger.debug("Consulta ejecutada con éxito. Filas obtenidas: %s", len(results))
             
             # Si hay una clave de caché, almacenar los resultados
             if cache_key:
-                self._cache[cache_key] = results
-                self._cache_timestamp[cache_key] = datetime.now()
-                print(f"DEBUG: Resultados almacenados en caché con la clave '{cache_key}'")
+                tablas = cache_tables if cache_tables is not None else extraer_tablas(query)
+                if self._cache.put(cache_key, results, tables=tablas):
+                    logger.debug("Resultados almacenados en caché con la clave '%s'", cache_key)
+                if persist:
+                    # Recién leído de Oracle: no hace falta revalidarlo en esta sesión
+                    self._claves_revalidadas.add(cache_key)
+                    self._get_disk_cache().put(cache_key, results, tables=tablas)
             
             return results
             
         except cx_Oracle.Error as e:
-            print(f"DEBUG: Error al ejecutar consulta: {str(e)}")
+            logger.warning("Error al ejecutar consulta: %s", e)
             
             # Si es un error de conexión y hay intentos restantes, intentar reconectar
             if retry_count > 0:
-                print(f"DEBUG: Intentando reconectar ({retry_count} intentos restantes)...")
+                logger.debug("Intentando reconectar (%s intentos restantes)...", retry_count)
                 time.sleep(1)  # Esperar un segundo antes de reintentar
-                self.connection = None  # Forzar reconexión
+                if not self.use_pool:
+                    self.connection = None  # Forzar reconexión (el pool descarta solo la sesión fallida)
                 if self.connect():
-                    print("DEBUG: Reconexión exitosa, reintentando consulta...")
-                    return self.execute_query(query, params, cache_key, retry_count - 1)
+                    logger.debug("Reconexión exitosa, reintentando consulta...")
+                    medicion['reintentos'] += 1
+                    return self._ejecutar_consulta(query, params, cache_key, retry_count - 1, cache_tables,
+                                                   persist, medicion)
+            
+            logger.error("No se pudo ejecutar la consulta después de los reintentos")
+            return None
+
+    def iter_query(self, query: str, params: Union[tuple, dict] = None, batch_size: int = 500,
+                   arraysize: int = None, prefetchrows: int = None) -> Iterator[tuple]:
+        """
+        Ejecuta una consulta y entrega sus filas a medida que llegan de la base de datos.
+        
+        Las filas se leen en lotes con fetchmany, por lo que la memoria usada depende del
+        tamaño del lote y no del total de filas. La sesión permanece ocupada hasta que el
+        generador se agota o se cierra; en modo conexión única las demás consultas esperan
+        mientras tanto. Los resultados no se almacenan en caché.
+        
+        Ejemplo:
+            for fila in db.iter_query("SELECT ... ORDER BY ID_TURNO", batch_size=1000):
+                ...
+        
+        Args:
+            query: Consulta SQL a ejecutar
+            params: Parámetros para la consulta (opcional)
+            batch_size: Filas pedidas en cada fetchmany
+            arraysize: Filas por viaje de red (por defecto, batch_size)
+            prefetchrows: Filas que Oracle envía junto con la ejecución (por defecto, batch_size)
+            
+        Yields:
+            Cada fila del resultado
+            
+        Raises:
+            ValueError: Si batch_size no es positivo
+            cx_Oracle.Error: Si no hay conexión o la consulta falla
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size debe ser positivo: {batch_size}")
+        
+        logger.debug("Ejecutando consulta por lotes de %s: %.100s...", batch_size, query)
+        total = 0
+        inicio = time.perf_counter()
+        sitio = self._stats.sitio_actual()
+        completada = False
+        try:
+            with self.acquire() as conn:
+                cursor = self._crear_cursor(conn, arraysize or batch_size, prefetchrows or batch_size)
+                try:
+                    cursor.execute(query, params or {})
+                    while True:
+                        filas = cursor.fetchmany(batch_size)
+                        if not filas:
+                            break
+                        total += len(filas)
+                        yield from filas
+                finally:
+                    cursor.close()
+            completada = True
+        finally:
+            # Incluye el tiempo que el consumidor tarda en procesar las filas
+            self._stats.registrar(query, params, time.perf_counter() - inicio, filas=total,
+                                  error=not completada, sitio=sitio)
+        logger.debug("Consulta por lotes completada. Filas obtenidas: %s", total)
+
+    def usar_backend(self, backend) -> None:
+        """
+        Redirige todas las consultas a un backend alternativo, como SQLiteBackend.
+        
+        El backend debe ofrecer acquire() (context manager que entrega una conexión con
+        la interfaz de cx_Oracle) y el atributo conexion. Se descarta la caché en memoria
+        para no mezclar resultados de ambos orígenes; la caché en disco no se usa mientras
+        el backend esté activo.
+        
+        Args:
+            backend: Backend a usar, o None para volver a Oracle
+        """
+        with self._lock:
+            self.backend = backend
+            self._cache.clear()
+            self._claves_revalidadas.clear()
+        logger.info("Backend de datos: %s", type(backend).__name__ if backend is not None else 'Oracle')
+
+    def _crear_cursor(self, conn, arraysize: int = None, prefetchrows: int = None):
+        """Crea un cursor con los tamaños de lectura configurados."""
+        cursor = conn.cursor()
+        cursor.arraysize = arraysize or self.arraysize
+        cursor.prefetchrows = prefetchrows or self.prefetchrows
+        return cursor
+
+    def execute_query_async(self, query: str, params: Union[tuple, dict] = None, on_result=None, on_error=None,
+                            cache_key: str = None, persist: bool = False):
+        """
+        Ejecuta una consulta en un hilo del QThreadPool sin bloquear la interfaz.
+        
+        Los callbacks se invocan a través de señales de Qt, es decir, en el hilo de la
+        interfaz, por lo que pueden actualizar widgets directamente. Si la conexión en
+        segundo plano aún no está lista, la consulta se encola hasta que lo esté.
+        
+        Args:
+            query: Consulta SQL a ejecutar
+            params: Parámetros para la consulta (opcional)
+            on_result: Función que recibe la lista de resultados
+            on_error: Función que recibe el mensaje de error
+            cache_key: Clave para almacenar en caché los resultados (opcional)
+            persist: Guarda también el resultado en la caché en disco (ver execute_query)
             
-            print("DEBUG: No se pudo ejecutar la consulta después de los reintentos")
+        Returns:
+            El QueryWorker encolado, para conectar señales adicionales si es necesario
+        """
+        def _ejecutar():
+            resultados = self.execute_query(query, params, cache_key=cache_key, persist=persist)
+            if resultados is None:
+                raise cx_Oracle.DatabaseError("No se pudo ejecutar la consulta en la base de datos")
+            return resultados
+        
+        return self.ejecutar_async(_ejecutar, on_result=on_result, on_error=on_error)
+    
+    def ejecutar_async(self, funcion: Callable[[], Any], on_result=None, on_error=None):
+        """
+        Ejecuta una función de acceso a datos en un hilo del QThreadPool.
+        
+        Igual que execute_query_async, pero para operaciones que ejecutan varias consultas
+        o procesan las filas antes de entregarlas (por ejemplo, las búsquedas por lotes de
+        CargadorPorLotes). Una excepción de la función se entrega a on_error.
+        
+        Args:
+            funcion: Función sin argumentos que devuelve el resultado
+            on_result: Función que recibe el resultado
+            on_error: Función que recibe el mensaje de error
+            
+        Returns:
+            El QueryWorker encolado
+        """
+        from .query_worker import QueryWorker
+        
+        # En el hilo de trabajo la pila ya no contiene al widget: el sitio se captura aquí
+        sitio = self._stats.sitio_actual()
+        
+        def _ejecutar():
+            with self._stats.en_sitio(sitio):
+                return funcion()
+        
+        worker = QueryWorker(_ejecutar)
+        if on_result:
+            worker.signals.resultado.connect(on_result)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        
+        # Mantener una referencia al worker hasta que termine para que no se destruyan sus señales
+        self._workers_activos.add(worker)
+        worker.signals.finalizado.connect(lambda: self._workers_activos.discard(worker))
+        
+        # Mientras la conexión en segundo plano no esté lista, la operación espera en cola
+        self.cuando_conectado(lambda: self._get_thread_pool().start(worker))
+        return worker
+
+    def _get_thread_pool(self):
+        """Obtiene el QThreadPool de consultas, ajustado al tamaño del pool de sesiones."""
+        from PyQt6.QtCore import QThreadPool
+        
+        if self._thread_pool is None:
+            self._thread_pool = QThreadPool()
+        # Sin pool de sesiones solo tiene sentido un hilo: la conexión única se serializa
+        self._thread_pool.setMaxThreadCount(self.pool_max if self.use_pool else 1)
+        return self._thread_pool
+
+    def _get_disk_cache(self) -> DiskCache:
+        """Obtiene la caché persistente en disco, creándola la primera vez que se usa."""
+        with self._lock:
+            if self._disk_cache is None:
+                self._disk_cache = DiskCache(max_age=self.DISK_CACHE_MAX_AGE)
+            return self._disk_cache
+
+    def _disk_cache_existente(self) -> Optional[DiskCache]:
+        """Devuelve la caché en disco solo si su archivo ya existe, sin crearlo."""
+        disk_cache = self._get_disk_cache()
+        return disk_cache if disk_cache.existe() else None
+
+    def senales_cache(self):
+        """
+        Obtiene el objeto Qt con las señales de la caché, creándolo la primera vez.
+        
+        Debe llamarse desde el hilo de la interfaz. Mientras nadie lo pida no se emite
+        ninguna señal, de modo que el acceso a datos funciona sin Qt.
+        """
+        with self._lock:
+            if self._senales_cache is None:
+                from .query_worker import SenalesCache
+                self._senales_cache = SenalesCache()
+            return self._senales_cache
+
+    @property
+    def estado_conexion(self) -> str:
+        """Estado de la conexión en segundo plano (ESTADO_DESCONECTADO, ESTADO_CONECTANDO...)."""
+        return self._estado_conexion
+
+    @property
+    def error_conexion(self) -> str:
+        """Mensaje del último intento fallido de conectar_en_segundo_plano."""
+        return self._error_conexion
+
+    def senales_conexion(self):
+        """
+        Obtiene el objeto Qt con la señal de cambio de estado de la conexión, creándolo
+        la primera vez. Debe llamarse desde el hilo de la interfaz.
+        """
+        with self._lock:
+            if self._senales_conexion is None:
+                from .query_worker import SenalesConexion
+                self._senales_conexion = SenalesConexion()
+            return self._senales_conexion
+
+    def _cambiar_estado_conexion(self, estado: str, mensaje: str = "") -> None:
+        self._estado_conexion = estado
+        self._error_conexion = mensaje if estado == ESTADO_ERROR else ""
+        if self._senales_conexion is not None:
+            self._senales_conexion.estado_cambiado.emit(estado, mensaje)
+
+    def conectar_en_segundo_plano(self):
+        """
+        Establece la conexión (y la precarga de consultas comunes) en un hilo del QThreadPool.
+        
+        La interfaz puede mostrarse de inmediato: mientras la conexión está en curso, o si
+        falló, las acciones registradas con cuando_conectado y las consultas de
+        execute_query_async quedan a la espera y se ejecutan al conectar. Se puede volver
+        a llamar para reintentar después de un error.
+        
+        Returns:
+            El QueryWorker encolado, o None si ya había una conexión en curso o establecida
+        """
+        from .query_worker import QueryWorker
+        
+        if self._estado_conexion in (ESTADO_CONECTANDO, ESTADO_CONECTADO):
+            return None
+        if self.backend is not None:
+            self._al_conectar()
             return None
+        
+        # Un reintento manual parte con el contador de intentos en cero
+        self.connection_attempts = 0
+        self._cambiar_estado_conexion(ESTADO_CONECTANDO)
+        
+        def _conectar():
+            if not self.connect():
+                raise cx_Oracle.DatabaseError("No se pudo establecer la conexión con la base de datos")
+        
+        worker = QueryWorker(_conectar)
+        worker.signals.resultado.connect(lambda _: self._al_conectar())
+        worker.signals.error.connect(self._al_fallar_conexion)
+        self._workers_activos.add(worker)
+        worker.signals.finalizado.connect(lambda: self._workers_activos.discard(worker))
+        self._get_thread_pool().start(worker)
+        return worker
+
+    def _al_conectar(self) -> None:
+        """Marca la conexión como establecida y ejecuta las acciones a la espera (hilo de la interfaz)."""
+        logger.info("Conexión en segundo plano establecida")
+        self._cambiar_estado_conexion(ESTADO_CONECTADO)
+        pendientes, self._pendientes_conexion = self._pendientes_conexion, []
+        for funcion in pendientes:
+            try:
+                funcion()
+            except Exception:
+                logger.exception("Error en una acción que esperaba la conexión")
+
+    def _al_fallar_conexion(self, mensaje: str) -> None:
+        """Registra el fallo de la conexión en segundo plano; las acciones siguen a la espera."""
+        logger.error("No se pudo conectar en segundo plano: %s", mensaje)
+        self._cambiar_estado_conexion(ESTADO_ERROR, mensaje)
+
+    def cuando_conectado(self, funcion) -> None:
+        """
+        Ejecuta `funcion` cuando la conexión esté disponible.
+        
+        Si conectar_en_segundo_plano está en curso o falló, la función espera a que la
+        conexión se establezca; en otro caso se ejecuta de inmediato (y, si hace falta,
+        la propia consulta conecta, como siempre). Debe llamarse desde el hilo de la interfaz.
+        """
+        if self._estado_conexion in (ESTADO_CONECTANDO, ESTADO_ERROR):
+            self._pendientes_conexion.append(funcion)
+        else:
+            funcion()
+
+    def _revalidar_en_segundo_plano(self, query: str, params: Union[tuple, dict], cache_key: str,
+                                    tablas: Iterable[str]) -> None:
+        """
+        Vuelve a ejecutar en segundo plano una consulta servida desde la caché en disco.
+        
+        Cada clave se revalida como máximo una vez por sesión; si la consulta falla se
+        conservan los datos del disco. Los resultados frescos se publican con la señal
+        `revalidada` para que quien mostró los datos del disco pueda actualizarse.
+        """
+        with self._lock:
+            if cache_key in self._claves_revalidadas:
+                return
+            self._claves_revalidadas.add(cache_key)
+            if self._revalidador is None:
+                self._revalidador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="revalidacion_cache")
+        
+        def _revalidar():
+            with self._stats.en_sitio(f"revalidacion_cache:{cache_key}"):
+                resultados = self.execute_query(query, params)
+            if resultados is None:
+                logger.warning("No se pudo revalidar la clave '%s', se mantienen los datos del disco", cache_key)
+                return
+            self._cache.put(cache_key, resultados, tables=tablas)
+            self._get_disk_cache().put(cache_key, resultados, tables=tablas)
+            logger.debug("Clave '%s' revalidada (%s filas)", cache_key, len(resultados))
+            if self._senales_cache is not None:
+                self._senales_cache.revalidada.emit(cache_key, resultados)
+        
+        self._revalidador.submit(_revalidar)
 
     def _prefetch_common_queries(self):
-        """Precarga consultas comunes en el caché durante la inicialización."""
+        """Precarga consultas comunes durante la inicialización."""
         try:
-            # Solo ejecutar si la conexión está establecida
-            if not self.connection:
+            # Solo ejecutar si la conexión (o el pool) está establecida
+            if not self.connection and self.pool is None:
                 return
-                
-            # Obtener último ID de turnos
-            self.execute_query(
-                "SELECT NVL(MAX(ID_TURNO), 0) + 1 FROM ASISTENCIAS.TURNO",
-                cache_key="ultimo_id_turno"
-            )
             
-            # Obtener último ID de detalles
-            self.execute_query(
-                "SELECT NVL(MAX(ID_TURNO_DETALLE_DIARIO), 0) + 1 FROM ASISTENCIAS.TURNO_DETALLE_DIARIO",
-                cache_key="ultimo_id_detalle"
-            )
+            # Reservar los primeros bloques de IDs de turnos y detalles (una sola consulta)
+            from .id_allocator import IdAllocator
+            IdAllocator().sincronizar()
         except Exception as e:
-            print(f"Error al precargar consultas comunes: {e}")
+            logger.error("Error al precargar consultas comunes: %s", e)
 
     def close(self):
-        """Cierra la conexión con la base de datos."""
+        """Cierra la conexión con la base de datos y el pool de sesiones, si existe."""
+        self._estado_conexion = ESTADO_DESCONECTADO
+        self._pendientes_conexion = []
+        if self._revalidador is not None:
+            self._revalidador.shutdown(wait=False, cancel_futures=True)
+            self._revalidador = None
+        if self.pool is not None:
+            self._close_pool()
+            self._connection_reported = False
         if self.connection:
             try:
                 self.connection.close()
                 self.connection = None
                 self._connection_reported = False  # Resetear bandera al cerrar
-                print("Conexión cerrada exitosamente")
+                logger.info("Conexión cerrada exitosamente")
             except cx_Oracle.Error as error:
-                print(f"Error al cerrar la conexión: {error}")
+                logger.error("Error al cerrar la conexión: %s", error)
 
     def clear_cache(self):
-        """Limpia la caché de consultas."""
+        """Limpia la caché de consultas, tanto en memoria como en disco."""
         self._cache.clear()
-        self._cache_timestamp.clear()
+        disk_cache = self._disk_cache_existente()
+        if disk_cache is not None:
+            disk_cache.clear()
+        self._claves_revalidadas.clear()
+
+    def invalidate_cache(self, table: str = None, cache_key: str = None) -> int:
+        """
+        Descarta de la caché solo las entradas afectadas por un cambio.
+        
+        Al invalidar una tabla se emite la señal `invalidada`, para que las vistas que
+        muestran datos de ella los vuelvan a leer.
+        
+        Args:
+            table: Tabla modificada (ej. 'ASISTENCIAS.TURNO'); se descartan las consultas que la leen
+            cache_key: Clave concreta a descartar
+            
+        Returns:
+            Número de entradas descartadas
+        """
+        if table is None and cache_key is None:
+            return 0
+        descartadas = self._cache.invalidate(table=table, key=cache_key)
+        disk_cache = self._disk_cache_existente()
+        if disk_cache is not None:
+            descartadas += disk_cache.invalidate(table=table, key=cache_key)
+        if cache_key is not None:
+            self._claves_revalidadas.discard(cache_key)
+        if table is not None and self._senales_cache is not None:
+            self._senales_cache.invalidada.emit(table.upper())
+        logger.debug("%s entradas de caché invalidadas (tabla=%s, clave=%s)", descartadas, table, cache_key)
+        return descartadas
+
+    def stats(self, ordenar_por: str = 'segundos_total', limite: int = None) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas de las consultas ejecutadas desde el último reinicio.
+        
+        Las consultas se agrupan por texto SQL normalizado (sin literales ni espacios
+        sobrantes); para cada una se informan llamadas, errores, latencias (total,
+        promedio, p95 y máxima), filas, aciertos de caché, reintentos, formas de los
+        parámetros y sitios de llamada (widget > DAO).
+        
+        Args:
+            ordenar_por: Campo por el que ordenar las consultas, de mayor a menor
+            limite: Número máximo de consultas a devolver
+            
+        Returns:
+            Diccionario con 'totales', 'consultas' y 'cache' (contadores de la caché en memoria)
+        """
+        return {
+            'totales': self._stats.totales(),
+            'consultas': self._stats.consultas(ordenar_por=ordenar_por, limite=limite),
+            'cache': self.cache_stats(),
+        }
+    
+    def reset_stats(self) -> None:
+        """Descarta las estadísticas de consultas acumuladas."""
+        self._stats.reiniciar()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Devuelve los contadores de aciertos, fallos y expulsiones de la caché."""
+        return self._cache.stats()
         
     def refresh_cache(self):
         """Actualiza las consultas en caché."""
@@ -213,18 +842,16 @@ class OracleConnection:
         
     def get_cached_value(self, cache_key: str, default=None):
         """Obtiene un valor del caché si existe, o devuelve un valor predeterminado."""
-        if cache_key in self._cache:
-            cache_time = self._cache_timestamp.get(cache_key)
-            if cache_time and datetime.now() - cache_time < self.CACHE_DURATION:
-                return self._cache[cache_key]
-        return default
+        return self._cache.get(cache_key, default)
 
     def get_connection(self) -> Optional[cx_Oracle.Connection]:
         """
         Obtiene la conexión actual a la base de datos, estableciéndola si no existe.
         
+        En modo pool devuelve el pool de sesiones; para obtener una sesión use acquire().
+        
         Returns:
-            Objeto de conexión a Oracle o None si no se puede establecer
+            Objeto de conexión (o pool) de Oracle o None si no se puede establecer
         """
         return self.connect()
 
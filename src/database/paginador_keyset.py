@@ -0,0 +1,101 @@
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Filas por página de una consulta paginada
+TAMANO_PAGINA = 200
+
+
+def condicion_posterior(columnas: Sequence[str], prefijo: str = "k") -> str:
+    """
+    Construye la condición "fila posterior a la clave" para un orden ascendente.
+
+    Oracle no admite comparaciones de tuplas con > ((a, b) > (:k0, :k1)), por lo que se
+    expande en disyunciones: a > :k0 OR (a = :k0 AND b > :k1) OR ...
+
+    Args:
+        columnas: Expresiones SQL de la clave, en el orden de ORDER BY
+        prefijo: Prefijo de las variables enlazadas (:k0, :k1...)
+
+    Returns:
+        Condición SQL entre paréntesis
+    """
+    alternativas = []
+    for i, columna in enumerate(columnas):
+        iguales = [f"{anterior} = :{prefijo}{j}" for j, anterior in enumerate(columnas[:i])]
+        alternativas.append(" AND ".join(iguales + [f"{columna} > :{prefijo}{i}"]))
+    return "(" + " OR ".join(f"({alternativa})" for alternativa in alternativas) + ")"
+
+
+class PaginadorKeyset:
+    """
+    Recorre una consulta página a página usando la última clave recibida (keyset).
+
+    Cada página filtra las filas posteriores a la última clave entregada y pide
+    tamano_pagina + 1 filas: la fila sobrante solo indica que hay más y no se entrega.
+    A diferencia de OFFSET, el costo de una página no crece con las páginas anteriores
+    y un índice sobre las columnas de la clave permite a la base de datos detenerse al
+    completar la página.
+
+    La consulta base debe tener una cláusula WHERE (se le agrega la condición con AND),
+    no debe incluir ORDER BY y debe seleccionar las columnas de la clave al final de cada
+    fila, en el mismo orden que columnas_clave. La clave debe identificar cada fila: si
+    hay filas con la misma clave, las que queden en el límite de una página se pierden.
+    Las columnas de la clave no deben ser NULL (envuélvalas en NVL si es necesario), ya
+    que una comparación con NULL descartaría las filas.
+    """
+
+    def __init__(self, consulta: str, params: Dict[str, Any], columnas_clave: Sequence[str],
+                 tamano_pagina: int = TAMANO_PAGINA):
+        """
+        Args:
+            consulta: Consulta base, sin ORDER BY
+            params: Parámetros de la consulta base
+            columnas_clave: Expresiones SQL de la clave, de la más a la menos significativa
+            tamano_pagina: Filas entregadas por página
+        """
+        if tamano_pagina < 1:
+            raise ValueError("El tamaño de página debe ser mayor que cero")
+        self.consulta = consulta
+        self.params = dict(params or {})
+        self.columnas_clave = list(columnas_clave)
+        self.tamano_pagina = tamano_pagina
+        self._ultima_clave = None
+        self.agotado = False
+        self.paginas_recibidas = 0
+
+    def consulta_siguiente(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Devuelve la consulta y los parámetros de la página siguiente.
+
+        Returns:
+            Tupla (consulta, parámetros)
+        """
+        query = self.consulta
+        params = dict(self.params)
+        if self._ultima_clave is not None:
+            query += " AND " + condicion_posterior(self.columnas_clave)
+            params.update({f"k{i}": valor for i, valor in enumerate(self._ultima_clave)})
+        query += f" ORDER BY {', '.join(self.columnas_clave)}"
+        query += f" FETCH FIRST {self.tamano_pagina + 1} ROWS ONLY"
+        return query, params
+
+    def recibir_pagina(self, filas: List[tuple]) -> List[tuple]:
+        """
+        Registra las filas de la consulta devuelta por consulta_siguiente.
+
+        Args:
+            filas: Filas devueltas por la base de datos
+
+        Returns:
+            Filas de la página, sin la fila sobrante
+        """
+        filas = list(filas or [])
+        self.agotado = len(filas) <= self.tamano_pagina
+        pagina = filas[:self.tamano_pagina]
+        if pagina:
+            self._ultima_clave = tuple(pagina[-1][-len(self.columnas_clave):])
+        self.paginas_recibidas += 1
+        logger.debug("Página %s con %s filas (agotado=%s)", self.paginas_recibidas, len(pagina), self.agotado)
+        return pagina
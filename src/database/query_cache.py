@@ -0,0 +1,226 @@
+import re
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+# Tablas calificadas con esquema que aparecen tras FROM o JOIN (ej. ASISTENCIAS.TURNO)
+_PATRON_TABLAS = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_][\w$#]*\.[A-Za-z_][\w$#]*)', re.IGNORECASE)
+
+# Filas usadas para estimar el tamaño de resultados grandes
+_MUESTRA_TAMANO = 1000
+
+
+def extraer_tablas(query: str) -> FrozenSet[str]:
+    """
+    Obtiene las tablas que lee una consulta SQL.
+
+    Args:
+        query: Consulta SQL
+
+    Returns:
+        Conjunto de nombres ESQUEMA.TABLA en mayúsculas
+    """
+    return frozenset(tabla.upper() for tabla in _PATRON_TABLAS.findall(query))
+
+
+def estimar_tamano(valor: Any) -> int:
+    """
+    Estima en bytes la memoria ocupada por un resultado de consulta.
+
+    Para listas grandes se mide una muestra de filas y se extrapola, de modo que
+    el costo de la estimación no crece con el tamaño del resultado.
+
+    Args:
+        valor: Resultado a medir (normalmente una lista de tuplas)
+
+    Returns:
+        Tamaño aproximado en bytes
+    """
+    if not isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor)
+
+    total = sys.getsizeof(valor)
+    if not valor:
+        return total
+
+    paso = max(1, len(valor) // _MUESTRA_TAMANO)
+    muestra = valor[::paso]
+    tamano_muestra = 0
+    for fila in muestra:
+        tamano_muestra += sys.getsizeof(fila)
+        if isinstance(fila, (list, tuple)):
+            tamano_muestra += sum(sys.getsizeof(celda) for celda in fila)
+
+    return total + int(tamano_muestra * len(valor) / len(muestra))
+
+
+class _EntradaCache:
+    """Valor almacenado en la caché junto con sus metadatos."""
+
+    __slots__ = ('valor', 'tablas', 'tamano', 'creado')
+
+    def __init__(self, valor: Any, tablas: FrozenSet[str], tamano: int, creado: datetime):
+        self.valor = valor
+        self.tablas = tablas
+        self.tamano = tamano
+        self.creado = creado
+
+
+class QueryCache:
+    """
+    Caché LRU acotada para resultados de consultas.
+
+    Limita tanto el número de entradas como el total de bytes estimados y expulsa
+    primero las entradas usadas hace más tiempo. Cada entrada se etiqueta con las
+    tablas que lee, de modo que invalidate(table=...) descarta solo las afectadas.
+    Es segura para uso desde varios hilos.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[timedelta] = timedelta(minutes=10)):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Tamaño máximo estimado en bytes de todas las entradas
+            ttl: Tiempo de vida de cada entrada (None para no expirar)
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("La caché debe admitir al menos una entrada y un byte")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entradas: "OrderedDict[str, _EntradaCache]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expirada(self, entrada: _EntradaCache) -> bool:
+        return self.ttl is not None and datetime.now() - entrada.creado >= self.ttl
+
+    def _quitar(self, key: str) -> None:
+        entrada = self._entradas.pop(key)
+        self._bytes -= entrada.tamano
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Obtiene un valor de la caché y lo marca como usado recientemente.
+
+        Args:
+            key: Clave de la entrada
+            default: Valor devuelto si la clave no existe o expiró
+        """
+        with self._lock:
+            entrada = self._entradas.get(key)
+            if entrada is None:
+                self.misses += 1
+                return default
+
+            if self._expirada(entrada):
+                self._quitar(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entradas.move_to_end(key)
+            self.hits += 1
+            return entrada.valor
+
+    def put(self, key: str, value: Any, tables: Iterable[str] = ()) -> bool:
+        """
+        Almacena un valor, expulsando las entradas menos usadas si se supera el presupuesto.
+
+        Args:
+            key: Clave de la entrada
+            value: Valor a almacenar
+            tables: Tablas (ESQUEMA.TABLA) de las que depende el valor
+
+        Returns:
+            True si se almacenó, False si el valor excede por sí solo el presupuesto de bytes
+        """
+        tamano = estimar_tamano(value)
+        tablas = frozenset(tabla.upper() for tabla in tables)
+
+        with self._lock:
+            if key in self._entradas:
+                self._quitar(key)
+
+            if tamano > self.max_bytes:
+                return False
+
+            self._entradas[key] = _EntradaCache(value, tablas, tamano, datetime.now())
+            self._bytes += tamano
+
+            while len(self._entradas) > self.max_entries or self._bytes > self.max_bytes:
+                key_antigua = next(iter(self._entradas))
+                self._quitar(key_antigua)
+                self.evictions += 1
+
+            return True
+
+    def invalidate(self, table: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        Descarta entradas de la caché.
+
+        Args:
+            table: Descarta las entradas que leen esta tabla (ESQUEMA.TABLA)
+            key: Descarta la entrada con esta clave
+
+        Returns:
+            Número de entradas descartadas
+        """
+        with self._lock:
+            if table is None and key is None:
+                descartadas = len(self._entradas)
+                self._entradas.clear()
+                self._bytes = 0
+                return descartadas
+
+            claves = set()
+            if key is not None and key in self._entradas:
+                claves.add(key)
+            if table is not None:
+                tabla = table.upper()
+                claves.update(k for k, entrada in self._entradas.items() if tabla in entrada.tablas)
+
+            for k in claves:
+                self._quitar(k)
+            return len(claves)
+
+    def clear(self) -> None:
+        """Descarta todas las entradas (los contadores se conservan)."""
+        self.invalidate()
+
+    def reset_stats(self) -> None:
+        """Reinicia los contadores de aciertos, fallos y expulsiones."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Devuelve los contadores y la ocupación actual de la caché."""
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / consultas if consultas else 0.0,
+                "entries": len(self._entradas),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entrada = self._entradas.get(key)
+            return entrada is not None and not self._expirada(entrada)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
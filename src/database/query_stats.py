@@ -0,0 +1,261 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+# Literales que se reemplazan al normalizar el texto SQL
+_PATRON_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_PATRON_NUMEROS = re.compile(r"(?<![\w:$#.])\d+(?:\.\d+)?\b")
+# Listas de variables de enlace generadas por bloques (:id0, :id1, ...)
+_PATRON_LISTA_BINDS = re.compile(r":[A-Za-z_]\w*(?:\s*,\s*:[A-Za-z_]\w*)+")
+_PATRON_ESPACIOS = re.compile(r"\s+")
+
+# Módulos cuyas funciones no se consideran sitio de llamada (la propia capa de acceso)
+_ARCHIVOS_INTERNOS = {"oracle_connection.py", "query_stats.py", "query_worker.py", "contextlib.py", "threading.py"}
+_DIRECTORIO_UI = os.sep + "ui" + os.sep
+
+# Formas de parámetros y sitios distintos guardados por consulta
+_MAX_VARIANTES = 20
+# Latencias recientes conservadas por consulta para calcular percentiles
+_MAX_LATENCIAS = 256
+# Marcos de la pila revisados como máximo para identificar el sitio de llamada
+_PROFUNDIDAD_SITIO = 16
+
+
+@lru_cache(maxsize=512)
+def normalizar_sql(query: str) -> str:
+    """
+    Normaliza el texto de una consulta para agrupar sus ejecuciones.
+
+    Colapsa los espacios, reemplaza literales de texto y números por '?' y reduce las
+    listas de variables de enlace (:id0, :id1, ...) a una sola, de modo que la misma
+    consulta con distinto número de elementos IN cuenta como una. Los DAO repiten el
+    mismo texto en cada ejecución, por lo que el resultado se memoriza.
+    """
+    texto = _PATRON_CADENAS.sub("?", query)
+    texto = _PATRON_LISTA_BINDS.sub(":lista", texto)
+    texto = _PATRON_NUMEROS.sub("?", texto)
+    return _PATRON_ESPACIOS.sub(" ", texto).strip()
+
+
+def forma_parametros(params: Union[tuple, dict, None]) -> str:
+    """
+    Describe los parámetros de una consulta sin sus valores.
+
+    Ejemplo: {"id_turno": 5, "nombre": "x"} -> "id_turno:int, nombre:str"
+    """
+    if not params:
+        return ""
+    if isinstance(params, dict):
+        return ", ".join(f"{nombre}:{type(valor).__name__}" for nombre, valor in sorted(params.items()))
+    return ", ".join(type(valor).__name__ for valor in params)
+
+
+@lru_cache(maxsize=256)
+def _clasificar_archivo(ruta: str) -> tuple:
+    """Devuelve (nombre del módulo o None si es interno, si pertenece a la interfaz) de un archivo."""
+    archivo = os.path.basename(ruta)
+    if archivo in _ARCHIVOS_INTERNOS:
+        return None, False
+    return os.path.splitext(archivo)[0], _DIRECTORIO_UI in ruta
+
+
+def sitio_llamada() -> str:
+    """
+    Identifica desde dónde se ejecutó una consulta.
+
+    Devuelve la primera función fuera de la capa de conexión (normalmente el DAO) y, si
+    la llamada viene de la interfaz, también la acción del widget que la originó:
+    "crear_turno_widget.generar_script_sql > turno_dao.generar_script_sql_batch".
+    Solo se revisan los _PROFUNDIDAD_SITIO marcos más cercanos.
+    """
+    marco = sys._getframe(1)
+    interno = None
+    ui = None
+    for _ in range(_PROFUNDIDAD_SITIO):
+        if marco is None:
+            break
+        modulo, es_ui = _clasificar_archivo(marco.f_code.co_filename)
+        if modulo is not None:
+            nombre = f"{modulo}.{marco.f_code.co_name}"
+            if interno is None:
+                interno = nombre
+            if es_ui:
+                ui = nombre
+                break
+        marco = marco.f_back
+
+    if interno is None:
+        return "desconocido"
+    if ui is None or ui == interno:
+        return interno
+    return f"{ui} > {interno}"
+
+
+class _EstadisticaConsulta:
+    """Acumulados de todas las ejecuciones de una consulta normalizada."""
+
+    __slots__ = ('llamadas', 'errores', 'segundos_total', 'segundos_max', 'filas_total', 'aciertos_memoria',
+                 'aciertos_disco', 'fallos_cache', 'reintentos', 'formas', 'sitios', 'latencias', 'ultima')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.segundos_total = 0.0
+        self.segundos_max = 0.0
+        self.filas_total = 0
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos_cache = 0
+        self.reintentos = 0
+        self.formas: Counter = Counter()
+        self.sitios: Counter = Counter()
+        self.latencias = deque(maxlen=_MAX_LATENCIAS)
+        self.ultima = 0.0
+
+    def a_dict(self, sql: str) -> Dict[str, Any]:
+        latencias = sorted(self.latencias)
+        consultas_cache = self.aciertos_memoria + self.aciertos_disco + self.fallos_cache
+        return {
+            'sql': sql,
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'segundos_total': self.segundos_total,
+            'segundos_promedio': self.segundos_total / self.llamadas if self.llamadas else 0.0,
+            'segundos_p95': latencias[int(0.95 * (len(latencias) - 1))] if latencias else 0.0,
+            'segundos_max': self.segundos_max,
+            'filas_total': self.filas_total,
+            'filas_promedio': self.filas_total / self.llamadas if self.llamadas else 0.0,
+            'aciertos_memoria': self.aciertos_memoria,
+            'aciertos_disco': self.aciertos_disco,
+            'fallos_cache': self.fallos_cache,
+            'tasa_aciertos_cache': (self.aciertos_memoria + self.aciertos_disco) / consultas_cache
+            if consultas_cache else None,
+            'reintentos': self.reintentos,
+            'formas_parametros': dict(self.formas),
+            'sitios': dict(self.sitios.most_common()),
+            'ultima_ejecucion': self.ultima,
+        }
+
+
+class QueryStats:
+    """
+    Estadísticas de ejecución de consultas, agrupadas por texto SQL normalizado.
+
+    Registra latencia, filas, forma de los parámetros, uso de la caché, reintentos y
+    sitio de llamada de cada consulta. Es segura para uso desde varios hilos.
+    """
+
+    def __init__(self):
+        self._por_consulta: Dict[str, _EstadisticaConsulta] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.desde = time.time()
+
+    @contextmanager
+    def en_sitio(self, sitio: str):
+        """
+        Atribuye a `sitio` las consultas ejecutadas dentro del bloque en este hilo.
+
+        Se usa para las consultas asíncronas: el sitio se captura al encolarlas, ya
+        que en el hilo de trabajo la pila ya no contiene al widget que las pidió.
+        """
+        anterior = getattr(self._local, 'sitio', None)
+        self._local.sitio = sitio
+        try:
+            yield
+        finally:
+            self._local.sitio = anterior
+
+    def sitio_actual(self) -> str:
+        """Devuelve el sitio fijado con en_sitio o, si no hay, el de la pila actual."""
+        return getattr(self._local, 'sitio', None) or sitio_llamada()
+
+    def registrar(self, query: str, params: Union[tuple, dict, None], segundos: float, filas: int = 0,
+                  cache: Optional[str] = None, reintentos: int = 0, error: bool = False,
+                  sitio: Optional[str] = None) -> None:
+        """
+        Registra una ejecución.
+
+        Args:
+            query: Texto SQL ejecutado
+            params: Parámetros de la consulta (solo se guarda su forma)
+            segundos: Duración total, incluidos los reintentos
+            filas: Filas devueltas
+            cache: 'memoria' o 'disco' si se sirvió desde la caché, 'fallo' si se buscó
+                en la caché sin éxito, o None si la consulta no usa caché
+            reintentos: Reintentos realizados tras errores
+            error: Si la consulta terminó sin resultados por un error
+            sitio: Sitio de llamada (por defecto, el del hilo o la pila actual)
+        """
+        sql = normalizar_sql(query)
+        forma = forma_parametros(params)
+        sitio = sitio or self.sitio_actual()
+        with self._lock:
+            estadistica = self._por_consulta.get(sql)
+            if estadistica is None:
+                estadistica = self._por_consulta[sql] = _EstadisticaConsulta()
+            estadistica.llamadas += 1
+            estadistica.errores += int(error)
+            estadistica.segundos_total += segundos
+            estadistica.segundos_max = max(estadistica.segundos_max, segundos)
+            estadistica.filas_total += filas
+            estadistica.reintentos += reintentos
+            estadistica.latencias.append(segundos)
+            estadistica.ultima = time.time()
+            if cache == 'memoria':
+                estadistica.aciertos_memoria += 1
+            elif cache == 'disco':
+                estadistica.aciertos_disco += 1
+            elif cache == 'fallo':
+                estadistica.fallos_cache += 1
+            if forma in estadistica.formas or len(estadistica.formas) < _MAX_VARIANTES:
+                estadistica.formas[forma] += 1
+            if sitio in estadistica.sitios or len(estadistica.sitios) < _MAX_VARIANTES:
+                estadistica.sitios[sitio] += 1
+
+    def consultas(self, ordenar_por: str = 'segundos_total', limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Devuelve las estadísticas de cada consulta, de mayor a menor según `ordenar_por`.
+
+        Args:
+            ordenar_por: Campo numérico por el que ordenar (segundos_total, llamadas, filas_total...)
+            limite: Número máximo de consultas a devolver
+        """
+        with self._lock:
+            filas = [estadistica.a_dict(sql) for sql, estadistica in self._por_consulta.items()]
+        filas.sort(key=lambda fila: fila[ordenar_por] or 0, reverse=True)
+        return filas[:limite] if limite is not None else filas
+
+    def totales(self) -> Dict[str, Any]:
+        """Devuelve los acumulados de todas las consultas."""
+        with self._lock:
+            estadisticas = list(self._por_consulta.values())
+        llamadas = sum(e.llamadas for e in estadisticas)
+        aciertos = sum(e.aciertos_memoria + e.aciertos_disco for e in estadisticas)
+        con_cache = aciertos + sum(e.fallos_cache for e in estadisticas)
+        return {
+            'consultas_distintas': len(estadisticas),
+            'llamadas': llamadas,
+            'errores': sum(e.errores for e in estadisticas),
+            'segundos_total': sum(e.segundos_total for e in estadisticas),
+            'filas_total': sum(e.filas_total for e in estadisticas),
+            'reintentos': sum(e.reintentos for e in estadisticas),
+            'tasa_aciertos_cache': aciertos / con_cache if con_cache else None,
+            'desde': self.desde,
+        }
+
+    def reiniciar(self) -> None:
+        """Descarta todas las estadísticas acumuladas."""
+        with self._lock:
+            self._por_consulta.clear()
+            self.desde = time.time()
+
+    def __len__(self) -> int:
+        return len(self._por_consulta)
+
@@ -0,0 +1,59 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class QueryWorkerSignals(QObject):
+    """Señales que QueryWorker emite hacia el hilo de la interfaz."""
+
+    iniciado = pyqtSignal()
+    resultado = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finalizado = pyqtSignal()
+
+
+class SenalesCache(QObject):
+    """
+    Señales de OracleConnection sobre cambios en la caché de consultas.
+
+    Se emiten desde el hilo que produjo el cambio; los receptores de la interfaz las
+    reciben encoladas en el hilo de la GUI.
+    """
+
+    # Clave revalidada en segundo plano y sus resultados frescos
+    revalidada = pyqtSignal(str, object)
+    # Tabla (ESQUEMA.TABLA) cuyas entradas en caché se descartaron
+    invalidada = pyqtSignal(str)
+
+
+class SenalesConexion(QObject):
+    """Señales de OracleConnection sobre el estado de la conexión en segundo plano."""
+
+    # Nuevo estado (ESTADO_CONECTANDO, ESTADO_CONECTADO, ESTADO_ERROR...) y mensaje de error
+    estado_cambiado = pyqtSignal(str, str)
+
+
+class QueryWorker(QRunnable):
+    """
+    Ejecuta una operación de base de datos en un hilo del QThreadPool.
+
+    El resultado (o el mensaje de error) se entrega mediante señales de Qt, por lo que
+    los callbacks conectados desde la interfaz se ejecutan en el hilo de la GUI.
+    """
+
+    def __init__(self, funcion, *args, **kwargs):
+        super().__init__()
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = QueryWorkerSignals()
+
+    def run(self):
+        """Ejecuta la operación y emite el resultado o el error."""
+        self.signals.iniciado.emit()
+        try:
+            resultado = self.funcion(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.resultado.emit(resultado)
+        finally:
+            self.signals.finalizado.emit()
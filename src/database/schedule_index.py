@@ -0,0 +1,104 @@
+import threading
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Firma canónica de un horario (ver models.turno.calcular_firma_horario)
+Firma = Tuple[Hashable, ...]
+
+
+class ScheduleIndex:
+    """
+    Índice en memoria de turnos por firma de horario semanal.
+
+    Permite saber en tiempo constante qué turnos tienen exactamente el mismo horario
+    (mismos días, horas de ingreso y salida) sin recorrer el catálogo completo.
+    Se construye una vez y luego se mantiene con agregar/eliminar. Es seguro para
+    uso desde varios hilos.
+    """
+
+    def __init__(self):
+        self._ids_por_firma: Dict[Firma, Set[int]] = {}
+        self._firma_por_id: Dict[int, Firma] = {}
+        self._nombres: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.construido = datetime.now()
+
+    def agregar(self, id_turno: int, nombre: str, firma: Firma) -> None:
+        """
+        Registra (o actualiza) el horario de un turno.
+
+        Args:
+            id_turno: ID del turno
+            nombre: Nombre del turno
+            firma: Firma canónica de su horario
+        """
+        with self._lock:
+            self._quitar(id_turno)
+            self._ids_por_firma.setdefault(firma, set()).add(id_turno)
+            self._firma_por_id[id_turno] = firma
+            self._nombres[id_turno] = nombre
+
+    def eliminar(self, id_turno: int) -> bool:
+        """
+        Quita un turno del índice.
+
+        Returns:
+            True si el turno estaba registrado
+        """
+        with self._lock:
+            return self._quitar(id_turno)
+
+    def _quitar(self, id_turno: int) -> bool:
+        firma = self._firma_por_id.pop(id_turno, None)
+        if firma is None:
+            return False
+        ids = self._ids_por_firma[firma]
+        ids.discard(id_turno)
+        if not ids:
+            del self._ids_por_firma[firma]
+        self._nombres.pop(id_turno, None)
+        return True
+
+    def buscar(self, firma: Firma) -> List[int]:
+        """
+        Obtiene los turnos con exactamente la firma indicada.
+
+        Returns:
+            IDs de los turnos, en orden ascendente
+        """
+        with self._lock:
+            return sorted(self._ids_por_firma.get(firma, ()))
+
+    def firma_de(self, id_turno: int) -> Optional[Firma]:
+        """Devuelve la firma registrada para un turno, o None si no está en el índice."""
+        with self._lock:
+            return self._firma_por_id.get(id_turno)
+
+    def nombre_de(self, id_turno: int) -> Optional[str]:
+        """Devuelve el nombre registrado para un turno, o None si no está en el índice."""
+        with self._lock:
+            return self._nombres.get(id_turno)
+
+    def edad(self) -> float:
+        """Segundos transcurridos desde que se construyó el índice."""
+        return (datetime.now() - self.construido).total_seconds()
+
+    @classmethod
+    def desde_turnos(cls, turnos: Iterable[Tuple[int, str, Firma]]) -> "ScheduleIndex":
+        """
+        Construye un índice a partir de tuplas (id_turno, nombre, firma).
+
+        Los turnos se consumen uno a uno, por lo que pueden llegar desde un generador.
+        """
+        indice = cls()
+        for id_turno, nombre, firma in turnos:
+            indice.agregar(id_turno, nombre, firma)
+        indice.construido = datetime.now()
+        return indice
+
+    def __contains__(self, id_turno: int) -> bool:
+        with self._lock:
+            return id_turno in self._firma_por_id
+
+    def __len__(self) -> int:
+        return len(self._firma_por_id)
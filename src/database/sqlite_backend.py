@@ -0,0 +1,571 @@
+import argparse
+import os
+import random
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Sequence
+import cx_Oracle
+
+ESQUEMAS = ("ASISTENCIAS", "DATOS_TRANSVERSALES")
+
+_DDL = (
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.TURNO (
+        ID_TURNO INTEGER PRIMARY KEY,
+        NOMBRE TEXT NOT NULL,
+        VIGENCIA INTEGER NOT NULL DEFAULT 1,
+        FRECUENCIA TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.TURNO_DETALLE_DIARIO (
+        ID_TURNO_DETALLE_DIARIO INTEGER PRIMARY KEY,
+        ID_TURNO INTEGER NOT NULL,
+        JORNADA TEXT NOT NULL,
+        HORA_INGRESO DATE NOT NULL,
+        DURACION INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ASISTENCIAS.IDX_TDD_TURNO ON TURNO_DETALLE_DIARIO (ID_TURNO)",
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.PERSONA_TURNO (
+        ID_PERSONA INTEGER NOT NULL,
+        ID_TURNO INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ASISTENCIAS.IDX_PT_PERSONA ON PERSONA_TURNO (ID_PERSONA)",
+    "CREATE INDEX IF NOT EXISTS ASISTENCIAS.IDX_PT_TURNO ON PERSONA_TURNO (ID_TURNO)",
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.FUNCIONARIO (
+        ID_FUNCIONARIO INTEGER PRIMARY KEY,
+        NOMBRE TEXT NOT NULL,
+        APELLIDO TEXT NOT NULL,
+        ID_ORGANISMO INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.HORARIO_FLEXIBLE (
+        ID_HORARIO_FLEXIBLE INTEGER PRIMARY KEY,
+        ID_FUNCIONARIO INTEGER NOT NULL,
+        FECHA DATE NOT NULL,
+        HORA_ENTRADA DATE,
+        HORA_SALIDA DATE,
+        VIGENCIA INTEGER NOT NULL DEFAULT 1
+    )""",
+    """CREATE TABLE IF NOT EXISTS ASISTENCIAS.MARCAJE (
+        ID_MARCAJE INTEGER PRIMARY KEY,
+        ID_PERSONA INTEGER NOT NULL,
+        FECHA DATE NOT NULL,
+        HORA DATE NOT NULL,
+        TIPO TEXT NOT NULL,
+        COMENTARIO TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS ASISTENCIAS.IDX_MARCAJE_PERSONA ON MARCAJE (ID_PERSONA)",
+    """CREATE TABLE IF NOT EXISTS DATOS_TRANSVERSALES.PERSONA (
+        ID_PERSONA INTEGER PRIMARY KEY,
+        RUT TEXT NOT NULL,
+        NOMBRE TEXT NOT NULL,
+        APELLIDO_PATERNO TEXT NOT NULL,
+        APELLIDO_MATERNO TEXT,
+        ID_ORGANISMO INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS DATOS_TRANSVERSALES.IDX_PERSONA_RUT ON PERSONA (RUT)",
+    """CREATE TABLE IF NOT EXISTS DATOS_TRANSVERSALES.ORGANISMO (
+        ID_ORGANISMO INTEGER PRIMARY KEY,
+        NOMBRE TEXT NOT NULL,
+        VIGENCIA INTEGER NOT NULL DEFAULT 1
+    )""",
+    "CREATE TABLE IF NOT EXISTS DUAL (DUMMY TEXT)",
+)
+
+# Elementos de formato de fecha de Oracle y su equivalente en strftime
+_FORMATOS_FECHA = {"YYYY": "%Y", "MM": "%m", "DD": "%d", "HH24": "%H", "HH": "%I", "MI": "%M", "SS": "%S"}
+_PATRON_FORMATO = re.compile("|".join(sorted(_FORMATOS_FECHA, key=len, reverse=True)))
+
+# Traducciones directas de sintaxis Oracle a SQLite
+_TRADUCCIONES = (
+    (re.compile(r"\bFETCH\s+(?:FIRST|NEXT)\s+(:?\w+)\s+ROWS?\s+ONLY", re.IGNORECASE), r"LIMIT \1"),
+)
+
+# SQLite no guarda un SCN por fila: cada esquema tiene una tabla con un contador por tabla,
+# que los disparadores creados en crear_tablas() incrementan con cada escritura
+TABLA_VERSIONES = "VERSION_TABLAS"
+_PATRON_ORA_ROWSCN = re.compile(r"\bORA_ROWSCN\b", re.IGNORECASE)
+_PATRON_FROM = re.compile(r"\bFROM\s+(\w+)\.(\w+)", re.IGNORECASE)
+_PATRON_TABLA_DDL = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)\.(\w+)")
+
+_PATRON_LISTAGG = re.compile(r"\bLISTAGG\s*\(", re.IGNORECASE)
+_PATRON_WITHIN_GROUP = re.compile(r"\s*WITHIN\s+GROUP\s*\(\s*ORDER\s+BY\s+", re.IGNORECASE)
+
+
+def _formato_oracle_a_python(formato: str) -> str:
+    return _PATRON_FORMATO.sub(lambda m: _FORMATOS_FECHA[m.group(0)], formato.upper())
+
+
+def _a_fecha(valor) -> Optional[datetime]:
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    if isinstance(valor, time):
+        return datetime.combine(date(1900, 1, 1), valor)
+    return datetime.fromisoformat(str(valor))
+
+
+def _to_date(texto, formato=None):
+    if texto is None:
+        return None
+    if formato is None:
+        return _a_fecha(texto).isoformat(sep=" ")
+    return datetime.strptime(str(texto), _formato_oracle_a_python(formato)).isoformat(sep=" ")
+
+
+def _to_char(valor, formato=None):
+    if valor is None:
+        return None
+    if formato is None:
+        return str(valor)
+    return _a_fecha(valor).strftime(_formato_oracle_a_python(formato))
+
+
+def _to_number(valor):
+    if valor is None:
+        return None
+    numero = float(valor)
+    return int(numero) if numero.is_integer() else numero
+
+
+def _translate(texto, desde, hacia):
+    if texto is None:
+        return None
+    tabla = {ord(c): (hacia[i] if i < len(hacia) else None) for i, c in enumerate(desde)}
+    return texto.translate(tabla)
+
+
+def _mod(a, b):
+    if a is None or b is None:
+        return None
+    return a - b * int(a / b) if b else a
+
+
+class _ListaggOrdenado:
+    """Agregado LISTAGG(valor, separador) WITHIN GROUP (ORDER BY claves...)."""
+
+    def __init__(self):
+        self.elementos = []
+        self.separador = ","
+
+    def step(self, valor, separador, *claves):
+        if valor is not None:
+            self.separador = separador
+            self.elementos.append((claves, valor))
+
+    def finalize(self):
+        if not self.elementos:
+            return None
+        self.elementos.sort(key=lambda e: tuple((c is None, c) for c in e[0]))
+        return self.separador.join(str(valor) for _, valor in self.elementos)
+
+
+def _cerrar_parentesis(texto: str, inicio: int) -> int:
+    """Devuelve la posición del paréntesis que cierra al abierto justo antes de `inicio`."""
+    nivel = 1
+    en_cadena = False
+    for i in range(inicio, len(texto)):
+        c = texto[i]
+        if c == "'":
+            en_cadena = not en_cadena
+        elif not en_cadena:
+            if c == "(":
+                nivel += 1
+            elif c == ")":
+                nivel -= 1
+                if nivel == 0:
+                    return i
+    raise ValueError("Paréntesis sin cerrar en la consulta")
+
+
+def _dividir_argumentos(texto: str) -> List[str]:
+    """Divide una lista de argumentos SQL por las comas de primer nivel."""
+    partes, nivel, en_cadena, actual = [], 0, False, []
+    for c in texto:
+        if c == "'":
+            en_cadena = not en_cadena
+        elif not en_cadena and c == "(":
+            nivel += 1
+        elif not en_cadena and c == ")":
+            nivel -= 1
+        elif not en_cadena and c == "," and nivel == 0:
+            partes.append("".join(actual).strip())
+            actual = []
+            continue
+        actual.append(c)
+    partes.append("".join(actual).strip())
+    return partes
+
+
+def _traducir_listagg(query: str) -> str:
+    while True:
+        coincidencia = _PATRON_LISTAGG.search(query)
+        if not coincidencia:
+            return query
+        fin_args = _cerrar_parentesis(query, coincidencia.end())
+        argumentos = _dividir_argumentos(query[coincidencia.end():fin_args])
+        if len(argumentos) == 1:
+            argumentos.append("''")
+
+        grupo = _PATRON_WITHIN_GROUP.match(query, fin_args + 1)
+        claves = []
+        fin = fin_args + 1
+        if grupo:
+            fin = _cerrar_parentesis(query, grupo.end())
+            for clave in _dividir_argumentos(query[grupo.end():fin]):
+                if re.search(r"\bDESC\s*$", clave, re.IGNORECASE):
+                    raise ValueError("LISTAGG con ORDER BY ... DESC no está soportado en SQLite")
+                claves.append(re.sub(r"\s+ASC\s*$", "", clave, flags=re.IGNORECASE))
+            fin += 1
+
+        reemplazo = f"LISTAGG_ORDENADO({', '.join(argumentos[:2] + claves)})"
+        query = query[:coincidencia.start()] + reemplazo + query[fin:]
+
+
+def _traducir_ora_rowscn(query: str) -> str:
+    """
+    Reemplaza ORA_ROWSCN por el contador de cambios de la tabla del primer FROM calificado.
+
+    Como en Oracle, el valor solo avanza con las escrituras en esa tabla.
+    """
+    if not _PATRON_ORA_ROWSCN.search(query):
+        return query
+    tabla = _PATRON_FROM.search(query)
+    if tabla is None:
+        raise ValueError("ORA_ROWSCN solo se admite en consultas sobre una tabla ESQUEMA.TABLA")
+    esquema, nombre = tabla.group(1).upper(), tabla.group(2).upper()
+    version = f"(SELECT VERSION FROM {esquema}.{TABLA_VERSIONES} WHERE TABLA = '{nombre}')"
+    return _PATRON_ORA_ROWSCN.sub(version, query)
+
+
+def traducir_consulta(query: str) -> str:
+    """
+    Traduce las construcciones de Oracle usadas por la aplicación a SQLite.
+
+    NVL, TO_DATE, TO_CHAR, TO_NUMBER, TRANSLATE y MOD se registran como funciones, y
+    `||` y las variables :nombre son nativas de SQLite; aquí solo se reescriben
+    LISTAGG ... WITHIN GROUP, FETCH FIRST n ROWS ONLY y ORA_ROWSCN.
+    """
+    query = _traducir_listagg(query)
+    query = _traducir_ora_rowscn(query)
+    for patron, reemplazo in _TRADUCCIONES:
+        query = patron.sub(reemplazo, query)
+    return query
+
+
+def _convertir_fecha(valor: bytes) -> datetime:
+    return datetime.fromisoformat(valor.decode())
+
+
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(sep=" "))
+sqlite3.register_adapter(date, lambda valor: datetime(valor.year, valor.month, valor.day).isoformat(sep=" "))
+sqlite3.register_adapter(time, lambda valor: datetime.combine(date(1900, 1, 1), valor).isoformat(sep=" "))
+sqlite3.register_converter("DATE", _convertir_fecha)
+
+
+class _CursorSQLite:
+    """Cursor con la interfaz de cx_Oracle usada por OracleConnection."""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+        self.arraysize = 100
+        self.prefetchrows = 2
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query: str, params=None):
+        try:
+            self._cursor.execute(traducir_consulta(query), params or {})
+        except (sqlite3.Error, ValueError) as e:
+            raise cx_Oracle.DatabaseError(f"SQLite: {e}") from e
+        return self
+
+    def executemany(self, query: str, filas):
+        try:
+            self._cursor.executemany(traducir_consulta(query), filas)
+        except (sqlite3.Error, ValueError) as e:
+            raise cx_Oracle.DatabaseError(f"SQLite: {e}") from e
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, cantidad: int = None):
+        return self._cursor.fetchmany(cantidad or self.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class _ConexionSQLite:
+    """Conexión con la interfaz de cx_Oracle usada por OracleConnection."""
+
+    def __init__(self, conexion: sqlite3.Connection):
+        self._conexion = conexion
+
+    def cursor(self) -> _CursorSQLite:
+        return _CursorSQLite(self._conexion.cursor())
+
+    def commit(self):
+        self._conexion.commit()
+
+    def rollback(self):
+        self._conexion.rollback()
+
+    def ping(self):
+        return None
+
+    def close(self):
+        # La conexión pertenece al backend; se cierra con SQLiteBackend.close()
+        pass
+
+
+class SQLiteBackend:
+    """
+    Base de datos SQLite con las tablas de ASISTENCIAS y DATOS_TRANSVERSALES.
+
+    Permite ejecutar el DAO y los widgets sin acceso a Oracle (pruebas, mediciones de
+    rendimiento, trabajo sin conexión). Cada esquema se adjunta como una base separada,
+    de modo que los nombres calificados (ASISTENCIAS.TURNO) funcionan sin cambios.
+
+    Se conecta a OracleConnection mediante usar_backend(); a partir de ese momento
+    execute_query, iter_query y acquire trabajan sobre SQLite.
+    """
+
+    def __init__(self, directorio: Optional[str] = None):
+        """
+        Args:
+            directorio: Carpeta donde guardar un archivo por esquema; si se omite,
+                las bases se crean en memoria y se pierden al cerrar
+        """
+        self.directorio = directorio
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        principal = os.path.join(directorio, "principal.sqlite3") if directorio else ":memory:"
+
+        self._sqlite = sqlite3.connect(principal, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        for esquema in ESQUEMAS:
+            ruta = os.path.join(directorio, f"{esquema.lower()}.sqlite3") if directorio else ":memory:"
+            self._sqlite.execute(f"ATTACH DATABASE ? AS {esquema}", (ruta,))
+
+        self._sqlite.create_function("NVL", 2, lambda a, b: b if a is None else a, deterministic=True)
+        self._sqlite.create_function("TO_DATE", -1, _to_date, deterministic=True)
+        self._sqlite.create_function("TO_CHAR", -1, _to_char, deterministic=True)
+        self._sqlite.create_function("TO_NUMBER", 1, _to_number, deterministic=True)
+        self._sqlite.create_function("TRANSLATE", 3, _translate, deterministic=True)
+        self._sqlite.create_function("MOD", 2, _mod, deterministic=True)
+        # UPPER nativo de SQLite solo convierte ASCII; Oracle también convierte letras con tilde
+        self._sqlite.create_function("UPPER", 1, lambda s: s.upper() if isinstance(s, str) else s,
+                                     deterministic=True)
+        self._sqlite.create_aggregate("LISTAGG_ORDENADO", -1, _ListaggOrdenado)
+
+        self.lock = threading.RLock()
+        self.conexion = _ConexionSQLite(self._sqlite)
+        self.crear_tablas()
+
+    def crear_tablas(self) -> None:
+        """Crea las tablas (si no existen), sus contadores de cambios y la tabla DUAL de una fila."""
+        with self.lock:
+            for sentencia in _DDL:
+                self._sqlite.execute(sentencia)
+            for esquema in ESQUEMAS:
+                self._sqlite.execute(f"CREATE TABLE IF NOT EXISTS {esquema}.{TABLA_VERSIONES} "
+                                     f"(TABLA TEXT PRIMARY KEY, VERSION INTEGER NOT NULL)")
+            for esquema, tabla in _PATRON_TABLA_DDL.findall("\n".join(_DDL)):
+                self._crear_contador_cambios(esquema, tabla)
+            if self._sqlite.execute("SELECT COUNT(*) FROM DUAL").fetchone()[0] == 0:
+                self._sqlite.execute("INSERT INTO DUAL (DUMMY) VALUES ('X')")
+            self._sqlite.commit()
+
+    def _crear_contador_cambios(self, esquema: str, tabla: str) -> None:
+        """Crea el contador de cambios de una tabla y los disparadores que lo incrementan."""
+        self._sqlite.execute(f"INSERT OR IGNORE INTO {esquema}.{TABLA_VERSIONES} (TABLA, VERSION) VALUES (?, 0)",
+                             (tabla,))
+        for operacion in ("INSERT", "UPDATE", "DELETE"):
+            # El disparador vive en el mismo esquema que la tabla, así que los nombres van sin calificar
+            self._sqlite.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {esquema}.VERSION_{tabla}_{operacion}
+                AFTER {operacion} ON {tabla}
+                BEGIN
+                    UPDATE {TABLA_VERSIONES} SET VERSION = VERSION + 1 WHERE TABLA = '{tabla}';
+                END
+            """)
+
+    @contextmanager
+    def acquire(self):
+        """Entrega la conexión, serializando su uso entre hilos."""
+        with self.lock:
+            yield self.conexion
+
+    def insertar(self, tabla: str, columnas: Sequence[str], filas: Sequence[tuple]) -> None:
+        """
+        Inserta filas en una tabla calificada con su esquema.
+
+        Args:
+            tabla: Nombre ESQUEMA.TABLA
+            columnas: Columnas a llenar
+            filas: Valores de cada fila
+        """
+        marcadores = ", ".join("?" for _ in columnas)
+        with self.lock:
+            self._sqlite.executemany(
+                f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({marcadores})", filas
+            )
+            self._sqlite.commit()
+
+    def close(self) -> None:
+        """Cierra la base de datos."""
+        with self.lock:
+            self._sqlite.close()
+
+
+# Horarios típicos (hora de ingreso, duración en minutos) y combinaciones de días
+_HORARIOS = [(time(8, 0), 480), (time(8, 30), 510), (time(9, 0), 480), (time(7, 0), 540),
+             (time(14, 0), 480), (time(22, 0), 480), (time(8, 0), 240), (time(13, 0), 300)]
+_COMBINACIONES_DIAS = [
+    ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES"),
+    ("LUNES", "MARTES", "MIERCOLES", "JUEVES"),
+    ("LUNES", "MIERCOLES", "VIERNES"),
+    ("MARTES", "JUEVES"),
+    ("SABADO", "DOMINGO"),
+    ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES", "SABADO"),
+    ("VIERNES",),
+]
+_NOMBRES = ["Ana", "Juan", "María", "Pedro", "Camila", "José", "Valentina", "Diego", "Javiera", "Matías"]
+_APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda"]
+_TIPOS_MARCAJE = ["ENTRADA", "SALIDA"]
+
+
+def _digito_verificador(numero: int) -> str:
+    suma, factor = 0, 2
+    for digito in reversed(str(numero)):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    return {11: "0", 10: "K"}.get(resto, str(resto))
+
+
+def generar_datos(backend: SQLiteBackend, num_turnos: int = 1000, semilla: int = 42,
+                  num_personas: Optional[int] = None, num_organismos: int = 20) -> dict:
+    """
+    Llena el backend con datos sintéticos reproducibles.
+
+    Los turnos combinan un conjunto acotado de horarios y días, de modo que hay
+    duplicados exactos, como en el catálogo real. Escala sin problemas a 100.000 turnos.
+
+    Args:
+        backend: Backend a llenar
+        num_turnos: Número de turnos
+        semilla: Semilla del generador aleatorio (mismos parámetros, mismos datos)
+        num_personas: Número de personas (por defecto, la mitad de los turnos, mínimo 10)
+        num_organismos: Número de organismos
+
+    Returns:
+        Diccionario con el número de filas generadas por tabla
+    """
+    aleatorio = random.Random(semilla)
+    num_personas = num_personas if num_personas is not None else max(10, num_turnos // 2)
+
+    organismos = [(i, f"Organismo {i:03d}", 1 if i % 10 else 0) for i in range(1, num_organismos + 1)]
+    backend.insertar("DATOS_TRANSVERSALES.ORGANISMO", ("ID_ORGANISMO", "NOMBRE", "VIGENCIA"), organismos)
+
+    turnos, detalles = [], []
+    id_detalle = 1
+    for id_turno in range(1, num_turnos + 1):
+        dias = aleatorio.choice(_COMBINACIONES_DIAS)
+        hora_ingreso, duracion = aleatorio.choice(_HORARIOS)
+        horas = int(duracion * len(dias) / 60)
+        turnos.append((id_turno, f"{id_turno}-{horas} {dias[0][:2]} a {dias[-1][:2]}",
+                       1 if aleatorio.random() < 0.9 else 0, "Diarios"))
+        for dia in dias:
+            detalles.append((id_detalle, id_turno, dia, datetime.combine(date(2025, 1, 1), hora_ingreso), duracion))
+            id_detalle += 1
+    backend.insertar("ASISTENCIAS.TURNO", ("ID_TURNO", "NOMBRE", "VIGENCIA", "FRECUENCIA"), turnos)
+    backend.insertar("ASISTENCIAS.TURNO_DETALLE_DIARIO",
+                     ("ID_TURNO_DETALLE_DIARIO", "ID_TURNO", "JORNADA", "HORA_INGRESO", "DURACION"), detalles)
+
+    personas, funcionarios, persona_turno = [], [], []
+    for id_persona in range(1, num_personas + 1):
+        numero_rut = 10_000_000 + id_persona
+        nombre = aleatorio.choice(_NOMBRES)
+        paterno, materno = aleatorio.choice(_APELLIDOS), aleatorio.choice(_APELLIDOS)
+        id_organismo = aleatorio.randint(1, num_organismos)
+        personas.append((id_persona, f"{numero_rut}-{_digito_verificador(numero_rut)}", nombre, paterno, materno,
+                         id_organismo))
+        funcionarios.append((id_persona, nombre, paterno, id_organismo))
+        if num_turnos:
+            persona_turno.append((id_persona, aleatorio.randint(1, num_turnos)))
+    backend.insertar("DATOS_TRANSVERSALES.PERSONA",
+                     ("ID_PERSONA", "RUT", "NOMBRE", "APELLIDO_PATERNO", "APELLIDO_MATERNO", "ID_ORGANISMO"), personas)
+    backend.insertar("ASISTENCIAS.FUNCIONARIO", ("ID_FUNCIONARIO", "NOMBRE", "APELLIDO", "ID_ORGANISMO"), funcionarios)
+    backend.insertar("ASISTENCIAS.PERSONA_TURNO", ("ID_PERSONA", "ID_TURNO"), persona_turno)
+
+    fecha_base = date(2025, 3, 3)
+    horarios_flexibles, marcajes = [], []
+    for indice in range(num_personas):
+        id_persona = indice + 1
+        fecha = fecha_base + timedelta(days=aleatorio.randint(0, 60))
+        hora_ingreso, duracion = aleatorio.choice(_HORARIOS)
+        entrada = datetime.combine(fecha, hora_ingreso)
+        horarios_flexibles.append((indice + 1, id_persona, datetime.combine(fecha, time()), entrada,
+                                   entrada + timedelta(minutes=duracion), 1))
+        for orden, tipo in enumerate(_TIPOS_MARCAJE):
+            hora = entrada + timedelta(minutes=orden * duracion + aleatorio.randint(-10, 10))
+            marcajes.append((2 * indice + orden + 1, id_persona, datetime.combine(fecha, time()), hora, tipo, None))
+    backend.insertar("ASISTENCIAS.HORARIO_FLEXIBLE",
+                     ("ID_HORARIO_FLEXIBLE", "ID_FUNCIONARIO", "FECHA", "HORA_ENTRADA", "HORA_SALIDA", "VIGENCIA"),
+                     horarios_flexibles)
+    backend.insertar("ASISTENCIAS.MARCAJE", ("ID_MARCAJE", "ID_PERSONA", "FECHA", "HORA", "TIPO", "COMENTARIO"),
+                     marcajes)
+
+    return {
+        "ORGANISMO": len(organismos),
+        "TURNO": len(turnos),
+        "TURNO_DETALLE_DIARIO": len(detalles),
+        "PERSONA": len(personas),
+        "FUNCIONARIO": len(funcionarios),
+        "PERSONA_TURNO": len(persona_turno),
+        "HORARIO_FLEXIBLE": len(horarios_flexibles),
+        "MARCAJE": len(marcajes),
+    }
+
+
+def main(argumentos=None) -> int:
+    """
+    Genera una base SQLite local con datos sintéticos.
+
+    Uso (desde src/):
+        python -m database.sqlite_backend --directorio datos_locales --turnos 100000
+    """
+    parser = argparse.ArgumentParser(description="Genera una base SQLite local con datos sintéticos de turnos")
+    parser.add_argument("--directorio", required=True, help="Carpeta donde se crearán los archivos SQLite")
+    parser.add_argument("--turnos", type=int, default=1000, help="Número de turnos a generar")
+    parser.add_argument("--personas", type=int, default=None, help="Número de personas a generar")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador aleatorio")
+    args = parser.parse_args(argumentos)
+
+    backend = SQLiteBackend(args.directorio)
+    try:
+        conteos = generar_datos(backend, num_turnos=args.turnos, semilla=args.semilla, num_personas=args.personas)
+    finally:
+        backend.close()
+
+    for tabla, cantidad in conteos.items():
+        print(f"{tabla}: {cantidad} filas")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from models.turno import DIAS_SEMANA, MINUTOS_POR_DIA, ORDEN_DIAS, Turno, normalizar_jornada
+
+logger = logging.getLogger(__name__)
+
+
+class TurnoCatalog:
+    """
+    Catálogo completo de turnos en arreglos de NumPy, por columnas.
+
+    Cada detalle diario ocupa una posición de los arreglos dias, ingresos y duraciones; los
+    detalles del turno i van de desplazamientos[i] a desplazamientos[i + 1]. Las preguntas
+    sobre todo el catálogo (filtros, horas semanales, horarios duplicados) se resuelven
+    con operaciones vectorizadas en lugar de recorrer diccionarios por turno.
+
+    Los días se guardan como índice de DIAS_SEMANA (0 = lunes); un nombre de día no
+    reconocido recibe un código propio a partir de len(DIAS_SEMANA). El catálogo es una
+    foto: no se actualiza al guardar turnos, se vuelve a construir.
+    """
+
+    def __init__(self, ids: np.ndarray, nombres: List[str], vigencias: np.ndarray, desplazamientos: np.ndarray,
+                 dias: np.ndarray, ingresos: np.ndarray, duraciones: np.ndarray, dias_extra: List[str] = None):
+        self.ids = ids
+        self.nombres = nombres
+        self.vigencias = vigencias
+        self.desplazamientos = desplazamientos
+        self.dias = dias
+        self.ingresos = ingresos
+        self.duraciones = duraciones
+        # Nombres normalizados de los días no reconocidos, por código (len(DIAS_SEMANA) + posición)
+        self.dias_extra = dias_extra or []
+        # Posición del turno de cada detalle
+        self.turno_de_detalle = np.repeat(np.arange(len(ids)), np.diff(desplazamientos))
+        self._matriz_horarios: Optional[np.ndarray] = None
+        # Índice de intervalos: detalles ordenados por (día, ingreso) y sus claves ordenadas
+        self._orden_ingresos: Optional[np.ndarray] = None
+        self._claves_ingresos: Optional[np.ndarray] = None
+        self._dias_por_turno: Optional[np.ndarray] = None
+        self.construido = datetime.now()
+
+    @classmethod
+    def desde_filas(cls, filas: Iterable[tuple]) -> "TurnoCatalog":
+        """
+        Construye el catálogo en una sola pasada sobre las filas de la consulta de turnos
+        con detalles (ID_TURNO, NOMBRE, VIGENCIA, FRECUENCIA, ID_TURNO_DETALLE_DIARIO,
+        JORNADA, HORA_INGRESO, DURACION), ordenadas por ID_TURNO.
+
+        Las filas se consumen una a una, por lo que pueden llegar desde iter_query.
+        """
+        ids, nombres, vigencias, desplazamientos = [], [], [], []
+        dias, ingresos, duraciones = [], [], []
+        codigos_dia = dict(ORDEN_DIAS)
+        dias_extra = []
+        id_actual = None
+
+        for id_turno, nombre, vigencia, _, _, jornada, hora_ingreso, duracion in filas:
+            if id_turno != id_actual:
+                id_actual = id_turno
+                ids.append(id_turno)
+                nombres.append(nombre)
+                vigencias.append(vigencia or 0)
+                desplazamientos.append(len(dias))
+
+            dia = normalizar_jornada(jornada or "")
+            codigo = codigos_dia.get(dia)
+            if codigo is None:
+                codigo = codigos_dia[dia] = len(DIAS_SEMANA) + len(dias_extra)
+                dias_extra.append(dia)
+            dias.append(codigo)
+            ingresos.append(hora_ingreso.hour * 60 + hora_ingreso.minute)
+            duraciones.append(duracion or 0)
+        desplazamientos.append(len(dias))
+
+        catalogo = cls(
+            np.array(ids, dtype=np.int64),
+            nombres,
+            np.array(vigencias, dtype=np.int8),
+            np.array(desplazamientos, dtype=np.int64),
+            np.array(dias, dtype=np.int8),
+            np.array(ingresos, dtype=np.int16),
+            np.array(duraciones, dtype=np.int16),
+            dias_extra
+        )
+        logger.debug("Catálogo construido con %s turnos y %s detalles", len(catalogo), catalogo.total_detalles)
+        return catalogo
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def edad(self) -> float:
+        """Segundos transcurridos desde que se construyó el catálogo."""
+        return (datetime.now() - self.construido).total_seconds()
+
+    @property
+    def total_detalles(self) -> int:
+        """Número de detalles diarios del catálogo."""
+        return len(self.dias)
+
+    @property
+    def salidas(self) -> np.ndarray:
+        """Minuto de salida de cada detalle, módulo 24 horas (como la firma de horario)."""
+        return (self.ingresos.astype(np.int32) + self.duraciones) % MINUTOS_POR_DIA
+
+    def posicion(self, id_turno: int) -> Optional[int]:
+        """Posición de un turno en los arreglos, o None si no está en el catálogo."""
+        posicion = int(np.searchsorted(self.ids, id_turno))
+        if posicion < len(self.ids) and self.ids[posicion] == id_turno:
+            return posicion
+        return None
+
+    def _codigo_dia(self, dia: Union[int, str]) -> int:
+        """Convierte un nombre de día (en cualquier formato) o un índice en el código del catálogo."""
+        if isinstance(dia, str):
+            normalizado = normalizar_jornada(dia)
+            if normalizado in ORDEN_DIAS:
+                return ORDEN_DIAS[normalizado]
+            if normalizado in self.dias_extra:
+                return len(DIAS_SEMANA) + self.dias_extra.index(normalizado)
+            return -1
+        return dia
+
+    def filtrar(self, dia: Union[int, str] = None, ingreso: int = None, duracion_minima: int = None,
+                duracion_maxima: int = None, solo_vigentes: bool = False) -> np.ndarray:
+        """
+        Obtiene los turnos con al menos un detalle que cumple todos los criterios indicados.
+
+        Ejemplo: turnos que ingresan a las 08:00 los lunes
+            catalogo.filtrar(dia="Lunes", ingreso=8 * 60)
+
+        Args:
+            dia: Nombre del día o índice en DIAS_SEMANA
+            ingreso: Minuto del día de ingreso
+            duracion_minima: Duración mínima del detalle en minutos
+            duracion_maxima: Duración máxima del detalle en minutos
+            solo_vigentes: Descarta los turnos no vigentes
+
+        Returns:
+            IDs de los turnos, en orden ascendente
+        """
+        mascara = np.ones(self.total_detalles, dtype=bool)
+        if dia is not None:
+            mascara &= self.dias == self._codigo_dia(dia)
+        if ingreso is not None:
+            mascara &= self.ingresos == ingreso
+        if duracion_minima is not None:
+            mascara &= self.duraciones >= duracion_minima
+        if duracion_maxima is not None:
+            mascara &= self.duraciones <= duracion_maxima
+
+        turnos = np.zeros(len(self), dtype=bool)
+        turnos[self.turno_de_detalle[mascara]] = True
+        if solo_vigentes:
+            turnos &= self.vigencias == 1
+        return self.ids[turnos]
+
+    def horas_semanales(self) -> np.ndarray:
+        """Horas semanales de cada turno, en el orden de ids."""
+        minutos = np.bincount(self.turno_de_detalle, weights=self.duraciones, minlength=len(self))
+        return minutos / 60
+
+    def turnos_con_horas_mayores(self, horas: float) -> np.ndarray:
+        """IDs de los turnos que superan las horas semanales indicadas (por ejemplo, 44)."""
+        return self.ids[self.horas_semanales() > horas]
+
+    def distribucion_ingresos(self, dia: Union[int, str] = None) -> Dict[int, int]:
+        """
+        Cuenta los detalles por minuto de ingreso, opcionalmente de un solo día.
+
+        Returns:
+            Diccionario minuto de ingreso -> número de detalles
+        """
+        ingresos = self.ingresos if dia is None else self.ingresos[self.dias == self._codigo_dia(dia)]
+        minutos, cantidades = np.unique(ingresos, return_counts=True)
+        return dict(zip(minutos.tolist(), cantidades.tolist()))
+
+    def _matriz(self) -> np.ndarray:
+        """
+        Una fila por turno con su horario canónico: los tramos (día, ingreso, salida)
+        ordenados, uno tras otro, y -1 en las posiciones sobrantes. Dos turnos tienen la
+        misma fila si y solo si tienen la misma firma de horario.
+        """
+        if self._matriz_horarios is None:
+            salidas = self.salidas
+            # Orden por (turno, día, ingreso, salida) con una sola clave entera
+            clave = (
+                (self.turno_de_detalle.astype(np.int64) << 32) | (self.dias.astype(np.int64) << 24)
+                | (self.ingresos.astype(np.int64) << 12) | salidas
+            )
+            orden = np.argsort(clave, kind="stable")
+            cantidades = np.diff(self.desplazamientos)
+            ancho = int(cantidades.max()) if len(cantidades) else 0
+            # Posición de cada tramo dentro de su turno, una vez ordenados
+            posiciones = np.arange(self.total_detalles) - self.desplazamientos[self.turno_de_detalle]
+            matriz = np.full((len(self), ancho, 3), -1, dtype=np.int16)
+            turnos = self.turno_de_detalle[orden]
+            matriz[turnos, posiciones, 0] = self.dias[orden]
+            matriz[turnos, posiciones, 1] = self.ingresos[orden]
+            matriz[turnos, posiciones, 2] = salidas[orden]
+            self._matriz_horarios = matriz.reshape(len(self), ancho * 3)
+        return self._matriz_horarios
+
+    def grupos_duplicados(self) -> List[np.ndarray]:
+        """
+        Agrupa los turnos que tienen exactamente el mismo horario semanal.
+
+        Returns:
+            Por cada horario repetido, los IDs de sus turnos (solo grupos de dos o más)
+        """
+        if not len(self):
+            return []
+        matriz = self._matriz()
+        # Ordenar las filas (lexsort es estable: dentro de cada grupo los IDs quedan ascendentes)
+        orden = np.lexsort(matriz.T[::-1])
+        ordenada = matriz[orden]
+        inicios = np.concatenate(([0], np.flatnonzero(np.any(ordenada[1:] != ordenada[:-1], axis=1)) + 1))
+        fines = np.append(inicios[1:], len(self))
+        ids = self.ids[orden]
+        return [ids[inicio:fin] for inicio, fin in zip(inicios.tolist(), fines.tolist()) if fin - inicio > 1]
+
+    def buscar_duplicados(self, turno: Turno) -> np.ndarray:
+        """
+        Obtiene los turnos del catálogo con exactamente el mismo horario que el indicado.
+
+        Returns:
+            IDs de los turnos, en orden ascendente (incluye al propio turno si está en el catálogo)
+        """
+        matriz = self._matriz()
+        firma = turno.firma_horario()
+        if not firma or len(firma) > matriz.shape[1] // 3:
+            return self.ids[:0]
+
+        # La firma ordena los días no reconocidos por nombre; la matriz, por código
+        tramos = []
+        for jornada, ingreso, salida in firma:
+            codigo = self._codigo_dia(jornada)
+            if codigo < 0:
+                return self.ids[:0]
+            tramos.append((codigo, ingreso, salida))
+        fila = np.full(matriz.shape[1], -1, dtype=np.int16)
+        fila[:len(tramos) * 3] = np.array(sorted(tramos)).ravel()
+        return self.ids[np.all(matriz == fila, axis=1)]
+
+    def _indice_intervalos(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ordena los detalles por (día, ingreso) una sola vez, para ubicar con búsqueda
+        binaria los que ingresan en un rango de minutos de un día.
+
+        Returns:
+            Posiciones de los detalles en ese orden y sus claves día << 12 | ingreso
+        """
+        if self._orden_ingresos is None:
+            claves = (self.dias.astype(np.int64) << 12) | self.ingresos
+            self._orden_ingresos = np.argsort(claves, kind="stable")
+            self._claves_ingresos = claves[self._orden_ingresos]
+        return self._orden_ingresos, self._claves_ingresos
+
+    def _dias_distintos(self) -> np.ndarray:
+        """Número de días distintos de cada turno (un turno partido cuenta el día una vez)."""
+        if self._dias_por_turno is None:
+            pares = np.unique((self.turno_de_detalle.astype(np.int64) << 8) | self.dias)
+            self._dias_por_turno = np.bincount(pares >> 8, minlength=len(self))
+        return self._dias_por_turno
+
+    def buscar_cercanos(self, turno: Turno, tolerancia_minutos: int = 15, similitud_minima: float = 0.8,
+                        limite: int = None) -> List[Tuple[int, str, float, int]]:
+        """
+        Busca turnos con un horario parecido al indicado.
+
+        Un día del turno coincide con el mismo día de un candidato si algún tramo del
+        candidato ingresa y sale a no más de tolerancia_minutos de un tramo del turno (la
+        salida se compara módulo 24 horas). Los candidatos de cada tramo se ubican con
+        búsqueda binaria en el índice de intervalos, sin recorrer el catálogo.
+
+        La similitud de días es la de Jaccard entre los días del turno y los del candidato,
+        contando solo los días coincidentes como comunes. La distancia suma, por día
+        coincidente, la menor diferencia de ingreso más la de salida, en minutos.
+
+        Args:
+            turno: Turno a comparar
+            tolerancia_minutos: Diferencia máxima de ingreso y de salida en cada día
+            similitud_minima: Similitud de días mínima (0 a 1) para incluir un candidato
+            limite: Máximo de candidatos a devolver (todos si es None)
+
+        Returns:
+            Tuplas (id_turno, nombre, similitud, distancia), de mayor a menor similitud y
+            de menor a mayor distancia; el propio turno no se incluye
+        """
+        firma = turno.firma_horario()
+        # Un día que no existe en el catálogo no coincide con nadie, pero cuenta en la similitud
+        dias_turno = len({jornada for jornada, _, _ in firma})
+        tramos = []
+        for jornada, ingreso, salida in firma:
+            codigo = self._codigo_dia(jornada)
+            if codigo >= 0:
+                tramos.append((codigo, ingreso, salida))
+        if not tramos or not len(self):
+            return []
+
+        orden, claves = self._indice_intervalos()
+        salidas = self.salidas
+        posiciones, distancias = [], []
+        for codigo, ingreso, salida in tramos:
+            desde = np.searchsorted(claves, (codigo << 12) | max(ingreso - tolerancia_minutos, 0))
+            hasta = np.searchsorted(claves, (codigo << 12) | min(ingreso + tolerancia_minutos, MINUTOS_POR_DIA - 1),
+                                    side="right")
+            detalles = orden[desde:hasta]
+            diferencia_salida = np.abs(salidas[detalles] - salida)
+            diferencia_salida = np.minimum(diferencia_salida, MINUTOS_POR_DIA - diferencia_salida)
+            dentro = diferencia_salida <= tolerancia_minutos
+            detalles = detalles[dentro]
+            posiciones.append(detalles)
+            distancias.append(np.abs(self.ingresos[detalles].astype(np.int32) - ingreso) + diferencia_salida[dentro])
+
+        detalles = np.concatenate(posiciones)
+        distancias = np.concatenate(distancias)
+        if not len(detalles):
+            return []
+
+        # Por cada par (turno, día) se conserva la coincidencia de menor distancia
+        pares = (self.turno_de_detalle[detalles].astype(np.int64) << 8) | self.dias[detalles]
+        orden_pares = np.lexsort((distancias, pares))
+        pares, distancias = pares[orden_pares], distancias[orden_pares]
+        primeros = np.concatenate(([True], pares[1:] != pares[:-1]))
+        turnos = pares[primeros] >> 8
+        distancias = distancias[primeros]
+
+        dias_comunes = np.bincount(turnos, minlength=len(self))
+        distancia_total = np.bincount(turnos, weights=distancias, minlength=len(self))
+        candidatos = np.flatnonzero(dias_comunes)
+        comunes = dias_comunes[candidatos]
+        similitud = comunes / (dias_turno + self._dias_distintos()[candidatos] - comunes)
+
+        elegidos = similitud >= similitud_minima
+        if turno.id_turno is not None:
+            elegidos &= self.ids[candidatos] != turno.id_turno
+        candidatos, similitud = candidatos[elegidos], similitud[elegidos]
+        distancia_total = distancia_total[candidatos]
+
+        ranking = np.lexsort((distancia_total, -similitud))[:limite]
+        return [
+            (int(self.ids[candidatos[i]]), self.nombres[candidatos[i]], float(similitud[i]), int(distancia_total[i]))
+            for i in ranking
+        ]
@@ -1,8 +1,21 @@
-from typing import Optional, List, Tuple, Dict, Any
-from datetime import time
+import logging
+from typing import Optional, List, Tuple, Dict, Any, Iterable, Iterator, NamedTuple
+from datetime import time, timedelta
+import threading
 import cx_Oracle
 from .oracle_connection import OracleConnection
-from models.turno import Turno, TurnoDetalleDiario
+from .id_allocator import IdAllocator, ColisionIdsError
+from .schedule_index import ScheduleIndex
+from .cargador_lotes import MAX_ELEMENTOS_IN, consultar_por_lista
+from .turno_catalog import TurnoCatalog
+from models.turno import Turno, TurnoDetalleDiario, FirmaHorario, calcular_firma_horario, firma_a_texto
+
+logger = logging.getLogger(__name__)
+
+
+def literal_sql(valor) -> str:
+    """Convierte un texto en un literal SQL entre comillas simples, duplicando las comillas internas."""
+    return "'" + str(valor).replace("'", "''") + "'"
 
 class TurnoDAOError(Exception):
     """Excepción base para errores del DAO."""
@@ -16,10 +29,39 @@ class ConsultaError(TurnoDAOError):
     """Error al ejecutar una consulta."""
     pass
 
+class TurnoCercano(NamedTuple):
+    """Turno con un horario parecido a otro (ver TurnoDAO.buscar_turnos_cercanos)."""
+    id_turno: int
+    nombre: str
+    # Similitud de Jaccard entre los días de ambos turnos (1.0 = mismos días)
+    similitud_dias: float
+    # Suma de las diferencias de ingreso y salida de los días coincidentes, en minutos
+    distancia: int
+    personas_asignadas: int
+
 class TurnoDAO:
+    # Filas leídas por viaje de red al recorrer el catálogo completo de turnos
+    TAMANO_LOTE_BUSQUEDA = 1000
+    # Tiempo tras el cual el índice de horarios se reconstruye desde la base de datos
+    DURACION_INDICE_HORARIOS = timedelta(minutes=10)
+    # Oracle admite como máximo 1000 elementos en una lista IN
+    MAX_ELEMENTOS_IN = MAX_ELEMENTOS_IN
+    # Calcular las firmas de horario en Oracle en lugar de recorrer el catálogo en Python
+    FIRMA_EN_SERVIDOR = True
+    # Índice de horarios compartido por todas las instancias del DAO
+    _indice_horarios: Optional[ScheduleIndex] = None
+    # Catálogo por columnas compartido, con la misma vigencia que el índice de horarios
+    _catalogo: Optional[TurnoCatalog] = None
+    # Turnos guardados en esta sesión: solo se genera su script, así que no están en la
+    # base de datos y ni la búsqueda en el servidor ni un índice reconstruido los verían
+    _guardados_sesion = ScheduleIndex()
+    _lock_indice = threading.Lock()
+
     def __init__(self):
+        # La conexión no se abre aquí: cada operación la verifica al usarla, de modo que
+        # los widgets se pueden construir mientras se conecta en segundo plano
         self.db = OracleConnection()
-        self._verificar_conexion()
+        self.id_allocator = IdAllocator()
 
     def _verificar_conexion(self) -> None:
         """
@@ -29,69 +71,88 @@ class TurnoDAO:
             ConexionError: Si no se puede establecer la conexión
         """
         try:
-            print("DEBUG: Verificando conexión a la base de datos...")
+            logger.debug("Verificando conexión a la base de datos...")
             if not self.db.connect():
-                print("DEBUG: No se pudo establecer la conexión con la base de datos")
+                logger.error("No se pudo establecer la conexión con la base de datos")
                 raise ConexionError("No se pudo establecer la conexión con la base de datos")
-            print("DEBUG: Conexión a la base de datos verificada correctamente")
+            logger.debug("Conexión a la base de datos verificada correctamente")
         except cx_Oracle.Error as e:
-            print(f"DEBUG: Error de conexión a la base de datos: {str(e)}")
+            logger.error("Error de conexión a la base de datos: %s", e)
             raise ConexionError(f"Error de conexión: {str(e)}")
 
     def obtener_ultimo_id_turno(self) -> int:
         """
-        Obtiene el último ID de turno de la base de datos.
+        Obtiene el próximo ID de turno libre (sin reservarlo).
         
         Returns:
-            int: El último ID + 1
+            int: El último ID + 1, considerando también los IDs ya entregados en la sesión
             
         Raises:
             ConsultaError: Si hay un error al ejecutar la consulta
         """
         try:
-            self._verificar_conexion()
-            
-            query = """
-                SELECT NVL(MAX(ID_TURNO), 0) + 1
-                FROM ASISTENCIAS.TURNO
-            """
-            result = self.db.execute_query(query, cache_key="ultimo_id_turno")
-            
-            if not result:
-                raise ConsultaError("No se pudo obtener el último ID de turno")
-                
-            return result[0][0]
-            
+            return self.id_allocator.proximo_id_turno()
         except cx_Oracle.Error as e:
             raise ConsultaError(f"Error al obtener último ID de turno: {str(e)}")
 
     def obtener_ultimo_id_detalle(self) -> int:
         """
-        Obtiene el último ID de detalle de turno de la base de datos.
+        Obtiene el próximo ID de detalle libre (sin reservarlo).
         
         Returns:
-            int: El último ID + 1
+            int: El último ID + 1, considerando también los IDs ya entregados en la sesión
             
         Raises:
             ConsultaError: Si hay un error al ejecutar la consulta
         """
         try:
-            self._verificar_conexion()
-            
-            query = """
-                SELECT NVL(MAX(ID_TURNO_DETALLE_DIARIO), 0) + 1
-                FROM ASISTENCIAS.TURNO_DETALLE_DIARIO
-            """
-            result = self.db.execute_query(query, cache_key="ultimo_id_detalle")
-            
-            if not result:
-                raise ConsultaError("No se pudo obtener el último ID de detalle")
-                
-            return result[0][0]
-            
+            return self.id_allocator.proximo_id_detalle()
         except cx_Oracle.Error as e:
             raise ConsultaError(f"Error al obtener último ID de detalle: {str(e)}")
 
+    def reservar_id_turno(self) -> int:
+        """
+        Reserva un ID de turno que no se volverá a entregar durante la sesión.
+        
+        Raises:
+            ConsultaError: Si hay un error al ejecutar la consulta
+        """
+        try:
+            return self.id_allocator.reservar_turnos(1)[0]
+        except cx_Oracle.Error as e:
+            raise ConsultaError(f"Error al reservar ID de turno: {str(e)}")
+
+    def reservar_ids_detalle(self, cantidad: int = 1) -> range:
+        """
+        Reserva `cantidad` IDs de detalle consecutivos que no se volverán a entregar durante la sesión.
+        
+        Raises:
+            ConsultaError: Si hay un error al ejecutar la consulta
+        """
+        try:
+            return self.id_allocator.reservar_detalles(cantidad)
+        except cx_Oracle.Error as e:
+            raise ConsultaError(f"Error al reservar IDs de detalle: {str(e)}")
+
+    def renumerar_turnos(self, turnos: List[Turno]) -> bool:
+        """
+        Verifica en una sola consulta que los IDs de un lote de turnos estén libres,
+        renumerando todo el lote si alguno ya existe en la base de datos.
+        
+        Args:
+            turnos: Turnos a verificar; se modifican en el lugar
+            
+        Returns:
+            True si hubo que renumerar el lote
+            
+        Raises:
+            ConsultaError: Si no se pudo verificar o asignar los IDs
+        """
+        try:
+            return self.id_allocator.renumerar(turnos)
+        except (cx_Oracle.Error, ColisionIdsError) as e:
+            raise ConsultaError(f"Error al asignar IDs al lote de turnos: {str(e)}")
+
     def buscar_turnos_similares(self, turno: Turno) -> List[Tuple[int, str, List[dict]]]:
         """
         Busca turnos con configuración exactamente igual al proporcionado.
@@ -108,21 +169,21 @@ class TurnoDAO:
             Lista de tuplas (id_turno, nombre, detalles) de turnos exactamente iguales
         """
         try:
-            print("DEBUG: Iniciando búsqueda de turnos similares")
+            logger.debug("Iniciando búsqueda de turnos similares")
             self._verificar_conexion()
             
             if not turno.detalles:
-                print("DEBUG: No hay detalles en el turno a comparar")
+                logger.debug("No hay detalles en el turno a comparar")
                 return []
             
-            print(f"DEBUG: Buscando turnos similares para turno ID={turno.id_turno}, Nombre={turno.nombre}")
-            print(f"DEBUG: Detalles del turno a comparar:")
-            for detalle in turno.detalles:
-                print(f"DEBUG:   - {detalle.jornada}: {detalle.hora_ingreso} - Duración: {detalle.duracion} min")
+            logger.debug("Buscando turnos similares para turno ID=%s, Nombre=%s", turno.id_turno, turno.nombre)
+            if logger.isEnabledFor(logging.DEBUG):
+                for detalle in turno.detalles:
+                    logger.debug("  - %s: %s - Duración: %s min", detalle.jornada, detalle.hora_ingreso, detalle.duracion)
             
             # Verificar primero si existe un turno con el mismo ID
             if turno.id_turno is not None and turno.id_turno > 0:
-                print(f"DEBUG: Verificando si existe un turno con ID={turno.id_turno}")
+                logger.debug("Verificando si existe un turno con ID=%s", turno.id_turno)
                 query_id = """
                 SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
                        tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, tdd.HORA_INGRESO, tdd.DURACION
@@ -135,7 +196,7 @@ class TurnoDAO:
                 results_id = self.db.execute_query(query_id, {"id_turno": turno.id_turno})
                 
                 if results_id:
-                    print(f"DEBUG: Se encontró un turno con ID={turno.id_turno}")
+                    logger.debug("Se encontró un turno con ID=%s", turno.id_turno)
                     # Procesar resultados
                     turnos_agrupados = self._agrupar_resultados_turnos(results_id)
                     
@@ -153,49 +214,32 @@ class TurnoDAO:
                         # Devolver solo este turno si existe
                         return [turno_existente]
             
-            # Si no se encontró un turno con el mismo ID, buscar turnos similares
-            print("DEBUG: Buscando turnos con configuración similar")
-            
-            # Obtener todos los turnos de la base de datos
-            query_todos_turnos = """
-            SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
-                   tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, tdd.HORA_INGRESO, tdd.DURACION
-            FROM ASISTENCIAS.TURNO t
-            JOIN ASISTENCIAS.TURNO_DETALLE_DIARIO tdd ON t.ID_TURNO = tdd.ID_TURNO
-            ORDER BY t.ID_TURNO, tdd.JORNADA
-            """
-            
-            print("DEBUG: Ejecutando consulta para obtener todos los turnos")
-            results_todos_turnos = self.db.execute_query(query_todos_turnos)
-            
-            if not results_todos_turnos:
-                print("DEBUG: No se encontraron turnos en la base de datos")
-                return []
-            
-            print(f"DEBUG: Se encontraron {len(results_todos_turnos)} filas de resultados")
-            
-            # Agrupar resultados por turno
-            turnos_agrupados = self._agrupar_resultados_turnos(results_todos_turnos)
-            print(f"DEBUG: Se agruparon en {len(turnos_agrupados)} turnos distintos")
-            
-            # Convertir a lista de tuplas (id, nombre, detalles)
-            turnos_para_comparar = [(
-                id_turno,
-                info['nombre'],
-                self._convertir_detalles_para_comparacion(info['detalles'])
-            ) for id_turno, info in turnos_agrupados.items()]
-            
-            # Filtrar por coincidencia exacta en días, horas de entrada y salida
-            turnos_coincidentes = self._filtrar_turnos_similares(turno, turnos_para_comparar)
-            
-            print(f"DEBUG: Después de filtrar, se encontraron {len(turnos_coincidentes)} turnos coincidentes")
+            # Si no se encontró un turno con el mismo ID, buscar otros turnos con la misma firma:
+            # en el índice si ya está construido, si no en Oracle, y si eso falla, en Python
+            firma = turno.firma_horario()
+            candidatos = None
+            if self.FIRMA_EN_SERVIDOR and not self._indice_vigente():
+                candidatos = self._buscar_firma_en_servidor(firma)
+            if candidatos is None:
+                logger.debug("Buscando turnos con el mismo horario en el índice")
+                indice = self.obtener_indice_horarios()
+                candidatos = [(id_turno, indice.nombre_de(id_turno)) for id_turno in indice.buscar(firma)]
+            candidatos = self._agregar_guardados_sesion(candidatos, firma)
+            
+            detalles_firma = self._detalles_desde_firma(firma)
+            turnos_coincidentes = []
+            for id_turno, nombre in candidatos:
+                # El propio turno no existe en la base de datos (se verificó arriba): no es un duplicado
+                if turno.id_turno is not None and id_turno == turno.id_turno:
+                    continue
+                turnos_coincidentes.append((id_turno, nombre, detalles_firma))
+            
+            logger.debug("Se encontraron %s turnos con el mismo horario", len(turnos_coincidentes))
             
             return turnos_coincidentes
             
         except Exception as e:
-            print(f"ERROR al buscar turnos similares: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al buscar turnos similares: %s", e)
             return []
 
     def _agrupar_resultados_turnos(self, results):
@@ -237,6 +281,290 @@ class TurnoDAO:
         
         return turnos_agrupados
 
+    def _buscar_firma_en_servidor(self, firma: FirmaHorario) -> Optional[List[Tuple[int, str]]]:
+        """
+        Busca en Oracle los turnos cuya firma de horario coincide exactamente con la indicada.
+        
+        La firma de cada turno se arma en el servidor con LISTAGG, en el mismo formato que
+        firma_a_texto, y se compara con una variable de enlace: solo viajan por la red los
+        turnos coincidentes.
+        
+        Returns:
+            Lista de (id_turno, nombre) o None si la consulta falló
+        """
+        query = """
+        SELECT ID_TURNO, NOMBRE
+        FROM (
+            SELECT t.ID_TURNO, t.NOMBRE,
+                   LISTAGG(d.DIA || ':' || d.INGRESO || ':' || d.SALIDA, ',')
+                       WITHIN GROUP (ORDER BY d.ORDEN_DIA, d.DIA, d.INGRESO, d.SALIDA) AS FIRMA
+            FROM ASISTENCIAS.TURNO t
+            JOIN (
+                SELECT n.ID_TURNO, n.DIA, n.INGRESO,
+                       MOD(n.INGRESO + NVL(n.DURACION, 0), 1440) AS SALIDA,
+                       CASE n.DIA
+                           WHEN 'LUNES' THEN 0 WHEN 'MARTES' THEN 1 WHEN 'MIERCOLES' THEN 2
+                           WHEN 'JUEVES' THEN 3 WHEN 'VIERNES' THEN 4 WHEN 'SABADO' THEN 5
+                           WHEN 'DOMINGO' THEN 6 ELSE 7
+                       END AS ORDEN_DIA
+                FROM (
+                    SELECT tdd.ID_TURNO, tdd.DURACION,
+                           UPPER(TRANSLATE(TRIM(tdd.JORNADA), 'ÁÉÍÓÚÜáéíóúü', 'AEIOUUaeiouu')) AS DIA,
+                           TO_NUMBER(TO_CHAR(tdd.HORA_INGRESO, 'HH24')) * 60
+                               + TO_NUMBER(TO_CHAR(tdd.HORA_INGRESO, 'MI')) AS INGRESO
+                    FROM ASISTENCIAS.TURNO_DETALLE_DIARIO tdd
+                ) n
+            ) d ON t.ID_TURNO = d.ID_TURNO
+            GROUP BY t.ID_TURNO, t.NOMBRE
+            HAVING COUNT(*) = :num_dias
+        )
+        WHERE FIRMA = :firma
+        ORDER BY ID_TURNO
+        """
+        
+        texto_firma = firma_a_texto(firma)
+        logger.debug("Buscando en el servidor turnos con la firma %s", texto_firma)
+        results = self.db.execute_query(query, {"num_dias": len(firma), "firma": texto_firma})
+        if results is None:
+            logger.warning("La búsqueda de firmas en el servidor falló, se usará el índice local")
+            return None
+        return [(row[0], row[1]) for row in results]
+
+    def _indice_vigente(self) -> bool:
+        """Indica si el índice de horarios ya está construido y no ha caducado."""
+        indice = TurnoDAO._indice_horarios
+        return indice is not None and indice.edad() <= self.DURACION_INDICE_HORARIOS.total_seconds()
+
+    def obtener_indice_horarios(self, forzar: bool = False) -> ScheduleIndex:
+        """
+        Obtiene el índice de turnos por firma de horario, construyéndolo si hace falta.
+        
+        El índice se comparte entre todas las instancias del DAO y se reconstruye desde
+        la base de datos solo cuando supera DURACION_INDICE_HORARIOS o se fuerza.
+        
+        Args:
+            forzar: Reconstruye el índice aunque esté vigente
+            
+        Raises:
+            cx_Oracle.Error: Si no se puede leer el catálogo de turnos
+        """
+        with TurnoDAO._lock_indice:
+            indice = TurnoDAO._indice_horarios
+            if forzar or not self._indice_vigente():
+                indice = self._construir_indice_horarios()
+                TurnoDAO._indice_horarios = indice
+            return indice
+
+    def _construir_indice_horarios(self) -> ScheduleIndex:
+        """Recorre el catálogo de turnos por lotes y construye el índice de horarios."""
+        query = """
+        SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
+               tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, tdd.HORA_INGRESO, tdd.DURACION
+        FROM ASISTENCIAS.TURNO t
+        JOIN ASISTENCIAS.TURNO_DETALLE_DIARIO tdd ON t.ID_TURNO = tdd.ID_TURNO
+        ORDER BY t.ID_TURNO, tdd.JORNADA
+        """
+        
+        logger.debug("Construyendo índice de horarios desde la base de datos")
+        filas = self.db.iter_query(query, batch_size=self.TAMANO_LOTE_BUSQUEDA)
+        indice = ScheduleIndex.desde_turnos(
+            (id_turno, nombre, calcular_firma_horario(
+                (d['jornada'], d['hora_ingreso'], d['duracion']) for d in detalles
+            ))
+            for id_turno, nombre, detalles in self._iterar_turnos_agrupados(filas)
+        )
+        logger.debug("Índice de horarios construido con %s turnos", len(indice))
+        return indice
+
+    def obtener_catalogo(self, forzar: bool = False) -> TurnoCatalog:
+        """
+        Obtiene el catálogo completo de turnos por columnas (TurnoCatalog), para responder
+        preguntas sobre todo el catálogo sin recorrerlo en Python.
+        
+        Como el índice de horarios, se comparte entre las instancias del DAO y se vuelve a
+        leer por lotes solo cuando supera DURACION_INDICE_HORARIOS o se fuerza.
+        
+        Args:
+            forzar: Vuelve a leer el catálogo aunque esté vigente
+            
+        Raises:
+            ConsultaError: Si no se puede leer el catálogo de turnos
+        """
+        query = """
+        SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
+               tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, tdd.HORA_INGRESO, tdd.DURACION
+        FROM ASISTENCIAS.TURNO t
+        JOIN ASISTENCIAS.TURNO_DETALLE_DIARIO tdd ON t.ID_TURNO = tdd.ID_TURNO
+        ORDER BY t.ID_TURNO, tdd.JORNADA
+        """
+        
+        with TurnoDAO._lock_indice:
+            catalogo = TurnoDAO._catalogo
+            if forzar or catalogo is None or catalogo.edad() > self.DURACION_INDICE_HORARIOS.total_seconds():
+                try:
+                    catalogo = TurnoCatalog.desde_filas(self.db.iter_query(query, batch_size=self.TAMANO_LOTE_BUSQUEDA))
+                except cx_Oracle.Error as e:
+                    raise ConsultaError(f"Error al leer el catálogo de turnos: {str(e)}")
+                TurnoDAO._catalogo = catalogo
+            return catalogo
+
+    def buscar_turnos_cercanos(self, turno: Turno, tolerancia_minutos: int = 15, similitud_dias: float = 0.8,
+                               limite: int = 10) -> List[TurnoCercano]:
+        """
+        Busca turnos con un horario parecido, no necesariamente igual, al proporcionado.
+        
+        A diferencia de buscar_turnos_similares, admite una diferencia de hasta
+        tolerancia_minutos en el ingreso y la salida de cada día, y que los días no sean
+        exactamente los mismos. Los candidatos salen del índice de intervalos del catálogo
+        (ver TurnoCatalog.buscar_cercanos) y se informa cuántas personas tienen asignado
+        cada uno, para que quien crea un turno sepa si ya existe uno en uso.
+        
+        Args:
+            turno: El turno a comparar
+            tolerancia_minutos: Diferencia máxima de ingreso y de salida en cada día
+            similitud_dias: Similitud mínima (0 a 1) entre los conjuntos de días
+            limite: Máximo de turnos a devolver
+            
+        Returns:
+            Turnos parecidos, de mayor a menor similitud de días y de menor a mayor distancia
+            
+        Raises:
+            ConsultaError: Si no se puede leer el catálogo o las asignaciones
+        """
+        if not turno.detalles:
+            return []
+        
+        cercanos = self.obtener_catalogo().buscar_cercanos(turno, tolerancia_minutos, similitud_dias, limite)
+        if not cercanos:
+            return []
+        
+        personas = dict(self._consultar_por_ids("""
+            SELECT ID_TURNO, COUNT(*)
+            FROM ASISTENCIAS.PERSONA_TURNO
+            WHERE ID_TURNO IN ({ids})
+            GROUP BY ID_TURNO
+        """, sorted(id_turno for id_turno, _, _, _ in cercanos)))
+        logger.debug("Se encontraron %s turnos con horario parecido", len(cercanos))
+        return [
+            TurnoCercano(id_turno, nombre, similitud, distancia, personas.get(id_turno, 0))
+            for id_turno, nombre, similitud, distancia in cercanos
+        ]
+
+    def buscar_duplicados_lote(self, turnos: List[Turno]) -> List[List[Tuple[int, str]]]:
+        """
+        Busca, para cada turno de un lote, los turnos existentes con exactamente el mismo horario.
+
+        A diferencia de buscar_turnos_similares, que puede consultar la firma en Oracle para
+        cada turno, el lote completo se resuelve contra el índice de horarios: el catálogo
+        se lee una sola vez y cada turno cuesta una búsqueda en memoria.
+
+        Args:
+            turnos: Turnos a comparar
+
+        Returns:
+            Para cada turno, en el mismo orden, la lista de (id_turno, nombre) coincidentes
+
+        Raises:
+            ConsultaError: Si no se pudo leer el catálogo de turnos
+        """
+        try:
+            indice = self.obtener_indice_horarios()
+        except cx_Oracle.Error as e:
+            raise ConsultaError(f"Error al leer el catálogo de turnos: {str(e)}")
+
+        duplicados = []
+        for turno in turnos:
+            if turno.detalles:
+                firma = turno.firma_horario()
+                candidatos = [(id_turno, indice.nombre_de(id_turno)) for id_turno in indice.buscar(firma)]
+                candidatos = self._agregar_guardados_sesion(candidatos, firma)
+            else:
+                candidatos = []
+            duplicados.append([
+                (id_turno, nombre)
+                for id_turno, nombre in candidatos
+                if turno.id_turno is None or id_turno != turno.id_turno
+            ])
+        return duplicados
+
+    def registrar_en_indice(self, turno: Turno) -> None:
+        """
+        Registra un turno creado o modificado en esta sesión como duplicado potencial.
+        
+        Siempre se agrega a los turnos guardados en la sesión, que se suman a los candidatos
+        de cualquier búsqueda (en el servidor o en el índice), y también al índice de
+        horarios si ya está construido.
+        """
+        if turno.id_turno is None:
+            return
+        firma = turno.firma_horario()
+        with TurnoDAO._lock_indice:
+            TurnoDAO._guardados_sesion.agregar(turno.id_turno, turno.nombre, firma)
+            if TurnoDAO._indice_horarios is not None:
+                TurnoDAO._indice_horarios.agregar(turno.id_turno, turno.nombre, firma)
+
+    def _agregar_guardados_sesion(self, candidatos: List[Tuple[int, str]],
+                                  firma: FirmaHorario) -> List[Tuple[int, str]]:
+        """Suma a los candidatos los turnos guardados en la sesión con la misma firma, ordenados por ID."""
+        guardados = TurnoDAO._guardados_sesion
+        ids_guardados = guardados.buscar(firma)
+        if not ids_guardados:
+            return candidatos
+        por_id = dict(candidatos)
+        for id_turno in ids_guardados:
+            por_id.setdefault(id_turno, guardados.nombre_de(id_turno))
+        return sorted(por_id.items())
+
+    @staticmethod
+    def _detalles_desde_firma(firma: FirmaHorario) -> List[dict]:
+        """Reconstruye los detalles para comparación (jornada, ingreso y salida) desde una firma."""
+        return [{
+            'jornada': jornada,
+            'hora_ingreso': time(minuto_ingreso // 60, minuto_ingreso % 60),
+            'hora_salida': time(minuto_salida // 60, minuto_salida % 60)
+        } for jornada, minuto_ingreso, minuto_salida in firma]
+
+    def _iterar_turnos_agrupados(self, filas: Iterable[tuple]) -> Iterator[Tuple[int, str, List[dict]]]:
+        """
+        Agrupa filas ordenadas por ID_TURNO a medida que llegan.
+        
+        A diferencia de _agrupar_resultados_turnos, no espera a tener todas las filas:
+        entrega cada turno en cuanto aparece la primera fila del siguiente.
+        
+        Args:
+            filas: Filas de la consulta de turnos con detalles, ordenadas por ID_TURNO
+            
+        Yields:
+            Tuplas (id_turno, nombre, detalles) con los detalles tal como vienen de la base de datos
+        """
+        id_actual = None
+        nombre_actual = None
+        detalles_actuales = []
+        total_turnos = 0
+        
+        for row in filas:
+            id_turno = row[0]
+            if id_turno != id_actual:
+                if id_actual is not None:
+                    total_turnos += 1
+                    yield id_actual, nombre_actual, detalles_actuales
+                id_actual = id_turno
+                nombre_actual = row[1]
+                detalles_actuales = []
+            
+            detalles_actuales.append({
+                'id_turno_detalle_diario': row[4],
+                'jornada': row[5],
+                'hora_ingreso': row[6],
+                'duracion': row[7]
+            })
+        
+        if id_actual is not None:
+            total_turnos += 1
+            yield id_actual, nombre_actual, detalles_actuales
+        
+        logger.debug("Se recorrieron %s turnos distintos", total_turnos)
+
     def _convertir_detalles_para_comparacion(self, detalles):
         """
         Convierte los detalles a un formato adecuado para la comparación.
@@ -283,148 +611,6 @@ class TurnoDAO:
         
         return detalles_convertidos
 
-    def _filtrar_turnos_similares(self, turno: Turno, turnos_para_comparar: List[Tuple[int, str, List[dict]]]) -> List[Tuple[int, str, List[dict]]]:
-        """
-        Filtra los turnos que son exactamente iguales al turno proporcionado.
-        Solo compara día, hora de entrada y hora de salida.
-        
-        Args:
-            turno: Turno a comparar
-            turnos_para_comparar: Lista de turnos candidatos
-            
-        Returns:
-            Lista de turnos exactamente iguales
-        """
-        print(f"DEBUG: Iniciando filtrado de turnos similares. Turno a comparar ID={turno.id_turno}")
-        print(f"DEBUG: Hay {len(turnos_para_comparar)} turnos candidatos para comparar")
-        
-        # Preparar los detalles del turno a comparar
-        detalles_turno = []
-        for detalle in turno.detalles:
-            # Calcular hora de salida si no está definida
-            hora_salida = None
-            if hasattr(detalle, 'hora_salida') and detalle.hora_salida:
-                hora_salida = detalle.hora_salida
-            else:
-                minutos_totales = detalle.hora_ingreso.hour * 60 + detalle.hora_ingreso.minute + detalle.duracion
-                horas_salida = minutos_totales // 60
-                minutos_salida = minutos_totales % 60
-                hora_salida = time(hour=horas_salida % 24, minute=minutos_salida)
-                
-            # Normalizar el nombre del día (convertir a mayúsculas)
-            jornada_normalizada = detalle.jornada.upper()
-            # Corregir "MIÉRCOLES" a "MIERCOLES" (sin tilde) para coincidir con la BD
-            if jornada_normalizada == "MIÉRCOLES":
-                jornada_normalizada = "MIERCOLES"
-                
-            detalles_turno.append({
-                'jornada': jornada_normalizada,
-                'hora_ingreso': detalle.hora_ingreso,
-                'hora_salida': hora_salida
-            })
-        
-        # Ordenar por jornada
-        dias_semana = {
-            "LUNES": 1, "MARTES": 2, "MIERCOLES": 3, 
-            "JUEVES": 4, "VIERNES": 5, "SABADO": 6, "DOMINGO": 7
-        }
-        detalles_turno = sorted(detalles_turno, key=lambda x: dias_semana.get(x['jornada'], 99))
-        
-        # Resultados para coincidencias exactas
-        coincidencias_exactas = []
-        
-        # Crear un conjunto con los días del turno a comparar
-        dias_turno = {detalle['jornada'] for detalle in detalles_turno}
-        print(f"DEBUG: Días del turno a comparar: {dias_turno}")
-        
-        # Verificar coincidencia exacta por ID primero
-        for id_turno, nombre, detalles in turnos_para_comparar:
-            if turno.id_turno is not None and id_turno == turno.id_turno:
-                print(f"DEBUG: Encontrado turno con el mismo ID={id_turno}")
-                coincidencias_exactas.insert(0, (id_turno, nombre, detalles))
-                # No salimos del bucle para seguir buscando otras coincidencias exactas
-        
-        # Luego buscar otras coincidencias exactas
-        for id_turno, nombre, detalles in turnos_para_comparar:
-            # Saltar si ya encontramos este turno por ID
-            if turno.id_turno is not None and id_turno == turno.id_turno:
-                continue
-                
-            print(f"DEBUG: Comparando con turno ID={id_turno}, Nombre={nombre}")
-            
-            # Normalizar los nombres de los días en el turno candidato
-            detalles_normalizados = []
-            for detalle in detalles:
-                jornada_normalizada = detalle['jornada'].upper()
-                if jornada_normalizada == "MIÉRCOLES":
-                    jornada_normalizada = "MIERCOLES"
-                
-                detalles_normalizados.append({
-                    'jornada': jornada_normalizada,
-                    'hora_ingreso': detalle['hora_ingreso'],
-                    'hora_salida': detalle['hora_salida']
-                })
-            
-            # Crear un conjunto con los días del turno candidato (normalizados)
-            dias_candidato = {detalle['jornada'] for detalle in detalles_normalizados}
-            
-            # Si los conjuntos de días son diferentes, no hay coincidencia
-            if dias_turno != dias_candidato:
-                print(f"DEBUG: Los días no coinciden, saltando turno ID={id_turno}")
-                continue
-            
-            print(f"DEBUG: Días coinciden: {dias_turno} == {dias_candidato}")
-            
-            # Verificar coincidencia exacta
-            es_coincidencia_exacta = True
-            
-            # Crear diccionarios para facilitar la comparación por día
-            detalles_turno_dict = {detalle['jornada']: detalle for detalle in detalles_turno}
-            detalles_candidato_dict = {detalle['jornada']: detalle for detalle in detalles_normalizados}
-            
-            # Comparar cada día
-            for dia in dias_turno:
-                detalle_original = detalles_turno_dict[dia]
-                detalle_comparar = detalles_candidato_dict[dia]
-                
-                # Convertimos a minutos para comparar hora de ingreso
-                minutos_ingreso_orig = detalle_original['hora_ingreso'].hour * 60 + detalle_original['hora_ingreso'].minute
-                minutos_ingreso_comp = detalle_comparar['hora_ingreso'].hour * 60 + detalle_comparar['hora_ingreso'].minute
-                
-                print(f"DEBUG: Comparando día {dia}:")
-                print(f"DEBUG:   Hora ingreso original: {detalle_original['hora_ingreso']} ({minutos_ingreso_orig} min)")
-                print(f"DEBUG:   Hora ingreso comparar: {detalle_comparar['hora_ingreso']} ({minutos_ingreso_comp} min)")
-                
-                # Para coincidencia exacta, las horas de ingreso deben ser idénticas
-                if minutos_ingreso_orig != minutos_ingreso_comp:
-                    print(f"DEBUG:   ❌ Las horas de ingreso no coinciden para el día {dia}")
-                    es_coincidencia_exacta = False
-                    break
-                else:
-                    print(f"DEBUG:   ✓ Horas de ingreso iguales")
-                
-                # Convertimos a minutos para comparar hora de salida
-                minutos_salida_orig = detalle_original['hora_salida'].hour * 60 + detalle_original['hora_salida'].minute
-                minutos_salida_comp = detalle_comparar['hora_salida'].hour * 60 + detalle_comparar['hora_salida'].minute
-                
-                print(f"DEBUG:   Hora salida original: {detalle_original['hora_salida']} ({minutos_salida_orig} min)")
-                print(f"DEBUG:   Hora salida comparar: {detalle_comparar['hora_salida']} ({minutos_salida_comp} min)")
-                
-                # Para coincidencia exacta, las horas de salida deben ser idénticas
-                if minutos_salida_orig != minutos_salida_comp:
-                    print(f"DEBUG:   ❌ Las horas de salida no coinciden para el día {dia}")
-                    es_coincidencia_exacta = False
-                    break
-                else:
-                    print(f"DEBUG:   ✓ Horas de salida iguales")
-            
-            if es_coincidencia_exacta:
-                print(f"DEBUG: ✅ Encontrada coincidencia exacta con ID={id_turno}")
-                coincidencias_exactas.append((id_turno, nombre, detalles))
-        
-        print(f"DEBUG: Filtrado completado. Se encontraron {len(coincidencias_exactas)} coincidencias exactas")
-        return coincidencias_exactas
-
     def asignar_ids(self, turno: Turno) -> None:
         """
         Asigna IDs al turno y sus detalles.
@@ -436,21 +622,10 @@ class TurnoDAO:
             ConsultaError: Si hay un error al obtener los IDs
         """
         try:
-            # Solo asignar un nuevo ID si el turno no tiene uno válido
-            if turno.id_turno <= 0:
-                nuevo_id_turno = self.obtener_ultimo_id_turno()
-                turno.id_turno = nuevo_id_turno
-            
-            # Obtener ID para el primer detalle
-            id_detalle = self.obtener_ultimo_id_detalle()
-            
-            # Asignar IDs a cada detalle
-            for detalle in turno.detalles:
-                detalle.id_turno_detalle_diario = id_detalle
-                detalle.id_turno = turno.id_turno
-                id_detalle += 1
-                    
-        except (ConexionError, ConsultaError) as e:
+            # Solo se asigna un nuevo ID al turno si no tiene uno válido; los detalles
+            # reciben IDs consecutivos del bloque reservado
+            self.id_allocator.asignar(turno)
+        except cx_Oracle.Error as e:
             raise ConsultaError(f"Error al asignar IDs: {str(e)}")
             
     def buscar_por_id(self, id_turno: int) -> Optional[Turno]:
@@ -483,31 +658,70 @@ class TurnoDAO:
             
             if not results:
                 return None
-                
-            # Crear turno
-            turno = Turno()
-            turno.id_turno = results[0][0]
-            turno.nombre = results[0][1]
-            turno.vigencia = results[0][2]
-            turno.frecuencia = results[0][3]
-            
-            # Agregar detalles
-            for row in results:
-                detalle = TurnoDetalleDiario(
-                    id_turno_detalle_diario=row[4],
-                    id_turno=turno.id_turno,
-                    jornada=row[5],
-                    hora_ingreso=time(row[6].hour, row[6].minute),
-                    duracion=row[7]
-                )
-                detalle.calcular_hora_salida()
-                turno.agregar_detalle(detalle)
-                
-            return turno
+            return self._construir_turnos(results)[0]
             
         except cx_Oracle.Error as e:
             raise ConsultaError(f"Error al buscar turno por ID: {str(e)}")
             
+    def buscar_por_ids(self, ids: Iterable[int]) -> Dict[int, Turno]:
+        """
+        Busca varios turnos, con sus detalles, en una consulta por cada bloque de
+        MAX_ELEMENTOS_IN IDs. Es la función de lote de CargadorPorLotes para las vistas
+        que cargan el detalle de un turno al seleccionarlo.
+        
+        Args:
+            ids: IDs de los turnos a buscar (los repetidos se consultan una vez)
+            
+        Returns:
+            Diccionario ID -> Turno; los IDs que no existen no aparecen
+            
+        Raises:
+            ConsultaError: Si hay un error al ejecutar la consulta
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return {}
+        
+        results = self._consultar_por_ids("""
+            SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA,
+                   tdd.ID_TURNO_DETALLE_DIARIO, tdd.JORNADA, 
+                   tdd.HORA_INGRESO, tdd.DURACION
+            FROM ASISTENCIAS.TURNO t
+            JOIN ASISTENCIAS.TURNO_DETALLE_DIARIO tdd ON t.ID_TURNO = tdd.ID_TURNO
+            WHERE t.ID_TURNO IN ({ids})
+            ORDER BY t.ID_TURNO, tdd.JORNADA
+        """, ids)
+        return {turno.id_turno: turno for turno in self._construir_turnos(results)}
+    
+    def _construir_turnos(self, results: List[tuple]) -> List[Turno]:
+        """
+        Arma los turnos a partir de filas (ID_TURNO, NOMBRE, VIGENCIA, FRECUENCIA,
+        ID_TURNO_DETALLE_DIARIO, JORNADA, HORA_INGRESO, DURACION) agrupadas por turno.
+        """
+        turnos = []
+        turno = None
+        for row in results:
+            if turno is None or turno.id_turno != row[0]:
+                # Crear turno
+                turno = Turno()
+                turno.id_turno = row[0]
+                turno.nombre = row[1]
+                turno.vigencia = row[2]
+                turno.frecuencia = row[3]
+                turnos.append(turno)
+            
+            # Agregar detalles
+            detalle = TurnoDetalleDiario(
+                id_turno_detalle_diario=row[4],
+                id_turno=turno.id_turno,
+                jornada=row[5],
+                hora_ingreso=time(row[6].hour, row[6].minute),
+                duracion=row[7]
+            )
+            detalle.calcular_hora_salida()
+            turno.agregar_detalle(detalle)
+        return turnos
+            
     def buscar_por_nombre(self, nombre: str) -> List[Turno]:
         """
         Busca turnos que contengan el texto en el nombre.
@@ -587,7 +801,7 @@ class TurnoDAO:
                 f.write(script)
             return True
         except Exception as e:
-            print(f"Error al guardar script: {str(e)}")
+            logger.error("Error al guardar script: %s", e)
             return False
             
     def actualizar_vigencia(self, id_turno: int, vigencia: int) -> bool:
@@ -611,10 +825,11 @@ class TurnoDAO:
             """
             
             self.db.execute_query(query, params={'vigencia': vigencia, 'id_turno': id_turno})
+            self.db.invalidate_cache(table="ASISTENCIAS.TURNO")
             return True
             
         except Exception as e:
-            print(f"Error al actualizar vigencia: {str(e)}")
+            logger.error("Error al actualizar vigencia: %s", e)
             return False
 
     def guardar_turno(self, turno: Turno) -> None:
@@ -626,7 +841,7 @@ class TurnoDAO:
             turno: El turno a guardar
         """
         try:
-            print(f"Guardando turno: ID={turno.id_turno}, Nombre={turno.nombre}")
+            logger.info("Guardando turno: ID=%s, Nombre=%s", turno.id_turno, turno.nombre)
             
             # Verificar que todos los detalles tengan IDs asignados
             for detalle in turno.detalles:
@@ -636,13 +851,17 @@ class TurnoDAO:
             
             # Generar script SQL para referencia
             script = self.generar_script_sql(turno)
-            print(f"Script SQL generado para el turno {turno.id_turno}:")
-            print(script)
+            
+            # Los turnos guardados en esta sesión también cuentan como duplicados potenciales
+            self.registrar_en_indice(turno)
+            # No se invalida la caché: el turno no se escribe en la base de datos, y releer
+            # el catálogo no lo mostraría
+            logger.debug("Script SQL generado para el turno %s:\n%s", turno.id_turno, script)
             
             # Aquí se podría guardar el script en un archivo si es necesario
             
         except Exception as e:
-            print(f"Error al guardar turno: {str(e)}")
+            logger.error("Error al guardar turno: %s", e)
             raise ConsultaError(f"Error al guardar turno: {str(e)}")
 
     def generar_script_sql(self, turno: Turno) -> str:
@@ -656,8 +875,6 @@ class TurnoDAO:
             str: El script SQL generado.
         """
         try:
-            script = []
-            
             # Verificar si el turno ya existe en la base de datos
             turno_existe = False
             if turno.id_turno > 0:
@@ -669,25 +886,6 @@ class TurnoDAO:
                 count = result[0][0] if result else 0
                 turno_existe = count > 0
             
-            # Generar script para el turno principal
-            if turno_existe:
-                # Script para actualizar un turno existente
-                script.append(f"-- Actualización del turno existente con ID {turno.id_turno}")
-                script.append(f"""
-UPDATE ASISTENCIAS.TURNO
-SET NOMBRE = '{turno.nombre}',
-    VIGENCIA = {turno.vigencia},
-    FRECUENCIA = '{turno.frecuencia}'
-WHERE ID_TURNO = {turno.id_turno};
-""")
-            else:
-                # Script para insertar un nuevo turno
-                script.append(f"-- Inserción de un nuevo turno con ID {turno.id_turno}")
-                script.append(f"""
-INSERT INTO ASISTENCIAS.TURNO (ID_TURNO, NOMBRE, VIGENCIA, FRECUENCIA)
-VALUES ({turno.id_turno}, '{turno.nombre}', {turno.vigencia}, '{turno.frecuencia}');
-""")
-            
             # Verificar si existen detalles para este turno
             detalles_existentes = {}
             if turno_existe:
@@ -699,27 +897,122 @@ VALUES ({turno.id_turno}, '{turno.nombre}', {turno.vigencia}, '{turno.frecuencia
                 result = self.db.execute_query(query, {"id_turno": turno.id_turno})
                 if result:
                     detalles_existentes = {row[0]: row[1] for row in result}
-                
-                if detalles_existentes:
-                    script.append(f"\n-- Eliminación de detalles existentes para el turno {turno.id_turno}")
-                    script.append(f"""
+            
+            return self._renderizar_script_turno(turno, turno_existe, detalles_existentes)
+        except Exception as e:
+            logger.exception("Error al generar script SQL: %s", e)
+            return f"-- Error al generar script SQL: {str(e)}"
+
+    def generar_script_sql_batch(self, turnos: List[Turno]) -> List[str]:
+        """
+        Genera los scripts SQL de varios turnos consultando la base de datos en bloque.
+        
+        Equivale a llamar a generar_script_sql para cada turno, pero la existencia de los
+        turnos se verifica con una sola consulta IN y los detalles existentes se leen con
+        otra, en lugar de dos consultas por turno.
+        
+        Args:
+            turnos: Turnos a insertar o actualizar
+            
+        Returns:
+            Lista con el script de cada turno, en el mismo orden
+            
+        Raises:
+            ConsultaError: Si no se pudo verificar qué turnos existen
+        """
+        ids = sorted({turno.id_turno for turno in turnos if turno.id_turno and turno.id_turno > 0})
+        
+        ids_existentes = {row[0] for row in self._consultar_por_ids("""
+            SELECT ID_TURNO FROM ASISTENCIAS.TURNO
+            WHERE ID_TURNO IN ({ids})
+        """, ids)}
+        
+        detalles_por_turno: Dict[int, Dict[int, str]] = {}
+        for id_turno, id_detalle, jornada in self._consultar_por_ids("""
+            SELECT ID_TURNO, ID_TURNO_DETALLE_DIARIO, JORNADA
+            FROM ASISTENCIAS.TURNO_DETALLE_DIARIO
+            WHERE ID_TURNO IN ({ids})
+        """, sorted(ids_existentes)):
+            detalles_por_turno.setdefault(id_turno, {})[id_detalle] = jornada
+        
+        logger.debug("%s de %s turnos ya existen en la base de datos", len(ids_existentes), len(turnos))
+        return [
+            self._renderizar_script_turno(
+                turno,
+                turno.id_turno in ids_existentes,
+                detalles_por_turno.get(turno.id_turno, {})
+            )
+            for turno in turnos
+        ]
+
+    def _consultar_por_ids(self, query: str, ids: List[int]) -> List[tuple]:
+        """
+        Ejecuta una consulta con una lista IN de IDs enlazados, dividida en bloques de
+        MAX_ELEMENTOS_IN elementos.
+        
+        Args:
+            query: Consulta con el marcador {ids} en el lugar de la lista IN
+            ids: IDs a consultar
+            
+        Returns:
+            Filas de todos los bloques
+            
+        Raises:
+            ConsultaError: Si alguna consulta falla
+        """
+        try:
+            return consultar_por_lista(self.db, query, ids, self.MAX_ELEMENTOS_IN)
+        except cx_Oracle.Error as e:
+            raise ConsultaError(f"No se pudo consultar la base de datos por lista de IDs: {str(e)}")
+
+    def _renderizar_script_turno(self, turno: Turno, turno_existe: bool, detalles_existentes: Dict[int, str]) -> str:
+        """
+        Arma el script SQL de un turno a partir de lo que ya existe en la base de datos.
+        
+        Args:
+            turno: El turno a insertar o actualizar
+            turno_existe: Si el turno ya existe (se genera UPDATE en lugar de INSERT)
+            detalles_existentes: Detalles actuales del turno en la base de datos (ID -> jornada)
+            
+        Returns:
+            str: El script SQL generado
+        """
+        script = []
+        
+        # Generar script para el turno principal
+        if turno_existe:
+            # Script para actualizar un turno existente
+            script.append(f"-- Actualización del turno existente con ID {turno.id_turno}")
+            script.append(f"""
+UPDATE ASISTENCIAS.TURNO
+SET NOMBRE = {literal_sql(turno.nombre)},
+    VIGENCIA = {turno.vigencia},
+    FRECUENCIA = {literal_sql(turno.frecuencia)}
+WHERE ID_TURNO = {turno.id_turno};
+""")
+        else:
+            # Script para insertar un nuevo turno
+            script.append(f"-- Inserción de un nuevo turno con ID {turno.id_turno}")
+            script.append(f"""
+INSERT INTO ASISTENCIAS.TURNO (ID_TURNO, NOMBRE, VIGENCIA, FRECUENCIA)
+VALUES ({turno.id_turno}, {literal_sql(turno.nombre)}, {turno.vigencia}, {literal_sql(turno.frecuencia)});
+""")
+        
+        if turno_existe and detalles_existentes:
+            script.append(f"\n-- Eliminación de detalles existentes para el turno {turno.id_turno}")
+            script.append(f"""
 DELETE FROM ASISTENCIAS.TURNO_DETALLE_DIARIO
 WHERE ID_TURNO = {turno.id_turno};
 """)
-            
-            # Generar script para los detalles del turno
-            if turno.detalles:
-                script.append(f"\n-- Inserción de detalles para el turno {turno.id_turno}")
-                for detalle in turno.detalles:
-                    hora_ingreso_str = detalle.hora_ingreso.strftime("%H:%M:%S")
-                    script.append(f"""
+        
+        # Generar script para los detalles del turno
+        if turno.detalles:
+            script.append(f"\n-- Inserción de detalles para el turno {turno.id_turno}")
+            for detalle in turno.detalles:
+                hora_ingreso_str = detalle.hora_ingreso.strftime("%H:%M:%S")
+                script.append(f"""
 INSERT INTO ASISTENCIAS.TURNO_DETALLE_DIARIO (ID_TURNO_DETALLE_DIARIO, ID_TURNO, JORNADA, HORA_INGRESO, DURACION)
-VALUES ({detalle.id_turno_detalle_diario}, {detalle.id_turno}, '{detalle.jornada}', TO_DATE('2025-01-01 {hora_ingreso_str}', 'YYYY-MM-DD HH24:MI:SS'), {detalle.duracion});
+VALUES ({detalle.id_turno_detalle_diario}, {detalle.id_turno}, {literal_sql(detalle.jornada)}, TO_DATE('2025-01-01 {hora_ingreso_str}', 'YYYY-MM-DD HH24:MI:SS'), {detalle.duracion});
 """)
-            
-            return "\n".join(script)
-        except Exception as e:
-            print(f"Error al generar script SQL: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return f"-- Error al generar script SQL: {str(e)}" 
\ No newline at end of file
+        
+        return "\n".join(script)
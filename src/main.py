@@ -1,5 +1,7 @@
 import sys
 import os
+import logging
+import time
 
 # Añadir el directorio raíz al path para que las importaciones funcionen correctamente
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,47 +11,64 @@ from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt, QTimer
 
 from ui.main_window import MainWindow
-from database.oracle_connection import OracleConnection
+from src.database.oracle_connection import OracleConnection
+
+logger = logging.getLogger(__name__)
+
+def configurar_logging():
+    """
+    Configura el registro de mensajes de la aplicación.
+    
+    El nivel se toma de la variable de entorno GESTION_TURNOS_LOG (DEBUG, INFO, WARNING...).
+    Por defecto es INFO: los mensajes de depuración de los módulos database y ui no se
+    formatean ni se escriben.
+    """
+    nivel = os.environ.get("GESTION_TURNOS_LOG", "INFO").upper()
+    logging.basicConfig(
+        level=getattr(logging, nivel, logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
 
 def main():
     """Función principal que inicia la aplicación."""
-    print("\n==== INICIANDO APLICACIÓN DE GESTIÓN DE TURNOS v1.2 ====")
-    print("Características principales:")
-    print("- Creación y edición de turnos")
-    print("- Búsqueda optimizada de turnos en base de datos")
-    print("- Detección y gestión de turnos duplicados")
-    print("- Generación de scripts SQL")
+    inicio_arranque = time.perf_counter()
+    configurar_logging()
+    logger.info("==== INICIANDO APLICACIÓN DE GESTIÓN DE TURNOS v1.2 ====")
     
     app = QApplication(sys.argv)
     
-    # Establecer conexión a la base de datos
+    # Configurar el origen de datos; la conexión se establece después de mostrar la ventana
     try:
         conn = OracleConnection()  # Usar el constructor directamente, ya que implementa singleton internamente
-        conn.connect()  # Llamar al método connect explícitamente
-        if conn.is_connected():
-            print("Conexión establecida exitosamente")
+        directorio_local = os.environ.get("GESTION_TURNOS_SQLITE")
+        if directorio_local:
+            # Trabajo sin conexión: base SQLite generada con `python -m database.sqlite_backend`
+            from src.database.sqlite_backend import SQLiteBackend
+            conn.usar_backend(SQLiteBackend(directorio_local))
         else:
-            print("No se pudo establecer la conexión")
-            QMessageBox.critical(
-                None, 
-                "Error de Conexión", 
-                "No se pudo establecer la conexión con la base de datos.\nLa aplicación se cerrará."
-            )
-            return 1
+            # Usar un pool de sesiones para que los módulos puedan consultar en paralelo
+            conn.enable_pool(min_sessions=1, max_sessions=4, increment=1)
     except Exception as e:
-        print(f"Error al conectar: {str(e)}")
+        logger.error("Error al configurar la conexión: %s", e)
         QMessageBox.critical(
             None, 
             "Error de Conexión", 
-            f"Error al conectar con la base de datos: {str(e)}\nLa aplicación se cerrará."
+            f"Error al configurar la conexión con la base de datos: {str(e)}\nLa aplicación se cerrará."
         )
         return 1
     
+    # Conectar (y precargar las consultas comunes) en segundo plano: la ventana se muestra
+    # sin esperar el handshake y las primeras consultas de los módulos quedan en cola hasta
+    # que la conexión esté lista. La barra de estado muestra el estado y permite reintentar.
+    conn.conectar_en_segundo_plano()
+    
     # Crear y mostrar la ventana principal
-    main_window = MainWindow()
+    # GESTION_TURNOS_CARGA_INMEDIATA=1 construye todos los módulos al inicio (sin carga diferida)
+    carga_inmediata = os.environ.get("GESTION_TURNOS_CARGA_INMEDIATA", "") not in ("", "0")
+    main_window = MainWindow(carga_diferida=not carga_inmediata, inicio_arranque=inicio_arranque)
     main_window.show()
     
-    print("Aplicación iniciada correctamente. Interfaz de usuario cargada.")
+    logger.info("Aplicación iniciada correctamente. Interfaz de usuario cargada.")
     
     # Ejecutar el bucle principal de la aplicación
     ret = app.exec()
@@ -57,8 +76,7 @@ def main():
     # Cerrar la conexión de la base de datos al finalizar
     conn.close()
     
-    print("\n==== APLICACIÓN FINALIZADA ====")
-    print(f"Código de salida: {ret}")
+    logger.info("==== APLICACIÓN FINALIZADA (código de salida: %s) ====", ret)
     
     return ret
 
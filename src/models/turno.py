@@ -1,25 +1,295 @@
-from typing import List, Optional
+import logging
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 from datetime import datetime, time
-from dataclasses import dataclass
+import unicodedata
+import numpy as np
 
-@dataclass
-class TurnoDetalleDiario:
-    id_turno_detalle_diario: int
-    id_turno: int
-    jornada: str
-    hora_ingreso: time
-    duracion: int
-    hora_salida: Optional[time] = None
+logger = logging.getLogger(__name__)
+
+# Días de la semana normalizados (mayúsculas, sin tildes) en orden
+DIAS_SEMANA = ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES", "SABADO", "DOMINGO")
+ORDEN_DIAS = {dia: indice for indice, dia in enumerate(DIAS_SEMANA)}
+
+MINUTOS_POR_DIA = 24 * 60
+
+# Horas del día por minuto: los detalles comparten estos objetos en lugar de crear uno por fila
+_HORAS_POR_MINUTO = tuple(time(minuto // 60, minuto % 60) for minuto in range(MINUTOS_POR_DIA))
+# Enteros 0..1440 compartidos: fuera del rango -5..256 Python crea un objeto por valor leído
+_ENTEROS_MINUTOS = tuple(range(MINUTOS_POR_DIA + 1))
+
+# Firma de un horario semanal: tupla de (jornada normalizada, minuto de ingreso, minuto de salida)
+FirmaHorario = Tuple[Tuple[str, int, int], ...]
+
+
+@lru_cache(maxsize=64)
+def normalizar_jornada(jornada: str) -> str:
+    """
+    Normaliza el nombre de un día: mayúsculas, sin tildes ni espacios sobrantes.
+    
+    Ejemplo: "Miércoles" -> "MIERCOLES"
+    """
+    descompuesto = unicodedata.normalize("NFKD", jornada.strip().upper())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def calcular_firma_horario(detalles: Iterable[Tuple[str, time, int]]) -> FirmaHorario:
+    """
+    Calcula la firma canónica de un horario semanal.
+    
+    Dos turnos tienen la misma firma si y solo si trabajan los mismos días con las mismas
+    horas de ingreso y salida (la salida se toma módulo 24 horas, como en la comparación
+    de duplicados). La firma es hashable, por lo que sirve como clave de un índice.
+    
+    Args:
+        detalles: Tuplas (jornada, hora_ingreso, duracion en minutos); hora_ingreso puede
+            ser time o datetime
+            
+    Returns:
+        Tupla ordenada por día, ingreso y salida de (jornada normalizada, minuto de ingreso,
+        minuto de salida); un turno partido aporta varios tramos al mismo día
+    """
+    firma = []
+    for jornada, hora_ingreso, duracion in detalles:
+        minuto_ingreso = hora_ingreso.hour * 60 + hora_ingreso.minute
+        minuto_salida = (minuto_ingreso + (duracion or 0)) % MINUTOS_POR_DIA
+        firma.append((normalizar_jornada(jornada), minuto_ingreso, minuto_salida))
+    firma.sort(key=lambda d: (ORDEN_DIAS.get(d[0], len(DIAS_SEMANA)), d[0], d[1], d[2]))
+    return tuple(firma)
 
+def firma_a_texto(firma: FirmaHorario) -> str:
+    """
+    Representa una firma como texto, en el mismo formato que la consulta de firmas de TurnoDAO.
+
+    Ejemplo: (("LUNES", 480, 960),) -> "LUNES:480:960"
+    """
+    return ",".join(f"{jornada}:{minuto_ingreso}:{minuto_salida}" for jornada, minuto_ingreso, minuto_salida in firma)
+
+
+# Valor de los arreglos de la codificación semanal para los días sin trabajo
+SIN_TRABAJO = -1
+# Bits de cada minuto en la clave entera: ingreso < 1440 (11 bits), fin < 2880 (12 bits)
+_BITS_INGRESO = 11
+_BITS_FIN = 12
+
+
+class CodificacionSemanal:
+    """
+    Horario semanal de forma fija: máscara de 7 bits de los días trabajados (bit 0 = lunes)
+    y dos arreglos de 7 minutos, ingreso y fin, con SIN_TRABAJO en los días libres.
+    
+    El fin es ingreso + duración, sin tomar módulo 24 horas, para que un turno nocturno
+    siga siendo un intervalo. Igualdad, contención y distancia entre horarios se resuelven
+    con operaciones sobre los arreglos, y clave() empaqueta todo en un solo entero.
+    """
+    
+    __slots__ = ("mascara", "ingresos", "fines")
+    
+    def __init__(self, mascara: int, ingresos: np.ndarray, fines: np.ndarray):
+        self.mascara = mascara
+        self.ingresos = ingresos
+        self.fines = fines
+    
+    @classmethod
+    def desde_detalles(cls, detalles: Iterable[Tuple[str, time, int]]) -> Optional['CodificacionSemanal']:
+        """
+        Codifica un horario a partir de tuplas (jornada, hora_ingreso, duracion).
+        
+        Returns:
+            La codificación, o None si algún día no se reconoce o tiene más de un tramo
+            (los turnos partidos no caben en la forma fija; se comparan por su firma)
+        """
+        ingresos = np.full(len(DIAS_SEMANA), SIN_TRABAJO, dtype=np.int16)
+        fines = np.full(len(DIAS_SEMANA), SIN_TRABAJO, dtype=np.int16)
+        mascara = 0
+        for jornada, hora_ingreso, duracion in detalles:
+            dia = ORDEN_DIAS.get(normalizar_jornada(jornada))
+            if dia is None or mascara & (1 << dia):
+                return None
+            mascara |= 1 << dia
+            ingresos[dia] = hora_ingreso.hour * 60 + hora_ingreso.minute
+            fines[dia] = ingresos[dia] + (duracion or 0)
+        return cls(mascara, ingresos, fines)
+    
+    def dias(self) -> np.ndarray:
+        """Arreglo booleano de los 7 días, True en los trabajados."""
+        return self.ingresos != SIN_TRABAJO
+    
+    def clave(self) -> int:
+        """
+        Empaqueta la codificación en un entero: la máscara en los 7 bits bajos y, por cada
+        día, el ingreso y el fin (0 en los días libres). Dos horarios son iguales si y solo
+        si sus claves lo son.
+        """
+        clave = 0
+        for ingreso, fin in zip(self.ingresos.tolist()[::-1], self.fines.tolist()[::-1]):
+            clave = (clave << (_BITS_INGRESO + _BITS_FIN)) | (max(ingreso, 0) << _BITS_FIN) | max(fin, 0)
+        return (clave << len(DIAS_SEMANA)) | self.mascara
+    
+    @classmethod
+    def desde_clave(cls, clave: int) -> 'CodificacionSemanal':
+        """Reconstruye la codificación empaquetada con clave()."""
+        mascara = clave & ((1 << len(DIAS_SEMANA)) - 1)
+        clave >>= len(DIAS_SEMANA)
+        ingresos = np.full(len(DIAS_SEMANA), SIN_TRABAJO, dtype=np.int16)
+        fines = np.full(len(DIAS_SEMANA), SIN_TRABAJO, dtype=np.int16)
+        for dia in range(len(DIAS_SEMANA)):
+            if mascara & (1 << dia):
+                ingresos[dia] = (clave >> _BITS_FIN) & ((1 << _BITS_INGRESO) - 1)
+                fines[dia] = clave & ((1 << _BITS_FIN) - 1)
+            clave >>= _BITS_INGRESO + _BITS_FIN
+        return cls(mascara, ingresos, fines)
+    
+    def contiene(self, otra: 'CodificacionSemanal') -> bool:
+        """Indica si cada día trabajado de otra cae dentro del mismo día de este horario."""
+        if otra.mascara & ~self.mascara:
+            return False
+        dias = otra.dias()
+        return bool(
+            np.all(self.ingresos[dias] <= otra.ingresos[dias]) and np.all(otra.fines[dias] <= self.fines[dias])
+        )
+    
+    def distancia(self, otra: 'CodificacionSemanal') -> int:
+        """
+        Minutos de diferencia entre dos horarios: en los días que ambos trabajan, la suma
+        de las diferencias de ingreso y de fin; en los que trabaja solo uno, la duración
+        de ese día. Es 0 si y solo si los horarios son iguales.
+        """
+        propios, ajenos = self.dias(), otra.dias()
+        ambos = propios & ajenos
+        diferencia = np.abs(self.ingresos[ambos] - otra.ingresos[ambos]).sum()
+        diferencia += np.abs(self.fines[ambos] - otra.fines[ambos]).sum()
+        solo_propios = propios & ~ajenos
+        solo_ajenos = ajenos & ~propios
+        diferencia += (self.fines[solo_propios] - self.ingresos[solo_propios]).sum()
+        diferencia += (otra.fines[solo_ajenos] - otra.ingresos[solo_ajenos]).sum()
+        return int(diferencia)
+    
+    def __eq__(self, otra) -> bool:
+        if not isinstance(otra, CodificacionSemanal):
+            return NotImplemented
+        return (
+            self.mascara == otra.mascara
+            and np.array_equal(self.ingresos, otra.ingresos)
+            and np.array_equal(self.fines, otra.fines)
+        )
+    
+    def __hash__(self) -> int:
+        return hash(self.clave())
+    
+    def __repr__(self) -> str:
+        return (
+            f"CodificacionSemanal(mascara={self.mascara:07b}, "
+            f"ingresos={self.ingresos.tolist()}, fines={self.fines.tolist()})"
+        )
+
+
+def _minuto_compartido(valor: Optional[int]) -> Optional[int]:
+    """Devuelve el entero compartido de un minuto o duración, si está en el rango de un día."""
+    if valor is not None and 0 <= valor <= MINUTOS_POR_DIA:
+        return _ENTEROS_MINUTOS[valor]
+    return valor
+
+
+class TurnoDetalleDiario:
+    """
+    Horario de un día de un turno.
+    
+    Los catálogos en caché tienen decenas de miles de detalles, por lo que la clase usa
+    __slots__ y guarda la hora de ingreso como minuto del día (entero compartido). La
+    jornada se interna: todos los detalles del mismo día apuntan a un único texto. Las
+    horas de ingreso y salida se entregan como datetime.time y la salida se calcula al
+    consultarla a partir del ingreso y la duración.
+    """
+    
+    __slots__ = ("id_turno_detalle_diario", "id_turno", "_jornada", "minuto_ingreso", "duracion")
+    
+    def __init__(self, id_turno_detalle_diario: int, id_turno: int, jornada: str, hora_ingreso: time,
+                 duracion: int, hora_salida: Optional[time] = None):
+        self.id_turno_detalle_diario = id_turno_detalle_diario
+        self.id_turno = id_turno
+        self.jornada = jornada
+        self.hora_ingreso = hora_ingreso
+        self.duracion = _minuto_compartido(duracion)
+        if hora_salida is not None:
+            self.hora_salida = hora_salida
+    
+    @property
+    def jornada(self) -> str:
+        """Nombre del día tal como se leyó o ingresó (por ejemplo, "Lunes" o "MIÉRCOLES")."""
+        return self._jornada
+    
+    @jornada.setter
+    def jornada(self, valor: str) -> None:
+        # Solo se internan textos str exactos (sys.intern no admite subclases)
+        self._jornada = sys.intern(valor) if type(valor) is str else valor
+    
+    @property
+    def indice_dia(self) -> int:
+        """Posición del día en DIAS_SEMANA (0 = lunes), o len(DIAS_SEMANA) si no se reconoce."""
+        if not self._jornada:
+            return len(DIAS_SEMANA)
+        return ORDEN_DIAS.get(normalizar_jornada(self._jornada), len(DIAS_SEMANA))
+    
+    @property
+    def hora_ingreso(self) -> Optional[time]:
+        """Hora de ingreso; se asigna con un time o un datetime (se conservan hora y minuto)."""
+        if self.minuto_ingreso is None:
+            return None
+        return _HORAS_POR_MINUTO[self.minuto_ingreso]
+    
+    @hora_ingreso.setter
+    def hora_ingreso(self, valor) -> None:
+        self.minuto_ingreso = None if valor is None else _ENTEROS_MINUTOS[valor.hour * 60 + valor.minute]
+    
+    @property
+    def minuto_salida(self) -> Optional[int]:
+        """Minuto del día de la salida (la salida se toma módulo 24 horas)."""
+        if self.minuto_ingreso is None or not self.duracion:
+            return None
+        return (self.minuto_ingreso + self.duracion) % MINUTOS_POR_DIA
+    
+    @property
+    def hora_salida(self) -> Optional[time]:
+        """Hora de salida calculada desde el ingreso y la duración; None si falta alguno."""
+        minuto = self.minuto_salida
+        return None if minuto is None else _HORAS_POR_MINUTO[minuto]
+    
+    @hora_salida.setter
+    def hora_salida(self, valor: Optional[time]) -> None:
+        # La salida no se almacena: asignar una distinta de la calculada ajusta la duración
+        if valor is None or self.minuto_ingreso is None or valor == self.hora_salida:
+            return
+        minuto_salida = valor.hour * 60 + valor.minute
+        self.duracion = _minuto_compartido((minuto_salida - self.minuto_ingreso) % MINUTOS_POR_DIA)
+    
     def calcular_hora_salida(self) -> None:
-        """Calcula la hora de salida basada en la hora de ingreso y la duración en minutos."""
-        if self.hora_ingreso and self.duracion:
-            minutos_totales = self.hora_ingreso.hour * 60 + self.hora_ingreso.minute + self.duracion
-            horas = minutos_totales // 60
-            minutos = minutos_totales % 60
-            self.hora_salida = time(hour=horas % 24, minute=minutos)
+        """
+        Se conserva por compatibilidad: la hora de salida se calcula al consultarla, a
+        partir de la hora de ingreso y la duración en minutos.
+        """
+    
+    def __eq__(self, otro) -> bool:
+        if otro.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.id_turno_detalle_diario, self.id_turno, self._jornada, self.minuto_ingreso, self.duracion)
+            == (otro.id_turno_detalle_diario, otro.id_turno, otro._jornada, otro.minuto_ingreso, otro.duracion)
+        )
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"TurnoDetalleDiario(id_turno_detalle_diario={self.id_turno_detalle_diario!r}, "
+            f"id_turno={self.id_turno!r}, jornada={self._jornada!r}, hora_ingreso={self.hora_ingreso!r}, "
+            f"duracion={self.duracion!r}, hora_salida={self.hora_salida!r})"
+        )
 
 class Turno:
+    __slots__ = ("id_turno", "nombre", "vigencia", "frecuencia", "detalles", "_total_horas_semanales")
+    
     def __init__(self):
         self.id_turno: Optional[int] = None
         self.nombre: str = ""
@@ -48,15 +318,31 @@ class Turno:
         
         self.detalles.append(detalle)
         self._actualizar_total_horas()
-        self._actualizar_nombre()
+        self.actualizar_nombre()
         return True
 
+    def firma_horario(self) -> FirmaHorario:
+        """Devuelve la firma canónica del horario semanal (ver calcular_firma_horario)."""
+        return calcular_firma_horario((d.jornada, d.hora_ingreso, d.duracion) for d in self.detalles)
+
+    def codificacion_semanal(self) -> Optional[CodificacionSemanal]:
+        """
+        Devuelve el horario con forma fija de 7 días (ver CodificacionSemanal), o None si
+        el turno es partido o tiene un día no reconocido.
+        """
+        return CodificacionSemanal.desde_detalles((d.jornada, d.hora_ingreso, d.duracion) for d in self.detalles)
+
     def _actualizar_total_horas(self) -> None:
         """Actualiza el total de horas semanales basado en los detalles."""
         self._total_horas_semanales = sum(d.duracion for d in self.detalles) / 60
 
-    def _actualizar_nombre(self) -> None:
-        """Actualiza el nombre del turno basado en el ID y los días de la jornada."""
+    def actualizar_nombre(self) -> None:
+        """
+        Actualiza el nombre del turno basado en el ID y los días de la jornada.
+        
+        Se llama al agregar cada detalle; si el ID se asigna después (como en la carga
+        masiva, que reserva los IDs por lotes), hay que volver a llamarlo.
+        """
         if not self.detalles:
             return
 
@@ -83,7 +369,7 @@ class Turno:
                 detalles_ordenados.append((detalle, dias_semana[jornada_normalizada]))
             else:
                 # Si aún no está en el diccionario, usar el valor original
-                print(f"ADVERTENCIA: Día no reconocido: {detalle.jornada}")
+                logger.warning("Día no reconocido: %s", detalle.jornada)
                 detalles_ordenados.append((detalle, 99))  # Valor alto para ponerlo al final
         
         # Ordenar por el valor numérico del día
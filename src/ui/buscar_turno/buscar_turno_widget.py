@@ -1,6 +1,7 @@
+import logging
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
     QGroupBox, QMessageBox, QFileDialog, QSplitter, QProgressBar
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
@@ -9,23 +10,51 @@ from datetime import datetime, time
 
 from src.models.turno import Turno, TurnoDetalleDiario
 from src.database.turno_dao import TurnoDAO, TurnoDAOError
+from src.database.cargador_lotes import CargadorPorLotes
+from src.ui.filas_table_model import FilasTableModel, Columna, ALINEACION_CENTRO
+from src.utils.indice_trigramas import IndiceTrigramas
 from .editar_turno_dialog import EditarTurnoDialog
 
+logger = logging.getLogger(__name__)
+
 class BuscarTurnoWidget(QWidget):
     """Widget para buscar y editar turnos."""
     
     # Señal para comunicarse con el módulo de edición
     turno_seleccionado = pyqtSignal(Turno)
     
+    # Espera tras la última tecla antes de filtrar el catálogo (ms)
+    RETARDO_BUSQUEDA_MS = 250
+    
     def __init__(self):
         super().__init__()
         self.turno_dao = TurnoDAO()
         self.turnos_encontrados = []
         self.turno_seleccionado_actual = None
         self.esta_cargando = False
+        # La tabla de turnos cambió mientras se cargaba el catálogo: se vuelve a cargar al terminar
+        self._recarga_pendiente = False
+        # Los detalles pedidos en un mismo ciclo se consultan juntos, una vez por turno
+        self._cargador_turnos = CargadorPorLotes(self.turno_dao.db, self.turno_dao.buscar_por_ids)
+        
+        # Catálogo completo en memoria; las búsquedas se resuelven aquí sin consultar Oracle
+        self.catalogo_turnos = None
+        self._turnos_por_id = {}
+        self.indice_nombres = IndiceTrigramas()
         
         self.setup_ui()
         
+        self._temporizador_busqueda = QTimer(self)
+        self._temporizador_busqueda.setSingleShot(True)
+        self._temporizador_busqueda.setInterval(self.RETARDO_BUSQUEDA_MS)
+        self._temporizador_busqueda.timeout.connect(self.filtrar_catalogo)
+        self.search_input.textChanged.connect(self._temporizador_busqueda.start)
+        
+        # El catálogo se vuelve a mostrar cuando la caché se revalida o se invalida la tabla TURNO
+        senales_cache = self.turno_dao.db.senales_cache()
+        senales_cache.revalidada.connect(self._al_revalidar_cache)
+        senales_cache.invalidada.connect(self._al_invalidar_cache)
+        
         # Cargar todos los turnos al iniciar, con un pequeño retraso para permitir que la interfaz se muestre
         QTimer.singleShot(100, self.cargar_todos_turnos)
         
@@ -46,14 +75,15 @@ class BuscarTurnoWidget(QWidget):
         # Barra de progreso de carga
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(False)
-        self.progress_bar.setMaximum(0)  # Modo indeterminado
+        self.progress_bar.setMaximum(0)  # Modo indeterminado mientras la consulta está en curso
         self.progress_bar.setStyleSheet("""
             QProgressBar {
                 border: 1px solid #3c3c3c;
                 border-radius: 4px;
                 background-color: #252526;
-                height: 5px;
+                height: 14px;
                 text-align: center;
+                color: white;
             }
             QProgressBar::chunk {
                 background-color: #007acc;
@@ -136,17 +166,25 @@ class BuscarTurnoWidget(QWidget):
         """)
         results_layout = QVBoxLayout(results_group)
         
-        self.results_table = QTableWidget(0, 5)  # Columnas: ID, Nombre, Estado, Detalle, Acciones
-        self.results_table.setHorizontalHeaderLabels(["ID", "Nombre", "Estado", "Total Horas", "Acciones"])
+        # Las filas son los objetos Turno encontrados; el texto se calcula al dibujar cada celda
+        self.modelo_resultados = FilasTableModel([
+            Columna("ID", lambda turno: str(turno.id_turno), ALINEACION_CENTRO),
+            Columna("Nombre", lambda turno: turno.nombre),
+            Columna("Estado", lambda turno: "Activo" if turno.vigencia == 1 else "Inactivo", ALINEACION_CENTRO),
+            Columna("Total Horas", lambda turno: f"{sum(d.duracion for d in turno.detalles) / 60:.1f}",
+                    ALINEACION_CENTRO),
+        ], parent=self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.modelo_resultados)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        self.results_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.results_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.results_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #252526;
                 alternate-background-color: #2d2d2d;
                 color: white;
@@ -160,11 +198,13 @@ class BuscarTurnoWidget(QWidget):
                 padding: 5px;
                 border: 1px solid #3c3c3c;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #264f78;
             }
         """)
-        self.results_table.itemSelectionChanged.connect(self.mostrar_detalle_turno)
+        self.results_table.selectionModel().selectionChanged.connect(self.mostrar_detalle_turno)
+        # Doble clic en una fila abre el editor (reemplaza los botones por fila de la columna Acciones)
+        self.results_table.doubleClicked.connect(lambda _: self.editar_turno())
         
         results_layout.addWidget(self.results_table)
         splitter.addWidget(results_group)
@@ -233,10 +273,17 @@ class BuscarTurnoWidget(QWidget):
         
         main_layout.addLayout(action_layout)
     
-    def mostrar_cargando(self, mostrar=True):
-        """Muestra u oculta la barra de progreso durante la carga de datos."""
+    def mostrar_cargando(self, mostrar=True, mensaje="Consultando base de datos..."):
+        """
+        Muestra u oculta la barra de progreso durante la carga de datos.
+        
+        La barra se muestra antes de lanzar la consulta en segundo plano, de modo que
+        sigue animándose mientras la base de datos responde.
+        """
         self.esta_cargando = mostrar
         if mostrar:
+            self.progress_bar.setFormat(mensaje)
+            self.progress_bar.setTextVisible(True)
             self.progress_bar.show()
             self.search_button.setEnabled(False)
             self.clear_button.setEnabled(False)
@@ -247,11 +294,19 @@ class BuscarTurnoWidget(QWidget):
     
     def buscar_turnos(self):
         """Busca turnos según el criterio ingresado."""
+        self._temporizador_busqueda.stop()
         criterio = self.search_input.text().strip()
         if not criterio:
             QMessageBox.warning(self, "Búsqueda vacía", "Por favor ingrese un criterio de búsqueda.")
             return
         
+        if self.catalogo_turnos is not None:
+            self.turnos_encontrados = self.buscar_en_catalogo(criterio)
+            # Un ID ausente puede corresponder a un turno creado después de cargar el catálogo
+            if self.turnos_encontrados or not criterio.isdigit():
+                self.mostrar_resultados()
+                return
+        
         self.mostrar_cargando(True)
         try:
             # Realizar búsqueda en base de datos
@@ -262,6 +317,25 @@ class BuscarTurnoWidget(QWidget):
         finally:
             self.mostrar_cargando(False)
     
+    def filtrar_catalogo(self):
+        """
+        Filtra el catálogo en memoria con el texto actual del campo de búsqueda.
+        
+        Se llama tras una pausa en la escritura; con el campo vacío se muestra el catálogo completo.
+        """
+        if self.catalogo_turnos is None:
+            return
+        criterio = self.search_input.text().strip()
+        self.turnos_encontrados = self.buscar_en_catalogo(criterio) if criterio else list(self.catalogo_turnos)
+        self.mostrar_resultados(avisar_sin_resultados=False)
+    
+    def buscar_en_catalogo(self, criterio):
+        """Busca turnos en el catálogo cargado: por ID si el criterio es numérico y si no por nombre."""
+        if criterio.isdigit():
+            turno = self._turnos_por_id.get(int(criterio))
+            return [turno] if turno else []
+        return self.indice_nombres.buscar(criterio)
+    
     def buscar_en_bd(self, criterio):
         """Busca turnos en la base de datos según el criterio."""
         try:
@@ -272,7 +346,7 @@ class BuscarTurnoWidget(QWidget):
                 # Buscar por nombre (contiene el texto)
                 return self.buscar_por_nombre(criterio)
         except Exception as e:
-            print(f"Error al buscar en BD: {str(e)}")
+            logger.error("Error al buscar en BD: %s", e)
             QMessageBox.warning(
                 self, 
                 "Error de búsqueda", 
@@ -292,7 +366,7 @@ class BuscarTurnoWidget(QWidget):
             results = self.turno_dao.db.execute_query(query, {"id_turno": id_turno})
             return self._procesar_resultados_turnos(results)
         except Exception as e:
-            print(f"Error al buscar por ID: {str(e)}")
+            logger.error("Error al buscar por ID: %s", e)
             raise TurnoDAOError(f"No se pudo buscar por ID: {str(e)}")
     
     def buscar_por_nombre(self, nombre):
@@ -308,31 +382,77 @@ class BuscarTurnoWidget(QWidget):
             results = self.turno_dao.db.execute_query(query, {"nombre": nombre})
             return self._procesar_resultados_turnos(results)
         except Exception as e:
-            print(f"Error al buscar por nombre: {str(e)}")
+            logger.error("Error al buscar por nombre: %s", e)
             raise TurnoDAOError(f"No se pudo buscar por nombre: {str(e)}")
     
-    def cargar_todos_turnos(self):
-        """Carga todos los turnos de la base de datos."""
-        self.mostrar_cargando(True)
-        try:
-            query = """
-            SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA
-            FROM ASISTENCIAS.TURNO t
-            ORDER BY t.ID_TURNO DESC
-            """
-            results = self.turno_dao.db.execute_query(query)
-            self.turnos_encontrados = self._procesar_resultados_turnos(results)
+    def cargar_todos_turnos(self, refrescar=False):
+        """
+        Carga todos los turnos de la base de datos en segundo plano.
+        
+        Args:
+            refrescar: Si es True, descarta el catálogo en caché y lo vuelve a leer de Oracle
+        """
+        if self.esta_cargando:
+            return
+        
+        self._recarga_pendiente = False
+        if refrescar:
+            self.turno_dao.db.invalidate_cache(cache_key="catalogo_turnos")
+        self.mostrar_cargando(True, "Cargando catálogo de turnos...")
+        query = """
+        SELECT t.ID_TURNO, t.NOMBRE, t.VIGENCIA, t.FRECUENCIA
+        FROM ASISTENCIAS.TURNO t
+        ORDER BY t.ID_TURNO DESC
+        """
+        self.turno_dao.db.execute_query_async(
+            query,
+            on_result=self._al_cargar_todos_turnos,
+            on_error=self._al_fallar_carga_turnos,
+            cache_key="catalogo_turnos",
+            persist=True
+        )
+    
+    def _al_cargar_todos_turnos(self, results):
+        """Recibe el catálogo de turnos cargado en segundo plano, lo indexa y lo muestra."""
+        self.mostrar_cargando(False)
+        self.catalogo_turnos = self._procesar_resultados_turnos(results)
+        self._turnos_por_id = {turno.id_turno: turno for turno in self.catalogo_turnos}
+        self.indice_nombres.construir((turno, turno.nombre) for turno in self.catalogo_turnos)
+        
+        if self.search_input.text().strip():
+            self.filtrar_catalogo()
+        else:
+            self.turnos_encontrados = list(self.catalogo_turnos)
             self.mostrar_resultados()
-        except Exception as e:
-            print(f"Error al cargar todos los turnos: {str(e)}")
-            QMessageBox.warning(
-                self, 
-                "Error", 
-                f"No se pudieron cargar los turnos: {str(e)}"
-            )
-            self.turnos_encontrados = []
-        finally:
-            self.mostrar_cargando(False)
+        
+        if self._recarga_pendiente:
+            # El catálogo recibido puede no incluir el cambio que llegó durante la carga
+            self.cargar_todos_turnos()
+    
+    def _al_revalidar_cache(self, cache_key, resultados):
+        """Muestra el catálogo fresco cuando se revalida el que se cargó desde el disco."""
+        if cache_key == "catalogo_turnos" and self.catalogo_turnos is not None:
+            self._al_cargar_todos_turnos(resultados)
+    
+    def _al_invalidar_cache(self, tabla):
+        """Vuelve a cargar el catálogo cuando cambia la tabla de turnos."""
+        if tabla == "ASISTENCIAS.TURNO":
+            self._cargador_turnos.limpiar()
+            if self.esta_cargando:
+                self._recarga_pendiente = True
+            elif self.catalogo_turnos is not None:
+                self.cargar_todos_turnos()
+    
+    def _al_fallar_carga_turnos(self, mensaje):
+        """Informa un error en la carga en segundo plano del catálogo de turnos."""
+        self.mostrar_cargando(False)
+        logger.error("Error al cargar todos los turnos: %s", mensaje)
+        self.turnos_encontrados = []
+        QMessageBox.warning(
+            self, 
+            "Error", 
+            f"No se pudieron cargar los turnos: {mensaje}"
+        )
     
     def _procesar_resultados_turnos(self, results):
         """Procesa los resultados de la consulta de turnos (sin detalles)."""
@@ -392,83 +512,12 @@ class BuscarTurnoWidget(QWidget):
             
         return list(turnos.values())
     
-    def mostrar_resultados(self):
+    def mostrar_resultados(self, avisar_sin_resultados=True):
         """Muestra los resultados de la búsqueda en la tabla."""
-        self.results_table.setRowCount(0)
+        self.modelo_resultados.establecer_filas(self.turnos_encontrados)
         
-        if not self.turnos_encontrados:
+        if not self.turnos_encontrados and avisar_sin_resultados:
             QMessageBox.information(self, "Sin resultados", "No se encontraron turnos con el criterio especificado.")
-            return
-        
-        for turno in self.turnos_encontrados:
-            row = self.results_table.rowCount()
-            self.results_table.insertRow(row)
-            
-            # ID
-            id_item = QTableWidgetItem(str(turno.id_turno))
-            id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 0, id_item)
-            
-            # Nombre
-            nombre_item = QTableWidgetItem(turno.nombre)
-            self.results_table.setItem(row, 1, nombre_item)
-            
-            # Estado (Vigencia)
-            estado = "Activo" if turno.vigencia == 1 else "Inactivo"
-            estado_item = QTableWidgetItem(estado)
-            estado_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 2, estado_item)
-            
-            # Total horas semanales
-            total_horas = sum(d.duracion for d in turno.detalles) / 60
-            total_item = QTableWidgetItem(f"{total_horas:.1f}")
-            total_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 3, total_item)
-            
-            # Botones de acción
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(2, 2, 2, 2)
-            action_layout.setSpacing(5)
-            
-            edit_btn = QPushButton("Editar")
-            edit_btn.setProperty("row", row)
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background: #007acc;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background: #0098ff;
-                }
-            """)
-            edit_btn.clicked.connect(lambda _, r=row: self.seleccionar_fila(r))
-            action_layout.addWidget(edit_btn)
-            
-            status_btn = QPushButton("Estado")
-            status_btn.setProperty("row", row)
-            status_btn.setStyleSheet("""
-                QPushButton {
-                    background: #555555;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background: #666666;
-                }
-            """)
-            status_btn.clicked.connect(lambda _, r=row: self.seleccionar_fila_y_cambiar_estado(r))
-            action_layout.addWidget(status_btn)
-            
-            action_layout.setStretch(0, 1)
-            action_layout.setStretch(1, 1)
-            
-            self.results_table.setCellWidget(row, 4, action_widget)
     
     def seleccionar_fila(self, row):
         """Selecciona una fila de la tabla."""
@@ -483,8 +532,8 @@ class BuscarTurnoWidget(QWidget):
     
     def mostrar_detalle_turno(self):
         """Muestra los detalles del turno seleccionado."""
-        selected_items = self.results_table.selectedItems()
-        if not selected_items:
+        filas_seleccionadas = self.results_table.selectionModel().selectedRows()
+        if not filas_seleccionadas:
             self.detail_table.setRowCount(0)
             self.turno_seleccionado_actual = None
             self.edit_button.setEnabled(False)
@@ -492,67 +541,60 @@ class BuscarTurnoWidget(QWidget):
             return
         
         # Obtener el turno seleccionado
-        row = selected_items[0].row()
-        turno = self.turnos_encontrados[row]
+        turno = self.modelo_resultados.fila(filas_seleccionadas[0].row())
         self.turno_seleccionado_actual = turno
         
         # Activar botones
         self.edit_button.setEnabled(True)
         self.change_status_button.setEnabled(True)
         
-        # Cargar detalles del turno seleccionado si aún no se han cargado
+        # Cargar detalles del turno seleccionado si aún no se han cargado; la tabla se
+        # completa cuando llegan, sin bloquear la interfaz
         if not turno.detalles:
-            self.mostrar_cargando(True)
+            self.detail_table.setRowCount(0)
             self.cargar_detalles_turno(turno.id_turno)
-            self.mostrar_cargando(False)
+            return
         
         # Mostrar detalles en la tabla
         self.mostrar_detalles_en_tabla(turno)
     
     def cargar_detalles_turno(self, id_turno):
-        """Carga los detalles de un turno específico desde la base de datos."""
-        try:
-            # Realizar consulta a ASISTENCIAS.TURNO_DETALLE_DIARIO solo para el turno seleccionado
-            query = """
-            SELECT ID_TURNO_DETALLE_DIARIO, JORNADA, HORA_INGRESO, DURACION
-            FROM ASISTENCIAS.TURNO_DETALLE_DIARIO
-            WHERE ID_TURNO = :id_turno
-            ORDER BY JORNADA
-            """
-            results = self.turno_dao.db.execute_query(query, {"id_turno": id_turno})
-            
-            # Buscar el turno en la lista de turnos encontrados
-            for turno in self.turnos_encontrados:
-                if turno.id_turno == id_turno:
-                    # Limpiar detalles existentes
-                    turno.detalles = []
-                    turno._total_horas_semanales = 0
-                    
-                    # Agregar los detalles
-                    for row in results:
-                        id_detalle, jornada, hora_ingreso, duracion = row
-                        
-                        detalle = TurnoDetalleDiario(
-                            id_turno_detalle_diario=id_detalle,
-                            id_turno=id_turno,
-                            jornada=jornada,
-                            hora_ingreso=time(hora_ingreso.hour, hora_ingreso.minute),
-                            duracion=duracion
-                        )
-                        detalle.calcular_hora_salida()
+        """Carga en segundo plano los detalles de un turno específico desde la base de datos."""
+        self._cargador_turnos.cargar(
+            id_turno,
+            lambda turno_cargado: self._al_cargar_detalles_turno(id_turno, turno_cargado),
+            lambda mensaje: self._al_fallar_carga_detalles(id_turno, mensaje)
+        )
+    
+    def _al_cargar_detalles_turno(self, id_turno, turno_cargado):
+        """Recibe el turno leído con sus detalles y los muestra si sigue seleccionado."""
+        # Buscar el turno en la lista de turnos encontrados
+        for turno in self.turnos_encontrados:
+            if turno.id_turno == id_turno:
+                # Reemplazar los detalles; un turno sin detalles en la base queda vacío
+                turno.detalles = []
+                turno._total_horas_semanales = 0
+                if turno_cargado is not None:
+                    for detalle in turno_cargado.detalles:
                         turno.agregar_detalle(detalle)
-                    
-                    # Actualizar la tabla de resultados con las horas semanales
-                    self.actualizar_horas_semanales_en_tabla(id_turno, turno._total_horas_semanales)
-                    break
-                    
-        except Exception as e:
-            print(f"Error al cargar detalles del turno: {str(e)}")
-            QMessageBox.warning(
-                self, 
-                "Error", 
-                f"No se pudieron cargar los detalles del turno: {str(e)}"
-            )
+                
+                # Actualizar la tabla de resultados con las horas semanales
+                self.actualizar_horas_semanales_en_tabla(id_turno, turno._total_horas_semanales)
+                break
+        
+        # Si entretanto se seleccionó otro turno, su tabla de detalles no se toca
+        seleccionado = self.turno_seleccionado_actual
+        if seleccionado is not None and seleccionado.id_turno == id_turno:
+            self.mostrar_detalles_en_tabla(seleccionado)
+    
+    def _al_fallar_carga_detalles(self, id_turno, mensaje):
+        """Informa un error en la carga en segundo plano de los detalles de un turno."""
+        logger.error("Error al cargar detalles del turno %s: %s", id_turno, mensaje)
+        QMessageBox.warning(
+            self, 
+            "Error", 
+            f"No se pudieron cargar los detalles del turno: {mensaje}"
+        )
     
     def mostrar_detalles_en_tabla(self, turno):
         """Muestra los detalles de un turno en la tabla de detalles."""
@@ -584,17 +626,16 @@ class BuscarTurnoWidget(QWidget):
     
     def actualizar_horas_semanales_en_tabla(self, id_turno, horas_semanales):
         """Actualiza las horas semanales en la tabla de resultados para un turno específico."""
-        for row in range(self.results_table.rowCount()):
-            item_id = self.results_table.item(row, 0)
-            if item_id and int(item_id.text()) == id_turno:
-                self.results_table.setItem(row, 3, QTableWidgetItem(f"{horas_semanales:.1f}"))
-                self.results_table.item(row, 3).setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                break
+        # La columna se calcula desde los detalles del turno; basta con refrescar su fila
+        fila = self.modelo_resultados.buscar_fila(lambda turno: turno.id_turno == id_turno)
+        if fila >= 0:
+            self.modelo_resultados.actualizar_fila(fila)
     
     def limpiar_busqueda(self):
         """Limpia el campo de búsqueda y los resultados."""
         self.search_input.clear()
-        self.results_table.setRowCount(0)
+        self._temporizador_busqueda.stop()
+        self.modelo_resultados.limpiar()
         self.detail_table.setRowCount(0)
         self.turnos_encontrados = []
         self.turno_seleccionado_actual = None
@@ -612,7 +653,7 @@ class BuscarTurnoWidget(QWidget):
         
         # Si se aceptó el diálogo, actualizar la vista
         if resultado == EditarTurnoDialog.DialogCode.Accepted:
-            self.buscar_turnos()  # Refrescar la lista de turnos
+            self.cargar_todos_turnos(refrescar=True)  # Refrescar el catálogo de turnos
             QMessageBox.information(
                 self,
                 "Turno Actualizado",
@@ -641,13 +682,9 @@ class BuscarTurnoWidget(QWidget):
             self.turno_seleccionado_actual.vigencia = nuevo_estado
             
             # Actualizar la tabla
-            for row in range(self.results_table.rowCount()):
-                id_item = self.results_table.item(row, 0)
-                if id_item and int(id_item.text()) == self.turno_seleccionado_actual.id_turno:
-                    estado_item = QTableWidgetItem(estado_texto)
-                    estado_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.results_table.setItem(row, 2, estado_item)
-                    break
+            fila = self.modelo_resultados.buscar_fila(lambda turno: turno is self.turno_seleccionado_actual)
+            if fila >= 0:
+                self.modelo_resultados.actualizar_fila(fila)
             
             # Generar script SQL
             script = self.generar_script_actualizacion()
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTableWidget, QTableWidgetItem, 
+    QPushButton, QTableWidget, QTableWidgetItem, QTableView, 
     QHeaderView, QMessageBox, QComboBox, 
     QLineEdit, QGroupBox, QFormLayout, QSplitter
 )
@@ -8,15 +8,32 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from src.database.oracle_connection import OracleConnection
 from src.database.turno_dao import TurnoDAO
+from src.database.cargador_lotes import CargadorPorLotes
+from src.database.datos_referencia import ServicioDatosReferencia
+from src.database.paginador_keyset import PaginadorKeyset, TAMANO_PAGINA
 from src.models.turno import Turno
+from src.ui.filas_table_model import FilasTableModel, Columna, columna_indice, ALINEACION_CENTRO
+
+# Clave de paginación de los turnos asignados: el orden alfabético de la tabla, con el ID
+# de la persona y del turno como desempate (una persona puede tener varios turnos)
+CLAVE_FUNCIONARIOS = (
+    "p.APELLIDO_PATERNO", "NVL(p.APELLIDO_MATERNO, ' ')", "p.NOMBRE", "p.ID_PERSONA", "t.ID_TURNO"
+)
 
 class ConsultaTurnoWidget(QWidget):
     """Widget para consultar los turnos asignados a funcionarios."""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, tamano_pagina=TAMANO_PAGINA):
         super().__init__(parent)
         self.db = OracleConnection()
+        self.datos_referencia = ServicioDatosReferencia()
         self.turno_dao = TurnoDAO()
+        self._cargador_turnos = CargadorPorLotes(self.db, self.turno_dao.buscar_por_ids)
+        
+        # Los turnos asignados se cargan por páginas; la siguiente se pide al acercarse al final
+        self.tamano_pagina = tamano_pagina
+        self._paginador = None
+        self._pagina_en_curso = False
         self.setup_ui()
         
     def setup_ui(self):
@@ -73,6 +90,8 @@ class ConsultaTurnoWidget(QWidget):
                 selection-background-color: #3c3c3c;
             }
         """)
+        # Todas las pestañas comparten el modelo de organismos del servicio de referencia
+        self.organismo_combo.setModel(self.datos_referencia.modelo_organismos())
         filtros_layout.addRow("Organismo:", self.organismo_combo)
         
         # ID o nombre del funcionario
@@ -112,8 +131,8 @@ class ConsultaTurnoWidget(QWidget):
         # Botones
         botones_layout = QHBoxLayout()
         
-        buscar_btn = QPushButton("Buscar")
-        buscar_btn.setStyleSheet("""
+        self.buscar_btn = QPushButton("Buscar")
+        self.buscar_btn.setStyleSheet("""
             QPushButton {
                 background-color: #007acc;
                 color: white;
@@ -129,7 +148,7 @@ class ConsultaTurnoWidget(QWidget):
                 background-color: #005f99;
             }
         """)
-        buscar_btn.clicked.connect(self.buscar_turnos)
+        self.buscar_btn.clicked.connect(self.buscar_turnos)
         
         limpiar_btn = QPushButton("Limpiar Filtros")
         limpiar_btn.setStyleSheet("""
@@ -149,7 +168,7 @@ class ConsultaTurnoWidget(QWidget):
         """)
         limpiar_btn.clicked.connect(self.limpiar_filtros)
         
-        botones_layout.addWidget(buscar_btn)
+        botones_layout.addWidget(self.buscar_btn)
         botones_layout.addWidget(limpiar_btn)
         filtros_layout.addRow("", botones_layout)
         
@@ -174,27 +193,32 @@ class ConsultaTurnoWidget(QWidget):
         funcionarios_label.setStyleSheet("color: #007acc; margin-bottom: 5px;")
         funcionarios_layout.addWidget(funcionarios_label)
         
-        self.funcionarios_table = QTableWidget()
-        self.funcionarios_table.setColumnCount(5)
-        self.funcionarios_table.setHorizontalHeaderLabels([
-            "ID", "Funcionario", "RUT", "ID Turno", "Nombre Turno"
-        ])
+        # Filas: (ID_PERSONA, FUNCIONARIO, RUT, ID_TURNO, NOMBRE_TURNO) tal como llegan de la consulta
+        self.modelo_funcionarios = FilasTableModel([
+            Columna("ID", columna_indice(0), ALINEACION_CENTRO),
+            Columna("Funcionario", columna_indice(1)),
+            Columna("RUT", columna_indice(2), ALINEACION_CENTRO),
+            Columna("ID Turno", columna_indice(3), ALINEACION_CENTRO),
+            Columna("Nombre Turno", columna_indice(4)),
+        ], parent=self)
+        self.funcionarios_table = QTableView()
+        self.funcionarios_table.setModel(self.modelo_funcionarios)
         self.funcionarios_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.funcionarios_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.funcionarios_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.funcionarios_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.funcionarios_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.funcionarios_table.setAlternatingRowColors(True)
         self.funcionarios_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #252526;
                 color: white;
                 gridline-color: #3c3c3c;
                 border: 1px solid #3c3c3c;
                 border-radius: 4px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #264f78;
             }
             QHeaderView::section {
@@ -203,13 +227,14 @@ class ConsultaTurnoWidget(QWidget):
                 padding: 5px;
                 border: 1px solid #3c3c3c;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background-color: #2d2d2d;
             }
         """)
         
         funcionarios_layout.addWidget(self.funcionarios_table)
-        self.funcionarios_table.itemSelectionChanged.connect(self.cargar_detalle_turno)
+        self.funcionarios_table.selectionModel().selectionChanged.connect(self.cargar_detalle_turno)
+        self.funcionarios_table.verticalScrollBar().valueChanged.connect(self._al_desplazar_funcionarios)
         
         # Detalle del turno seleccionado
         detalle_container = QWidget()
@@ -265,46 +290,29 @@ class ConsultaTurnoWidget(QWidget):
         
         main_layout.addWidget(splitter)
         
-        # Cargar datos iniciales
-        self.cargar_organismos()
+        # Cargar datos iniciales en cuanto la conexión esté disponible
+        self.db.cuando_conectado(self.cargar_organismos)
     
     def cargar_organismos(self):
-        """Carga los organismos desde la base de datos."""
+        """Carga los organismos en el servicio compartido; solo se leen si la tabla cambió."""
         try:
-            self.organismo_combo.clear()
-            self.organismo_combo.addItem("Todos los organismos", None)
-            
-            # Consulta para obtener los organismos
-            query = """
-                SELECT ID_ORGANISMO, NOMBRE
-                FROM DATOS_TRANSVERSALES.ORGANISMO
-                WHERE VIGENCIA = 1
-                ORDER BY NOMBRE
-            """
-            
-            # Ejecutar consulta
-            resultados = self.db.execute_query(query)
-            
-            if resultados:
-                for row in resultados:
-                    id_organismo, nombre = row
-                    self.organismo_combo.addItem(nombre, id_organismo)
+            self.datos_referencia.cargar_organismos()
             
         except Exception as e:
             self.mostrar_error(f"Error al cargar organismos: {str(e)}")
     
     def buscar_turnos(self):
-        """Busca los turnos asignados según los filtros establecidos."""
+        """Busca los turnos asignados según los filtros establecidos, cargando la primera página."""
         try:
             # Obtener valores de los filtros
             id_organismo = self.organismo_combo.currentData()
             funcionario = self.funcionario_input.text().strip()
             turno = self.turno_input.text().strip()
             
-            # Construir consulta base
-            query = """
+            # Construir consulta base; las columnas de la clave van al final de cada fila
+            query = f"""
                 SELECT p.ID_PERSONA, p.APELLIDO_PATERNO || ' ' || p.APELLIDO_MATERNO || ', ' || p.NOMBRE AS FUNCIONARIO, 
-                       p.RUT, t.ID_TURNO, t.NOMBRE
+                       p.RUT, t.ID_TURNO, t.NOMBRE, {", ".join(CLAVE_FUNCIONARIOS)}
                 FROM DATOS_TRANSVERSALES.PERSONA p
                 JOIN ASISTENCIAS.PERSONA_TURNO pt ON p.ID_PERSONA = pt.ID_PERSONA
                 JOIN ASISTENCIAS.TURNO t ON pt.ID_TURNO = t.ID_TURNO
@@ -339,40 +347,70 @@ class ConsultaTurnoWidget(QWidget):
                     query += " AND UPPER(t.NOMBRE) LIKE UPPER('%' || :nombre_turno || '%')"
                     params["nombre_turno"] = turno
             
-            # Ordenar resultados
-            query += " ORDER BY p.APELLIDO_PATERNO, p.APELLIDO_MATERNO, p.NOMBRE"
+            # Cada búsqueda parte con la caché de detalles vacía
+            self._cargador_turnos.limpiar()
             
-            # Ejecutar consulta
-            resultados = self.db.execute_query(query, params)
+            # El paginador agrega el orden y el límite de cada página; las páginas de una
+            # búsqueda anterior que sigan en curso se descartan al llegar
+            self._paginador = PaginadorKeyset(query, params, CLAVE_FUNCIONARIOS, self.tamano_pagina)
+            self._pagina_en_curso = False
             
-            # Llenar tabla con resultados
-            self.funcionarios_table.setRowCount(0)
+            # Ejecutar consulta en segundo plano para no bloquear la interfaz
+            self.buscar_btn.setEnabled(False)
+            self.buscar_btn.setText("Buscando...")
+            self._pedir_pagina()
+            
+        except Exception as e:
+            self._al_fallar_busqueda(str(e))
+    
+    def _pedir_pagina(self):
+        """Pide en segundo plano la página siguiente, si la hay y no hay otra en curso."""
+        paginador = self._paginador
+        if paginador is None or paginador.agotado or self._pagina_en_curso:
+            return
+        
+        self._pagina_en_curso = True
+        query, params = paginador.consulta_siguiente()
+        self.db.execute_query_async(
+            query,
+            params,
+            on_result=lambda filas: self._al_recibir_pagina(paginador, filas),
+            on_error=lambda mensaje: self._al_fallar_pagina(paginador, mensaje)
+        )
+    
+    def _al_desplazar_funcionarios(self, _valor=None):
+        """Precarga la página siguiente cuando las filas visibles se acercan al final."""
+        if self._paginador is None or self._paginador.agotado:
+            return
+        
+        ultima_visible = self.funcionarios_table.rowAt(self.funcionarios_table.viewport().height() - 1)
+        if ultima_visible < 0:
+            # La vista no alcanza a llenarse: todas las filas cargadas están visibles
+            ultima_visible = self.modelo_funcionarios.rowCount() - 1
+        
+        if ultima_visible >= self.modelo_funcionarios.total_filas() - max(1, self.tamano_pagina // 2):
+            self._pedir_pagina()
+    
+    def _restaurar_boton_buscar(self):
+        """Vuelve a habilitar el botón de búsqueda al terminar una consulta."""
+        self.buscar_btn.setEnabled(True)
+        self.buscar_btn.setText("Buscar")
+    
+    def _al_recibir_pagina(self, paginador, filas):
+        """Agrega a la tabla de funcionarios una página de resultados de la búsqueda."""
+        if paginador is not self._paginador:
+            return
+        
+        self._pagina_en_curso = False
+        pagina = paginador.recibir_pagina(filas)
+        
+        if paginador.paginas_recibidas > 1:
+            self.modelo_funcionarios.agregar_filas(pagina)
+        else:
+            self._restaurar_boton_buscar()
+            self.modelo_funcionarios.establecer_filas(pagina)
             
-            if resultados:
-                for row_index, row in enumerate(resultados):
-                    self.funcionarios_table.insertRow(row_index)
-                    
-                    # ID Persona
-                    id_item = QTableWidgetItem(str(row[0]))
-                    id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.funcionarios_table.setItem(row_index, 0, id_item)
-                    
-                    # Funcionario
-                    self.funcionarios_table.setItem(row_index, 1, QTableWidgetItem(row[1]))
-                    
-                    # RUT
-                    rut_item = QTableWidgetItem(row[2])
-                    rut_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.funcionarios_table.setItem(row_index, 2, rut_item)
-                    
-                    # ID Turno
-                    id_turno_item = QTableWidgetItem(str(row[3]))
-                    id_turno_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.funcionarios_table.setItem(row_index, 3, id_turno_item)
-                    
-                    # Nombre Turno
-                    self.funcionarios_table.setItem(row_index, 4, QTableWidgetItem(row[4]))
-                    
+            if pagina:
                 # Limpiar tabla de detalles
                 self.detalle_table.setRowCount(0)
                 
@@ -382,97 +420,123 @@ class ConsultaTurnoWidget(QWidget):
                     "Sin resultados",
                     "No se encontraron funcionarios con los filtros proporcionados."
                 )
-                
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error en la búsqueda",
-                f"Ocurrió un error al buscar los turnos: {str(e)}"
-            )
+        
+        # Si la página no alcanza a llenar la vista, se pide la siguiente sin esperar al desplazamiento
+        self._al_desplazar_funcionarios()
+    
+    def _al_fallar_pagina(self, paginador, mensaje):
+        """Informa el error de una página si pertenece a la búsqueda actual."""
+        if paginador is not self._paginador:
+            return
+        
+        self._pagina_en_curso = False
+        self._al_fallar_busqueda(mensaje)
+    
+    def _al_fallar_busqueda(self, mensaje):
+        """Informa un error ocurrido durante la búsqueda de turnos asignados."""
+        self._restaurar_boton_buscar()
+        QMessageBox.critical(
+            self,
+            "Error en la búsqueda",
+            f"Ocurrió un error al buscar los turnos: {mensaje}"
+        )
     
     def cargar_detalle_turno(self):
-        """Carga el detalle del turno seleccionado."""
+        """Carga en segundo plano el detalle del turno seleccionado."""
+        id_turno = self._id_turno_seleccionado()
+        if id_turno is None:
+            return
+        
+        # Las filas de funcionarios repiten turnos: el cargador consulta cada uno una sola vez
+        self._cargador_turnos.cargar(
+            id_turno,
+            lambda turno: self._al_cargar_detalle_turno(id_turno, turno),
+            self._al_fallar_carga_detalle
+        )
+    
+    def _id_turno_seleccionado(self):
+        """Devuelve el ID del turno de la fila seleccionada, o None si no hay."""
         # Obtener fila seleccionada
         indexes = self.funcionarios_table.selectedIndexes()
         if not indexes:
-            return
+            return None
         
         row = indexes[0].row()
         
         # Obtener ID del turno
-        id_turno_item = self.funcionarios_table.item(row, 3)
-        if not id_turno_item:
+        id_turno = self.modelo_funcionarios.fila(row)[3]
+        return int(id_turno) if id_turno is not None else None
+    
+    def _al_cargar_detalle_turno(self, id_turno, turno):
+        """Muestra el detalle de un turno si su fila sigue seleccionada."""
+        if self._id_turno_seleccionado() != id_turno:
             return
         
-        try:
-            id_turno = int(id_turno_item.text())
-            
-            # Buscar detalle del turno
-            turno = self.turno_dao.buscar_por_id(id_turno)
-            
-            if not turno:
-                QMessageBox.warning(
-                    self,
-                    "Turno no encontrado",
-                    f"No se encontró el detalle del turno con ID {id_turno}."
-                )
-                return
+        if not turno:
+            QMessageBox.warning(
+                self,
+                "Turno no encontrado",
+                f"No se encontró el detalle del turno con ID {id_turno}."
+            )
+            return
+        
+        # Llenar tabla de detalles
+        self.detalle_table.setRowCount(0)
+        
+        # Ordenar por días de la semana
+        dias_orden = {
+            "Lunes": 1, "Martes": 2, "Miércoles": 3,
+            "Jueves": 4, "Viernes": 5, "Sábado": 6, "Domingo": 7
+        }
+        detalles_ordenados = sorted(
+            turno.detalles,
+            key=lambda x: dias_orden.get(x.jornada, 99)
+        )
+        
+        for row_index, detalle in enumerate(detalles_ordenados):
+            self.detalle_table.insertRow(row_index)
             
-            # Llenar tabla de detalles
-            self.detalle_table.setRowCount(0)
+            # Día
+            self.detalle_table.setItem(row_index, 0, QTableWidgetItem(detalle.jornada))
             
-            # Ordenar por días de la semana
-            dias_orden = {
-                "Lunes": 1, "Martes": 2, "Miércoles": 3,
-                "Jueves": 4, "Viernes": 5, "Sábado": 6, "Domingo": 7
-            }
-            detalles_ordenados = sorted(
-                turno.detalles,
-                key=lambda x: dias_orden.get(x.jornada, 99)
-            )
+            # Hora Ingreso
+            hora_ingreso = detalle.hora_ingreso.strftime("%H:%M")
+            ingreso_item = QTableWidgetItem(hora_ingreso)
+            ingreso_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.detalle_table.setItem(row_index, 1, ingreso_item)
             
-            for row_index, detalle in enumerate(detalles_ordenados):
-                self.detalle_table.insertRow(row_index)
-                
-                # Día
-                self.detalle_table.setItem(row_index, 0, QTableWidgetItem(detalle.jornada))
-                
-                # Hora Ingreso
-                hora_ingreso = detalle.hora_ingreso.strftime("%H:%M")
-                ingreso_item = QTableWidgetItem(hora_ingreso)
-                ingreso_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.detalle_table.setItem(row_index, 1, ingreso_item)
-                
-                # Hora Salida
-                if detalle.hora_salida:
-                    hora_salida = detalle.hora_salida.strftime("%H:%M")
-                else:
-                    # Calcular hora salida si no está disponible
-                    detalle.calcular_hora_salida()
-                    hora_salida = detalle.hora_salida.strftime("%H:%M")
-                    
-                salida_item = QTableWidgetItem(hora_salida)
-                salida_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.detalle_table.setItem(row_index, 2, salida_item)
+            # Hora Salida
+            if detalle.hora_salida:
+                hora_salida = detalle.hora_salida.strftime("%H:%M")
+            else:
+                # Calcular hora salida si no está disponible
+                detalle.calcular_hora_salida()
+                hora_salida = detalle.hora_salida.strftime("%H:%M")
                 
-                # Duración
-                duracion_item = QTableWidgetItem(str(detalle.duracion))
-                duracion_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.detalle_table.setItem(row_index, 3, duracion_item)
+            salida_item = QTableWidgetItem(hora_salida)
+            salida_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.detalle_table.setItem(row_index, 2, salida_item)
             
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error al cargar detalle",
-                f"Ocurrió un error al cargar el detalle del turno: {str(e)}"
-            )
+            # Duración
+            duracion_item = QTableWidgetItem(str(detalle.duracion))
+            duracion_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.detalle_table.setItem(row_index, 3, duracion_item)
+    
+    def _al_fallar_carga_detalle(self, mensaje):
+        """Informa un error en la carga en segundo plano del detalle de un turno."""
+        QMessageBox.critical(
+            self,
+            "Error al cargar detalle",
+            f"Ocurrió un error al cargar el detalle del turno: {mensaje}"
+        )
     
     def limpiar_filtros(self):
         """Limpia todos los filtros de búsqueda."""
         self.organismo_combo.setCurrentIndex(0)
         self.funcionario_input.clear()
         self.turno_input.clear()
-        self.funcionarios_table.setRowCount(0)
+        self._paginador = None
+        self.modelo_funcionarios.limpiar()
         self.detalle_table.setRowCount(0)
 
     def cargar_turnos(self):
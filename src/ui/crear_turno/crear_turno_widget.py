@@ -1,3 +1,4 @@
+import logging
 import sys
 import os
 from datetime import datetime, time
@@ -12,8 +13,10 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTime, QDate, QTimer, pyqtSignal, QRegularExpression
 from PyQt6.QtGui import QFont, QColor, QKeyEvent, QIntValidator, QIcon, QSyntaxHighlighter, QTextCharFormat
 
-from models.turno import Turno, TurnoDetalleDiario
-from database.turno_dao import TurnoDAO
+from src.models.turno import Turno, TurnoDetalleDiario
+from src.database.turno_dao import TurnoDAO, ConsultaError
+
+logger = logging.getLogger(__name__)
 
 class TimeEditMejorado(QTimeEdit):
     """Control de tiempo mejorado que facilita la entrada de horas."""
@@ -479,7 +482,7 @@ class CrearTurnoWidget(QWidget):
         self.detalle_editando_id = None
         self.turno_dao = TurnoDAO()
         
-        print("Inicializando CrearTurnoWidget")
+        logger.debug("Inicializando CrearTurnoWidget")
         
         # Configurar la interfaz de usuario
         self.setup_ui()
@@ -1211,7 +1214,7 @@ class CrearTurnoWidget(QWidget):
             return duracion
         except Exception as e:
             # Manejar cualquier error
-            print(f"Error al calcular duración: {str(e)}")
+            logger.error("Error al calcular duración: %s", e)
             return 0
 
     def _obtener_detalle_actual(self):
@@ -1221,7 +1224,7 @@ class CrearTurnoWidget(QWidget):
         Returns:
             dict: Diccionario con los datos del detalle actual
         """
-        print("Obteniendo detalle actual del formulario")
+        logger.debug("Obteniendo detalle actual del formulario")
         
         # Obtener días seleccionados
         dias_seleccionados = []
@@ -1243,7 +1246,7 @@ class CrearTurnoWidget(QWidget):
                 elif nombre_abreviado == "Dom":
                     dias_seleccionados.append("Domingo")
         
-        print(f"Días seleccionados: {dias_seleccionados}")
+        logger.debug("Días seleccionados: %s", dias_seleccionados)
         
         # Obtener horas de ingreso y salida
         hora_ingreso = self.hora_ingreso.time()
@@ -1256,7 +1259,7 @@ class CrearTurnoWidget(QWidget):
         # Calcular duración en minutos
         duracion_minutos = hora_ingreso.secsTo(hora_salida) // 60
         
-        print(f"Horario: {hora_ingreso_str} a {hora_salida_str}, Duración: {duracion_minutos} minutos")
+        logger.debug("Horario: %s a %s, Duración: %s minutos", hora_ingreso_str, hora_salida_str, duracion_minutos)
         
         return {
             "dias": dias_seleccionados,
@@ -1268,10 +1271,10 @@ class CrearTurnoWidget(QWidget):
     def agregar_detalle(self):
         """Agrega un detalle al turno actual."""
         try:
-            print("Iniciando agregar_detalle")
+            logger.debug("Iniciando agregar_detalle")
             # Obtener los datos del detalle actual
             detalle_actual = self._obtener_detalle_actual()
-            print(f"Detalle actual: {detalle_actual}")
+            logger.debug("Detalle actual: %s", detalle_actual)
             
             # Validar que al menos un día esté seleccionado
             if not detalle_actual["dias"]:
@@ -1294,33 +1297,30 @@ class CrearTurnoWidget(QWidget):
                 )
                 return
             
-            # Obtener el último ID de detalle para asignar IDs temporales
+            # Reservar un ID para cada día que se agregará (los días editados conservan el suyo);
+            # el asignador nunca repite un ID entregado en la sesión
+            dias_nuevos = [
+                dia for dia in detalle_actual["dias"]
+                if not any(
+                    detalle["dia"] == dia and (self.detalle_editando_id is None
+                                               or detalle.get("id") == self.detalle_editando_id)
+                    for detalle in self.detalles
+                )
+            ]
             try:
-                ultimo_id_detalle = self.turno_dao.obtener_ultimo_id_detalle()
-                print(f"Último ID de detalle obtenido de la BD: {ultimo_id_detalle}")
-                
-                # Encontrar el ID más alto entre los detalles existentes
-                max_id_existente = 0
-                for detalle in self.detalles:
-                    if detalle.get("id", 0) > max_id_existente:
-                        max_id_existente = detalle.get("id", 0)
-                
-                # Usar el mayor entre el ID de la BD y el máximo existente
-                id_actual = max(ultimo_id_detalle, max_id_existente + 1)
-                print(f"ID inicial para nuevos detalles: {id_actual}")
-                
-            except Exception as e:
-                print(f"Error al obtener último ID de detalle: {str(e)}")
-                # Si hay error, usar un ID temporal basado en el máximo existente
-                id_actual = 1
-                for detalle in self.detalles:
-                    if detalle.get("id", 0) >= id_actual:
-                        id_actual = detalle.get("id", 0) + 1
-                print(f"ID inicial para nuevos detalles (fallback): {id_actual}")
+                ids_nuevos = iter(self.turno_dao.reservar_ids_detalle(len(dias_nuevos)) if dias_nuevos else ())
+            except ConsultaError as e:
+                logger.error("Error al reservar IDs de detalle: %s", e)
+                QMessageBox.warning(
+                    self,
+                    "Error al reservar IDs",
+                    f"No se pudieron reservar IDs para los detalles: {str(e)}"
+                )
+                return
             
             # Procesar cada día seleccionado
             for dia in detalle_actual["dias"]:
-                print(f"Procesando día: {dia}")
+                logger.debug("Procesando día: %s", dia)
                 # Verificar si ya existe un detalle para este día
                 existe_detalle = False
                 indice_existente = -1
@@ -1331,7 +1331,7 @@ class CrearTurnoWidget(QWidget):
                             # Estamos editando este detalle, así que lo actualizaremos
                             indice_existente = i
                             existe_detalle = True
-                            print(f"Actualizando detalle existente en índice {i}")
+                            logger.debug("Actualizando detalle existente en índice %s", i)
                             break
                         elif self.detalle_editando_id is None:
                             # No estamos en modo edición, así que es un duplicado
@@ -1356,13 +1356,12 @@ class CrearTurnoWidget(QWidget):
                     if self.detalle_editando_id is not None and indice_existente >= 0:
                         nuevo_detalle["id"] = self.detalles[indice_existente].get("id", 0)
                         self.detalles[indice_existente] = nuevo_detalle
-                        print(f"Detalle actualizado: {nuevo_detalle}")
+                        logger.debug("Detalle actualizado: %s", nuevo_detalle)
                     elif not existe_detalle:
-                        # Asignar un ID único al nuevo detalle
-                        nuevo_detalle["id"] = id_actual
-                        id_actual += 1
+                        # Asignar uno de los IDs reservados al nuevo detalle
+                        nuevo_detalle["id"] = next(ids_nuevos)
                         self.detalles.append(nuevo_detalle)
-                        print(f"Nuevo detalle agregado: {nuevo_detalle} con ID {nuevo_detalle['id']}")
+                        logger.debug("Nuevo detalle agregado: %s con ID %s", nuevo_detalle, nuevo_detalle['id'])
             
             # Actualizar la tabla de detalles
             self.actualizar_tabla_detalles()
@@ -1376,9 +1375,7 @@ class CrearTurnoWidget(QWidget):
             self.btn_agregar_detalle.setText("Agregar")
             
         except Exception as e:
-            print(f"Error en agregar_detalle: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error en agregar_detalle: %s", e)
             QMessageBox.critical(
                 self,
                 "Error",
@@ -1439,7 +1436,7 @@ class CrearTurnoWidget(QWidget):
             key=lambda x: dias_orden[x["dia"]]
         )
         
-        print(f"Actualizando tabla con {len(detalles_ordenados)} detalles")
+        logger.debug("Actualizando tabla con %s detalles", len(detalles_ordenados))
         
         # Agregar filas a la tabla
         for detalle in detalles_ordenados:
@@ -1528,7 +1525,7 @@ class CrearTurnoWidget(QWidget):
         minutos = total_minutos % 60
         horas_semanales = f"{horas}.{minutos//6}" if minutos else f"{horas}.0"
         
-        print(f"Total minutos: {total_minutos}, Horas semanales: {horas_semanales}")
+        logger.debug("Total minutos: %s, Horas semanales: %s", total_minutos, horas_semanales)
         
         # Actualizar etiqueta de horas semanales
         self.horas_semanales_label.setText(f"{horas_semanales} horas")
@@ -1672,13 +1669,48 @@ class CrearTurnoWidget(QWidget):
         self.editar_btn.setEnabled(False)
         self.eliminar_btn.setEnabled(False)
 
+    def confirmar_turnos_cercanos(self):
+        """
+        Avisa si ya existen turnos con un horario parecido al actual (no idéntico) y
+        pregunta si se continúa.
+        
+        Returns:
+            bool: True si no hay turnos parecidos o el usuario decide continuar
+        """
+        try:
+            cercanos = self.turno_dao.buscar_turnos_cercanos(self.turno_actual)
+        except Exception as e:
+            # Es solo un aviso: un error no impide guardar el turno
+            logger.warning("No se pudieron buscar turnos parecidos: %s", e)
+            return True
+        
+        if not cercanos:
+            return True
+        
+        msg = "Ya existen turnos con un horario parecido:\n\n"
+        for cercano in cercanos[:3]:
+            msg += (f"• Turno ID: {cercano.id_turno}, Nombre: {cercano.nombre} "
+                    f"({cercano.distancia} min de diferencia, {cercano.personas_asignadas} personas asignadas)\n")
+        if len(cercanos) > 3:
+            msg += f"Y {len(cercanos) - 3} turnos más...\n"
+        msg += "\n¿Desea continuar con la creación del turno?"
+        
+        respuesta = QMessageBox.question(
+            self,
+            "Turnos Parecidos Encontrados",
+            msg,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        return respuesta == QMessageBox.StandardButton.Yes
+    
     def guardar_turno(self):
         """Guarda el turno actual y genera SQL si es válido."""
         if not self.validar_turno():
             return
         
         try:
-            print("Iniciando guardado de turno")
+            logger.debug("Iniciando guardado de turno")
             # Actualizar datos del turno
             self.turno_actual.nombre = self.nombre_custom_edit.text().strip() or self._generar_nombre_turno()
             self.turno_actual.vigencia = 1 if self.btn_activo.isChecked() else 0
@@ -1689,16 +1721,17 @@ class CrearTurnoWidget(QWidget):
                 id_turno = int(id_turno_str)
                 self.turno_actual.id_turno = id_turno
             except ValueError:
-                print(f"Error al convertir ID de turno: {id_turno_str}")
+                logger.error("Error al convertir ID de turno: %s", id_turno_str)
             
-            print(f"Turno a guardar: ID={self.turno_actual.id_turno}, Nombre={self.turno_actual.nombre}, Vigencia={self.turno_actual.vigencia}")
+            logger.debug("Turno a guardar: ID=%s, Nombre=%s, Vigencia=%s",
+                         self.turno_actual.id_turno, self.turno_actual.nombre, self.turno_actual.vigencia)
             
             # Convertir los detalles del formato de diccionario al modelo TurnoDetalleDiario
             self.turno_actual.detalles = []
-            print(f"Procesando {len(self.detalles)} detalles")
+            logger.debug("Procesando %s detalles", len(self.detalles))
             
             for detalle_dict in self.detalles:
-                print(f"Procesando detalle: {detalle_dict}")
+                logger.debug("Procesando detalle: %s", detalle_dict)
                 # Convertir QTime a time de Python si es necesario
                 hora_ingreso = detalle_dict["hora_ingreso"]
                 if isinstance(hora_ingreso, QTime):
@@ -1714,29 +1747,28 @@ class CrearTurnoWidget(QWidget):
                     hora_ingreso=hora_ingreso,
                     duracion=detalle_dict.get("duracion_minutos", detalle_dict.get("duracion", 0))
                 )
-                print(f"Detalle creado: ID={detalle.id_turno_detalle_diario}, Día={detalle.jornada}, Hora={detalle.hora_ingreso}, Duración={detalle.duracion}")
+                logger.debug("Detalle creado: ID=%s, Día=%s, Hora=%s, Duración=%s", detalle.id_turno_detalle_diario,
+                             detalle.jornada, detalle.hora_ingreso, detalle.duracion)
                 self.turno_actual.detalles.append(detalle)
             
             # Verificar conexión a la base de datos
             try:
-                print("Verificando conexión a la base de datos...")
+                logger.debug("Verificando conexión a la base de datos...")
                 if not self.turno_dao.db.is_connected():
-                    print("No hay conexión activa, intentando conectar...")
+                    logger.debug("No hay conexión activa, intentando conectar...")
                     if not self.turno_dao.db.connect():
-                        print("ERROR: No se pudo establecer conexión a la base de datos")
+                        logger.error("No se pudo establecer conexión a la base de datos")
                         QMessageBox.critical(
                             self,
                             "Error de conexión",
                             "No se pudo establecer conexión a la base de datos. No se puede verificar duplicados."
                         )
                         return
-                    print("Conexión establecida correctamente")
+                    logger.debug("Conexión establecida correctamente")
                 else:
-                    print("Conexión a la base de datos activa")
+                    logger.debug("Conexión a la base de datos activa")
             except Exception as e:
-                print(f"ERROR al verificar conexión: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error al verificar conexión: %s", e)
                 QMessageBox.critical(
                     self,
                     "Error de conexión",
@@ -1745,15 +1777,13 @@ class CrearTurnoWidget(QWidget):
                 return
             
             # Verificar duplicados antes de asignar IDs
-            print("Buscando turnos exactamente iguales...")
+            logger.debug("Buscando turnos exactamente iguales...")
             turnos_similares = []
             try:
                 turnos_similares = self.turno_dao.buscar_turnos_similares(self.turno_actual)
-                print(f"Búsqueda completada. Se encontraron {len(turnos_similares)} turnos similares")
+                logger.debug("Búsqueda completada. Se encontraron %s turnos similares", len(turnos_similares))
             except Exception as e:
-                print(f"ERROR al buscar turnos similares: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error al buscar turnos similares: %s", e)
                 QMessageBox.warning(
                     self,
                     "Error al buscar duplicados",
@@ -1761,12 +1791,14 @@ class CrearTurnoWidget(QWidget):
                 )
             
             if turnos_similares:
-                print(f"Se encontraron {len(turnos_similares)} turnos exactamente iguales:")
-                for idx, (id_turno, nombre, detalles) in enumerate(turnos_similares):
-                    print(f"Turno exacto #{idx+1}: ID={id_turno}, Nombre={nombre}")
-                    print(f"  Detalles: {len(detalles)} días")
-                    for detalle in detalles:
-                        print(f"    {detalle['jornada']}: {detalle['hora_ingreso']} - {detalle['hora_salida']}")
+                logger.info("Se encontraron %s turnos exactamente iguales", len(turnos_similares))
+                if logger.isEnabledFor(logging.DEBUG):
+                    for idx, (id_turno, nombre, detalles) in enumerate(turnos_similares):
+                        logger.debug("Turno exacto #%s: ID=%s, Nombre=%s", idx+1, id_turno, nombre)
+                        logger.debug("  Detalles: %s días", len(detalles))
+                        for detalle in detalles:
+                            logger.debug("    %s: %s - %s",
+                                         detalle['jornada'], detalle['hora_ingreso'], detalle['hora_salida'])
                 
                 # Determinar si hay coincidencia exacta por ID
                 coincidencia_exacta_id = any(id_turno == self.turno_actual.id_turno for id_turno, _, _ in turnos_similares)
@@ -1802,8 +1834,8 @@ class CrearTurnoWidget(QWidget):
                 else:
                     msg += "¿Desea continuar con la creación a pesar de la duplicidad?"
                 
-                print(f"Mostrando mensaje de alerta: {titulo}")
-                print(f"Mensaje: {msg}")
+                logger.debug("Mostrando mensaje de alerta: %s", titulo)
+                logger.debug("Mensaje: %s", msg)
                 
                 respuesta = QMessageBox.question(
                     self,
@@ -1813,18 +1845,28 @@ class CrearTurnoWidget(QWidget):
                     QMessageBox.StandardButton.No
                 )
                 
-                print(f"Respuesta del usuario: {'Sí' if respuesta == QMessageBox.StandardButton.Yes else 'No'}")
+                logger.debug("Respuesta del usuario: %s",
+                             'Sí' if respuesta == QMessageBox.StandardButton.Yes else 'No')
                 
                 if respuesta == QMessageBox.StandardButton.No:
-                    print("Usuario canceló la operación debido a duplicidad")
+                    logger.info("Usuario canceló la operación debido a duplicidad")
                     return
             else:
-                print("No se encontraron turnos exactamente iguales")
+                logger.debug("No se encontraron turnos exactamente iguales")
+                if not self.confirmar_turnos_cercanos():
+                    logger.info("Usuario canceló la operación debido a turnos parecidos")
+                    return
             
-            # Asignar IDs a los detalles del turno
+            # El turno y sus detalles ya traen los IDs reservados; solo se asignan IDs nuevos
+            # si alguno quedó sin reservar (p. ej. si se guardó antes de conectar)
             try:
-                self.turno_dao.asignar_ids(self.turno_actual)
-                print(f"IDs asignados: Turno={self.turno_actual.id_turno}, Detalles={[d.id_turno_detalle_diario for d in self.turno_actual.detalles]}")
+                if not self.turno_actual.id_turno or any(
+                        not d.id_turno_detalle_diario or d.id_turno_detalle_diario <= 0
+                        for d in self.turno_actual.detalles):
+                    self.turno_dao.asignar_ids(self.turno_actual)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("IDs asignados: Turno=%s, Detalles=%s", self.turno_actual.id_turno,
+                                 [d.id_turno_detalle_diario for d in self.turno_actual.detalles])
                 
                 # Actualizar los IDs en la lista de detalles para mostrarlos en la interfaz
                 for i, detalle in enumerate(self.turno_actual.detalles):
@@ -1834,11 +1876,11 @@ class CrearTurnoWidget(QWidget):
                 # Actualizar la tabla para mostrar los nuevos IDs
                 self.actualizar_tabla_detalles()
             except Exception as e:
-                print(f"Error al asignar IDs: {str(e)}")
+                logger.error("Error al asignar IDs: %s", e)
                 # Continuar con el proceso a pesar del error
             
             # Guardar turno en la base de datos
-            print("Guardando turno en la base de datos")
+            logger.debug("Guardando turno en la base de datos")
             self.turno_dao.guardar_turno(self.turno_actual)
             
             # Crear una copia del turno actual para guardar en la lista de turnos creados
@@ -1890,9 +1932,7 @@ class CrearTurnoWidget(QWidget):
                 self.generar_script_sql()
             
         except Exception as e:
-            print(f"ERROR GENERAL al guardar turno: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error general al guardar turno: %s", e)
             QMessageBox.critical(
                 self,
                 "Error al guardar turno",
@@ -1918,67 +1958,37 @@ class CrearTurnoWidget(QWidget):
             script += f"-- Total de turnos: {len(self.turnos_creados)}\n"
             script += "-- Fecha de generación: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n"
             
-            # Asegurar que cada turno tenga un ID único
-            ultimo_id_turno = self.turno_dao.obtener_ultimo_id_turno()
-            ultimo_id_detalle = self.turno_dao.obtener_ultimo_id_detalle()
+            # Verificar en una sola consulta que ningún ID del lote se haya ocupado entretanto;
+            # si alguno colisiona, todo el lote recibe IDs nuevos y consecutivos. Se renumeran
+            # los turnos creados, de modo que los IDs del script y de la sesión coincidan
+            if self.turno_dao.renumerar_turnos(self.turnos_creados):
+                logger.info("Los IDs del lote se renumeraron porque algunos ya existían en la base de datos")
+                
+            # Generar los scripts de todos los turnos con dos consultas en total
+            logger.debug("Generando SQL para %s turnos", len(self.turnos_creados))
+            scripts_turnos = self.turno_dao.generar_script_sql_batch(self.turnos_creados)
             
-            # Crear una copia de los turnos para no modificar los originales
-            turnos_procesados = []
+            for i, (turno, turno_script) in enumerate(zip(self.turnos_creados, scripts_turnos)):
+                script += f"-- ======== TURNO {i+1}: {turno.nombre} ========\n"
+                script += turno_script + "\n\n"
             
-            for i, turno_original in enumerate(self.turnos_creados):
-                # Crear una copia del turno
-                turno = Turno()
-                turno.id_turno = ultimo_id_turno + i
-                turno.nombre = turno_original.nombre
-                turno.vigencia = turno_original.vigencia
-                turno.frecuencia = turno_original.frecuencia
-                
-                # Copiar los detalles con IDs correlativos
-                for j, detalle_original in enumerate(turno_original.detalles):
-                    detalle = TurnoDetalleDiario(
-                        id_turno_detalle_diario=ultimo_id_detalle + j,
-                        id_turno=turno.id_turno,
-                        jornada=detalle_original.jornada,
-                        hora_ingreso=detalle_original.hora_ingreso,
-                        duracion=detalle_original.duracion
-                    )
-                    turno.detalles.append(detalle)
-                
-                turnos_procesados.append(turno)
-                ultimo_id_detalle += len(turno.detalles)
-                
-            # Generar script para cada turno
-            for i, turno in enumerate(turnos_procesados):
-                print(f"Generando SQL para turno {i+1}/{len(turnos_procesados)}: ID={turno.id_turno}, Nombre={turno.nombre}")
-                
-                # Usar el método de TurnoDAO para generar el script
-                turno_script = self.turno_dao.generar_script_sql(turno)
-                if turno_script:
-                    script += f"-- ======== TURNO {i+1}: {turno.nombre} ========\n"
-                    script += turno_script + "\n\n"
-                else:
-                    # Fallback al método anterior si el de TurnoDAO falla
-                    script += f"-- ======== TURNO {i+1}: {turno.nombre} ========\n"
-                    # INSERT para la tabla TURNO
-                    script += f"INSERT INTO ASISTENCIAS.TURNO (ID_TURNO, NOMBRE, VIGENCIA, FRECUENCIA) VALUES ({turno.id_turno},'{turno.nombre}', {turno.vigencia}, 'Diarios');\n"
-                    
-                    # INSERTs para los detalles
-                    for detalle in turno.detalles:
-                        print(f"  Detalle: ID={detalle.id_turno_detalle_diario}, Día={detalle.jornada}, Hora={detalle.hora_ingreso}, Duración={detalle.duracion}")
-                        script += f"INSERT INTO ASISTENCIAS.TURNO_DETALLE_DIARIO (ID_TURNO_DETALLE_DIARIO, ID_TURNO, JORNADA, HORA_INGRESO, DURACION) VALUES ({detalle.id_turno_detalle_diario}, {turno.id_turno}, '{detalle.jornada}', TO_DATE('2025-01-01 {detalle.hora_ingreso.strftime('%H:%M')}:00', 'YYYY-MM-DD HH24:MI:SS'), {detalle.duracion});\n"
-                    
-                    script += "\n"
-        
             # Agregar COMMIT al final del script
             script += "COMMIT;\n"
             
             # Mostrar diálogo con script SQL
             self.mostrar_dialogo_sql(script)
             
+        except ConsultaError as e:
+            logger.error("No se pudo consultar la base de datos para generar el script: %s", e)
+            QMessageBox.critical(
+                self,
+                "Error al generar script",
+                "No se pudo generar el script SQL porque falló la consulta a la base de datos "
+                f"(verificación de IDs o de turnos existentes).\n\nDetalle: {str(e)}\n\n"
+                "Verifique la conexión e inténtelo nuevamente."
+            )
         except Exception as e:
-            print(f"Error al generar script SQL: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al generar script SQL: %s", e)
             QMessageBox.critical(
                 self,
                 "Error al generar script",
@@ -2133,45 +2143,45 @@ class CrearTurnoWidget(QWidget):
         """Inicializa un nuevo turno para la creación."""
         self.turno_actual = Turno()
         
+        # Establecer valores por defecto
+        self.turno_actual.vigencia = 1
+        self.btn_activo.setChecked(True)
+        self.btn_inactivo.setChecked(False)
+        
+        # Limpiar la tabla de detalles si se solicita
+        if limpiar_tabla:
+            self.detalles = []
+            self.tabla_detalles.setRowCount(0)
+            self.tabla_con_datos = False
+        
+        # Limpiar campos
+        self.nombre_custom_edit.clear()
+        
+        # Actualizar etiquetas de información
+        self.horas_semanales_label.setText("0.0 horas")
+        self.nombre_turno_label.setText("Se generará automáticamente")
+        self.info_turno_label.setText("No hay detalles agregados")
+        
+        # El ID se reserva cuando la conexión está disponible; al arrancar, la conexión
+        # puede estar estableciéndose todavía en segundo plano
+        self.id_turno_label.setText("...")
+        turno = self.turno_actual
+        self.turno_dao.db.cuando_conectado(lambda: self._reservar_id_turno(turno))
+    
+    def _reservar_id_turno(self, turno):
+        """Reserva el ID del turno indicado, si sigue siendo el turno en edición."""
+        if turno is not self.turno_actual:
+            return
         try:
-            # Limpiar la caché para forzar la obtención de un nuevo ID
-            self.turno_dao.db.clear_cache()
-            
-            # Obtener el próximo ID desde la base de datos
-            id_turno = self.turno_dao.obtener_ultimo_id_turno()
-            
-            # Si ya tenemos turnos creados, incrementar el ID manualmente
-            if self.turnos_creados:
-                # Encontrar el ID más alto entre los turnos creados
-                max_id = max(turno.id_turno for turno in self.turnos_creados)
-                # Usar el mayor entre el ID de la base de datos y el máximo de los turnos creados + 1
-                id_turno = max(id_turno, max_id + 1)
+            # Reservar el próximo ID: el asignador nunca repite un ID entregado en la sesión
+            id_turno = self.turno_dao.reservar_id_turno()
             
-            print(f"Último ID de turno obtenido de la base de datos: {id_turno}")
+            logger.debug("ID reservado para el nuevo turno: %s", id_turno)
             
             # Asignar el ID al turno actual
-            self.turno_actual.id_turno = id_turno
+            turno.id_turno = id_turno
             self.id_turno_label.setText(str(id_turno))
             
-            # Establecer valores por defecto
-            self.turno_actual.vigencia = 1
-            self.btn_activo.setChecked(True)
-            self.btn_inactivo.setChecked(False)
-            
-            # Limpiar la tabla de detalles si se solicita
-            if limpiar_tabla:
-                self.detalles = []
-                self.tabla_detalles.setRowCount(0)
-                self.tabla_con_datos = False
-            
-            # Limpiar campos
-            self.nombre_custom_edit.clear()
-            
-            # Actualizar etiquetas de información
-            self.horas_semanales_label.setText("0.0 horas")
-            self.nombre_turno_label.setText("Se generará automáticamente")
-            self.info_turno_label.setText("No hay detalles agregados")
-            
         except Exception as e:
             QMessageBox.warning(
                 self,
@@ -2368,5 +2378,5 @@ def highlight_sql(text_edit):
         # Guardar el resaltador como atributo del QTextEdit para evitar que sea eliminado por el recolector de basura
         text_edit.highlighter = highlighter
     except Exception as e:
-        print(f"Error al aplicar resaltado SQL: {str(e)}")
+        logger.error("Error al aplicar resaltado SQL: %s", e)
         # Continuar sin resaltado si hay un error
\ No newline at end of file
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# Filas que se agregan a la vista en cada fetchMore
+TAMANO_LOTE = 200
+
+ALINEACION_CENTRO = Qt.AlignmentFlag.AlignCenter
+ALINEACION_IZQUIERDA = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+
+def columna_indice(indice: int, formato: Optional[Callable[[Any], str]] = None) -> Callable[[Sequence], str]:
+    """
+    Crea un formateador que toma el valor en la posición `indice` de la fila.
+
+    Los valores None se muestran vacíos; el resto pasa por `formato` (por defecto str).
+    """
+    def formatear(fila: Sequence) -> str:
+        valor = fila[indice]
+        if valor is None:
+            return ""
+        return formato(valor) if formato else str(valor)
+    return formatear
+
+
+@dataclass(frozen=True)
+class Columna:
+    """Columna de un FilasTableModel: encabezado y forma de obtener su texto desde la fila."""
+    encabezado: str
+    formateador: Callable[[Any], str]
+    alineacion: Qt.AlignmentFlag = ALINEACION_IZQUIERDA
+
+
+class FilasTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla respaldado por una lista de filas.
+
+    Las filas se guardan tal como llegan (tuplas de la base de datos u objetos del modelo)
+    y el texto de cada celda se calcula en data() solo cuando la vista lo pide, es decir,
+    para las filas visibles. La vista recibe las filas por lotes mediante canFetchMore y
+    fetchMore a medida que se desplaza, de modo que cargar miles de resultados no crea
+    miles de elementos gráficos.
+    """
+
+    def __init__(self, columnas: List[Columna], tamano_lote: int = TAMANO_LOTE, parent=None):
+        super().__init__(parent)
+        self._columnas = list(columnas)
+        self._tamano_lote = tamano_lote
+        self._filas: List[Any] = []
+        self._cargadas = 0
+
+    def establecer_filas(self, filas: Iterable[Any]) -> None:
+        """Reemplaza todas las filas; la vista recibe solo el primer lote."""
+        self.beginResetModel()
+        self._filas = list(filas)
+        self._cargadas = min(self._tamano_lote, len(self._filas))
+        self.endResetModel()
+
+    def agregar_filas(self, filas: Iterable[Any]) -> None:
+        """
+        Agrega filas al final, por ejemplo la página siguiente de una consulta paginada.
+
+        Si la vista ya tenía todas las filas anteriores, recibe de inmediato hasta un lote
+        de las nuevas; si no, quedan a la espera de fetchMore como el resto.
+        """
+        nuevas = list(filas)
+        if not nuevas:
+            return
+        vista_completa = self._cargadas == len(self._filas)
+        self._filas.extend(nuevas)
+        if vista_completa:
+            self.fetchMore()
+
+    def limpiar(self) -> None:
+        """Elimina todas las filas."""
+        self.establecer_filas([])
+
+    def fila(self, indice: int) -> Any:
+        """Devuelve la fila original en la posición indicada."""
+        return self._filas[indice]
+
+    def filas(self) -> List[Any]:
+        """Devuelve todas las filas, incluidas las que la vista aún no ha pedido."""
+        return self._filas
+
+    def total_filas(self) -> int:
+        """Número total de filas, cargadas o no en la vista."""
+        return len(self._filas)
+
+    def buscar_fila(self, predicado: Callable[[Any], bool]) -> int:
+        """Devuelve la posición de la primera fila que cumple el predicado, o -1."""
+        for indice, fila in enumerate(self._filas):
+            if predicado(fila):
+                return indice
+        return -1
+
+    def actualizar_fila(self, indice: int, fila: Any = None) -> None:
+        """
+        Notifica a la vista que la fila cambió, reemplazándola si se indica una nueva.
+
+        Sirve también para filas mutables (objetos del modelo) modificadas en su lugar.
+        """
+        if fila is not None:
+            self._filas[indice] = fila
+        if indice < self._cargadas:
+            self.dataChanged.emit(self.index(indice, 0), self.index(indice, len(self._columnas) - 1))
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._cargadas
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columnas)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._cargadas:
+            return None
+        columna = self._columnas[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return columna.formateador(self._filas[index.row()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return columna.alineacion
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._columnas[section].encabezado
+        return str(section + 1)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._cargadas < len(self._filas)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        restantes = len(self._filas) - self._cargadas
+        cantidad = min(self._tamano_lote, restantes)
+        if cantidad <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._cargadas, self._cargadas + cantidad - 1)
+        self._cargadas += cantidad
+        self.endInsertRows()
@@ -1,12 +1,14 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTableWidget, QTableWidgetItem, 
+    QPushButton, QTableView, 
     QHeaderView, QMessageBox, QComboBox, 
     QLineEdit, QDateEdit, QGroupBox, QFormLayout
 )
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QFont
 from src.database.oracle_connection import OracleConnection
+from src.database.datos_referencia import ServicioDatosReferencia
+from src.ui.filas_table_model import FilasTableModel, Columna, columna_indice, ALINEACION_CENTRO
 
 class HorarioFlexibleWidget(QWidget):
     """Widget para la gestión y consulta de horarios flexibles."""
@@ -14,6 +16,7 @@ class HorarioFlexibleWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = OracleConnection()
+        self.datos_referencia = ServicioDatosReferencia()
         self.setup_ui()
         
     def setup_ui(self):
@@ -75,6 +78,8 @@ class HorarioFlexibleWidget(QWidget):
                 selection-background-color: #3c3c3c;
             }
         """)
+        # Todas las pestañas comparten el modelo de organismos del servicio de referencia
+        self.organismo_combo.setModel(self.datos_referencia.modelo_organismos())
         filtros_layout.addRow("Organismo:", self.organismo_combo)
         
         # Fecha
@@ -148,8 +153,8 @@ class HorarioFlexibleWidget(QWidget):
         filtros_layout.addRow("Buscar:", self.id_busqueda)
         
         # Botón de búsqueda
-        buscar_btn = QPushButton("Buscar")
-        buscar_btn.setStyleSheet("""
+        self.buscar_btn = QPushButton("Buscar")
+        self.buscar_btn.setStyleSheet("""
             QPushButton {
                 background-color: #007acc;
                 color: white;
@@ -165,7 +170,7 @@ class HorarioFlexibleWidget(QWidget):
                 background-color: #005f99;
             }
         """)
-        buscar_btn.clicked.connect(self.buscar_horarios)
+        self.buscar_btn.clicked.connect(self.buscar_horarios)
         
         limpiar_btn = QPushButton("Limpiar Filtros")
         limpiar_btn.setStyleSheet("""
@@ -186,34 +191,40 @@ class HorarioFlexibleWidget(QWidget):
         limpiar_btn.clicked.connect(self.limpiar_filtros)
         
         botones_layout = QHBoxLayout()
-        botones_layout.addWidget(buscar_btn)
+        botones_layout.addWidget(self.buscar_btn)
         botones_layout.addWidget(limpiar_btn)
         filtros_layout.addRow("", botones_layout)
         
         main_layout.addWidget(filtros_group)
         
         # Tabla de resultados
-        self.tabla_horarios = QTableWidget()
-        self.tabla_horarios.setColumnCount(6)
-        self.tabla_horarios.setHorizontalHeaderLabels([
-            "ID", "Funcionario", "Fecha", "Hora entrada", "Hora salida", "Estado"
-        ])
+        # Filas: (ID, NOMBRE, APELLIDO, FECHA, HORA_ENTRADA, HORA_SALIDA, VIGENCIA) de la consulta
+        self.modelo_horarios = FilasTableModel([
+            Columna("ID", columna_indice(0), ALINEACION_CENTRO),
+            Columna("Funcionario", lambda fila: f"{fila[1]} {fila[2]}"),
+            Columna("Fecha", lambda fila: fila[3].strftime("%d/%m/%Y") if fila[3] else "N/A", ALINEACION_CENTRO),
+            Columna("Hora entrada", lambda fila: fila[4].strftime("%H:%M") if fila[4] else "N/A", ALINEACION_CENTRO),
+            Columna("Hora salida", lambda fila: fila[5].strftime("%H:%M") if fila[5] else "N/A", ALINEACION_CENTRO),
+            Columna("Estado", lambda fila: "Activo" if fila[6] == 1 else "Inactivo", ALINEACION_CENTRO),
+        ], parent=self)
+        self.tabla_horarios = QTableView()
+        self.tabla_horarios.setModel(self.modelo_horarios)
         self.tabla_horarios.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.tabla_horarios.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.tabla_horarios.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.tabla_horarios.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.tabla_horarios.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.tabla_horarios.setAlternatingRowColors(True)
         self.tabla_horarios.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #252526;
                 color: white;
                 gridline-color: #3c3c3c;
                 border: 1px solid #3c3c3c;
                 border-radius: 4px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #264f78;
             }
             QHeaderView::section {
@@ -222,37 +233,20 @@ class HorarioFlexibleWidget(QWidget):
                 padding: 5px;
                 border: 1px solid #3c3c3c;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background-color: #2d2d2d;
             }
         """)
         
         main_layout.addWidget(self.tabla_horarios)
         
-        # Cargar datos iniciales
-        self.cargar_organismos()
+        # Cargar datos iniciales en cuanto la conexión esté disponible
+        self.db.cuando_conectado(self.cargar_organismos)
         
     def cargar_organismos(self):
-        """Carga los organismos desde la base de datos."""
+        """Carga los organismos en el servicio compartido; solo se leen si la tabla cambió."""
         try:
-            self.organismo_combo.clear()
-            self.organismo_combo.addItem("Todos los organismos", None)
-            
-            # Consulta para obtener los organismos
-            query = """
-                SELECT ID_ORGANISMO, NOMBRE
-                FROM DATOS_TRANSVERSALES.ORGANISMO
-                WHERE VIGENCIA = 1
-                ORDER BY NOMBRE
-            """
-            
-            # Ejecutar consulta
-            resultados = self.db.execute_query(query)
-            
-            if resultados:
-                for row in resultados:
-                    id_organismo, nombre = row
-                    self.organismo_combo.addItem(nombre, id_organismo)
+            self.datos_referencia.cargar_organismos()
             
         except Exception as e:
             QMessageBox.warning(
@@ -289,15 +283,12 @@ class HorarioFlexibleWidget(QWidget):
             # Ordenar resultados
             query += " ORDER BY hf.FECHA DESC, f.APELLIDO, f.NOMBRE"
             
-            # Ejecutar consulta
-            resultados = self.db.execute_query(query, params)
-            
-            if not resultados:
-                self.mostrar_mensaje("No se encontraron horarios flexibles con los criterios especificados")
-                return
-            
-            # Mostrar resultados en la tabla
-            self.mostrar_resultados(resultados)
+            # Ejecutar consulta en segundo plano
+            self._ejecutar_consulta_horarios(
+                query,
+                params,
+                "No se encontraron horarios flexibles con los criterios especificados"
+            )
             
         except Exception as e:
             self.mostrar_error(f"Error al buscar horarios: {str(e)}")
@@ -308,16 +299,11 @@ class HorarioFlexibleWidget(QWidget):
         self.fecha_desde.setDate(QDate.currentDate().addDays(-30))
         self.fecha_hasta.setDate(QDate.currentDate())
         self.id_busqueda.clear()
-        self.tabla_horarios.setRowCount(0)
+        self.modelo_horarios.limpiar()
 
     def cargar_horarios(self):
-        """Carga los horarios flexibles desde la base de datos."""
+        """Carga los horarios flexibles desde la base de datos en segundo plano."""
         try:
-            # Conectar a la base de datos
-            if not self.db.connect():
-                self.mostrar_error("No se pudo conectar a la base de datos")
-                return
-            
             # Consulta SQL para obtener los horarios flexibles
             query = """
             SELECT hf.ID_HORARIO_FLEXIBLE, f.NOMBRE, f.APELLIDO, 
@@ -328,59 +314,40 @@ class HorarioFlexibleWidget(QWidget):
             ORDER BY hf.FECHA DESC, f.APELLIDO, f.NOMBRE
             """
             
-            # Ejecutar la consulta
-            resultados = self.db.execute_query(query)
-            
-            if not resultados:
-                self.mostrar_mensaje("No se encontraron horarios flexibles activos")
-                return
-            
-            # Limpiar la tabla
-            self.tabla_horarios.setRowCount(0)
-            
-            # Llenar la tabla con los resultados
-            for row_index, row in enumerate(resultados):
-                self.tabla_horarios.insertRow(row_index)
-                
-                # ID
-                id_item = QTableWidgetItem(str(row[0]))
-                id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tabla_horarios.setItem(row_index, 0, id_item)
-                
-                # Funcionario (Nombre + Apellido)
-                funcionario = f"{row[1]} {row[2]}"
-                funcionario_item = QTableWidgetItem(funcionario)
-                self.tabla_horarios.setItem(row_index, 1, funcionario_item)
-                
-                # Fecha
-                fecha = row[3].strftime("%d/%m/%Y") if row[3] else "N/A"
-                fecha_item = QTableWidgetItem(fecha)
-                fecha_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tabla_horarios.setItem(row_index, 2, fecha_item)
-                
-                # Hora entrada
-                hora_entrada = row[4].strftime("%H:%M") if row[4] else "N/A"
-                hora_entrada_item = QTableWidgetItem(hora_entrada)
-                hora_entrada_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tabla_horarios.setItem(row_index, 3, hora_entrada_item)
-                
-                # Hora salida
-                hora_salida = row[5].strftime("%H:%M") if row[5] else "N/A"
-                hora_salida_item = QTableWidgetItem(hora_salida)
-                hora_salida_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tabla_horarios.setItem(row_index, 4, hora_salida_item)
-                
-                # Estado
-                estado_texto = "Activo" if row[6] == 1 else "Inactivo"
-                estado_item = QTableWidgetItem(estado_texto)
-                estado_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tabla_horarios.setItem(row_index, 5, estado_item)
-            
-            # Ajustar tamaño de las columnas
-            self.tabla_horarios.resizeColumnsToContents()
+            self._ejecutar_consulta_horarios(query, None, "No se encontraron horarios flexibles activos")
             
         except Exception as e:
             self.mostrar_error(f"Error al cargar horarios: {str(e)}")
+    
+    def _ejecutar_consulta_horarios(self, query, params, mensaje_sin_resultados):
+        """Lanza la consulta de horarios sin bloquear la interfaz y llena la tabla al terminar."""
+        self.buscar_btn.setEnabled(False)
+        self.buscar_btn.setText("Buscando...")
+        
+        def _al_recibir(resultados):
+            self._restaurar_boton_buscar()
+            if not resultados:
+                self.mostrar_mensaje(mensaje_sin_resultados)
+                return
+            self.mostrar_resultados(resultados)
+        
+        def _al_fallar(mensaje):
+            self._restaurar_boton_buscar()
+            self.mostrar_error(f"Error al cargar horarios: {mensaje}")
+        
+        self.db.execute_query_async(query, params, on_result=_al_recibir, on_error=_al_fallar)
+    
+    def _restaurar_boton_buscar(self):
+        """Vuelve a habilitar el botón de búsqueda al terminar una consulta."""
+        self.buscar_btn.setEnabled(True)
+        self.buscar_btn.setText("Buscar")
+    
+    def mostrar_resultados(self, resultados):
+        """Muestra los horarios flexibles en la tabla de resultados."""
+        self.modelo_horarios.establecer_filas(resultados)
+        
+        # Ajustar tamaño de las columnas
+        self.tabla_horarios.resizeColumnsToContents()
 
     def mostrar_error(self, mensaje):
         QMessageBox.critical(self, "Error", mensaje)
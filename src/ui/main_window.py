@@ -3,17 +3,49 @@ from PyQt6.QtWidgets import (
     QStackedWidget, QLabel, QTabWidget, QHBoxLayout, QMessageBox,
     QDialog, QApplication
 )
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon, QPixmap
+import importlib
+import logging
 import os
-from .crear_turno import CrearTurnoWidget
-from .buscar_turno import BuscarTurnoWidget
-from .horario_flexible import HorarioFlexibleWidget
-from .consulta_turno import ConsultaTurnoWidget
-from .marcaje_asistencia import MarcajeAsistenciaWidget
+import time
 
-# Comentamos las importaciones que no existen aún
-# from .marcaje_asistencia import MarcajeAsistenciaWidget
+from src.database.oracle_connection import (
+    OracleConnection, ESTADO_DESCONECTADO, ESTADO_CONECTANDO, ESTADO_CONECTADO, ESTADO_ERROR
+)
+
+logger = logging.getLogger(__name__)
+
+# Módulos de la aplicación, en orden de pestañas:
+# (atributo en MainWindow, título, descripción, subpaquete de ui, clase del widget)
+MODULOS = (
+    ("crear_turno_tab", "Crear Turno", "Crear y gestionar turnos para funcionarios",
+     "crear_turno", "CrearTurnoWidget"),
+    ("buscar_turno_tab", "Buscar y Editar Turno", "Buscar y editar turnos existentes",
+     "buscar_turno", "BuscarTurnoWidget"),
+    ("horario_flexible_tab", "Horario Flexible", "Gestionar horarios flexibles para funcionarios",
+     "horario_flexible", "HorarioFlexibleWidget"),
+    ("consulta_turno_tab", "Consulta Turno", "Consultar turnos asignados por funcionario",
+     "consulta_turno", "ConsultaTurnoWidget"),
+    ("marcaje_asistencia_tab", "Marcaje Asistencia", "Registrar y consultar marcajes de asistencia",
+     "marcaje_asistencia", "MarcajeAsistenciaWidget"),
+)
+
+# Orden en que se construyen las pestañas no visitadas mientras la aplicación está inactiva
+ORDEN_PRECONSTRUCCION = (
+    "buscar_turno_tab", "crear_turno_tab", "consulta_turno_tab",
+    "marcaje_asistencia_tab", "horario_flexible_tab",
+)
+# Pausa entre dos construcciones en segundo plano, para atender la interacción del usuario (ms)
+PAUSA_PRECONSTRUCCION_MS = 300
+
+# Texto y color del indicador de conexión de la barra de estado, por estado
+INDICADOR_CONEXION = {
+    ESTADO_DESCONECTADO: ("● Sin conexión", "#6c7086"),
+    ESTADO_CONECTANDO: ("● Conectando a la base de datos...", "#f9e2af"),
+    ESTADO_CONECTADO: ("● Conectado", "#a6e3a1"),
+    ESTADO_ERROR: ("● Sin conexión a la base de datos", "#f38ba8"),
+}
 
 class BienvenidaDialog(QDialog):
     """Diálogo de bienvenida que se muestra al iniciar la aplicación por primera vez."""
@@ -135,9 +167,64 @@ class BienvenidaDialog(QDialog):
         layout.addLayout(button_layout)
         layout.addStretch()
 
+class PestanaDiferida(QWidget):
+    """
+    Contenido de una pestaña cuyo módulo se construye la primera vez que se necesita.
+    
+    Hasta entonces muestra un aviso de carga; al construirse, el widget del módulo
+    reemplaza al aviso dentro de la misma pestaña.
+    """
+    
+    # Se emite con el widget del módulo recién construido
+    construida = pyqtSignal(QWidget)
+    
+    def __init__(self, fabrica, parent=None):
+        super().__init__(parent)
+        self._fabrica = fabrica
+        self.widget = None
+        self.segundos_construccion = None
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._aviso = QLabel("Cargando módulo...")
+        self._aviso.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self._aviso)
+    
+    @property
+    def esta_construida(self):
+        return self.widget is not None
+    
+    def construir(self):
+        """Construye el módulo si aún no existe y lo devuelve."""
+        if self.widget is None:
+            inicio = time.perf_counter()
+            self.widget = self._fabrica()
+            self.segundos_construccion = time.perf_counter() - inicio
+            
+            self.layout().removeWidget(self._aviso)
+            self._aviso.deleteLater()
+            self.layout().addWidget(self.widget)
+            self.construida.emit(self.widget)
+        return self.widget
+
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, carga_diferida=True, preconstruir=True, inicio_arranque=None):
+        """
+        Args:
+            carga_diferida: Si es False, todos los módulos se construyen al crear la ventana
+            preconstruir: Si es True, tras mostrarse la ventana se construyen en segundo plano
+                las pestañas aún no visitadas, en el orden de ORDEN_PRECONSTRUCCION
+            inicio_arranque: Instante (time.perf_counter) desde el que se miden los tiempos de
+                arranque; por defecto, la creación de la ventana
+        """
         super().__init__()
+        self.inicio_arranque = inicio_arranque if inicio_arranque is not None else time.perf_counter()
+        self.carga_diferida = carga_diferida
+        self.preconstruir = preconstruir
+        self.pestanas = {}
+        self.tiempos_arranque = {}
+        self._pendientes_preconstruccion = []
         self.setWindowTitle("Sistema de Gestión de Turnos")
         self.setMinimumSize(1024, 768)
         
@@ -159,6 +246,10 @@ class MainWindow(QMainWindow):
         # Configurar módulos
         self.setup_modules()
         
+        # Indicador del estado de la conexión, que se establece en segundo plano
+        self.setup_status_bar()
+        self.tiempos_arranque['ventana_creada'] = time.perf_counter() - self.inicio_arranque
+        
         # Mostrar diálogo de bienvenida si es la primera vez
         self.check_first_run()
 
@@ -289,33 +380,112 @@ class MainWindow(QMainWindow):
         # Agregar al layout principal
         self.centralWidget().layout().addWidget(self.tab_widget)
 
+    def setup_status_bar(self):
+        """Configura la barra de estado con el indicador de conexión y el botón para reintentar."""
+        self.indicador_conexion = QLabel()
+        self.boton_reintentar = QPushButton("Reintentar")
+        self.boton_reintentar.setStyleSheet("padding: 2px 10px;")
+        self.boton_reintentar.hide()
+        self.statusBar().addPermanentWidget(self.indicador_conexion)
+        self.statusBar().addPermanentWidget(self.boton_reintentar)
+        
+        conexion = OracleConnection()
+        self.boton_reintentar.clicked.connect(lambda: conexion.conectar_en_segundo_plano())
+        conexion.senales_conexion().estado_cambiado.connect(self._al_cambiar_estado_conexion)
+        self._al_cambiar_estado_conexion(conexion.estado_conexion, conexion.error_conexion)
+    
+    def _al_cambiar_estado_conexion(self, estado, mensaje=""):
+        """Actualiza el indicador de la barra de estado con el estado de la conexión."""
+        texto, color = INDICADOR_CONEXION.get(estado, INDICADOR_CONEXION[ESTADO_DESCONECTADO])
+        self.indicador_conexion.setText(texto)
+        self.indicador_conexion.setStyleSheet(f"color: {color}; padding: 0 8px;")
+        self.indicador_conexion.setToolTip(mensaje or "")
+        self.boton_reintentar.setVisible(estado == ESTADO_ERROR)
+        if estado == ESTADO_ERROR:
+            self.statusBar().showMessage("Las consultas se ejecutarán al restablecer la conexión")
+        else:
+            self.statusBar().clearMessage()
+    
     def setup_modules(self):
-        """Configura los módulos de la aplicación."""
-        # Crear e inicializar los módulos
-        # Módulo Crear Turno
-        self.crear_turno_tab = CrearTurnoWidget()
-        self.tab_widget.addTab(self.crear_turno_tab, "Crear Turno")
-        self.tab_widget.setTabToolTip(0, "Crear y gestionar turnos para funcionarios")
+        """
+        Configura los módulos de la aplicación.
         
-        # Módulo Buscar Turno
-        self.buscar_turno_tab = BuscarTurnoWidget()
-        self.tab_widget.addTab(self.buscar_turno_tab, "Buscar y Editar Turno")
-        self.tab_widget.setTabToolTip(1, "Buscar y editar turnos existentes")
+        Cada pestaña recibe un marcador que construye su módulo al activarse por primera vez
+        (o de inmediato si la carga diferida está desactivada). Mientras no se construye, el
+        atributo del módulo (crear_turno_tab, buscar_turno_tab...) vale None.
+        """
+        for indice, (atributo, titulo, descripcion, paquete, clase) in enumerate(MODULOS):
+            setattr(self, atributo, None)
+            pestana = PestanaDiferida(self._fabrica_modulo(paquete, clase))
+            pestana.construida.connect(
+                lambda widget, atributo=atributo, titulo=titulo: self._al_construir_modulo(atributo, titulo, widget)
+            )
+            self.pestanas[atributo] = pestana
+            self.tab_widget.addTab(pestana, titulo)
+            self.tab_widget.setTabToolTip(indice, descripcion)
         
-        # Módulo Horario Flexible
-        self.horario_flexible_tab = HorarioFlexibleWidget()
-        self.tab_widget.addTab(self.horario_flexible_tab, "Horario Flexible")
-        self.tab_widget.setTabToolTip(2, "Gestionar horarios flexibles para funcionarios")
+        self.tab_widget.currentChanged.connect(self._al_cambiar_pestana)
         
-        # Módulo Consulta Turno
-        self.consulta_turno_tab = ConsultaTurnoWidget()
-        self.tab_widget.addTab(self.consulta_turno_tab, "Consulta Turno")
-        self.tab_widget.setTabToolTip(3, "Consultar turnos asignados por funcionario")
+        if not self.carga_diferida:
+            for pestana in self.pestanas.values():
+                pestana.construir()
+    
+    @staticmethod
+    def _fabrica_modulo(paquete, clase):
+        """Devuelve una función que importa y crea el widget del módulo al llamarla."""
+        def fabricar():
+            modulo = importlib.import_module(f".{paquete}", __package__)
+            return getattr(modulo, clase)()
+        return fabricar
+    
+    def _al_construir_modulo(self, atributo, titulo, widget):
+        """Publica el módulo construido y registra cuánto tardó."""
+        setattr(self, atributo, widget)
+        segundos = self.pestanas[atributo].segundos_construccion
+        self.tiempos_arranque[f"construccion.{atributo}"] = segundos
+        logger.debug("Módulo '%s' construido en %.0f ms", titulo, segundos * 1000)
+    
+    def _al_cambiar_pestana(self, indice):
+        """Construye el módulo de la pestaña activada si aún no existe."""
+        pestana = self.tab_widget.widget(indice)
+        if isinstance(pestana, PestanaDiferida):
+            pestana.construir()
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'primer_pintado' not in self.tiempos_arranque:
+            self.tiempos_arranque['primer_pintado'] = time.perf_counter() - self.inicio_arranque
+            # La pestaña visible se construye después de este primer pintado
+            QTimer.singleShot(0, self._al_primer_pintado)
+    
+    def _al_primer_pintado(self):
+        """Construye la pestaña visible e inicia la construcción en segundo plano de las demás."""
+        self._al_cambiar_pestana(self.tab_widget.currentIndex())
+        self.tiempos_arranque['pestana_lista'] = time.perf_counter() - self.inicio_arranque
+        logger.info(
+            "Arranque: primer pintado en %.0f ms, pestaña visible lista en %.0f ms",
+            self.tiempos_arranque['primer_pintado'] * 1000, self.tiempos_arranque['pestana_lista'] * 1000
+        )
+        
+        if self.preconstruir:
+            self._pendientes_preconstruccion = [
+                atributo for atributo in ORDEN_PRECONSTRUCCION if not self.pestanas[atributo].esta_construida
+            ]
+            QTimer.singleShot(PAUSA_PRECONSTRUCCION_MS, self._preconstruir_siguiente)
+    
+    def _preconstruir_siguiente(self):
+        """Construye la siguiente pestaña pendiente y programa la próxima."""
+        while self._pendientes_preconstruccion:
+            pestana = self.pestanas[self._pendientes_preconstruccion.pop(0)]
+            if not pestana.esta_construida:
+                pestana.construir()
+                break
         
-        # Módulo Marcaje Asistencia
-        self.marcaje_asistencia_tab = MarcajeAsistenciaWidget()
-        self.tab_widget.addTab(self.marcaje_asistencia_tab, "Marcaje Asistencia")
-        self.tab_widget.setTabToolTip(4, "Registrar y consultar marcajes de asistencia")
+        if self._pendientes_preconstruccion:
+            QTimer.singleShot(PAUSA_PRECONSTRUCCION_MS, self._preconstruir_siguiente)
+        else:
+            self.tiempos_arranque['todas_construidas'] = time.perf_counter() - self.inicio_arranque
+            logger.info("Todos los módulos construidos en %.0f ms", self.tiempos_arranque['todas_construidas'] * 1000)
 
     def check_first_run(self):
         """Verifica si es la primera ejecución de la aplicación y muestra el diálogo de bienvenida."""
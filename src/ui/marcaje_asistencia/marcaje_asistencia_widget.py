@@ -1,12 +1,14 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTableWidget, QTableWidgetItem, 
+    QPushButton, QTableView, 
     QHeaderView, QMessageBox, QComboBox, 
     QLineEdit, QDateEdit, QTimeEdit, QGroupBox, QFormLayout
 )
 from PyQt6.QtCore import Qt, QDate, QTime
 from PyQt6.QtGui import QFont
 from src.database.oracle_connection import OracleConnection
+from src.database.cargador_lotes import CargadorPorLotes, consultar_por_lista
+from src.ui.filas_table_model import FilasTableModel, Columna, columna_indice, ALINEACION_CENTRO
 import datetime
 
 class MarcajeAsistenciaWidget(QWidget):
@@ -15,6 +17,8 @@ class MarcajeAsistenciaWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db = OracleConnection()
+        # Los RUT verificados en la sesión no se vuelven a consultar
+        self._cargador_personas = CargadorPorLotes(self.db, self.buscar_personas_por_rut)
         self.setup_ui()
         
     def setup_ui(self):
@@ -252,8 +256,8 @@ class MarcajeAsistenciaWidget(QWidget):
             }
         """)
         
-        buscar_btn = QPushButton("Buscar")
-        buscar_btn.setStyleSheet("""
+        self.buscar_btn = QPushButton("Buscar")
+        self.buscar_btn.setStyleSheet("""
             QPushButton {
                 background-color: #007acc;
                 color: white;
@@ -268,36 +272,42 @@ class MarcajeAsistenciaWidget(QWidget):
                 background-color: #005f99;
             }
         """)
-        buscar_btn.clicked.connect(self.buscar_marcajes)
+        self.buscar_btn.clicked.connect(self.buscar_marcajes)
         
         filtros_layout.addWidget(QLabel("RUT:"))
         filtros_layout.addWidget(self.buscar_rut)
-        filtros_layout.addWidget(buscar_btn)
+        filtros_layout.addWidget(self.buscar_btn)
         
         consulta_layout.addLayout(filtros_layout)
         
         # Tabla de marcajes
-        self.marcajes_table = QTableWidget()
-        self.marcajes_table.setColumnCount(6)
-        self.marcajes_table.setHorizontalHeaderLabels([
-            "ID", "Funcionario", "Fecha", "Hora", "Tipo", "Comentario"
-        ])
+        # Filas: (ID_MARCAJE, FUNCIONARIO, FECHA, HORA, TIPO, COMENTARIO) de la consulta
+        self.modelo_marcajes = FilasTableModel([
+            Columna("ID", columna_indice(0), ALINEACION_CENTRO),
+            Columna("Funcionario", columna_indice(1)),
+            Columna("Fecha", columna_indice(2, lambda fecha: fecha.strftime("%d/%m/%Y")), ALINEACION_CENTRO),
+            Columna("Hora", columna_indice(3, lambda hora: hora.strftime("%H:%M:%S")), ALINEACION_CENTRO),
+            Columna("Tipo", columna_indice(4), ALINEACION_CENTRO),
+            Columna("Comentario", columna_indice(5)),
+        ], parent=self)
+        self.marcajes_table = QTableView()
+        self.marcajes_table.setModel(self.modelo_marcajes)
         self.marcajes_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.marcajes_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.marcajes_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.marcajes_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.marcajes_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.marcajes_table.setAlternatingRowColors(True)
         self.marcajes_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #252526;
                 color: white;
                 gridline-color: #3c3c3c;
                 border: 1px solid #3c3c3c;
                 border-radius: 4px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #264f78;
             }
             QHeaderView::section {
@@ -306,7 +316,7 @@ class MarcajeAsistenciaWidget(QWidget):
                 padding: 5px;
                 border: 1px solid #3c3c3c;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background-color: #2d2d2d;
             }
         """)
@@ -332,16 +342,42 @@ class MarcajeAsistenciaWidget(QWidget):
             )
             return
         
+        # Obtener datos del marcaje tal como estaban al registrarlo
+        marcaje = {
+            "tipo": self.tipo_marcaje_combo.currentText(),
+            "fecha": self.fecha_marcaje.date().toString("yyyy-MM-dd"),
+            "hora": self.hora_marcaje.time().toString("HH:mm:ss"),
+            "comentario": self.comentario_input.text()
+        }
+        
+        # Verificar en segundo plano si el funcionario existe
+        self._cargador_personas.cargar(
+            rut,
+            lambda persona: self._al_verificar_funcionario(rut, persona, marcaje),
+            self._al_fallar_registro
+        )
+    
+    def buscar_personas_por_rut(self, ruts):
+        """
+        Busca varios funcionarios por RUT en una consulta por cada bloque de RUT.
+        
+        Returns:
+            Diccionario RUT -> (ID_PERSONA, nombre completo); los RUT inexistentes no aparecen
+        """
+        filas = consultar_por_lista(self.db, """
+            SELECT RUT, ID_PERSONA, NOMBRE, APELLIDO_PATERNO, APELLIDO_MATERNO
+            FROM DATOS_TRANSVERSALES.PERSONA
+            WHERE RUT IN ({ids})
+        """, list(ruts))
+        return {
+            rut: (id_persona, f"{nombre} {apellido_paterno} {apellido_materno}")
+            for rut, id_persona, nombre, apellido_paterno, apellido_materno in filas
+        }
+    
+    def _al_verificar_funcionario(self, rut, persona, marcaje):
+        """Confirma el marcaje del funcionario verificado y muestra el script de inserción."""
         try:
-            # Verificar si el funcionario existe
-            query_verificar = """
-                SELECT ID_PERSONA, NOMBRE, APELLIDO_PATERNO, APELLIDO_MATERNO
-                FROM DATOS_TRANSVERSALES.PERSONA
-                WHERE RUT = :rut
-            """
-            resultado = self.db.execute_query(query_verificar, {"rut": rut})
-            
-            if not resultado:
+            if not persona:
                 QMessageBox.warning(
                     self,
                     "Funcionario no encontrado",
@@ -350,14 +386,11 @@ class MarcajeAsistenciaWidget(QWidget):
                 return
             
             # Obtener datos del funcionario
-            id_persona = resultado[0][0]
-            nombre_completo = f"{resultado[0][1]} {resultado[0][2]} {resultado[0][3]}"
-            
-            # Obtener datos del marcaje
-            tipo_marcaje = self.tipo_marcaje_combo.currentText()
-            fecha = self.fecha_marcaje.date().toString("yyyy-MM-dd")
-            hora = self.hora_marcaje.time().toString("HH:mm:ss")
-            comentario = self.comentario_input.text()
+            id_persona, nombre_completo = persona
+            tipo_marcaje = marcaje["tipo"]
+            fecha = marcaje["fecha"]
+            hora = marcaje["hora"]
+            comentario = marcaje["comentario"]
             
             # Mostrar confirmación
             confirmacion = QMessageBox.question(
@@ -403,11 +436,15 @@ class MarcajeAsistenciaWidget(QWidget):
             self.limpiar_formulario()
             
         except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error al registrar marcaje",
-                f"Ocurrió un error al registrar el marcaje: {str(e)}"
-            )
+            self._al_fallar_registro(str(e))
+    
+    def _al_fallar_registro(self, mensaje):
+        """Informa un error al verificar el funcionario o generar el script del marcaje."""
+        QMessageBox.critical(
+            self,
+            "Error al registrar marcaje",
+            f"Ocurrió un error al registrar el marcaje: {mensaje}"
+        )
     
     def buscar_marcajes(self):
         """Busca marcajes de un funcionario por RUT."""
@@ -431,59 +468,45 @@ class MarcajeAsistenciaWidget(QWidget):
                 ORDER BY m.FECHA DESC, m.HORA DESC
             """
             
-            # Ejecutar consulta
-            resultados = self.db.execute_query(query, {"rut": rut})
-            
-            # Llenar tabla con resultados
-            self.marcajes_table.setRowCount(0)
+            # Ejecutar consulta en segundo plano para no bloquear la interfaz
+            self.buscar_btn.setEnabled(False)
+            self.buscar_btn.setText("Buscando...")
+            self.db.execute_query_async(
+                query,
+                {"rut": rut},
+                on_result=lambda resultados: self._al_recibir_marcajes(rut, resultados),
+                on_error=self._al_fallar_busqueda
+            )
             
-            if resultados:
-                for row_index, row in enumerate(resultados):
-                    self.marcajes_table.insertRow(row_index)
-                    
-                    # ID Marcaje
-                    id_item = QTableWidgetItem(str(row[0]))
-                    id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.marcajes_table.setItem(row_index, 0, id_item)
-                    
-                    # Funcionario
-                    self.marcajes_table.setItem(row_index, 1, QTableWidgetItem(row[1]))
-                    
-                    # Fecha
-                    fecha = row[2].strftime("%d/%m/%Y") if row[2] else ""
-                    fecha_item = QTableWidgetItem(fecha)
-                    fecha_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.marcajes_table.setItem(row_index, 2, fecha_item)
-                    
-                    # Hora
-                    hora = row[3].strftime("%H:%M:%S") if row[3] else ""
-                    hora_item = QTableWidgetItem(hora)
-                    hora_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.marcajes_table.setItem(row_index, 3, hora_item)
-                    
-                    # Tipo
-                    tipo_item = QTableWidgetItem(row[4])
-                    tipo_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.marcajes_table.setItem(row_index, 4, tipo_item)
-                    
-                    # Comentario
-                    comentario = row[5] or ""
-                    self.marcajes_table.setItem(row_index, 5, QTableWidgetItem(comentario))
-                    
-            else:
-                QMessageBox.information(
-                    self,
-                    "Sin resultados",
-                    f"No se encontraron marcajes para el funcionario con RUT {rut}."
-                )
-                
         except Exception as e:
-            QMessageBox.critical(
+            self._al_fallar_busqueda(str(e))
+    
+    def _restaurar_boton_buscar(self):
+        """Vuelve a habilitar el botón de búsqueda al terminar una consulta."""
+        self.buscar_btn.setEnabled(True)
+        self.buscar_btn.setText("Buscar")
+    
+    def _al_recibir_marcajes(self, rut, resultados):
+        """Llena la tabla de marcajes con los resultados de la búsqueda."""
+        self._restaurar_boton_buscar()
+        self.modelo_marcajes.establecer_filas(resultados or [])
+        
+        if not resultados:
+            QMessageBox.information(
                 self,
-                "Error en la búsqueda",
-                f"Ocurrió un error al buscar los marcajes: {str(e)}"
+                "Sin resultados",
+                f"No se encontraron marcajes para el funcionario con RUT {rut}."
             )
     
+    def _al_fallar_busqueda(self, mensaje):
+        """Informa un error ocurrido durante la búsqueda de marcajes."""
+        self._restaurar_boton_buscar()
+        QMessageBox.critical(
+            self,
+            "Error en la búsqueda",
+            f"Ocurrió un error al buscar los marcajes: {mensaje}"
+        )
+    
     def limpiar_formulario(self):
         """Limpia el formulario de registro de marcaje."""
         self.rut_input.clear()
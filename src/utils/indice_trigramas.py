@@ -0,0 +1,121 @@
+import unicodedata
+from array import array
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Largo de los fragmentos indexados
+LARGO_GRAMA = 3
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """
+    Normaliza un texto para compararlo sin distinguir mayúsculas ni acentos.
+
+    Ejemplo: "  Mañana  Miércoles " -> "MANANA MIERCOLES"
+    """
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.upper().split())
+
+
+def trigramas(texto: str) -> set:
+    """Devuelve los fragmentos de LARGO_GRAMA caracteres de un texto ya normalizado."""
+    return {texto[i:i + LARGO_GRAMA] for i in range(len(texto) - LARGO_GRAMA + 1)}
+
+
+class IndiceTrigramas:
+    """
+    Índice en memoria para buscar textos por coincidencia parcial.
+
+    Equivale a `UPPER(NOMBRE) LIKE '%x%'` sin distinguir acentos, pero sin recorrer el
+    catálogo: cada trigrama apunta a las posiciones de los textos que lo contienen, y una
+    búsqueda solo verifica los textos del trigrama menos frecuente de su palabra más larga.
+    Los resultados se ordenan por relevancia: coincidencia exacta, luego al inicio del
+    texto, luego al inicio de una palabra y por último el resto; a igualdad se conserva
+    el orden en que se construyó el índice.
+    """
+
+    def __init__(self):
+        self._claves: List[Hashable] = []
+        self._textos: List[str] = []
+        self._posiciones: Dict[str, array] = {}
+
+    def construir(self, elementos: Iterable[Tuple[Hashable, str]]) -> None:
+        """
+        Reconstruye el índice.
+
+        Args:
+            elementos: Pares (clave, texto); el orden se conserva para desempatar resultados
+        """
+        self._claves = []
+        self._textos = []
+        self._posiciones = {}
+        for posicion, (clave, texto) in enumerate(elementos):
+            normalizado = normalizar_texto(texto)
+            self._claves.append(clave)
+            self._textos.append(normalizado)
+            for grama in trigramas(normalizado):
+                lista = self._posiciones.get(grama)
+                if lista is None:
+                    lista = self._posiciones[grama] = array("I")
+                lista.append(posicion)
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def _candidatos(self, palabra: str) -> Iterable[int]:
+        """Posiciones que podrían contener la palabra (todas si es más corta que un trigrama)."""
+        if len(palabra) < LARGO_GRAMA:
+            return range(len(self._textos))
+        menor = None
+        for grama in trigramas(palabra):
+            lista = self._posiciones.get(grama)
+            if lista is None:
+                return ()
+            if menor is None or len(lista) < len(menor):
+                menor = lista
+        return menor
+
+    def buscar(self, consulta: str, limite: Optional[int] = None) -> List[Any]:
+        """
+        Busca los textos que contienen todas las palabras de la consulta.
+
+        Args:
+            consulta: Texto a buscar; se ignoran mayúsculas, acentos y espacios repetidos
+            limite: Número máximo de resultados
+
+        Returns:
+            Claves de los textos encontrados, de más a menos relevante
+        """
+        normalizada = normalizar_texto(consulta)
+        if not normalizada:
+            return []
+        palabras = sorted(set(normalizada.split()), key=len, reverse=True)
+
+        textos = self._textos
+        posiciones = [p for p in self._candidatos(palabras[0]) if palabras[0] in textos[p]]
+        for palabra in palabras[1:]:
+            posiciones = [p for p in posiciones if palabra in textos[p]]
+
+        # Niveles de relevancia; dentro de cada uno se conserva el orden del catálogo
+        exactos = [p for p in posiciones if textos[p] == normalizada]
+        al_inicio = [p for p in posiciones if textos[p].startswith(normalizada) and textos[p] != normalizada]
+        resto = [p for p in posiciones if not textos[p].startswith(normalizada)]
+        inicio_palabra = [p for p in resto if self._al_inicio_de_palabras(textos[p], palabras)]
+        if len(inicio_palabra) != len(resto):
+            marcados = set(inicio_palabra)
+            resto = [p for p in resto if p not in marcados]
+        else:
+            resto = []
+
+        ordenados = exactos + al_inicio + inicio_palabra + resto
+        if limite is not None:
+            ordenados = ordenados[:limite]
+        claves = self._claves
+        return [claves[p] for p in ordenados]
+
+    @staticmethod
+    def _al_inicio_de_palabras(texto: str, palabras: List[str]) -> bool:
+        """Indica si cada palabra de la consulta coincide con el inicio de una palabra del texto."""
+        return all(texto.startswith(palabra) or f" {palabra}" in texto for palabra in palabras)
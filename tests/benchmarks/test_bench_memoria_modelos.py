@@ -0,0 +1,23 @@
+import pytest
+from benchmarks import bench_memoria_modelos as bench
+
+
+@pytest.mark.unit
+class TestBenchMemoriaModelos:
+    """Pruebas para la medición de memoria de los modelos de turnos."""
+
+    def test_misma_informacion_con_menos_memoria(self):
+        """Verifica que ambas representaciones guardan lo mismo y la actual retiene menos memoria."""
+        filas = bench.generar_filas(500)
+        actual = bench.construir_actual(filas)
+        anterior = bench.construir_anterior(filas)
+        assert [
+            (d.id_turno_detalle_diario, d.jornada, d.hora_ingreso, d.hora_salida, d.duracion)
+            for turno in actual for d in turno.detalles
+        ] == [
+            (d.id_turno_detalle_diario, d.jornada, d.hora_ingreso, d.hora_salida, d.duracion)
+            for turno in anterior for d in turno.detalles
+        ]
+
+        resultados = bench.ejecutar(2000)
+        assert resultados["actual"] < resultados["anterior"]
@@ -0,0 +1,52 @@
+import pytest
+from benchmarks import bench_turno_dao as bench
+
+
+@pytest.mark.unit
+class TestBenchTurnoDAO:
+    """Pruebas para las mediciones de rendimiento de TurnoDAO."""
+
+    def test_ejecutar_mide_todos_los_casos(self):
+        """Verifica que cada caso registra tiempo, memoria y filas."""
+        resultados = bench.ejecutar(tamanos=[50], repeticiones=1)
+        casos = resultados["50"]
+        assert "buscar_turnos_similares.servidor" in casos
+        assert "generar_script_sql_batch" in casos
+        for medicion in casos.values():
+            assert set(medicion) == {"segundos", "memoria_pico_bytes", "filas"}
+        # Ambas rutas de búsqueda encuentran los mismos duplicados
+        assert casos["buscar_turnos_similares.servidor"]["filas"] == casos["buscar_turnos_similares.indice_frio"]["filas"]
+
+    def test_comparar_detecta_empeoramiento(self):
+        """Verifica que solo se informan los empeoramientos sobre el umbral y la tolerancia."""
+        base = {"1000": {"caso": {"segundos": 1.0, "memoria_pico_bytes": 10_000_000, "filas": 5}}}
+        dentro = {"1000": {"caso": {"segundos": 1.2, "memoria_pico_bytes": 10_000_000, "filas": 5}}}
+        fuera = {"1000": {"caso": {"segundos": 1.5, "memoria_pico_bytes": 10_000_000, "filas": 5}}}
+        assert bench.comparar(dentro, base, umbral=0.25) == []
+        assert len(bench.comparar(fuera, base, umbral=0.25)) == 1
+
+    def test_comparar_ignora_ruido_y_casos_nuevos(self):
+        """Verifica que las diferencias mínimas y los casos sin línea base no cuentan."""
+        base = {"1000": {"caso": {"segundos": 0.0001, "memoria_pico_bytes": 100, "filas": 5}}}
+        resultados = {"1000": {"caso": {"segundos": 0.0005, "memoria_pico_bytes": 400, "filas": 5},
+                               "nuevo": {"segundos": 9.0, "memoria_pico_bytes": 1, "filas": 1}}}
+        assert bench.comparar(resultados, base) == []
+
+    def test_main_devuelve_1_si_empeora(self, tmp_path, monkeypatch):
+        """Verifica el código de salida al comparar con una línea base más rápida."""
+        ruta = tmp_path / "base.json"
+        resultados = {"50": {"caso": {"segundos": 1.0, "memoria_pico_bytes": 0, "filas": 1}}}
+        bench.guardar_base(str(ruta), resultados)
+        monkeypatch.setattr(bench, "ejecutar", lambda *args, **kwargs:
+                            {"50": {"caso": {"segundos": 2.0, "memoria_pico_bytes": 0, "filas": 1}}})
+        assert bench.main(["--tamanos", "50", "--base", str(ruta)]) == 1
+        assert bench.main(["--tamanos", "50", "--base", str(ruta), "--umbral", "1.5"]) == 0
+
+    def test_main_sin_linea_base_falla(self, tmp_path, monkeypatch):
+        """Verifica que la comparación sin línea base no se da por aprobada."""
+        monkeypatch.setattr(bench, "ejecutar", lambda *args, **kwargs:
+                            {"50": {"caso": {"segundos": 1.0, "memoria_pico_bytes": 0, "filas": 1}}})
+        ruta = tmp_path / "no_existe.json"
+        assert bench.main(["--tamanos", "50", "--base", str(ruta)]) == bench.SALIDA_SIN_BASE
+        assert bench.main(["--tamanos", "50", "--base", str(ruta), "--guardar-base"]) == 0
+        assert bench.main(["--tamanos", "50", "--base", str(ruta)]) == 0
@@ -0,0 +1,140 @@
+import io
+import os
+import re
+import subprocess
+import sys
+import pytest
+from datetime import time
+
+from carga_masiva import CargaMasiva
+from carga_masiva.__main__ import main
+from carga_masiva.lectura import TurnoLeido
+from database import turno_dao as modulo_dao
+from database.id_allocator import IdAllocator
+from database.oracle_connection import OracleConnection
+from database.sqlite_backend import SQLiteBackend, generar_datos
+from models.turno import Turno, TurnoDetalleDiario
+
+
+def reiniciar_singletons():
+    """Descarta los IDs reservados y los índices del catálogo entre pruebas."""
+    IdAllocator._instance = None
+    modulo_dao.TurnoDAO._indice_horarios = None
+    modulo_dao.TurnoDAO._catalogo = None
+    modulo_dao.TurnoDAO._guardados_sesion = modulo_dao.ScheduleIndex()
+    OracleConnection().usar_backend(None)
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    """Fixture que crea una base SQLite en disco con un catálogo pequeño."""
+    reiniciar_singletons()
+    backend = SQLiteBackend(str(tmp_path / "db"))
+    generar_datos(backend, num_turnos=50, semilla=3)
+    with backend.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(ID_TURNO) FROM ASISTENCIAS.TURNO")
+        max_id = cursor.fetchone()[0]
+        cursor.execute("SELECT JORNADA, HORA_INGRESO, DURACION FROM ASISTENCIAS.TURNO_DETALLE_DIARIO "
+                       "WHERE ID_TURNO = 1 ORDER BY ID_TURNO_DETALLE_DIARIO")
+        existente = cursor.fetchall()
+    backend.close()
+    yield str(tmp_path / "db"), max_id, existente
+    reiniciar_singletons()
+
+
+def linea_csv(turno, detalle):
+    """Fila CSV de un detalle con su duración."""
+    jornada, hora_ingreso, duracion = detalle
+    return f"{turno};{jornada};{str(hora_ingreso)[-8:-3]};{duracion}"
+
+
+@pytest.mark.unit
+class TestCargaMasiva:
+    """Pruebas para la generación del script por lotes."""
+
+    def test_cli_con_base_sqlite(self, directorio, tmp_path, capsys):
+        """Verifica duplicados, IDs consecutivos tras el máximo y el script combinado."""
+        ruta_db, max_id, existente = directorio
+        filas = ["turno;dias;hora_ingreso;duracion"]
+        filas += [linea_csv("existente", detalle) for detalle in existente]
+        for i in range(7):
+            filas.append(f"n{i};Lu-Vi;{6 + i:02d}:15;480")
+        filas.append("repetido;Lu-Vi;06:15;480")
+        filas.append("malo;Lu;08:00;0")
+        entrada = tmp_path / "turnos.csv"
+        entrada.write_text("\n".join(filas) + "\n", encoding="utf-8")
+        salida = tmp_path / "turnos.sql"
+
+        codigo = main([str(entrada), "--salida", str(salida), "--sqlite", ruta_db, "--lote", "3"])
+
+        assert codigo == 1  # Hubo un registro inválido
+        errores = capsys.readouterr().err
+        assert "7 turnos en el script, 2 duplicados, 1 registros inválidos" in errores
+        assert "Duplicado, línea 2: mismo horario que 1 (" in errores
+        assert "mismo horario que línea" in errores
+
+        script = salida.read_text(encoding="utf-8")
+        ids = [int(i) for i in re.findall(r"INSERT INTO ASISTENCIAS\.TURNO \(.*\)\nVALUES \((\d+),", script)]
+        assert ids == list(range(max_id + 1, max_id + 8))
+        assert f"TURNO 1: {max_id + 1}-40 Lu a Vi (línea {len(existente) + 2})" in script
+        assert script.rstrip().endswith("COMMIT;")
+        assert not list(tmp_path.glob(".carga_masiva_*"))
+
+    def test_incluir_duplicados(self, directorio, tmp_path, capsys):
+        """Verifica que con --incluir-duplicados se crea el turno igual a uno existente."""
+        ruta_db, max_id, existente = directorio
+        entrada = tmp_path / "turnos.csv"
+        entrada.write_text("\n".join(["turno;dias;hora_ingreso;duracion"] +
+                                     [linea_csv("e", detalle) for detalle in existente]) + "\n", encoding="utf-8")
+
+        assert main([str(entrada), "--sqlite", ruta_db, "--incluir-duplicados"]) == 0
+
+        salida = capsys.readouterr()
+        assert f"VALUES ({max_id + 1}," in salida.out
+        assert "1 turnos en el script, 1 duplicados" in salida.err
+
+    def test_nombre_con_comillas(self, directorio, tmp_path, capsys):
+        """Verifica que un nombre con apóstrofo del archivo queda escapado en el script."""
+        ruta_db, max_id, _ = directorio
+        entrada = tmp_path / "turnos.csv"
+        entrada.write_text("nombre;dias;hora_ingreso;duracion\nTurno O'Higgins;Do;03:07;61\n", encoding="utf-8")
+
+        assert main([str(entrada), "--sqlite", ruta_db]) == 0
+
+        assert f"VALUES ({max_id + 1}, 'Turno O''Higgins', 1," in capsys.readouterr().out
+
+    def test_archivo_inexistente(self, directorio, tmp_path, capsys):
+        """Verifica que un archivo que no se puede leer termina con código 2 sin crear el script."""
+        ruta_db, _, _ = directorio
+        salida = tmp_path / "turnos.sql"
+
+        assert main([str(tmp_path / "no_existe.csv"), "--salida", str(salida), "--sqlite", ruta_db]) == 2
+        assert not salida.exists()
+        assert "Error en la entrada" in capsys.readouterr().err
+
+    def test_nombre_fijo(self):
+        """Verifica que el nombre del archivo se conserva y el generado usa el ID asignado."""
+        dao = modulo_dao.TurnoDAO.__new__(modulo_dao.TurnoDAO)
+        dao.buscar_duplicados_lote = lambda turnos: [[] for _ in turnos]
+        dao.renumerar_turnos = lambda turnos: [setattr(t, "id_turno", 100 + i) for i, t in enumerate(turnos)]
+        dao.generar_script_sql_batch = lambda turnos: [f"-- {t.id_turno}" for t in turnos]
+        entradas = []
+        for i, nombre in enumerate(["Oficina", None]):
+            turno = Turno()
+            turno.agregar_detalle(TurnoDetalleDiario(None, None, "Lunes", time(8 + i, 0), 480))
+            if nombre:
+                turno.nombre = nombre
+            entradas.append(TurnoLeido(f"línea {i + 2}", turno, bool(nombre)))
+
+        resultado = CargaMasiva(dao).ejecutar(entradas, io.StringIO())
+
+        assert (resultado.creados, resultado.lotes) == (2, 1)
+        assert [e.turno.nombre for e in entradas] == ["Oficina", "101-8 Lu"]
+
+    def test_sin_qt(self):
+        """Verifica que la carga masiva no importa PyQt6."""
+        codigo = ("import sys, carga_masiva.__main__; "
+                  "sys.exit(any(m.startswith('PyQt6') for m in sys.modules))")
+        entorno = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        assert subprocess.run([sys.executable, "-c", codigo], env=entorno).returncode == 0
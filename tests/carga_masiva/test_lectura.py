@@ -0,0 +1,135 @@
+import json
+import pytest
+from datetime import time
+
+from carga_masiva import lectura
+from carga_masiva.lectura import ErrorEntrada, detectar_formato, leer_turnos, parsear_dias
+
+
+def escribir(tmp_path, nombre, contenido):
+    """Escribe un archivo de entrada y devuelve su ruta."""
+    ruta = tmp_path / nombre
+    ruta.write_text(contenido, encoding="utf-8")
+    return str(ruta)
+
+
+def horario(turno):
+    """Detalles del turno como (jornada, hora de ingreso, duración)."""
+    return [(d.jornada, d.hora_ingreso, d.duracion) for d in turno.detalles]
+
+
+@pytest.mark.unit
+class TestParseo:
+    """Pruebas para la interpretación de días y formatos."""
+
+    def test_dias(self):
+        """Verifica nombres, abreviaturas, tildes y rangos."""
+        assert parsear_dias("Lunes a Jueves; Sa") == [0, 1, 2, 3, 5]
+        assert parsear_dias("mi,SÁBADO") == [2, 5]
+        assert parsear_dias("Lu-Vi") == [0, 1, 2, 3, 4]
+        assert parsear_dias(["Lunes", "Do"]) == [0, 6]
+
+    @pytest.mark.parametrize("texto", ["", "Lunes;Feriado", "Vi-Lu", "Lu;Lunes"])
+    def test_dias_invalidos(self, texto):
+        """Verifica que se rechazan días desconocidos, rangos invertidos y repetidos."""
+        with pytest.raises(ErrorEntrada):
+            parsear_dias(texto)
+
+    def test_formato_por_extension(self):
+        """Verifica que el formato se deduce de la extensión."""
+        assert detectar_formato("turnos.CSV") == "csv"
+        assert detectar_formato("turnos.ndjson") == "jsonl"
+        with pytest.raises(ErrorEntrada):
+            detectar_formato("turnos.xlsx")
+
+
+@pytest.mark.unit
+class TestLeerTurnos:
+    """Pruebas para la lectura de archivos de turnos."""
+
+    def test_csv_agrupa_por_turno(self, tmp_path):
+        """Verifica que las filas consecutivas del mismo turno forman un solo turno."""
+        ruta = escribir(tmp_path, "turnos.csv",
+                        "Turno;Nombre;Dias;Hora_Ingreso;Hora_Salida;Duracion\n"
+                        "a;;Lu-Ju;08:00;17:00;\n"
+                        "a;;Vi;08:00;14:00;\n"
+                        "b;Noche;Lu;22:00;06:00;\n"
+                        "c;;Sa;09:00;;240\n")
+
+        leidos = list(leer_turnos(ruta))
+
+        assert [l.ubicacion for l in leidos] == ["línea 2", "línea 4", "línea 5"]
+        assert horario(leidos[0].turno)[3:] == [("Jueves", time(8, 0), 540), ("Viernes", time(8, 0), 360)]
+        assert not leidos[0].nombre_fijo
+        assert (leidos[1].turno.nombre, leidos[1].nombre_fijo) == ("Noche", True)
+        assert horario(leidos[1].turno) == [("Lunes", time(22, 0), 480)]
+        assert horario(leidos[2].turno) == [("Sábado", time(9, 0), 240)]
+
+    def test_csv_sin_columna_turno(self, tmp_path):
+        """Verifica que, sin la columna turno, cada fila es un turno y se detecta la coma."""
+        ruta = escribir(tmp_path, "turnos.csv", "dias,hora_ingreso,duracion\nLu,08:00,480\nLu,08:00,480\n")
+        assert len(list(leer_turnos(ruta))) == 2
+
+    def test_errores_por_registro(self, tmp_path):
+        """Verifica que los registros inválidos se informan con su línea y no detienen la lectura."""
+        ruta = escribir(tmp_path, "turnos.csv",
+                        "turno;dias;hora_ingreso;hora_salida;vigencia\n"
+                        "a;Lu;25:00;10:00;\n"
+                        "b;Lu;08:00;16:00;1\n"
+                        "c;Lu;08:00;08:00;\n"
+                        "d;Lu;08:00;16:00;2\n"
+                        "e;Lu;08:00;12:00;\n"
+                        "e;Lunes;13:00;17:00;\n")
+        errores = []
+
+        leidos = list(leer_turnos(ruta, al_error=errores.append))
+
+        assert [l.ubicacion for l in leidos] == ["línea 3"]
+        assert [str(e).split(":")[0] for e in errores] == ["línea 2", "línea 4", "línea 5", "línea 6"]
+        with pytest.raises(ErrorEntrada, match="línea 2"):
+            list(leer_turnos(ruta))
+
+    def test_csv_sin_encabezado(self, tmp_path):
+        """Verifica que un CSV sin las columnas esperadas se rechaza entero."""
+        ruta = escribir(tmp_path, "turnos.csv", "Lu;08:00;16:00\n")
+        with pytest.raises(ErrorEntrada):
+            list(leer_turnos(ruta))
+
+    def test_json_por_bloques(self, tmp_path, monkeypatch):
+        """Verifica la lectura de una lista JSON cuyos elementos quedan cortados entre bloques."""
+        registros = [
+            {"nombre": "Oficina", "vigencia": 0, "detalles": [
+                {"dias": ["Lunes", "Martes"], "hora_ingreso": "08:30", "hora_salida": "17:30"},
+                {"dias": "Vi", "hora_ingreso": "08:30", "duracion": 300},
+            ]},
+            {"dias": "Sa a Do", "hora_ingreso": "20:00:00", "hora_salida": "08:00"},
+        ]
+        ruta = escribir(tmp_path, "turnos.json", json.dumps(registros, ensure_ascii=False, indent=2))
+        monkeypatch.setattr(lectura, "TAMANO_BLOQUE_JSON", 16)
+
+        leidos = list(leer_turnos(ruta))
+
+        assert [l.ubicacion for l in leidos] == ["registro 1", "registro 2"]
+        assert leidos[0].turno.vigencia == 0
+        assert [d.jornada for d in leidos[0].turno.detalles] == ["Lunes", "Martes", "Viernes"]
+        assert horario(leidos[1].turno) == [("Sábado", time(20, 0), 720), ("Domingo", time(20, 0), 720)]
+
+    def test_json_incompleto(self, tmp_path):
+        """Verifica que una lista JSON cortada se rechaza."""
+        ruta = escribir(tmp_path, "turnos.json", '[{"dias": "Lu", "hora_ingreso": "08:00", "duracion": 60}, {"dias"')
+        with pytest.raises(ErrorEntrada, match="incompleto"):
+            list(leer_turnos(ruta))
+
+    def test_json_lines(self, tmp_path):
+        """Verifica que cada línea es un turno y que una línea inválida se informa."""
+        ruta = escribir(tmp_path, "turnos.jsonl",
+                        '{"dias": "Lu", "hora_ingreso": "08:00", "duracion": 60}\n'
+                        '\n'
+                        '{"dias": "Lu", \n'
+                        '{"dias": "Ma", "hora_ingreso": "09:00", "duracion": 60}\n')
+        errores = []
+
+        leidos = list(leer_turnos(ruta, al_error=errores.append))
+
+        assert [l.ubicacion for l in leidos] == ["línea 1", "línea 4"]
+        assert len(errores) == 1 and str(errores[0]).startswith("línea 3")
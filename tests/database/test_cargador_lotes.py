@@ -0,0 +1,105 @@
+import pytest
+import cx_Oracle
+from unittest.mock import MagicMock
+
+from src.database.cargador_lotes import CargadorPorLotes, consultar_por_lista
+
+
+@pytest.fixture
+def db():
+    """Conexión simulada que ejecuta las funciones de ejecutar_async de inmediato."""
+    db = MagicMock()
+    
+    def _ejecutar_async(funcion, on_result=None, on_error=None):
+        try:
+            resultado = funcion()
+        except Exception as e:
+            on_error(str(e))
+        else:
+            on_result(resultado)
+    db.ejecutar_async.side_effect = _ejecutar_async
+    return db
+
+
+@pytest.mark.unit
+class TestCargadorPorLotes:
+    """Pruebas para la agrupación de búsquedas por clave."""
+    
+    def test_un_lote_por_ciclo_sin_repetidos(self, db, qtbot):
+        """Prueba que las claves de un mismo ciclo se resuelvan juntas y sin repetir."""
+        lotes = []
+        cargador = CargadorPorLotes(db, lambda claves: lotes.append(claves) or {clave: clave * 10 for clave in claves if clave != 3})
+        recibidos = []
+        
+        for clave in (1, 2, 1, 3):
+            cargador.cargar(clave, lambda valor, clave=clave: recibidos.append((clave, valor)))
+        assert lotes == []
+        
+        qtbot.waitUntil(lambda: len(recibidos) == 4, timeout=1000)
+        assert lotes == [[1, 2, 3]]
+        assert sorted(recibidos) == [(1, 10), (1, 10), (2, 20), (3, None)]
+    
+    def test_cache_hasta_limpiar(self, db, qtbot):
+        """Prueba que una clave ya resuelta no se vuelva a consultar hasta limpiar la caché."""
+        funcion_lote = MagicMock(side_effect=lambda claves: {clave: "valor" for clave in claves})
+        cargador = CargadorPorLotes(db, funcion_lote)
+        recibidos = []
+        
+        cargador.cargar("a", recibidos.append)
+        qtbot.waitUntil(lambda: recibidos == ["valor"], timeout=1000)
+        cargador.cargar("a", recibidos.append)
+        assert recibidos == ["valor", "valor"]
+        assert funcion_lote.call_count == 1
+        
+        cargador.limpiar()
+        cargador.cargar("a", recibidos.append)
+        qtbot.waitUntil(lambda: len(recibidos) == 3, timeout=1000)
+        assert funcion_lote.call_count == 2
+    
+    def test_error_a_todas_las_claves(self, db, qtbot):
+        """Prueba que un fallo del lote se informe a cada clave y no quede en la caché."""
+        def _fallar(claves):
+            raise cx_Oracle.DatabaseError("sin conexión")
+        cargador = CargadorPorLotes(db, _fallar)
+        errores = []
+        
+        cargador.cargar(1, lambda valor: None, errores.append)
+        cargador.cargar(2, lambda valor: None, errores.append)
+        qtbot.waitUntil(lambda: len(errores) == 2, timeout=1000)
+        
+        assert errores == ["sin conexión", "sin conexión"]
+        assert cargador._cache == {} and cargador._en_curso == {}
+    
+    def test_clave_en_curso_se_suma_al_lote(self, qtbot):
+        """Prueba que una clave pedida mientras su lote está en curso espere ese mismo resultado."""
+        db = MagicMock()
+        cargador = CargadorPorLotes(db, lambda claves: {clave: "valor" for clave in claves})
+        recibidos = []
+        
+        cargador.cargar(1, recibidos.append)
+        qtbot.waitUntil(lambda: db.ejecutar_async.called, timeout=1000)
+        cargador.cargar(1, recibidos.append)
+        db.ejecutar_async.call_args[1]["on_result"]({1: "valor"})
+        
+        assert db.ejecutar_async.call_count == 1
+        assert recibidos == ["valor", "valor"]
+
+
+@pytest.mark.unit
+class TestConsultarPorLista:
+    """Pruebas para las consultas con listas IN enlazadas."""
+    
+    def test_bloques_y_error(self):
+        """Prueba la división en bloques y que una consulta fallida lance un error."""
+        db = MagicMock()
+        db.execute_query.side_effect = lambda query, params: [(valor,) for valor in params.values()]
+        
+        filas = consultar_por_lista(db, "SELECT X FROM T WHERE X IN ({ids})", list(range(5)), tamano_bloque=2)
+        
+        assert filas == [(0,), (1,), (2,), (3,), (4,)]
+        assert db.execute_query.call_args_list[0][0][0] == "SELECT X FROM T WHERE X IN (:id0, :id1)"
+        
+        db.execute_query.side_effect = None
+        db.execute_query.return_value = None
+        with pytest.raises(cx_Oracle.DatabaseError):
+            consultar_por_lista(db, "SELECT X FROM T WHERE X IN ({ids})", ["a"])
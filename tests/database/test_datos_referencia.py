@@ -0,0 +1,163 @@
+import pytest
+from unittest.mock import patch
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QComboBox
+
+from src.database import datos_referencia as modulo
+from src.database.datos_referencia import Organismo, ServicioDatosReferencia
+from src.database.oracle_connection import OracleConnection
+from src.database.sqlite_backend import SQLiteBackend
+
+ORGANISMOS = [
+    (1, "Facultad de Medicina", 1),
+    (2, "Facultad de Derecho", 1),
+    (3, "Dirección de Finanzas", 1),
+    (4, "Facultad Antigua", 0),
+]
+
+
+@pytest.fixture
+def backend():
+    """Fixture que crea un backend SQLite en memoria con algunos organismos."""
+    backend = SQLiteBackend()
+    backend.insertar("DATOS_TRANSVERSALES.ORGANISMO", ("ID_ORGANISMO", "NOMBRE", "VIGENCIA"), ORGANISMOS)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def servicio(backend):
+    """Fixture con un servicio nuevo sobre el backend SQLite."""
+    conexion = OracleConnection()
+    conexion.usar_backend(backend)
+    ServicioDatosReferencia._instance = None
+    servicio = ServicioDatosReferencia()
+    yield servicio
+    if servicio._temporizador is not None:
+        servicio._temporizador.stop()
+    ServicioDatosReferencia._instance = None
+    conexion.clear_cache()
+    conexion.usar_backend(None)
+
+
+@pytest.mark.unit
+class TestServicioDatosReferencia:
+    """Pruebas para el servicio de datos de referencia."""
+
+    def test_singleton(self, servicio):
+        """Verifica que todas las pestañas reciben el mismo servicio."""
+        assert ServicioDatosReferencia() is servicio
+
+    def test_carga_e_indices(self, servicio):
+        """Verifica la carga ordenada por nombre y las búsquedas por ID y por prefijo."""
+        assert [o.nombre for o in servicio.cargar_organismos()] == [
+            "Dirección de Finanzas", "Facultad de Derecho", "Facultad de Medicina"
+        ]
+        assert servicio.obtener_organismo(2) == Organismo(2, "Facultad de Derecho")
+        assert servicio.obtener_organismo(4) is None
+
+        assert [o.id_organismo for o in servicio.buscar_organismos("facultad")] == [2, 1]
+        assert [o.id_organismo for o in servicio.buscar_organismos("DIRECCION")] == [3]
+        assert servicio.buscar_organismos("Rectoría") == []
+        assert len(servicio.buscar_organismos("")) == 3
+
+    def test_primera_carga_en_una_consulta(self, servicio):
+        """Verifica que la firma llega con los organismos, sin otro viaje a la base de datos."""
+        with patch.object(servicio.db, 'execute_query', wraps=servicio.db.execute_query) as consulta:
+            servicio.cargar_organismos()
+
+        consulta.assert_called_once()
+        assert "ORA_ROWSCN" in consulta.call_args[0][0]
+        assert consulta.call_args[1]["cache_key"] == modulo.CLAVE_CACHE_ORGANISMOS
+
+    def test_sin_cambios_no_recarga(self, servicio):
+        """Verifica que, si la firma no cambia, la verificación no vuelve a leer la tabla."""
+        servicio.cargar_organismos()
+        with patch.object(servicio.db, 'execute_query', wraps=servicio.db.execute_query) as consulta:
+            assert not servicio.verificar_cambios()
+            servicio.cargar_organismos()
+
+        consulta.assert_called_once()
+        assert "ORA_ROWSCN" in consulta.call_args[0][0]
+
+    def test_verificacion_limitada_por_intervalo(self, servicio, monkeypatch):
+        """Verifica que cargar_organismos solo consulta la firma tras el intervalo."""
+        servicio.cargar_organismos()
+        with patch.object(servicio, 'verificar_cambios') as verificar:
+            servicio.cargar_organismos()
+            verificar.assert_not_called()
+
+            monkeypatch.setattr(modulo.time, 'monotonic', lambda: servicio._verificado + 61)
+            servicio.cargar_organismos()
+            verificar.assert_called_once()
+
+    def test_cambio_en_la_tabla_recarga(self, servicio, backend, qapp):
+        """Verifica que un organismo nuevo se detecta con la firma y llega al modelo compartido."""
+        modelo = servicio.modelo_organismos()
+        servicio.cargar_organismos()
+        assert modelo.rowCount() == 4
+
+        backend.insertar("DATOS_TRANSVERSALES.ORGANISMO", ("ID_ORGANISMO", "NOMBRE", "VIGENCIA"),
+                         [(5, "Escuela de Posgrado", 1)])
+
+        assert [o.id_organismo for o in servicio.cargar_organismos(forzar=True)] == [3, 5, 2, 1]
+        assert modelo.rowCount() == 5
+        assert servicio.obtener_organismo(5).nombre == "Escuela de Posgrado"
+
+        # Una modificación no cambia el número de filas, pero sí la firma
+        with backend.acquire() as conn:
+            conn.cursor().execute("UPDATE DATOS_TRANSVERSALES.ORGANISMO SET NOMBRE = 'Escuela de Graduados' "
+                                  "WHERE ID_ORGANISMO = 5")
+            conn.commit()
+        assert servicio.verificar_cambios()
+        assert servicio.obtener_organismo(5).nombre == "Escuela de Graduados"
+
+    def test_modelo_compartido(self, servicio, qapp):
+        """Verifica que el modelo tiene "Todos los organismos" y el ID en UserRole."""
+        servicio.cargar_organismos()
+        modelo = servicio.modelo_organismos()
+
+        assert servicio.modelo_organismos() is modelo
+        assert modelo.item(0).text() == "Todos los organismos"
+        assert modelo.item(0).data(Qt.ItemDataRole.UserRole) is None
+        assert (modelo.item(1).text(), modelo.item(1).data(Qt.ItemDataRole.UserRole)) == ("Dirección de Finanzas", 3)
+
+    def test_combo_conserva_la_seleccion(self, servicio, backend, qtbot):
+        """Verifica que al recargar el modelo cada combo mantiene el organismo elegido."""
+        servicio.cargar_organismos()
+        combo = QComboBox()
+        qtbot.addWidget(combo)
+        combo.setModel(servicio.modelo_organismos())
+        combo.setCurrentIndex(combo.findData(2))
+
+        backend.insertar("DATOS_TRANSVERSALES.ORGANISMO", ("ID_ORGANISMO", "NOMBRE", "VIGENCIA"),
+                         [(5, "Escuela de Posgrado", 1)])
+        with backend.acquire() as conn:
+            conn.cursor().execute("UPDATE DATOS_TRANSVERSALES.ORGANISMO SET VIGENCIA = 0 WHERE ID_ORGANISMO = 3")
+            conn.cursor().execute("UPDATE DATOS_TRANSVERSALES.ORGANISMO SET NOMBRE = 'Facultad de Ciencias' "
+                                  "WHERE ID_ORGANISMO = 1")
+            conn.commit()
+        assert servicio.verificar_cambios()
+
+        modelo = servicio.modelo_organismos()
+        assert [modelo.item(fila).data(Qt.ItemDataRole.UserRole) for fila in range(modelo.rowCount())] == [None, 5, 1, 2]
+        assert modelo.item(2).text() == "Facultad de Ciencias"
+        assert combo.currentData() == 2
+
+    def test_verificacion_en_segundo_plano(self, servicio, backend, qtbot):
+        """Verifica que, con el modelo creado, el temporizador detecta cambios sin bloquear."""
+        modelo = servicio.modelo_organismos()
+        servicio.cargar_organismos()
+        assert servicio._temporizador.isActive()
+        assert servicio._temporizador.interval() == servicio.INTERVALO_VERIFICACION * 1000
+
+        backend.insertar("DATOS_TRANSVERSALES.ORGANISMO", ("ID_ORGANISMO", "NOMBRE", "VIGENCIA"),
+                         [(5, "Escuela de Posgrado", 1)])
+        with patch.object(servicio, 'verificar_cambios') as verificar:
+            servicio._temporizador.timeout.emit()
+            qtbot.waitUntil(lambda: modelo.rowCount() == 5, timeout=5000)
+            # Con el temporizador activo, cargar_organismos no consulta la firma en el hilo de la interfaz
+            servicio._verificado = 0.0
+            servicio.cargar_organismos()
+        verificar.assert_not_called()
+        assert servicio.obtener_organismo(5).nombre == "Escuela de Posgrado"
@@ -0,0 +1,82 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from src.database.disk_cache import DiskCache, directorio_cache_usuario
+
+@pytest.mark.unit
+class TestDiskCache:
+    """Pruebas para la caché persistente en disco."""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Fixture que crea una caché en un archivo temporal."""
+        cache = DiskCache(ruta=str(tmp_path / "cache" / "consultas.sqlite3"))
+        yield cache
+        cache.close()
+    
+    def test_get_put_conserva_tipos(self, cache):
+        """Prueba que los resultados se recuperen con sus tipos originales."""
+        filas = [(1, "Organismo 1", datetime(2024, 1, 1, 8, 0)), (2, None, None)]
+        
+        assert cache.get("organismos") is None
+        assert cache.put("organismos", filas, tables=["DATOS_TRANSVERSALES.ORGANISMO"]) is True
+        
+        valor, guardado = cache.get("organismos")
+        assert valor == filas
+        assert guardado <= time.time()
+    
+    def test_sobrevive_entre_instancias(self, tmp_path):
+        """Prueba que los datos sigan disponibles al reabrir el archivo (nueva sesión)."""
+        ruta = str(tmp_path / "consultas.sqlite3")
+        primera = DiskCache(ruta=ruta)
+        primera.put("catalogo", [(1, "Turno 1")])
+        primera.close()
+        
+        segunda = DiskCache(ruta=ruta)
+        assert segunda.get("catalogo")[0] == [(1, "Turno 1")]
+        segunda.close()
+    
+    def test_entrada_antigua_no_se_sirve(self, tmp_path):
+        """Prueba que no se sirvan entradas más antiguas que max_age."""
+        cache = DiskCache(ruta=str(tmp_path / "consultas.sqlite3"), max_age=timedelta(seconds=0))
+        cache.put("organismos", [(1,)])
+        time.sleep(0.01)
+        
+        assert cache.get("organismos") is None
+        cache.close()
+    
+    def test_invalidate_por_tabla_y_clave(self, cache):
+        """Prueba que invalidate descarte solo las entradas afectadas."""
+        cache.put("organismos", [(1,)], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        cache.put("catalogo", [(2,)], tables=["ASISTENCIAS.TURNO"])
+        cache.put("otro", [(3,)], tables=["ASISTENCIAS.TURNO_DETALLE_DIARIO"])
+        
+        assert cache.invalidate(table="asistencias.turno") == 1
+        assert cache.get("catalogo") is None
+        assert cache.get("otro") is not None
+        
+        assert cache.invalidate(key="organismos") == 1
+        assert cache.get("organismos") is None
+    
+    def test_invalidate_guion_bajo_no_es_comodin(self, cache):
+        """Prueba que el '_' de los nombres de tabla se compare literalmente."""
+        cache.put("detalles", [(1,)], tables=["ASISTENCIAS.TURNOXDETALLEXDIARIO"])
+        
+        assert cache.invalidate(table="ASISTENCIAS.TURNO_DETALLE_DIARIO") == 0
+        assert cache.get("detalles") is not None
+    
+    def test_archivo_corrupto_se_trata_como_fallo(self, tmp_path):
+        """Prueba que un archivo ilegible no interrumpa la consulta."""
+        ruta = tmp_path / "consultas.sqlite3"
+        ruta.write_bytes(b"esto no es una base de datos sqlite")
+        cache = DiskCache(ruta=str(ruta))
+        
+        assert cache.get("organismos") is None
+        assert cache.put("organismos", [(1,)]) is False
+    
+    def test_directorio_cache_usuario_respeta_xdg(self, monkeypatch, tmp_path):
+        """Prueba que en Linux se use $XDG_CACHE_HOME cuando está definido."""
+        monkeypatch.setattr("sys.platform", "linux")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        
+        assert directorio_cache_usuario() == str(tmp_path / "GestionTurnos")
@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import MagicMock
+from src.database.id_allocator import IdAllocator, ColisionIdsError
+from src.models.turno import Turno, TurnoDetalleDiario
+from datetime import time
+
+
+@pytest.fixture
+def allocator():
+    """Fixture que crea un asignador nuevo con una base de datos simulada."""
+    IdAllocator._instance = None
+    allocator = IdAllocator()
+    allocator.db = MagicMock()
+    allocator.tamano_bloque = 10
+    yield allocator
+    IdAllocator._instance = None
+
+
+def crear_turno(id_turno, ids_detalle):
+    """Crea un turno con un detalle por cada ID indicado."""
+    turno = Turno()
+    turno.id_turno = id_turno
+    for id_detalle in ids_detalle:
+        turno.detalles.append(TurnoDetalleDiario(id_detalle, id_turno, "LUNES", time(8, 0), 480))
+    return turno
+
+
+@pytest.mark.unit
+class TestIdAllocator:
+    """Pruebas para el asignador de IDs por bloques."""
+    
+    def test_singleton_pattern(self, allocator):
+        """Prueba que el asignador implemente el patrón Singleton."""
+        assert IdAllocator() is allocator
+    
+    def test_reserva_por_bloques(self, allocator):
+        """Prueba que se consulte la base de datos solo al agotar el bloque."""
+        allocator.db.execute_query.side_effect = [[(100, 500)], [(100, 500)]]
+        
+        ids = [allocator.reservar_turnos(1)[0] for _ in range(12)]
+        
+        assert ids == list(range(101, 113))
+        # Un bloque de 10 más una segunda sincronización
+        assert allocator.db.execute_query.call_count == 2
+    
+    def test_sincronizar_no_retrocede(self, allocator):
+        """Prueba que los IDs ya entregados no se repitan aunque la tabla no haya cambiado."""
+        allocator.db.execute_query.return_value = [(100, 500)]
+        
+        entregados = allocator.reservar_turnos(3)
+        allocator.sincronizar()
+        
+        assert allocator.proximo_id_turno() == entregados[-1] + 1
+    
+    def test_asignar_ids_detalles_consecutivos(self, allocator):
+        """Prueba que los detalles reciban IDs consecutivos y el ID del turno."""
+        allocator.db.execute_query.return_value = [(100, 500)]
+        turno = crear_turno(0, [0, 0, 0])
+        
+        allocator.asignar(turno)
+        
+        assert turno.id_turno == 101
+        assert [d.id_turno_detalle_diario for d in turno.detalles] == [501, 502, 503]
+        assert all(d.id_turno == 101 for d in turno.detalles)
+    
+    def test_renumerar_conserva_ids_libres(self, allocator):
+        """Prueba que un lote sin colisiones se verifique con una sola consulta y no cambie."""
+        allocator.db.execute_query.return_value = []
+        turnos = [crear_turno(101 + i, [501 + 2 * i, 502 + 2 * i]) for i in range(500)]
+        
+        assert allocator.renumerar(turnos) is False
+        assert allocator.db.execute_query.call_count == 1
+        _, params = allocator.db.execute_query.call_args[0]
+        assert params == {"turno_desde": 101, "turno_hasta": 600, "detalle_desde": 501, "detalle_hasta": 1500}
+    
+    def test_renumerar_ante_colision(self, allocator):
+        """Prueba que si un ID ya existe se asigne un bloque nuevo a todo el lote."""
+        allocator.db.execute_query.side_effect = [
+            [('T', 101)],      # El turno 101 ya existe
+            [(101, 600)],      # Nuevo máximo de ambas tablas
+            [],                # El bloque nuevo está libre
+        ]
+        turnos = [crear_turno(101, [501]), crear_turno(102, [502, 503])]
+        
+        assert allocator.renumerar(turnos) is True
+        assert [t.id_turno for t in turnos] == [102, 103]
+        assert [d.id_turno_detalle_diario for t in turnos for d in t.detalles] == [601, 602, 603]
+        assert turnos[1].detalles[0].id_turno == 103
+    
+    def test_renumerar_agota_reintentos(self, allocator):
+        """Prueba que se informe el error si nunca se encuentra un bloque libre."""
+        allocator.db.execute_query.side_effect = lambda query, params=None: (
+            [(100, 500)] if "DUAL" in query else [('T', params["turno_desde"])]
+        )
+        
+        with pytest.raises(ColisionIdsError):
+            allocator.renumerar([crear_turno(101, [501])])
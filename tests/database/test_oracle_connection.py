@@ -1,7 +1,11 @@
 import pytest
+import threading
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
-from src.database.oracle_connection import OracleConnection
+from src.database.oracle_connection import (
+    OracleConnection, ESTADO_DESCONECTADO, ESTADO_CONECTANDO, ESTADO_CONECTADO, ESTADO_ERROR
+)
+from src.database.disk_cache import DiskCache
 
 @pytest.mark.unit
 class TestOracleConnection:
@@ -190,4 +194,434 @@ class TestOracleConnection:
         connection_mock.close.assert_called_once()
         
         # Verificar que se estableció la conexión a None
-        assert conn.connection is None 
\ No newline at end of file
+        assert conn.connection is None 
+
+    def test_conexion_unica_sin_bloqueo_cruzado(self):
+        """Prueba que una consulta no espere a connect() con la conexión tomada, ni bloquee la caché."""
+        conn = OracleConnection()
+        conn.connection = MagicMock()
+        conectando = threading.Event()
+        continuar = threading.Event()
+        terminados = []
+        
+        def precarga_en_connect():
+            # Como connect() en segundo plano: consulta mientras tiene _lock_conexion
+            with conn._lock_conexion:
+                conectando.set()
+                continuar.wait(5)
+                with conn.acquire():
+                    terminados.append("precarga")
+        
+        def consulta():
+            with conn.acquire():
+                terminados.append("consulta")
+        
+        try:
+            with patch.object(OracleConnection, '_is_connection_valid', return_value=True):
+                hilo_precarga = threading.Thread(target=precarga_en_connect, daemon=True)
+                hilo_precarga.start()
+                assert conectando.wait(5)
+                hilo_consulta = threading.Thread(target=consulta, daemon=True)
+                hilo_consulta.start()
+                continuar.set()
+                hilo_precarga.join(5)
+                hilo_consulta.join(5)
+                assert sorted(terminados) == ["consulta", "precarga"]
+                
+                # Durante una consulta, la caché y las señales (_lock) siguen disponibles
+                def usar_cache():
+                    if conn._lock.acquire(timeout=1):
+                        conn._lock.release()
+                        terminados.append("cache")
+                
+                with conn.acquire():
+                    hilo = threading.Thread(target=usar_cache, daemon=True)
+                    hilo.start()
+                    hilo.join(5)
+                assert terminados[-1] == "cache"
+        finally:
+            conn.connection = None
+
+@pytest.mark.unit
+class TestOracleConnectionPool:
+    """Pruebas para el modo pool de sesiones de OracleConnection."""
+    
+    @pytest.fixture
+    def conn(self):
+        """Fixture que devuelve la instancia singleton y restaura el modo conexión única al terminar."""
+        conn = OracleConnection()
+        conn.connection = None
+        conn.connection_attempts = 0
+        yield conn
+        conn.use_pool = False
+        conn.pool = None
+        conn.pool_min, conn.pool_max, conn.pool_increment = 1, 4, 1
+    
+    def test_enable_pool_configuracion_invalida(self, conn):
+        """Prueba que enable_pool rechace tamaños incoherentes."""
+        with pytest.raises(ValueError):
+            conn.enable_pool(min_sessions=5, max_sessions=2)
+        
+        assert conn.use_pool is False
+    
+    @patch('cx_Oracle.SessionPool')
+    @patch('cx_Oracle.makedsn')
+    def test_connect_crea_pool(self, mock_makedsn, mock_session_pool, conn):
+        """Prueba que connect cree el pool con los tamaños configurados."""
+        conn.enable_pool(min_sessions=2, max_sessions=8, increment=2)
+        
+        with patch.object(OracleConnection, '_prefetch_common_queries'):
+            result = conn.connect()
+        
+        assert result is mock_session_pool.return_value
+        _, kwargs = mock_session_pool.call_args
+        assert kwargs["min"] == 2
+        assert kwargs["max"] == 8
+        assert kwargs["increment"] == 2
+        assert kwargs["threaded"] is True
+        assert conn.is_connected() is True
+    
+    def test_acquire_devuelve_sesion_al_pool(self, conn):
+        """Prueba que acquire tome una sesión del pool y la libere al salir del bloque."""
+        conn.use_pool = True
+        conn.pool = MagicMock()
+        sesion = conn.pool.acquire.return_value
+        
+        with conn.acquire() as sesion_obtenida:
+            assert sesion_obtenida is sesion
+            conn.pool.release.assert_not_called()
+        
+        conn.pool.release.assert_called_once_with(sesion)
+    
+    def test_acquire_descarta_sesion_con_error(self, conn):
+        """Prueba que una sesión que falló se descarte del pool en lugar de devolverse."""
+        import cx_Oracle
+        conn.use_pool = True
+        conn.pool = MagicMock()
+        sesion = conn.pool.acquire.return_value
+        
+        with pytest.raises(cx_Oracle.DatabaseError):
+            with conn.acquire():
+                raise cx_Oracle.DatabaseError("Sesión inválida")
+        
+        conn.pool.drop.assert_called_once_with(sesion)
+        conn.pool.release.assert_not_called()
+    
+    def test_execute_query_usa_sesion_del_pool(self, conn):
+        """Prueba que cada execute_query obtenga su propia sesión y cursor del pool."""
+        conn.use_pool = True
+        conn.pool = MagicMock()
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchall.return_value = [(1,)]
+        
+        assert conn.execute_query("SELECT 1 FROM DUAL") == [(1,)]
+        assert conn.execute_query("SELECT 1 FROM DUAL") == [(1,)]
+        
+        assert conn.pool.acquire.call_count == 2
+        assert conn.pool.release.call_count == 2
+        assert cursor.close.call_count == 2
+
+
+@pytest.mark.unit
+class TestOracleConnectionAsync:
+    """Pruebas para la ejecución asíncrona de consultas."""
+    
+    @patch.object(OracleConnection, 'execute_query')
+    def test_execute_query_async_entrega_resultados(self, mock_execute_query, qtbot):
+        """Prueba que los resultados lleguen al callback on_result sin bloquear el hilo llamador."""
+        mock_execute_query.return_value = [(1, "Turno 1")]
+        recibidos = []
+        
+        conn = OracleConnection()
+        conn.execute_query_async("SELECT 1 FROM DUAL", on_result=recibidos.append)
+        
+        qtbot.waitUntil(lambda: recibidos == [[(1, "Turno 1")]], timeout=5000)
+        mock_execute_query.assert_called_once_with("SELECT 1 FROM DUAL", None, cache_key=None, persist=False)
+    
+    @patch.object(OracleConnection, 'execute_query')
+    def test_execute_query_async_informa_error(self, mock_execute_query, qtbot):
+        """Prueba que un fallo de la consulta se informe mediante on_error."""
+        mock_execute_query.return_value = None
+        errores = []
+        resultados = []
+        
+        conn = OracleConnection()
+        conn.execute_query_async("SELECT 1 FROM DUAL", on_result=resultados.append, on_error=errores.append)
+        
+        qtbot.waitUntil(lambda: len(errores) == 1, timeout=5000)
+        assert resultados == []
+    
+    @pytest.fixture
+    def conn_desconectada(self):
+        """Fixture que deja la conexión en segundo plano en su estado inicial al terminar."""
+        conn = OracleConnection()
+        conn.use_pool = False
+        yield conn
+        conn._estado_conexion = ESTADO_DESCONECTADO
+        conn._error_conexion = ""
+        conn._pendientes_conexion = []
+        conn._senales_conexion = None
+    
+    def test_consultas_esperan_la_conexion_en_segundo_plano(self, conn_desconectada, qtbot):
+        """Prueba que las consultas asíncronas se encolen hasta que la conexión esté lista."""
+        conn = conn_desconectada
+        liberar = threading.Event()
+        recibidos = []
+        
+        with patch.object(OracleConnection, 'connect', side_effect=lambda: liberar.wait(5) and MagicMock()), \
+                patch.object(OracleConnection, 'execute_query', return_value=[(1,)]) as mock_execute_query:
+            with qtbot.waitSignal(conn.senales_conexion().estado_cambiado, timeout=1000) as conectando:
+                conn.conectar_en_segundo_plano()
+            assert conectando.args == [ESTADO_CONECTANDO, ""]
+            
+            conn.execute_query_async("SELECT 1 FROM DUAL", on_result=recibidos.append)
+            conn.cuando_conectado(lambda: recibidos.append("accion"))
+            qtbot.wait(50)
+            assert recibidos == []
+            mock_execute_query.assert_not_called()
+            
+            liberar.set()
+            qtbot.waitUntil(lambda: len(recibidos) == 2, timeout=5000)
+        
+        assert recibidos == ["accion", [(1,)]]
+        assert conn.estado_conexion == ESTADO_CONECTADO
+    
+    def test_fallo_de_conexion_y_reintento(self, conn_desconectada, qtbot):
+        """Prueba que tras un fallo las acciones sigan a la espera y se ejecuten al reintentar."""
+        conn = conn_desconectada
+        ejecutadas = []
+        
+        with patch.object(OracleConnection, 'connect', return_value=None):
+            with qtbot.waitSignal(conn.senales_conexion().estado_cambiado,
+                                  check_params_cb=lambda estado, mensaje: estado == ESTADO_ERROR, timeout=5000):
+                conn.conectar_en_segundo_plano()
+        assert conn.error_conexion
+        conn.cuando_conectado(lambda: ejecutadas.append(1))
+        assert ejecutadas == []
+        
+        with patch.object(OracleConnection, 'connect', return_value=MagicMock()):
+            conn.conectar_en_segundo_plano()
+            qtbot.waitUntil(lambda: ejecutadas == [1], timeout=5000)
+        assert conn.estado_conexion == ESTADO_CONECTADO
+
+
+@pytest.mark.unit
+class TestOracleConnectionDiskCache:
+    """Pruebas para la caché persistente en disco de OracleConnection."""
+    
+    QUERY = "SELECT ID_ORGANISMO, NOMBRE FROM DATOS_TRANSVERSALES.ORGANISMO"
+    
+    @pytest.fixture
+    def conn(self, tmp_path):
+        """Fixture que usa una caché en disco temporal y restaura el estado al terminar."""
+        conn = OracleConnection()
+        conn._cache.clear()
+        conn._disk_cache = DiskCache(ruta=str(tmp_path / "cache.sqlite3"))
+        conn._claves_revalidadas.clear()
+        yield conn
+        if conn._revalidador is not None:
+            conn._revalidador.shutdown(wait=True)
+            conn._revalidador = None
+        conn._disk_cache.close()
+        conn._disk_cache = None
+        conn._cache.clear()
+        conn._claves_revalidadas.clear()
+    
+    def test_persist_guarda_en_disco(self, conn):
+        """Prueba que una consulta con persist=True se guarde también en disco."""
+        conn.use_pool = False
+        with patch.object(OracleConnection, 'is_connected', return_value=True), \
+                patch.object(OracleConnection, 'acquire') as mock_acquire:
+            cursor = mock_acquire.return_value.__enter__.return_value.cursor.return_value
+            cursor.fetchall.return_value = [(1, "Organismo 1")]
+            
+            resultados = conn.execute_query(self.QUERY, cache_key="organismos", persist=True)
+        
+        assert resultados == [(1, "Organismo 1")]
+        valor, _ = conn._disk_cache.get("organismos")
+        assert valor == [(1, "Organismo 1")]
+    
+    def test_sirve_desde_disco_y_revalida_una_vez(self, conn):
+        """Prueba que en una sesión nueva se sirva el disco y se revalide en segundo plano una sola vez."""
+        conn._disk_cache.put("organismos", [(1, "Antiguo")], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        original = OracleConnection.execute_query
+        llamadas_bd = []
+        
+        def _execute_query(self, query, params=None, cache_key=None, *args, **kwargs):
+            if cache_key is None:
+                llamadas_bd.append(query)
+                return [(1, "Nuevo")]
+            return original(self, query, params, cache_key, *args, **kwargs)
+        
+        with patch.object(OracleConnection, 'execute_query', _execute_query):
+            assert conn.execute_query(self.QUERY, cache_key="organismos", persist=True) == [(1, "Antiguo")]
+            conn._revalidador.shutdown(wait=True)
+            conn._revalidador = None
+            
+            # La revalidación actualizó ambas capas
+            assert conn.execute_query(self.QUERY, cache_key="organismos", persist=True) == [(1, "Nuevo")]
+            assert conn._disk_cache.get("organismos")[0] == [(1, "Nuevo")]
+            
+            # Aunque la memoria se vacíe, la clave no se vuelve a revalidar en la misma sesión
+            conn._cache.clear()
+            conn.execute_query(self.QUERY, cache_key="organismos", persist=True)
+        
+        assert llamadas_bd == [self.QUERY]
+        assert conn._revalidador is None
+    
+    def test_invalidate_cache_descarta_disco(self, conn):
+        """Prueba que invalidar una tabla descarte también las entradas en disco."""
+        conn._disk_cache.put("organismos", [(1, "Organismo 1")], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        conn._cache.put("organismos", [(1, "Organismo 1")], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        
+        assert conn.invalidate_cache(table="DATOS_TRANSVERSALES.ORGANISMO") == 2
+        assert conn._disk_cache.get("organismos") is None
+    
+    def test_limpiar_sin_archivo_no_lo_crea(self, conn, tmp_path):
+        """Prueba que limpiar o invalidar la caché no cree el archivo en disco si no existe."""
+        conn._disk_cache = DiskCache(ruta=str(tmp_path / "sin_usar.sqlite3"))
+        
+        conn.clear_cache()
+        assert conn.invalidate_cache(table="ASISTENCIAS.TURNO") == 0
+        
+        assert not (tmp_path / "sin_usar.sqlite3").exists()
+    
+    def test_senales_de_revalidacion_e_invalidacion(self, conn, qtbot):
+        """Prueba que la revalidación entregue los datos frescos y la invalidación informe la tabla."""
+        conn._disk_cache.put("organismos", [(1, "Antiguo")], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        senales = conn.senales_cache()
+        original = OracleConnection.execute_query
+        
+        def _execute_query(self, query, params=None, cache_key=None, *args, **kwargs):
+            if cache_key is None:
+                return [(1, "Nuevo")]
+            return original(self, query, params, cache_key, *args, **kwargs)
+        
+        try:
+            with patch.object(OracleConnection, 'execute_query', _execute_query), \
+                    qtbot.waitSignal(senales.revalidada, timeout=2000) as revalidada:
+                conn.execute_query(self.QUERY, cache_key="organismos", persist=True)
+            assert revalidada.args == ["organismos", [(1, "Nuevo")]]
+            
+            with qtbot.waitSignal(senales.invalidada, timeout=1000) as invalidada:
+                conn.invalidate_cache(table="datos_transversales.organismo")
+            assert invalidada.args == ["DATOS_TRANSVERSALES.ORGANISMO"]
+        finally:
+            conn._senales_cache = None
+
+
+@pytest.mark.unit
+class TestOracleConnectionIterQuery:
+    """Pruebas para la lectura por lotes de iter_query."""
+    
+    @pytest.fixture
+    def conn(self):
+        """Fixture que usa una sesión simulada del pool."""
+        conn = OracleConnection()
+        conn.use_pool = True
+        conn.pool = MagicMock()
+        yield conn
+        conn.use_pool = False
+        conn.pool = None
+    
+    def test_iter_query_lee_por_lotes(self, conn):
+        """Prueba que las filas se pidan con fetchmany y se entreguen una a una."""
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        
+        filas = list(conn.iter_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO", batch_size=2))
+        
+        assert filas == [(1,), (2,), (3,)]
+        cursor.fetchmany.assert_called_with(2)
+        cursor.fetchall.assert_not_called()
+        assert cursor.arraysize == 2
+        assert cursor.prefetchrows == 2
+        cursor.close.assert_called_once()
+        conn.pool.release.assert_called_once()
+    
+    def test_iter_query_libera_sesion_al_cerrar(self, conn):
+        """Prueba que abandonar el generador devuelva la sesión al pool."""
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        
+        filas = conn.iter_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO", batch_size=2, arraysize=50)
+        assert next(filas) == (1,)
+        filas.close()
+        
+        assert cursor.arraysize == 50
+        cursor.close.assert_called_once()
+        conn.pool.release.assert_called_once()
+    
+    def test_execute_query_aplica_tamanos_de_lectura(self, conn):
+        """Prueba que execute_query configure arraysize y prefetchrows en el cursor."""
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchall.return_value = []
+        
+        conn.execute_query("SELECT 1 FROM DUAL")
+        
+        assert cursor.arraysize == conn.arraysize
+        assert cursor.prefetchrows == conn.prefetchrows
+
+
+@pytest.mark.unit
+class TestOracleConnectionStats:
+    """Pruebas para las estadísticas de consultas de OracleConnection."""
+    
+    @pytest.fixture
+    def conn(self):
+        """Fixture que usa una sesión simulada del pool y estadísticas vacías."""
+        conn = OracleConnection()
+        conn.use_pool = True
+        conn.pool = MagicMock()
+        conn._cache.clear()
+        conn.reset_stats()
+        yield conn
+        conn.use_pool = False
+        conn.pool = None
+        conn._cache.clear()
+        conn.reset_stats()
+    
+    def test_registra_latencia_filas_y_cache(self, conn):
+        """Prueba que cada llamada quede registrada con sus filas y el uso de la caché."""
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchall.return_value = [(1,), (2,)]
+        
+        conn.execute_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO WHERE ID_TURNO > :id", {"id": 0}, cache_key="t")
+        conn.execute_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO WHERE ID_TURNO > :id", {"id": 0}, cache_key="t")
+        
+        estadisticas = conn.stats()
+        consulta = estadisticas['consultas'][0]
+        assert consulta['llamadas'] == 2
+        assert consulta['filas_total'] == 4
+        assert consulta['fallos_cache'] == 1
+        assert consulta['aciertos_memoria'] == 1
+        assert consulta['formas_parametros'] == {"id:int": 2}
+        assert consulta['sitios'] == {"test_oracle_connection.test_registra_latencia_filas_y_cache": 2}
+        assert estadisticas['totales']['tasa_aciertos_cache'] == 0.5
+        cursor.fetchall.assert_called_once()
+    
+    @patch('src.database.oracle_connection.time.sleep')
+    def test_registra_reintentos_una_sola_vez(self, mock_sleep, conn):
+        """Prueba que un reintento tras un error se registre como una sola llamada."""
+        import cx_Oracle
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.execute.side_effect = [cx_Oracle.DatabaseError("ORA-03113"), None]
+        cursor.fetchall.return_value = [(1,)]
+        
+        assert conn.execute_query("SELECT 1 FROM DUAL") == [(1,)]
+        
+        consulta = conn.stats()['consultas'][0]
+        assert consulta['llamadas'] == 1
+        assert consulta['reintentos'] == 1
+        assert consulta['errores'] == 0
+    
+    def test_iter_query_y_reset(self, conn):
+        """Prueba que iter_query registre el total de filas y que reset_stats limpie todo."""
+        cursor = conn.pool.acquire.return_value.cursor.return_value
+        cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+        
+        list(conn.iter_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO", batch_size=2))
+        assert conn.stats()['consultas'][0]['filas_total'] == 2
+        
+        conn.reset_stats()
+        assert conn.stats()['consultas'] == []
@@ -0,0 +1,76 @@
+import pytest
+
+from src.database.oracle_connection import OracleConnection
+from src.database.paginador_keyset import PaginadorKeyset, condicion_posterior
+from src.database.sqlite_backend import SQLiteBackend, generar_datos
+
+CONSULTA_ASIGNACIONES = """
+    SELECT p.ID_PERSONA, t.ID_TURNO, p.APELLIDO_PATERNO, NVL(p.APELLIDO_MATERNO, ' '), p.NOMBRE, p.ID_PERSONA, t.ID_TURNO
+    FROM DATOS_TRANSVERSALES.PERSONA p
+    JOIN ASISTENCIAS.PERSONA_TURNO pt ON p.ID_PERSONA = pt.ID_PERSONA
+    JOIN ASISTENCIAS.TURNO t ON pt.ID_TURNO = t.ID_TURNO
+    WHERE 1=1
+"""
+CLAVE = ("p.APELLIDO_PATERNO", "NVL(p.APELLIDO_MATERNO, ' ')", "p.NOMBRE", "p.ID_PERSONA", "t.ID_TURNO")
+
+
+@pytest.fixture
+def db():
+    """Fixture que redirige OracleConnection a un backend SQLite con asignaciones sintéticas."""
+    backend = SQLiteBackend()
+    generar_datos(backend, num_turnos=100, num_personas=450, semilla=3)
+    conexion = OracleConnection()
+    conexion.usar_backend(backend)
+    yield conexion
+    conexion.usar_backend(None)
+    backend.close()
+
+
+@pytest.mark.unit
+class TestPaginadorKeyset:
+    """Pruebas para la paginación por clave."""
+
+    def test_condicion_posterior(self):
+        """Verifica la expansión de la comparación de tuplas en disyunciones."""
+        assert condicion_posterior(["a", "b"]) == "((a > :k0) OR (a = :k0 AND b > :k1))"
+
+    def test_primera_pagina_sin_condicion(self):
+        """Verifica que la primera página solo agrega el orden y pide una fila de más."""
+        paginador = PaginadorKeyset("SELECT A, B FROM T WHERE X = :x", {"x": 1}, ["A", "B"], tamano_pagina=2)
+        query, params = paginador.consulta_siguiente()
+
+        assert query == "SELECT A, B FROM T WHERE X = :x ORDER BY A, B FETCH FIRST 3 ROWS ONLY"
+        assert params == {"x": 1}
+
+    def test_pagina_siguiente_desde_la_ultima_clave(self):
+        """Verifica que la fila sobrante no se entrega y la página siguiente parte tras la última clave."""
+        paginador = PaginadorKeyset("SELECT A, B FROM T WHERE 1=1", {}, ["A", "B"], tamano_pagina=2)
+        pagina = paginador.recibir_pagina([("a", 1), ("a", 2), ("b", 1)])
+
+        assert pagina == [("a", 1), ("a", 2)]
+        assert not paginador.agotado
+        query, params = paginador.consulta_siguiente()
+        assert "AND ((A > :k0) OR (A = :k0 AND B > :k1)) ORDER BY A, B" in query
+        assert params == {"k0": "a", "k1": 2}
+
+        assert paginador.recibir_pagina([("b", 1)]) == [("b", 1)]
+        assert paginador.agotado
+        assert paginador.paginas_recibidas == 2
+
+    def test_tamano_invalido(self):
+        """Verifica que se rechaza un tamaño de página no positivo."""
+        with pytest.raises(ValueError):
+            PaginadorKeyset("SELECT 1 FROM DUAL WHERE 1=1", {}, ["1"], tamano_pagina=0)
+
+    def test_recorrido_completo_en_sqlite(self, db):
+        """Verifica que las páginas recorren todas las asignaciones una vez y en orden."""
+        completo = db.execute_query(CONSULTA_ASIGNACIONES + " ORDER BY " + ", ".join(CLAVE))
+        paginador = PaginadorKeyset(CONSULTA_ASIGNACIONES, {}, CLAVE, tamano_pagina=64)
+
+        filas = []
+        while not paginador.agotado:
+            filas.extend(paginador.recibir_pagina(db.execute_query(*paginador.consulta_siguiente())))
+
+        assert len(completo) > 64 * 3
+        assert filas == completo
+        assert paginador.paginas_recibidas == len(completo) // 64 + 1
@@ -0,0 +1,92 @@
+import pytest
+from datetime import timedelta
+from src.database.query_cache import QueryCache, extraer_tablas, estimar_tamano
+
+@pytest.mark.unit
+class TestQueryCache:
+    """Pruebas para la caché LRU de resultados de consultas."""
+    
+    def test_extraer_tablas(self):
+        """Prueba que se deduzcan las tablas leídas por una consulta."""
+        query = """
+            SELECT t.ID_TURNO FROM ASISTENCIAS.TURNO t
+            JOIN asistencias.turno_detalle_diario tdd ON t.ID_TURNO = tdd.ID_TURNO
+        """
+        assert extraer_tablas(query) == {"ASISTENCIAS.TURNO", "ASISTENCIAS.TURNO_DETALLE_DIARIO"}
+    
+    def test_get_put_y_contadores(self):
+        """Prueba que se registren aciertos y fallos."""
+        cache = QueryCache(max_entries=10)
+        
+        assert cache.get("turnos") is None
+        cache.put("turnos", [(1,), (2,)], tables=["ASISTENCIAS.TURNO"])
+        assert cache.get("turnos") == [(1,), (2,)]
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+    
+    def test_resultado_vacio_es_un_acierto(self):
+        """Prueba que un resultado vacío almacenado se distinga de una clave ausente."""
+        cache = QueryCache()
+        cache.put("vacio", [])
+        
+        sin_valor = object()
+        assert cache.get("vacio", sin_valor) == []
+    
+    def test_expulsion_lru_por_numero_de_entradas(self):
+        """Prueba que se expulse la entrada usada hace más tiempo al superar el límite."""
+        cache = QueryCache(max_entries=2)
+        cache.put("a", [(1,)])
+        cache.put("b", [(2,)])
+        cache.get("a")  # "a" pasa a ser la más reciente
+        cache.put("c", [(3,)])
+        
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()["evictions"] == 1
+    
+    def test_expulsion_por_presupuesto_de_bytes(self):
+        """Prueba que el presupuesto de bytes limite el contenido de la caché."""
+        fila = [(i, "x" * 100) for i in range(50)]
+        tamano = estimar_tamano(fila)
+        cache = QueryCache(max_entries=100, max_bytes=int(tamano * 2.5))
+        
+        cache.put("a", fila)
+        cache.put("b", list(fila))
+        cache.put("c", list(fila))
+        
+        assert len(cache) == 2
+        assert "a" not in cache
+        assert cache.stats()["bytes"] <= cache.max_bytes
+    
+    def test_valor_mayor_que_presupuesto_no_se_almacena(self):
+        """Prueba que un valor que excede el presupuesto no desplace al resto."""
+        cache = QueryCache(max_bytes=1000)
+        cache.put("pequeno", [(1,)])
+        
+        assert cache.put("grande", [("x" * 5000,)]) is False
+        assert "pequeno" in cache
+        assert "grande" not in cache
+    
+    def test_invalidate_por_tabla(self):
+        """Prueba que invalidate(table=...) descarte solo las entradas que leen esa tabla."""
+        cache = QueryCache()
+        cache.put("ultimo_id_turno", [(77,)], tables=["ASISTENCIAS.TURNO"])
+        cache.put("ultimo_id_detalle", [(400,)], tables=["ASISTENCIAS.TURNO_DETALLE_DIARIO"])
+        cache.put("organismos", [(1, "Rectoría")], tables=["DATOS_TRANSVERSALES.ORGANISMO"])
+        
+        assert cache.invalidate(table="asistencias.turno") == 1
+        assert "ultimo_id_turno" not in cache
+        assert "ultimo_id_detalle" in cache
+        assert "organismos" in cache
+    
+    def test_expiracion(self):
+        """Prueba que las entradas expiradas cuenten como fallo."""
+        cache = QueryCache(ttl=timedelta(0))
+        cache.put("a", [(1,)])
+        
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
@@ -0,0 +1,95 @@
+import pytest
+from src.database import query_stats as modulo_stats
+from src.database.query_stats import QueryStats, forma_parametros, normalizar_sql, sitio_llamada
+
+
+@pytest.mark.unit
+class TestNormalizacion:
+    """Pruebas para la normalización de consultas y parámetros."""
+
+    def test_normalizar_sql_quita_literales_y_espacios(self):
+        """Verifica que consultas con distintos literales se agrupen."""
+        a = normalizar_sql("SELECT * FROM ASISTENCIAS.TURNO\n   WHERE NOMBRE = 'A' AND ID_TURNO = 5")
+        b = normalizar_sql("SELECT * FROM ASISTENCIAS.TURNO WHERE NOMBRE = 'B''s' AND ID_TURNO = 10")
+        assert a == b == "SELECT * FROM ASISTENCIAS.TURNO WHERE NOMBRE = ? AND ID_TURNO = ?"
+
+    def test_normalizar_sql_agrupa_listas_in(self):
+        """Verifica que las listas IN de distinto largo cuenten como una sola consulta."""
+        a = normalizar_sql("SELECT 1 FROM T WHERE ID IN (:id0, :id1)")
+        b = normalizar_sql("SELECT 1 FROM T WHERE ID IN (:id0, :id1, :id2)")
+        assert a == b == "SELECT ? FROM T WHERE ID IN (:lista)"
+
+    def test_normalizar_sql_conserva_nombres_con_digitos(self):
+        """Verifica que los números dentro de identificadores y variables no se reemplacen."""
+        assert normalizar_sql("SELECT COL1 FROM T2 WHERE X = :id0") == "SELECT COL1 FROM T2 WHERE X = :id0"
+
+    def test_forma_parametros(self):
+        """Verifica que se describan los tipos sin los valores."""
+        assert forma_parametros({"nombre": "x", "id_turno": 5}) == "id_turno:int, nombre:str"
+        assert forma_parametros((1, None)) == "int, NoneType"
+        assert forma_parametros(None) == ""
+
+
+@pytest.mark.unit
+class TestQueryStats:
+    """Pruebas para la clase QueryStats."""
+
+    def test_agrupa_por_consulta_normalizada(self):
+        """Verifica los acumulados de llamadas, filas, caché y reintentos."""
+        stats = QueryStats()
+        stats.registrar("SELECT * FROM T WHERE ID = 1", None, 0.5, filas=3, cache='fallo', reintentos=1)
+        stats.registrar("SELECT * FROM T WHERE ID = 2", None, 0.1, filas=0, cache='memoria')
+        stats.registrar("SELECT 1 FROM DUAL", None, 2.0, error=True)
+
+        consultas = stats.consultas()
+        assert [c['sql'] for c in consultas] == ["SELECT ? FROM DUAL", "SELECT * FROM T WHERE ID = ?"]
+        por_id = consultas[1]
+        assert por_id['llamadas'] == 2
+        assert por_id['filas_total'] == 3
+        assert por_id['segundos_max'] == 0.5
+        assert por_id['tasa_aciertos_cache'] == 0.5
+        assert por_id['reintentos'] == 1
+
+        totales = stats.totales()
+        assert totales['llamadas'] == 3
+        assert totales['errores'] == 1
+        assert totales['consultas_distintas'] == 2
+
+    def test_ordenar_y_limitar(self):
+        """Verifica el orden por el campo indicado y el límite."""
+        stats = QueryStats()
+        for _ in range(3):
+            stats.registrar("SELECT A FROM T", None, 0.01)
+        stats.registrar("SELECT B FROM T", None, 1.0)
+        assert stats.consultas(ordenar_por='llamadas', limite=1)[0]['sql'] == "SELECT A FROM T"
+
+    def test_sitio_de_llamada(self):
+        """Verifica que se registre la función que ejecutó la consulta o el sitio fijado."""
+        stats = QueryStats()
+        stats.registrar("SELECT 1 FROM DUAL", None, 0.1)
+        with stats.en_sitio("widget.accion"):
+            stats.registrar("SELECT 1 FROM DUAL", None, 0.1)
+
+        sitios = stats.consultas()[0]['sitios']
+        assert sitios == {"test_query_stats.test_sitio_de_llamada": 1, "widget.accion": 1}
+        assert sitio_llamada() == "test_query_stats.test_sitio_de_llamada"
+
+    def test_sitio_de_llamada_profundidad_limitada(self, monkeypatch):
+        """Verifica que la búsqueda del sitio no recorra más marcos que el límite."""
+        monkeypatch.setattr(modulo_stats, "_PROFUNDIDAD_SITIO", 0)
+        assert sitio_llamada() == "desconocido"
+
+    def test_normalizar_sql_memorizado(self):
+        """Verifica que la normalización de un mismo texto se reutilice."""
+        normalizar_sql.cache_clear()
+        normalizar_sql("SELECT 1 FROM T WHERE X = 5")
+        normalizar_sql("SELECT 1 FROM T WHERE X = 5")
+        assert normalizar_sql.cache_info().hits == 1
+
+    def test_reiniciar(self):
+        """Verifica que reiniciar descarte las estadísticas."""
+        stats = QueryStats()
+        stats.registrar("SELECT 1 FROM DUAL", None, 0.1)
+        stats.reiniciar()
+        assert len(stats) == 0
+        assert stats.totales()['llamadas'] == 0
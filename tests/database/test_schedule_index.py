@@ -0,0 +1,44 @@
+import pytest
+from src.database.schedule_index import ScheduleIndex
+
+FIRMA_LUNES = (("LUNES", 480, 960),)
+FIRMA_MARTES = (("MARTES", 480, 960),)
+
+
+@pytest.mark.unit
+class TestScheduleIndex:
+    """Pruebas para el índice de turnos por firma de horario."""
+    
+    def test_buscar_por_firma(self):
+        """Prueba que se obtengan todos los turnos con la misma firma."""
+        indice = ScheduleIndex.desde_turnos([
+            (3, "Turno 3", FIRMA_LUNES),
+            (1, "Turno 1", FIRMA_LUNES),
+            (2, "Turno 2", FIRMA_MARTES),
+        ])
+        
+        assert indice.buscar(FIRMA_LUNES) == [1, 3]
+        assert indice.buscar(FIRMA_MARTES) == [2]
+        assert indice.buscar((("DOMINGO", 0, 60),)) == []
+        assert indice.nombre_de(2) == "Turno 2"
+        assert len(indice) == 3
+    
+    def test_agregar_actualiza_firma_existente(self):
+        """Prueba que volver a agregar un turno reemplace su firma anterior."""
+        indice = ScheduleIndex()
+        indice.agregar(1, "Turno 1", FIRMA_LUNES)
+        indice.agregar(1, "Turno 1 editado", FIRMA_MARTES)
+        
+        assert indice.buscar(FIRMA_LUNES) == []
+        assert indice.buscar(FIRMA_MARTES) == [1]
+        assert indice.firma_de(1) == FIRMA_MARTES
+        assert indice.nombre_de(1) == "Turno 1 editado"
+    
+    def test_eliminar(self):
+        """Prueba que eliminar quite el turno de su firma."""
+        indice = ScheduleIndex.desde_turnos([(1, "Turno 1", FIRMA_LUNES)])
+        
+        assert indice.eliminar(1) is True
+        assert indice.eliminar(1) is False
+        assert 1 not in indice
+        assert indice.buscar(FIRMA_LUNES) == []
@@ -0,0 +1,186 @@
+import pytest
+from datetime import datetime, time
+import cx_Oracle
+from src.database import turno_dao as modulo_dao
+from src.database.id_allocator import IdAllocator
+from src.database.oracle_connection import OracleConnection
+from src.database.sqlite_backend import SQLiteBackend, generar_datos, traducir_consulta
+
+
+@pytest.fixture
+def backend():
+    """Fixture que crea un backend SQLite en memoria con un catálogo pequeño."""
+    backend = SQLiteBackend()
+    generar_datos(backend, num_turnos=200, semilla=7)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def db(backend):
+    """Fixture que redirige OracleConnection al backend SQLite."""
+    conexion = OracleConnection()
+    conexion.usar_backend(backend)
+    IdAllocator._instance = None
+    modulo_dao.TurnoDAO._indice_horarios = None
+    modulo_dao.TurnoDAO._catalogo = None
+    modulo_dao.TurnoDAO._guardados_sesion = modulo_dao.ScheduleIndex()
+    yield conexion
+    conexion.usar_backend(None)
+    IdAllocator._instance = None
+    modulo_dao.TurnoDAO._indice_horarios = None
+    modulo_dao.TurnoDAO._catalogo = None
+    modulo_dao.TurnoDAO._guardados_sesion = modulo_dao.ScheduleIndex()
+
+
+def crear_turno(detalles):
+    """Crea un turno nuevo con detalles (jornada, hora_ingreso, duracion)."""
+    turno = modulo_dao.Turno()
+    for jornada, hora_ingreso, duracion in detalles:
+        turno.agregar_detalle(modulo_dao.TurnoDetalleDiario(
+            id_turno_detalle_diario=None, id_turno=None, jornada=jornada,
+            hora_ingreso=hora_ingreso, duracion=duracion
+        ))
+    return turno
+
+
+@pytest.mark.unit
+class TestTraduccion:
+    """Pruebas para la traducción de construcciones de Oracle."""
+
+    def test_listagg_se_convierte_en_agregado_ordenado(self):
+        """Verifica que LISTAGG ... WITHIN GROUP se reescribe con sus claves de orden."""
+        query = "SELECT LISTAGG(NOMBRE, ',') WITHIN GROUP (ORDER BY MOD(ID, 7), NOMBRE ASC) FROM T"
+        assert traducir_consulta(query) == "SELECT LISTAGG_ORDENADO(NOMBRE, ',', MOD(ID, 7), NOMBRE) FROM T"
+
+    def test_fetch_first_se_convierte_en_limit(self):
+        """Verifica que FETCH FIRST n ROWS ONLY se traduce a LIMIT."""
+        assert traducir_consulta("SELECT * FROM T FETCH FIRST :n ROWS ONLY") == "SELECT * FROM T LIMIT :n"
+
+    def test_ora_rowscn_como_contador_de_cambios(self, backend):
+        """Verifica que ORA_ROWSCN se traduce a un contador que avanza solo con las escrituras en su tabla."""
+        query = "SELECT MAX(ORA_ROWSCN) FROM DATOS_TRANSVERSALES.ORGANISMO"
+        with backend.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            antes = cursor.fetchone()[0]
+            cursor.execute("UPDATE ASISTENCIAS.TURNO SET VIGENCIA = 0 WHERE ID_TURNO = 1")
+            cursor.execute("DELETE FROM ASISTENCIAS.MARCAJE")
+            cursor.execute(query)
+            assert cursor.fetchone()[0] == antes
+            
+            cursor.execute("UPDATE DATOS_TRANSVERSALES.ORGANISMO SET VIGENCIA = 0 WHERE ID_ORGANISMO = 1")
+            cursor.execute(query)
+            assert cursor.fetchone()[0] > antes
+        
+        with pytest.raises(ValueError):
+            traducir_consulta("SELECT MAX(ORA_ROWSCN) FROM DUAL")
+
+    def test_funciones_oracle(self, backend):
+        """Verifica NVL, TO_CHAR, TO_DATE, TRANSLATE, UPPER y DUAL."""
+        with backend.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT NVL(NULL, 5),
+                       TO_CHAR(TO_DATE('2025-03-04 08:30', 'YYYY-MM-DD HH24:MI'), 'HH24') || 'h',
+                       TRANSLATE('MIÉRCOLES', 'É', 'E'),
+                       UPPER('sábado'),
+                       MOD(1470, 1440)
+                FROM DUAL
+            """)
+            assert cursor.fetchall() == [(5, "08h", "MIERCOLES", "SÁBADO", 30)]
+
+    def test_errores_se_informan_como_cx_oracle(self, backend):
+        """Verifica que los errores de SQLite llegan como cx_Oracle.DatabaseError."""
+        with backend.acquire() as conn:
+            with pytest.raises(cx_Oracle.DatabaseError):
+                conn.cursor().execute("SELECT * FROM ASISTENCIAS.NO_EXISTE")
+
+
+@pytest.mark.unit
+class TestGenerarDatos:
+    """Pruebas para el generador de datos sintéticos."""
+
+    def test_misma_semilla_mismos_datos(self):
+        """Verifica que el generador es reproducible."""
+        filas = []
+        for _ in range(2):
+            backend = SQLiteBackend()
+            generar_datos(backend, num_turnos=50, semilla=3)
+            with backend.acquire() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM ASISTENCIAS.TURNO_DETALLE_DIARIO ORDER BY 1")
+                filas.append(cursor.fetchall())
+            backend.close()
+        assert filas[0] == filas[1]
+        assert isinstance(filas[0][0][3], datetime)
+
+    def test_conteos(self, backend):
+        """Verifica que se generan turnos, personas y organismos en las tablas esperadas."""
+        with backend.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) FROM ASISTENCIAS.TURNO),
+                       (SELECT COUNT(*) FROM DATOS_TRANSVERSALES.PERSONA),
+                       (SELECT COUNT(*) FROM DATOS_TRANSVERSALES.ORGANISMO)
+                FROM DUAL
+            """)
+            assert cursor.fetchall() == [(200, 100, 20)]
+
+
+@pytest.mark.unit
+class TestTurnoDAOSobreSQLite:
+    """Pruebas que ejecutan el DAO sin cambios contra el backend SQLite."""
+
+    def test_iter_query(self, db):
+        """Verifica que la lectura por lotes funciona sobre SQLite."""
+        filas = list(db.iter_query("SELECT ID_TURNO FROM ASISTENCIAS.TURNO ORDER BY ID_TURNO", batch_size=64))
+        assert [fila[0] for fila in filas] == list(range(1, 201))
+
+    def test_firma_en_servidor_coincide_con_indice(self, db):
+        """Verifica que la consulta LISTAGG y el índice en Python encuentran los mismos duplicados."""
+        dao = modulo_dao.TurnoDAO()
+        turno = crear_turno([(dia, time(8, 0), 480) for dia in ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES")])
+
+        dao.FIRMA_EN_SERVIDOR = True
+        en_servidor = dao.buscar_turnos_similares(turno)
+        modulo_dao.TurnoDAO._indice_horarios = None
+        dao.FIRMA_EN_SERVIDOR = False
+        en_python = dao.buscar_turnos_similares(turno)
+
+        assert en_servidor
+        assert [(id_, nombre) for id_, nombre, _ in en_servidor] == [(id_, nombre) for id_, nombre, _ in en_python]
+
+    def test_buscar_por_id(self, db):
+        """Verifica que un turno se lee con sus detalles y horas como datetime."""
+        turno = modulo_dao.TurnoDAO().buscar_por_id(1)
+        assert turno is not None and turno.id_turno == 1
+        assert turno.detalles
+
+    def test_catalogo_coincide_con_busqueda_de_similares(self, db):
+        """Verifica que los duplicados del catálogo por columnas sean los mismos que encuentra el DAO."""
+        dao = modulo_dao.TurnoDAO()
+        catalogo = dao.obtener_catalogo()
+        turno = crear_turno([(dia, time(8, 0), 480) for dia in ("LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES")])
+
+        assert len(catalogo) == 200
+        assert catalogo.buscar_duplicados(turno).tolist() == [id_ for id_, _, _ in dao.buscar_turnos_similares(turno)]
+
+    def test_buscar_por_ids(self, db):
+        """Verifica que la búsqueda por lista de IDs lee lo mismo que la búsqueda por ID."""
+        dao = modulo_dao.TurnoDAO()
+        turnos = dao.buscar_por_ids([1, 2, 9999])
+        assert sorted(turnos) == [1, 2]
+        assert turnos[1].to_dict() == dao.buscar_por_id(1).to_dict()
+
+    def test_script_batch_con_ids_reservados(self, db):
+        """Verifica que los IDs reservados continúan tras el máximo y que se genera el script."""
+        dao = modulo_dao.TurnoDAO()
+        turno = crear_turno([("LUNES", time(9, 0), 480)])
+        turno.id_turno = dao.reservar_id_turno()
+        dao.asignar_ids(turno)
+
+        assert turno.id_turno == 201
+        assert dao.renumerar_turnos([turno]) is False
+        scripts = dao.generar_script_sql_batch([turno])
+        assert len(scripts) == 1 and "INSERT" in scripts[0].upper()
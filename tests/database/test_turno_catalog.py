@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, time
+
+from src.database.turno_catalog import TurnoCatalog
+from src.models.turno import Turno, TurnoDetalleDiario
+
+FILAS = [
+    (1, "Lu-Vi 8-16", 1, "Diarios", 10, "LUNES", datetime(2025, 1, 1, 8, 0), 480),
+    (1, "Lu-Vi 8-16", 1, "Diarios", 11, "Miércoles", datetime(2025, 1, 1, 8, 0), 480),
+    (2, "Mi/Lu 8-16", 0, "Diarios", 12, "MIERCOLES", datetime(2025, 1, 1, 8, 0), 480),
+    (2, "Mi/Lu 8-16", 0, "Diarios", 13, "lunes", datetime(2025, 1, 1, 8, 0), 480),
+    (3, "Largo", 1, "Diarios", 14, "LUNES", datetime(2025, 1, 1, 7, 0), 720),
+    (3, "Largo", 1, "Diarios", 15, "MARTES", datetime(2025, 1, 1, 7, 0), 720),
+    (3, "Largo", 1, "Diarios", 16, "JUEVES", datetime(2025, 1, 1, 7, 0), 720),
+    (3, "Largo", 1, "Diarios", 17, "VIERNES", datetime(2025, 1, 1, 7, 0), 720),
+    (4, "Do noche", 1, "Diarios", 18, "DOMINGO", datetime(2025, 1, 1, 22, 0), 480),
+    (5, "Feriado", 1, "Diarios", 19, "FERIADO", datetime(2025, 1, 1, 8, 0), 480),
+]
+
+
+@pytest.fixture
+def catalogo():
+    """Catálogo construido desde filas de la consulta de turnos con detalles."""
+    return TurnoCatalog.desde_filas(iter(FILAS))
+
+
+@pytest.mark.unit
+class TestTurnoCatalog:
+    """Pruebas para el catálogo de turnos por columnas."""
+
+    def test_construccion_en_una_pasada(self, catalogo):
+        """Prueba los arreglos por columnas y los desplazamientos de cada turno."""
+        assert len(catalogo) == 5 and catalogo.total_detalles == 10
+        assert catalogo.ids.tolist() == [1, 2, 3, 4, 5]
+        assert catalogo.desplazamientos.tolist() == [0, 2, 4, 8, 9, 10]
+        assert catalogo.dias.tolist()[:4] == [0, 2, 2, 0]
+        assert catalogo.dias_extra == ["FERIADO"]
+        assert catalogo.posicion(4) == 3 and catalogo.posicion(99) is None
+
+    def test_filtros(self, catalogo):
+        """Prueba los filtros por día, ingreso, duración y vigencia."""
+        assert catalogo.filtrar(dia="Lunes", ingreso=8 * 60).tolist() == [1, 2]
+        assert catalogo.filtrar(dia="Lunes", ingreso=8 * 60, solo_vigentes=True).tolist() == [1]
+        assert catalogo.filtrar(duracion_minima=600).tolist() == [3]
+        assert catalogo.filtrar(dia="Feriado").tolist() == [5]
+        assert catalogo.filtrar(dia="Sábado").tolist() == []
+
+    def test_agregados(self, catalogo):
+        """Prueba las horas semanales y la distribución de ingresos."""
+        assert catalogo.horas_semanales().tolist() == [16, 16, 48, 8, 8]
+        assert catalogo.turnos_con_horas_mayores(44).tolist() == [3]
+        assert catalogo.distribucion_ingresos("LUNES") == {420: 1, 480: 2}
+
+    def test_duplicados(self, catalogo):
+        """Prueba que los horarios repetidos se agrupen sin importar el orden ni el formato de los días."""
+        assert [grupo.tolist() for grupo in catalogo.grupos_duplicados()] == [[1, 2]]
+
+        turno = Turno()
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Miércoles", time(8, 0), 480))
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Lunes", time(8, 0), 480))
+        assert catalogo.buscar_duplicados(turno).tolist() == [1, 2]
+
+        nocturno = Turno()
+        nocturno.agregar_detalle(TurnoDetalleDiario(None, None, "Domingo", time(22, 0), 480))
+        assert catalogo.buscar_duplicados(nocturno).tolist() == [4]
+        assert TurnoCatalog.desde_filas([]).grupos_duplicados() == []
+
+    def test_buscar_cercanos(self, catalogo):
+        """Prueba la tolerancia por día, la similitud de días y el orden por distancia."""
+        turno = Turno()
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Lunes", time(8, 5), 475))
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Miércoles", time(8, 0), 480))
+
+        # Lunes: 5 min de ingreso + 0 de salida; miércoles idéntico
+        assert catalogo.buscar_cercanos(turno, tolerancia_minutos=10) == [(1, "Lu-Vi 8-16", 1.0, 5), (2, "Mi/Lu 8-16", 1.0, 5)]
+        assert catalogo.buscar_cercanos(turno, tolerancia_minutos=4) == []
+        # Con 4 minutos solo coincide el miércoles: 1 día común de 3 distintos
+        assert [c[:3] for c in catalogo.buscar_cercanos(turno, tolerancia_minutos=4, similitud_minima=0.3)] == [
+            (1, "Lu-Vi 8-16", pytest.approx(1 / 3)), (2, "Mi/Lu 8-16", pytest.approx(1 / 3))
+        ]
+
+        turno.id_turno = 1
+        assert [c[0] for c in catalogo.buscar_cercanos(turno, limite=1)] == [2]
+
+    def test_buscar_cercanos_pasada_medianoche(self, catalogo):
+        """Prueba que la salida se compare módulo 24 horas y que los días sobrantes bajen la similitud."""
+        turno = Turno()
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Domingo", time(21, 50), 495))
+        assert catalogo.buscar_cercanos(turno, tolerancia_minutos=10) == [(4, "Do noche", 1.0, 15)]
+
+        turno.agregar_detalle(TurnoDetalleDiario(None, None, "Sábado", time(22, 0), 480))
+        assert catalogo.buscar_cercanos(turno, tolerancia_minutos=10) == []
+        assert catalogo.buscar_cercanos(turno, tolerancia_minutos=10, similitud_minima=0.5) == [(4, "Do noche", 0.5, 15)]
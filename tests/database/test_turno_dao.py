@@ -0,0 +1,381 @@
+import logging
+import pytest
+from datetime import datetime, time
+from unittest.mock import MagicMock
+from src.database import turno_dao as modulo_dao
+
+# Catálogo compartido por las pruebas de ambas rutas de búsqueda (servidor y Python).
+# Filas con el formato de la consulta de turnos con detalles, ordenadas por ID_TURNO.
+FILAS_CATALOGO = [
+    (1, "Lu-Vi 8-16", 1, 1, 10, "LUNES", datetime(2025, 1, 1, 8, 0), 480),
+    (1, "Lu-Vi 8-16", 1, 1, 11, "MIÉRCOLES", datetime(2025, 1, 1, 8, 0), 480),
+    (2, "Lu/Mi 8-16", 1, 1, 12, "Miercoles", datetime(2025, 1, 1, 8, 0), 480),
+    (2, "Lu/Mi 8-16", 1, 1, 13, "lunes", datetime(2025, 1, 1, 8, 0), 480),
+    (3, "Lu 8-17", 1, 1, 14, "LUNES", datetime(2025, 1, 1, 8, 0), 540),
+    (4, "Lu 8-16", 1, 1, 15, "LUNES", datetime(2025, 1, 1, 8, 0), 480),
+    (5, "Do noche", 1, 1, 16, "DOMINGO", datetime(2025, 1, 1, 22, 0), 480),
+    (6, "Lu partido", 1, 1, 17, "LUNES", datetime(2025, 1, 1, 15, 0), 180),
+    (6, "Lu partido", 1, 1, 18, "LUNES", datetime(2025, 1, 1, 8, 0), 240),
+]
+
+_ORDEN_SQL = {"LUNES": 0, "MARTES": 1, "MIERCOLES": 2, "JUEVES": 3, "VIERNES": 4, "SABADO": 5, "DOMINGO": 6}
+
+
+def emular_consulta_firmas(filas, params):
+    """Reproduce en Python, paso a paso, lo que calcula la consulta LISTAGG en Oracle."""
+    traduccion = str.maketrans("ÁÉÍÓÚÜáéíóúü", "AEIOUUaeiouu")
+    por_turno = {}
+    for id_turno, nombre, _, _, _, jornada, hora_ingreso, duracion in filas:
+        dia = jornada.strip().translate(traduccion).upper()
+        ingreso = hora_ingreso.hour * 60 + hora_ingreso.minute
+        salida = (ingreso + (duracion or 0)) % 1440
+        por_turno.setdefault((id_turno, nombre), []).append((_ORDEN_SQL.get(dia, 7), dia, ingreso, salida))
+    
+    coincidencias = []
+    for (id_turno, nombre), detalles in sorted(por_turno.items()):
+        firma = ",".join(f"{dia}:{ingreso}:{salida}" for _, dia, ingreso, salida in sorted(detalles))
+        if len(detalles) == params["num_dias"] and firma == params["firma"]:
+            coincidencias.append((id_turno, nombre))
+    return coincidencias
+
+
+@pytest.fixture
+def dao():
+    """Fixture que crea un TurnoDAO sin conectarse a la base de datos y con el índice vacío."""
+    modulo_dao.TurnoDAO._indice_horarios = None
+    modulo_dao.TurnoDAO._catalogo = None
+    modulo_dao.TurnoDAO._guardados_sesion = modulo_dao.ScheduleIndex()
+    dao = modulo_dao.TurnoDAO.__new__(modulo_dao.TurnoDAO)
+    dao.db = MagicMock()
+    dao.id_allocator = MagicMock()
+    dao._verificar_conexion = MagicMock()
+    yield dao
+    modulo_dao.TurnoDAO._indice_horarios = None
+    modulo_dao.TurnoDAO._catalogo = None
+    modulo_dao.TurnoDAO._guardados_sesion = modulo_dao.ScheduleIndex()
+
+
+def crear_turno(id_turno, detalles):
+    """Crea un turno con detalles (jornada, hora_ingreso, duracion)."""
+    turno = modulo_dao.Turno()
+    turno.id_turno = id_turno
+    for i, (jornada, hora_ingreso, duracion) in enumerate(detalles, start=1):
+        turno.agregar_detalle(modulo_dao.TurnoDetalleDiario(
+            id_turno_detalle_diario=i,
+            id_turno=id_turno,
+            jornada=jornada,
+            hora_ingreso=hora_ingreso,
+            duracion=duracion
+        ))
+    return turno
+
+
+@pytest.fixture(params=["servidor", "python"])
+def dao_catalogo(request, dao):
+    """
+    Fixture que sirve FILAS_CATALOGO por la ruta indicada.
+    
+    En la ruta "servidor" la consulta de firmas se emula sobre el catálogo; en la ruta
+    "python" esa consulta falla y el DAO recurre al índice construido en Python.
+    """
+    def _execute_query(query, params=None, **kwargs):
+        if "LISTAGG" in query:
+            return emular_consulta_firmas(FILAS_CATALOGO, params) if request.param == "servidor" else None
+        return []
+    
+    dao.db.execute_query.side_effect = _execute_query
+    dao.db.iter_query.side_effect = lambda *args, **kwargs: iter(FILAS_CATALOGO)
+    return dao
+
+
+@pytest.mark.unit
+class TestBuscarTurnosSimilaresRutas:
+    """Pruebas que verifican que ambas rutas de búsqueda encuentren los mismos duplicados."""
+    
+    @pytest.mark.parametrize("detalles, esperados", [
+        ([("Lunes", time(8, 0), 480), ("Miércoles", time(8, 0), 480)], [1, 2]),
+        ([("Miercoles", time(8, 0), 480), ("LUNES", time(8, 0), 480)], [1, 2]),
+        ([("Lunes", time(8, 0), 480)], [4]),
+        ([("Lunes", time(8, 0), 540)], [3]),
+        ([("Domingo", time(22, 0), 480)], [5]),
+        ([("Martes", time(8, 0), 480)], []),
+        ([("Lunes", time(8, 0), 240), ("LUNES", time(15, 0), 180)], [6]),
+        ([("Lunes", time(15, 0), 180), ("LUNES", time(8, 0), 240)], [6]),
+        ([("Lunes", time(8, 0), 240), ("LUNES", time(15, 0), 240)], []),
+        ([("Lunes", time(8, 0), 480), ("Miércoles", time(8, 0), 480), ("Viernes", time(8, 0), 480)], []),
+    ])
+    def test_misma_respuesta_en_ambas_rutas(self, dao_catalogo, detalles, esperados):
+        """Prueba que la búsqueda en Oracle y el respaldo en Python coincidan."""
+        turno = crear_turno(99, detalles)
+        
+        coincidencias = dao_catalogo.buscar_turnos_similares(turno)
+        
+        assert [c[0] for c in coincidencias] == esperados
+    
+    def test_ruta_servidor_no_recorre_catalogo(self, dao):
+        """Prueba que, si Oracle responde, no se descargue el catálogo completo."""
+        dao.db.execute_query.side_effect = lambda query, params=None, **kwargs: (
+            emular_consulta_firmas(FILAS_CATALOGO, params) if "LISTAGG" in query else []
+        )
+        
+        turno = crear_turno(99, [("Lunes", time(8, 0), 480)])
+        
+        assert [c[0] for c in dao.buscar_turnos_similares(turno)] == [4]
+        dao.db.iter_query.assert_not_called()
+        _, params = dao.db.execute_query.call_args[0]
+        assert params == {"num_dias": 1, "firma": "LUNES:480:960"}
+    
+    def test_ruta_servidor_incluye_guardados_en_la_sesion(self, dao):
+        """Prueba que un turno guardado en la sesión, que no está en Oracle, se reporte como duplicado."""
+        dao.db.execute_query.side_effect = lambda query, params=None, **kwargs: (
+            emular_consulta_firmas(FILAS_CATALOGO, params) if "LISTAGG" in query else []
+        )
+        dao.generar_script_sql = MagicMock(return_value="")
+        
+        dao.guardar_turno(crear_turno(50, [("Martes", time(8, 0), 480)]))
+        dao.guardar_turno(crear_turno(51, [("Lunes", time(8, 0), 480)]))
+        
+        assert modulo_dao.TurnoDAO._indice_horarios is None
+        assert [c[0] for c in dao.buscar_turnos_similares(crear_turno(None, [("Martes", time(8, 0), 480)]))] == [50]
+        assert [c[0] for c in dao.buscar_turnos_similares(crear_turno(None, [("Lunes", time(8, 0), 480)]))] == [4, 51]
+        dao.db.iter_query.assert_not_called()
+
+
+@pytest.mark.unit
+class TestBuscarTurnosSimilares:
+    """Pruebas para la búsqueda de turnos con el mismo horario."""
+    
+    def test_iterar_turnos_agrupados_agrupa_filas_consecutivas(self, dao):
+        """Prueba que cada turno se entregue en cuanto terminan sus filas."""
+        filas = iter([
+            (1, "Turno 1", 1, 1, 10, "LUNES", time(8, 0), 480),
+            (1, "Turno 1", 1, 1, 11, "MARTES", time(8, 0), 480),
+            (2, "Turno 2", 1, 1, 12, "LUNES", time(9, 0), 60),
+        ])
+        
+        turnos = dao._iterar_turnos_agrupados(filas)
+        id_turno, nombre, detalles = next(turnos)
+        
+        assert (id_turno, nombre) == (1, "Turno 1")
+        assert [d['jornada'] for d in detalles] == ["LUNES", "MARTES"]
+        assert detalles[0]['duracion'] == 480
+        assert [t[0] for t in turnos] == [2]
+    
+    def test_busqueda_usa_lectura_por_lotes(self, dao):
+        """Prueba que la búsqueda completa recorra las filas con iter_query."""
+        dao.FIRMA_EN_SERVIDOR = False
+        dao.db.execute_query.return_value = []
+        dao.db.iter_query.return_value = iter([
+            (1, "Igual", 1, 1, 10, "LUNES", time(8, 0), 480),
+            (2, "Distinto", 1, 1, 11, "LUNES", time(9, 0), 480),
+            (3, "Otro día", 1, 1, 12, "MARTES", time(8, 0), 480),
+        ])
+        
+        turno = crear_turno(99, [("Lunes", time(8, 0), 480)])
+        coincidencias = dao.buscar_turnos_similares(turno)
+        
+        assert [c[0] for c in coincidencias] == [1]
+        assert coincidencias[0][2] == [{'jornada': "LUNES", 'hora_ingreso': time(8, 0), 'hora_salida': time(16, 0)}]
+        dao.db.iter_query.assert_called_once()
+        _, kwargs = dao.db.iter_query.call_args
+        assert kwargs["batch_size"] == modulo_dao.TurnoDAO.TAMANO_LOTE_BUSQUEDA
+    
+    def test_indice_se_construye_una_vez(self, dao):
+        """Prueba que guardar varios turnos no vuelva a recorrer el catálogo."""
+        dao.FIRMA_EN_SERVIDOR = False
+        dao.db.execute_query.return_value = []
+        dao.db.iter_query.return_value = iter([
+            (1, "Existente", 1, 1, 10, "MIÉRCOLES", time(8, 0), 480),
+        ])
+        
+        primero = crear_turno(50, [("Miercoles", time(8, 0), 480)])
+        assert [c[0] for c in dao.buscar_turnos_similares(primero)] == [1]
+        
+        # El turno guardado en la sesión se agrega al índice sin releer la base de datos
+        dao.generar_script_sql = MagicMock(return_value="")
+        dao.guardar_turno(primero)
+        segundo = crear_turno(51, [("MIERCOLES", time(8, 0), 480)])
+        
+        assert [c[0] for c in dao.buscar_turnos_similares(segundo)] == [1, 50]
+        dao.db.iter_query.assert_called_once()
+    
+    def test_propio_turno_no_es_duplicado(self, dao):
+        """Prueba que el turno en edición no se reporte como duplicado de sí mismo."""
+        dao.FIRMA_EN_SERVIDOR = False
+        dao.db.execute_query.return_value = []
+        dao.db.iter_query.return_value = iter([
+            (7, "Propio", 1, 1, 10, "LUNES", time(8, 0), 480),
+        ])
+        
+        turno = crear_turno(7, [("Lunes", time(8, 0), 480)])
+        
+        assert dao.buscar_turnos_similares(turno) == []
+    
+    def test_sin_mensajes_de_depuracion_fuera_de_debug(self, dao, caplog):
+        """Prueba que con nivel INFO la búsqueda no formatea ni emite mensajes de depuración."""
+        dao.FIRMA_EN_SERVIDOR = False
+        dao.db.iter_query.return_value = iter([])
+        formateos = []
+        
+        class JornadaContada(str):
+            def __str__(self):
+                formateos.append(self)
+                return super().__str__()
+        
+        turno = crear_turno(None, [(JornadaContada("LUNES"), time(8, 0), 480)])
+        
+        caplog.set_level(logging.INFO, logger=modulo_dao.logger.name)
+        assert dao.buscar_turnos_similares(turno) == []
+        assert not [r for r in caplog.records if r.levelno < logging.INFO]
+        assert formateos == []
+        
+        caplog.set_level(logging.DEBUG, logger=modulo_dao.logger.name)
+        dao.buscar_turnos_similares(turno)
+        assert any("LUNES" in r.getMessage() for r in caplog.records)
+        assert formateos
+    
+    def test_guardar_turno_no_invalida_catalogos(self, dao):
+        """Prueba que guardar un turno, que solo genera su script, no descarte los catálogos en caché."""
+        dao.db.execute_query.return_value = [(0,)]
+        turno = crear_turno(9, [("Lunes", time(8, 0), 480)])
+        
+        dao.guardar_turno(turno)
+        
+        dao.db.invalidate_cache.assert_not_called()
+    
+    def test_actualizar_vigencia_invalida_catalogos(self, dao):
+        """Prueba que una escritura real descarte de la caché las consultas sobre la tabla TURNO."""
+        assert dao.actualizar_vigencia(9, 0)
+        
+        dao.db.invalidate_cache.assert_called_once_with(table="ASISTENCIAS.TURNO")
+
+
+@pytest.mark.unit
+class TestGenerarScriptSqlBatch:
+    """Pruebas para la generación de scripts de varios turnos en bloque."""
+    
+    def test_dos_consultas_para_todo_el_lote(self, dao):
+        """Prueba que la existencia y los detalles se consulten una vez para todo el lote."""
+        turnos = [crear_turno(id_turno, [("Lunes", time(8, 0), 480)]) for id_turno in range(1, 301)]
+        
+        def _execute_query(query, params=None, **kwargs):
+            if "FROM ASISTENCIAS.TURNO_DETALLE_DIARIO" in query:
+                return [(2, 20, "LUNES")]
+            return [(2,)]
+        dao.db.execute_query.side_effect = _execute_query
+        
+        scripts = dao.generar_script_sql_batch(turnos)
+        
+        assert dao.db.execute_query.call_count == 2
+        assert len(scripts) == 300
+        assert "INSERT INTO ASISTENCIAS.TURNO " in scripts[0]
+        assert "UPDATE ASISTENCIAS.TURNO" in scripts[1]
+        assert "DELETE FROM ASISTENCIAS.TURNO_DETALLE_DIARIO" in scripts[1]
+        # Los detalles solo se consultan para los turnos que ya existen
+        _, params_detalles = dao.db.execute_query.call_args_list[1][0]
+        assert params_detalles == {"id0": 2}
+    
+    def test_misma_salida_que_por_turno(self, dao):
+        """Prueba que el script en bloque coincida con el generado turno a turno."""
+        turno = crear_turno(5, [("Lunes", time(8, 0), 480), ("Martes", time(9, 30), 300)])
+        dao.db.execute_query.side_effect = lambda query, params=None, **kwargs: (
+            [(1,)] if "COUNT(*)" in query
+            else [(5,)] if "SELECT ID_TURNO FROM" in query
+            else [(5, 50, "LUNES")] if "ID_TURNO IN" in query
+            else [(50, "LUNES")]
+        )
+        
+        assert dao.generar_script_sql_batch([turno]) == [dao.generar_script_sql(turno)]
+    
+    def test_comillas_en_textos(self, dao):
+        """Prueba que las comillas del nombre y la frecuencia no corten los literales del script."""
+        turno = crear_turno(5, [("Lunes", time(8, 0), 480)])
+        turno.nombre = "Turno O'Higgins"
+        turno.frecuencia = "x'); DROP TABLE ASISTENCIAS.TURNO; --"
+        dao.db.execute_query.return_value = []
+        
+        script = dao.generar_script_sql_batch([turno])[0]
+        
+        assert "VALUES (5, 'Turno O''Higgins', 1, 'x''); DROP TABLE ASISTENCIAS.TURNO; --');" in script
+        assert modulo_dao.literal_sql("a'b''c") == "'a''b''''c'"
+    
+    def test_lista_in_dividida_en_bloques(self, dao):
+        """Prueba que las listas IN no superen el límite de Oracle."""
+        dao.db.execute_query.return_value = []
+        turnos = [crear_turno(id_turno, []) for id_turno in range(1, 2501)]
+        
+        dao.generar_script_sql_batch(turnos)
+        
+        tamanos = [len(llamada[0][1]) for llamada in dao.db.execute_query.call_args_list]
+        assert tamanos == [1000, 1000, 500]
+
+
+@pytest.mark.unit
+class TestBuscarPorIds:
+    """Pruebas para la búsqueda de varios turnos en una sola consulta."""
+    
+    def test_una_consulta_para_todos_los_ids(self, dao):
+        """Prueba que los IDs repetidos se consulten una vez y los turnos se agrupen por ID."""
+        dao.db.execute_query.return_value = [fila for fila in FILAS_CATALOGO if fila[0] in (1, 5)]
+        
+        turnos = dao.buscar_por_ids([5, 1, 5, 99])
+        
+        assert dao.db.execute_query.call_count == 1
+        query, params = dao.db.execute_query.call_args[0]
+        assert "ID_TURNO IN (:id0, :id1, :id2)" in query
+        assert params == {"id0": 1, "id1": 5, "id2": 99}
+        assert sorted(turnos) == [1, 5]
+        assert [d.jornada for d in turnos[1].detalles] == ["LUNES", "MIÉRCOLES"]
+        assert turnos[5].detalles[0].hora_salida == time(6, 0)
+        assert dao.buscar_por_ids([]) == {}
+
+
+
+@pytest.mark.unit
+class TestBuscarDuplicadosLote:
+    """Pruebas para la búsqueda de duplicados de un lote de turnos."""
+    
+    def test_lote_con_una_lectura_del_catalogo(self, dao):
+        """Prueba que todo el lote se resuelve con el índice, sin consultar firmas por turno."""
+        dao.db.iter_query.side_effect = lambda *args, **kwargs: iter(FILAS_CATALOGO)
+        lote = [
+            crear_turno(None, [("Lunes", time(8, 0), 480)]),
+            crear_turno(None, [("Martes", time(8, 0), 480)]),
+            crear_turno(4, [("Lunes", time(8, 0), 480)]),
+            crear_turno(None, [("Miércoles", time(8, 0), 480), ("Lunes", time(8, 0), 480)]),
+        ]
+        
+        duplicados = dao.buscar_duplicados_lote(lote)
+        
+        assert duplicados == [[(4, "Lu 8-16")], [], [], [(1, "Lu-Vi 8-16"), (2, "Lu/Mi 8-16")]]
+        dao.db.iter_query.assert_called_once()
+        dao.db.execute_query.assert_not_called()
+    
+    def test_error_al_leer_el_catalogo(self, dao):
+        """Prueba que un fallo al leer el catálogo se informa como ConsultaError."""
+        dao.db.iter_query.side_effect = modulo_dao.cx_Oracle.DatabaseError("sin conexión")
+        
+        with pytest.raises(modulo_dao.ConsultaError):
+            dao.buscar_duplicados_lote([crear_turno(None, [("Lunes", time(8, 0), 480)])])
+
+
+@pytest.mark.unit
+class TestBuscarTurnosCercanos:
+    """Pruebas para la búsqueda de turnos con horario parecido."""
+    
+    def test_cercanos_con_personas_asignadas(self, dao):
+        """Prueba que los turnos parecidos se lean del catálogo e informen sus personas asignadas."""
+        dao.db.iter_query.return_value = iter(FILAS_CATALOGO)
+        dao.db.execute_query.return_value = [(4, 40)]
+        turno = crear_turno(None, [("Lunes", time(8, 5), 475)])
+        
+        cercanos = dao.buscar_turnos_cercanos(turno, tolerancia_minutos=10)
+        
+        assert cercanos == [modulo_dao.TurnoCercano(4, "Lu 8-16", 1.0, 5, 40)]
+        query, params = dao.db.execute_query.call_args[0]
+        assert "PERSONA_TURNO" in query and params == {"id0": 4}
+        
+        # El catálogo se lee una sola vez mientras esté vigente
+        dao.buscar_turnos_cercanos(turno)
+        dao.db.iter_query.assert_called_once()
+        assert dao.buscar_turnos_cercanos(crear_turno(None, [])) == []
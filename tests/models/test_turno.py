@@ -1,6 +1,6 @@
 import pytest
-from datetime import time
-from src.models.turno import Turno, TurnoDetalleDiario
+from datetime import datetime, time
+from src.models.turno import Turno, TurnoDetalleDiario, CodificacionSemanal, calcular_firma_horario, normalizar_jornada
 
 @pytest.mark.unit
 class TestTurnoDetalleDiario:
@@ -40,6 +40,31 @@ class TestTurnoDetalleDiario:
         )
         detalle.calcular_hora_salida()
         assert detalle.hora_salida == time(19, 0)
+    
+    def test_representacion_compacta(self):
+        """Prueba que el detalle no tenga __dict__, guarde minutos y comparta la jornada y las horas."""
+        jornada = "".join(["Lu", "nes"])
+        a = TurnoDetalleDiario(1, 1, jornada, datetime(2025, 1, 1, 8, 0), 480)
+        b = TurnoDetalleDiario(2, 2, "Lunes", time(8, 0), 480)
+        
+        assert not hasattr(a, "__dict__") and not hasattr(Turno(), "__dict__")
+        assert a.minuto_ingreso == 480 and a.minuto_salida == 960 and a.indice_dia == 0
+        assert a.jornada is b.jornada
+        assert a.hora_ingreso is b.hora_ingreso and a.hora_ingreso == time(8, 0)
+        assert a == TurnoDetalleDiario(1, 1, "Lunes", time(8, 0), 480) and a != b
+    
+    def test_hora_salida_calculada(self):
+        """Prueba que la salida se calcule al consultarla y que asignar otra ajuste la duración."""
+        detalle = TurnoDetalleDiario(1, 1, "Martes", time(22, 0), 480)
+        assert detalle.hora_salida == time(6, 0)
+        
+        detalle.hora_salida = time(7, 30)
+        assert detalle.duracion == 570
+        
+        # Un turno de 24 horas sale a la misma hora en que entra: su duración se conserva
+        completo = TurnoDetalleDiario(2, 1, "Martes", time(8, 0), 1440, hora_salida=time(8, 0))
+        assert completo.duracion == 1440
+        assert TurnoDetalleDiario(3, 1, "Martes", None, 480).hora_salida is None
 
 @pytest.mark.unit
 class TestTurno:
@@ -207,4 +232,83 @@ class TestTurno:
         assert turno.detalles[1].jornada == "Martes"
         assert turno.detalles[1].hora_ingreso == time(9, 0)
         assert turno.detalles[1].duracion == 420
-        assert turno.detalles[1].hora_salida == time(16, 0) 
\ No newline at end of file
+        assert turno.detalles[1].hora_salida == time(16, 0) 
+
+@pytest.mark.unit
+class TestFirmaHorario:
+    """Pruebas para la firma canónica del horario semanal."""
+    
+    def test_normalizar_jornada(self):
+        """Prueba que se eliminen tildes, espacios y diferencias de mayúsculas."""
+        assert normalizar_jornada(" Miércoles ") == "MIERCOLES"
+        assert normalizar_jornada("sábado") == "SABADO"
+    
+    def test_firma_independiente_del_orden_y_formato(self):
+        """Prueba que dos turnos con el mismo horario tengan la misma firma."""
+        a = Turno()
+        a.agregar_detalle(TurnoDetalleDiario(1, 1, "Martes", time(8, 0), 480))
+        a.agregar_detalle(TurnoDetalleDiario(2, 1, "Lunes", time(8, 0), 480))
+        b = Turno()
+        b.agregar_detalle(TurnoDetalleDiario(3, 2, "LUNES", time(8, 0), 480))
+        b.agregar_detalle(TurnoDetalleDiario(4, 2, "MARTES", time(8, 0), 480))
+        
+        assert a.firma_horario() == b.firma_horario() == (("LUNES", 480, 960), ("MARTES", 480, 960))
+        assert hash(a.firma_horario()) == hash(b.firma_horario())
+    
+    def test_firma_salida_pasada_medianoche(self):
+        """Prueba que la salida se tome módulo 24 horas."""
+        firma = calcular_firma_horario([("Domingo", time(22, 0), 480)])
+        
+        assert firma == (("DOMINGO", 1320, 360),)
+    
+    def test_firma_turno_partido(self):
+        """Prueba que los tramos de un mismo día se ordenen por ingreso, sin importar el orden de carga."""
+        manana_tarde = calcular_firma_horario([("Lunes", time(8, 0), 240), ("LUNES", time(15, 0), 180)])
+        tarde_manana = calcular_firma_horario([("LUNES", time(15, 0), 180), ("Lunes", time(8, 0), 240)])
+        
+        assert manana_tarde == tarde_manana == (("LUNES", 480, 720), ("LUNES", 900, 1080))
+
+
+@pytest.mark.unit
+class TestCodificacionSemanal:
+    """Pruebas para la codificación semanal de forma fija."""
+    
+    def crear_turno(self, detalles):
+        """Crea un turno con detalles (jornada, hora_ingreso, duracion)."""
+        turno = Turno()
+        for i, (jornada, hora_ingreso, duracion) in enumerate(detalles):
+            turno.agregar_detalle(TurnoDetalleDiario(i, 1, jornada, hora_ingreso, duracion))
+        return turno
+    
+    def test_mascara_y_arreglos(self):
+        """Prueba la máscara de días y los minutos de ingreso y fin, con fin pasado medianoche."""
+        codificacion = self.crear_turno([("Lunes", time(8, 0), 480), ("DOMINGO", time(22, 0), 480)]).codificacion_semanal()
+        
+        assert codificacion.mascara == 0b1000001
+        assert codificacion.ingresos.tolist() == [480, -1, -1, -1, -1, -1, 1320]
+        assert codificacion.fines.tolist() == [960, -1, -1, -1, -1, -1, 1800]
+    
+    def test_igualdad_y_clave(self):
+        """Prueba que la igualdad no dependa del orden ni del formato y que la clave sea reversible."""
+        a = self.crear_turno([("Lunes", time(8, 0), 480), ("Miércoles", time(9, 0), 300)]).codificacion_semanal()
+        b = self.crear_turno([("MIERCOLES", time(9, 0), 300), ("LUNES", time(8, 0), 480)]).codificacion_semanal()
+        c = self.crear_turno([("Lunes", time(8, 0), 481), ("Miércoles", time(9, 0), 300)]).codificacion_semanal()
+        
+        assert a == b and hash(a) == hash(b) and a.clave() == b.clave()
+        assert a != c and a.clave() != c.clave()
+        assert CodificacionSemanal.desde_clave(a.clave()) == a
+    
+    def test_contencion_y_distancia(self):
+        """Prueba la contención por día y la distancia en minutos entre horarios."""
+        amplio = self.crear_turno([("Lunes", time(7, 0), 600), ("Martes", time(7, 0), 600)]).codificacion_semanal()
+        estrecho = self.crear_turno([("Lunes", time(8, 0), 480)]).codificacion_semanal()
+        
+        assert amplio.contiene(estrecho) and not estrecho.contiene(amplio)
+        assert estrecho.distancia(estrecho) == 0
+        # Lunes: 60 de ingreso + 60 de fin; martes solo en uno: 600
+        assert amplio.distancia(estrecho) == estrecho.distancia(amplio) == 720
+    
+    def test_sin_codificacion_para_turnos_partidos(self):
+        """Prueba que un día con dos tramos o no reconocido no tenga codificación de forma fija."""
+        assert CodificacionSemanal.desde_detalles([("Lunes", time(8, 0), 240), ("LUNES", time(15, 0), 180)]) is None
+        assert CodificacionSemanal.desde_detalles([("Feriado", time(8, 0), 240)]) is None
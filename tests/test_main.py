@@ -11,10 +11,9 @@ class TestMain:
     @patch('src.main.MainWindow')
     @patch('src.main.OracleConnection')
     def test_main_success(self, mock_oracle_connection, mock_main_window, mock_qapp):
-        """Prueba que la función main funcione correctamente cuando la conexión es exitosa."""
+        """Prueba que la función main muestre la ventana y conecte en segundo plano."""
         # Configurar mocks
         mock_conn_instance = mock_oracle_connection.return_value
-        mock_conn_instance.is_connected.return_value = True
         
         mock_app_instance = mock_qapp.return_value
         mock_app_instance.exec.return_value = 0
@@ -27,8 +26,9 @@ class TestMain:
         # Verificar que se creó la aplicación
         mock_qapp.assert_called_once_with(sys.argv)
         
-        # Verificar que se estableció la conexión
-        mock_conn_instance.connect.assert_called_once()
+        # Verificar que la conexión se inicia en segundo plano, sin conectar antes de la ventana
+        mock_conn_instance.conectar_en_segundo_plano.assert_called_once()
+        mock_conn_instance.connect.assert_not_called()
         
         # Verificar que se creó y mostró la ventana principal
         mock_main_window.assert_called_once()
@@ -45,40 +45,36 @@ class TestMain:
     
     @patch('src.main.QMessageBox')
     @patch('src.main.QApplication')
+    @patch('src.main.MainWindow')
     @patch('src.main.OracleConnection')
-    def test_main_connection_error(self, mock_oracle_connection, mock_qapp, mock_message_box):
-        """Prueba que la función main maneje correctamente los errores de conexión."""
-        # Configurar mocks
+    def test_main_connection_error(self, mock_oracle_connection, mock_main_window, mock_qapp, mock_message_box):
+        """Prueba que un fallo de la conexión no impida mostrar la ventana."""
+        # Configurar mocks: la conexión en segundo plano fallará después de mostrar la ventana
         mock_conn_instance = mock_oracle_connection.return_value
         mock_conn_instance.is_connected.return_value = False
+        mock_app_instance = mock_qapp.return_value
+        mock_app_instance.exec.return_value = 0
         
         # Ejecutar la función main
         result = main()
         
-        # Verificar que se creó la aplicación
-        mock_qapp.assert_called_once_with(sys.argv)
-        
-        # Verificar que se estableció la conexión
-        mock_conn_instance.connect.assert_called_once()
-        
-        # Verificar que se mostró un mensaje de error
-        mock_message_box.critical.assert_called_once()
-        
-        # Verificar que no se ejecutó la aplicación
-        mock_app_instance = mock_qapp.return_value
-        mock_app_instance.exec.assert_not_called()
+        # Verificar que se mostró la ventana y se ejecutó la aplicación
+        mock_main_window.return_value.show.assert_called_once()
+        mock_app_instance.exec.assert_called_once()
         
-        # Verificar que se devolvió el código de error
-        assert result == 1
+        # El error se informa en la barra de estado de la ventana, no con un diálogo
+        mock_message_box.critical.assert_not_called()
+        assert result == 0
     
     @patch('src.main.QMessageBox')
     @patch('src.main.QApplication')
     @patch('src.main.OracleConnection')
-    def test_main_connection_exception(self, mock_oracle_connection, mock_qapp, mock_message_box):
-        """Prueba que la función main maneje correctamente las excepciones durante la conexión."""
+    def test_main_connection_exception(self, mock_oracle_connection, mock_qapp, mock_message_box, monkeypatch):
+        """Prueba que la función main maneje correctamente los errores al configurar la conexión."""
         # Configurar mocks
+        monkeypatch.delenv("GESTION_TURNOS_SQLITE", raising=False)
         mock_conn_instance = mock_oracle_connection.return_value
-        mock_conn_instance.connect.side_effect = Exception("Error de conexión simulado")
+        mock_conn_instance.enable_pool.side_effect = Exception("Error de conexión simulado")
         
         # Ejecutar la función main
         result = main()
@@ -86,8 +82,8 @@ class TestMain:
         # Verificar que se creó la aplicación
         mock_qapp.assert_called_once_with(sys.argv)
         
-        # Verificar que se intentó establecer la conexión
-        mock_conn_instance.connect.assert_called_once()
+        # Verificar que no se intentó conectar
+        mock_conn_instance.conectar_en_segundo_plano.assert_not_called()
         
         # Verificar que se mostró un mensaje de error
         mock_message_box.critical.assert_called_once()
@@ -97,4 +93,4 @@ class TestMain:
         mock_app_instance.exec.assert_not_called()
         
         # Verificar que se devolvió el código de error
-        assert result == 1 
\ No newline at end of file
+        assert result == 1
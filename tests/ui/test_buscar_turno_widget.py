@@ -0,0 +1,109 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.models.turno import Turno, TurnoDetalleDiario
+from src.ui.buscar_turno import buscar_turno_widget as modulo_widget
+
+CATALOGO = [
+    (3, "Noche Lunes", 1, "Diarios"),
+    (2, "Mañana Sábado", 1, "Diarios"),
+    (1, "Turno Mañana", 0, "Diarios"),
+]
+
+
+def crear_turno(id_turno, detalles):
+    """Crea un turno leído de la base con detalles (jornada, hora_ingreso, duracion)."""
+    turno = Turno()
+    turno.id_turno = id_turno
+    for i, (jornada, hora_ingreso, duracion) in enumerate(detalles):
+        detalle = TurnoDetalleDiario(id_turno * 10 + i, id_turno, jornada, hora_ingreso.time(), duracion)
+        detalle.calcular_hora_salida()
+        turno.agregar_detalle(detalle)
+    return turno
+
+
+@pytest.mark.ui
+class TestBuscarTurnoWidget:
+    """Pruebas para la búsqueda local de turnos."""
+
+    @pytest.fixture
+    def widget(self, qtbot):
+        """Widget con el DAO simulado y el catálogo ya cargado."""
+        with patch.object(modulo_widget, 'TurnoDAO'):
+            widget = modulo_widget.BuscarTurnoWidget()
+        qtbot.addWidget(widget)
+        widget.esta_cargando = False
+        widget._al_cargar_todos_turnos(CATALOGO)
+        return widget
+
+    def test_catalogo_completo_al_cargar(self, widget):
+        """Prueba que el catálogo cargado se muestra completo."""
+        assert widget.modelo_resultados.total_filas() == 3
+
+    def test_filtrado_al_escribir(self, widget, qtbot):
+        """Prueba que al escribir se filtra el catálogo local tras la pausa, sin consultar la base."""
+        qtbot.keyClicks(widget.search_input, "manana")
+        assert widget._temporizador_busqueda.isActive()
+
+        qtbot.waitUntil(lambda: widget.modelo_resultados.total_filas() == 2, timeout=2000)
+        assert [turno.id_turno for turno in widget.turnos_encontrados] == [2, 1]
+        widget.turno_dao.db.execute_query.assert_not_called()
+
+    def test_busqueda_por_id_local(self, widget):
+        """Prueba que la búsqueda por ID usa el catálogo y consulta la base solo si no lo encuentra."""
+        widget.search_input.setText("3")
+        widget.buscar_turnos()
+        assert [turno.id_turno for turno in widget.turnos_encontrados] == [3]
+        widget.turno_dao.db.execute_query.assert_not_called()
+
+        widget.turno_dao.db.execute_query.return_value = [(99, "Nuevo", 1, "Diarios")]
+        widget.search_input.setText("99")
+        widget.buscar_turnos()
+        assert [turno.id_turno for turno in widget.turnos_encontrados] == [99]
+
+    def test_detalles_en_segundo_plano(self, widget, qtbot):
+        """Prueba que los detalles se piden en segundo plano y solo se muestran si el turno sigue seleccionado."""
+        widget.results_table.selectRow(0)
+        ejecutar_async = widget.turno_dao.db.ejecutar_async
+        qtbot.waitUntil(lambda: ejecutar_async.called, timeout=1000)
+        
+        widget.turno_dao.db.execute_query.assert_not_called()
+        assert widget.detail_table.rowCount() == 0
+        
+        # El lote consulta el turno seleccionado mediante buscar_por_ids
+        funcion_lote = ejecutar_async.call_args[0][0]
+        funcion_lote()
+        widget.turno_dao.buscar_por_ids.assert_called_once_with([3])
+        
+        al_cargar = ejecutar_async.call_args[1]["on_result"]
+        al_cargar({3: crear_turno(3, [("Lunes", datetime(2025, 1, 1, 22, 0), 480)])})
+        assert widget.detail_table.rowCount() == 1
+        assert widget.detail_table.item(0, 2).text() == "06:00"
+        
+        # Una respuesta que llega con otro turno seleccionado no cambia la tabla de detalles
+        widget.results_table.selectRow(1)
+        qtbot.waitUntil(lambda: ejecutar_async.call_count == 2, timeout=1000)
+        al_cargar_otro = ejecutar_async.call_args[1]["on_result"]
+        widget.results_table.selectRow(0)
+        al_cargar_otro({2: crear_turno(2, [("Sábado", datetime(2025, 1, 1, 8, 0), 240), ("Domingo", datetime(2025, 1, 1, 8, 0), 240)])})
+        assert widget.detail_table.rowCount() == 1
+        
+        # El turno ya cargado se vuelve a mostrar sin otra consulta
+        assert ejecutar_async.call_count == 2
+
+    def test_invalidacion_durante_la_carga(self, widget):
+        """Prueba que un cambio en la tabla recibido mientras se carga el catálogo no se pierde."""
+        widget.cargar_todos_turnos()
+        ejecutar = widget.turno_dao.db.execute_query_async
+        assert ejecutar.call_count == 1
+
+        widget._al_invalidar_cache("ASISTENCIAS.TURNO")
+        assert ejecutar.call_count == 1
+
+        ejecutar.call_args[1]["on_result"](CATALOGO)
+        assert ejecutar.call_count == 2
+
+        ejecutar.call_args[1]["on_result"](CATALOGO)
+        assert ejecutar.call_count == 2
+        assert not widget.esta_cargando
@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import patch
+
+from src.ui.consulta_turno import consulta_turno_widget as modulo_widget
+
+
+def crear_filas(inicio, cantidad):
+    """Crea filas de asignaciones con las columnas de la clave al final."""
+    return [
+        (i, f"Apellido{i:04d} Materno, Nombre", f"{i}-K", 7, "Turno 7",
+         f"Apellido{i:04d}", "Materno", "Nombre", i, 7)
+        for i in range(inicio, inicio + cantidad)
+    ]
+
+
+@pytest.mark.ui
+class TestConsultaTurnoWidget:
+    """Pruebas para la carga paginada de turnos asignados."""
+
+    @pytest.fixture
+    def widget(self, qtbot):
+        """Widget con la conexión simulada y páginas de 4 filas."""
+        with patch.object(modulo_widget, 'OracleConnection'), patch.object(modulo_widget, 'TurnoDAO'):
+            widget = modulo_widget.ConsultaTurnoWidget(tamano_pagina=4)
+        qtbot.addWidget(widget)
+        widget.db.execute_query_async.reset_mock()
+        return widget
+
+    def responder(self, widget, filas):
+        """Entrega las filas a la última consulta enviada."""
+        widget.db.execute_query_async.call_args.kwargs["on_result"](filas)
+
+    def test_primera_pagina_con_una_consulta(self, widget):
+        """Prueba que la búsqueda sin filtros pide solo la primera página, ordenada por la clave."""
+        widget.buscar_turnos()
+
+        widget.db.execute_query_async.assert_called_once()
+        query = widget.db.execute_query_async.call_args[0][0]
+        assert "ORDER BY p.APELLIDO_PATERNO, NVL(p.APELLIDO_MATERNO, ' '), p.NOMBRE, p.ID_PERSONA, t.ID_TURNO" in query
+        assert "FETCH FIRST 5 ROWS ONLY" in query
+        assert not widget.buscar_btn.isEnabled()
+
+        self.responder(widget, crear_filas(0, 5))
+        assert widget.buscar_btn.isEnabled()
+        assert widget.modelo_funcionarios.total_filas() == 4
+        assert widget.modelo_funcionarios.fila(0)[:2] == (0, "Apellido0000 Materno, Nombre")
+
+    def test_precarga_al_acercarse_al_final(self, widget):
+        """Prueba que la página siguiente se pide desde la última clave y se agrega a la tabla."""
+        widget.buscar_turnos()
+        self.responder(widget, crear_filas(0, 5))
+
+        # La vista no alcanza a llenarse con 4 filas: se precarga la página siguiente
+        assert widget.db.execute_query_async.call_count == 2
+        query, params = widget.db.execute_query_async.call_args[0]
+        assert "p.APELLIDO_PATERNO > :k0" in query
+        assert (params["k0"], params["k3"], params["k4"]) == ("Apellido0003", 3, 7)
+
+        # Mientras la página está en curso no se pide otra
+        widget._al_desplazar_funcionarios()
+        assert widget.db.execute_query_async.call_count == 2
+
+        self.responder(widget, crear_filas(4, 2))
+        assert widget.modelo_funcionarios.total_filas() == 6
+        assert widget._paginador.agotado
+        widget._al_desplazar_funcionarios()
+        assert widget.db.execute_query_async.call_count == 2
+
+    def test_pagina_de_busqueda_anterior_se_descarta(self, widget):
+        """Prueba que una página que llega después de una nueva búsqueda no se agrega."""
+        widget.buscar_turnos()
+        respuesta_anterior = widget.db.execute_query_async.call_args.kwargs["on_result"]
+        widget.buscar_turnos()
+
+        respuesta_anterior(crear_filas(100, 5))
+        assert widget.modelo_funcionarios.total_filas() == 0
+
+        self.responder(widget, crear_filas(0, 2))
+        assert widget.modelo_funcionarios.total_filas() == 2
+
+    def test_sin_resultados(self, widget):
+        """Prueba que una primera página vacía se informa al usuario."""
+        widget.buscar_turnos()
+        with patch.object(modulo_widget.QMessageBox, 'information') as informacion:
+            self.responder(widget, [])
+
+        informacion.assert_called_once()
+        assert widget._paginador.agotado
@@ -0,0 +1,77 @@
+import pytest
+from datetime import time
+from unittest.mock import patch
+from PyQt6.QtCore import QTime
+
+from src.models.turno import Turno, TurnoDetalleDiario
+from src.ui.crear_turno import crear_turno_widget as modulo_widget
+
+
+@pytest.mark.ui
+class TestCrearTurnoWidget:
+    """Pruebas para la asignación de IDs en la creación de turnos."""
+
+    @pytest.fixture
+    def widget(self, qtbot):
+        """Widget con el DAO simulado; los IDs de detalle se reservan desde 500."""
+        with patch.object(modulo_widget, 'TurnoDAO') as dao:
+            dao.return_value.db.cuando_conectado.side_effect = lambda funcion: funcion()
+            dao.return_value.reservar_id_turno.return_value = 10
+            siguiente = iter(range(500, 600))
+            dao.return_value.reservar_ids_detalle.side_effect = lambda cantidad=1: [next(siguiente) for _ in range(cantidad)]
+            widget = modulo_widget.CrearTurnoWidget()
+        qtbot.addWidget(widget)
+        return widget
+
+    def test_agregar_detalle_reserva_ids(self, widget):
+        """Prueba que cada día agregado recibe un ID reservado al asignador, sin consultar el máximo."""
+        widget.dia_checks["Lun"].setChecked(True)
+        widget.dia_checks["Mar"].setChecked(True)
+        widget.hora_ingreso.setTime(QTime(8, 0))
+        widget.hora_salida.setTime(QTime(16, 0))
+        widget.agregar_detalle()
+
+        widget.dia_checks["Vie"].setChecked(True)
+        widget.agregar_detalle()
+
+        assert widget.id_turno_label.text() == "10"
+        assert sorted(detalle["id"] for detalle in widget.detalles) == [500, 501, 502]
+        widget.turno_dao.obtener_ultimo_id_detalle.assert_not_called()
+
+    def test_script_actualiza_ids_de_turnos_creados(self, widget):
+        """Prueba que los IDs renumerados al generar el script quedan en los turnos de la sesión."""
+        turno = Turno()
+        turno.id_turno = 10
+        turno.detalles.append(TurnoDetalleDiario(500, 10, "Lunes", time(8, 0), 480))
+        widget.turnos_creados = [turno]
+
+        def _renumerar(turnos):
+            for t in turnos:
+                t.id_turno = 20
+                for d in t.detalles:
+                    d.id_turno, d.id_turno_detalle_diario = 20, 700
+            return True
+
+        widget.turno_dao.renumerar_turnos.side_effect = _renumerar
+        widget.turno_dao.generar_script_sql_batch.return_value = ["INSERT ..."]
+        with patch.object(widget, 'mostrar_dialogo_sql') as dialogo:
+            widget.generar_script_sql()
+
+        assert (turno.id_turno, turno.detalles[0].id_turno_detalle_diario) == (20, 700)
+        widget.turno_dao.generar_script_sql_batch.assert_called_once_with([turno])
+        assert "INSERT ..." in dialogo.call_args[0][0]
+
+    def test_script_con_error_de_consulta(self, widget):
+        """Prueba que un fallo de la consulta en bloque se informa sin generar un script parcial."""
+        turno = Turno()
+        turno.id_turno = 10
+        widget.turnos_creados = [turno]
+        widget.turno_dao.renumerar_turnos.return_value = False
+        widget.turno_dao.generar_script_sql_batch.side_effect = modulo_widget.ConsultaError("sin conexión")
+
+        with patch.object(widget, 'mostrar_dialogo_sql') as dialogo, \
+                patch.object(modulo_widget.QMessageBox, 'critical') as critico:
+            widget.generar_script_sql()
+
+        dialogo.assert_not_called()
+        assert "sin conexión" in critico.call_args[0][2]
@@ -0,0 +1,101 @@
+import pytest
+from datetime import date
+from PyQt6.QtCore import Qt, QModelIndex
+from PyQt6.QtWidgets import QTableView
+
+from src.ui.filas_table_model import FilasTableModel, Columna, columna_indice, ALINEACION_CENTRO
+
+
+def crear_modelo(filas=None, tamano_lote=3):
+    """Crea un modelo de dos columnas: ID centrado y fecha formateada."""
+    modelo = FilasTableModel([
+        Columna("ID", columna_indice(0), ALINEACION_CENTRO),
+        Columna("Fecha", columna_indice(1, lambda fecha: fecha.strftime("%d/%m/%Y"))),
+    ], tamano_lote=tamano_lote)
+    if filas is not None:
+        modelo.establecer_filas(filas)
+    return modelo
+
+
+@pytest.mark.unit
+class TestFilasTableModel:
+    """Pruebas para el modelo de tabla respaldado por filas."""
+
+    def test_formato_y_alineacion(self, qapp):
+        """Prueba que las celdas se formatean desde la fila original."""
+        modelo = crear_modelo([(7, date(2024, 3, 5)), (8, None)])
+
+        assert modelo.columnCount() == 2
+        assert modelo.headerData(1, Qt.Orientation.Horizontal) == "Fecha"
+        assert modelo.data(modelo.index(0, 0)) == "7"
+        assert modelo.data(modelo.index(0, 1)) == "05/03/2024"
+        assert modelo.data(modelo.index(1, 1)) == ""
+        assert modelo.data(modelo.index(0, 0), Qt.ItemDataRole.TextAlignmentRole) == ALINEACION_CENTRO
+        assert modelo.fila(1) == (8, None)
+
+    def test_formato_solo_al_pedir_datos(self, qapp):
+        """Prueba que establecer filas no formatea ninguna celda."""
+        llamadas = []
+        modelo = FilasTableModel([Columna("ID", lambda fila: llamadas.append(fila) or str(fila))])
+
+        modelo.establecer_filas(range(1000))
+        assert llamadas == []
+
+        assert modelo.data(modelo.index(2, 0)) == "2"
+        assert llamadas == [2]
+
+    def test_carga_por_lotes(self, qapp):
+        """Prueba que la vista recibe las filas por lotes con fetchMore."""
+        modelo = crear_modelo([(i, None) for i in range(7)])
+
+        assert modelo.rowCount() == 3
+        assert modelo.total_filas() == 7
+        assert modelo.canFetchMore(QModelIndex())
+
+        modelo.fetchMore(QModelIndex())
+        assert modelo.rowCount() == 6
+        modelo.fetchMore(QModelIndex())
+        assert modelo.rowCount() == 7
+        assert not modelo.canFetchMore(QModelIndex())
+
+        modelo.establecer_filas([(1, None)])
+        assert modelo.rowCount() == 1
+        modelo.limpiar()
+        assert modelo.rowCount() == 0
+
+    def test_agregar_filas(self, qapp):
+        """Prueba que las filas agregadas llegan a la vista solo si ya tenía todas las anteriores."""
+        modelo = crear_modelo([(i, None) for i in range(2)])
+
+        modelo.agregar_filas([(i, None) for i in range(2, 7)])
+        assert modelo.rowCount() == 5
+        assert modelo.total_filas() == 7
+
+        modelo.agregar_filas([(7, None)])
+        assert modelo.rowCount() == 5
+        modelo.agregar_filas([])
+        assert modelo.total_filas() == 8
+
+    def test_actualizar_fila(self, qapp):
+        """Prueba que actualizar una fila reemplaza sus datos y notifica a la vista."""
+        modelo = crear_modelo([(1, None), (2, None)])
+        cambios = []
+        modelo.dataChanged.connect(lambda inicio, fin: cambios.append((inicio.row(), fin.column())))
+
+        indice = modelo.buscar_fila(lambda fila: fila[0] == 2)
+        modelo.actualizar_fila(indice, (20, None))
+
+        assert modelo.data(modelo.index(1, 0)) == "20"
+        assert cambios == [(1, 1)]
+        assert modelo.buscar_fila(lambda fila: fila[0] == 99) == -1
+
+    def test_vista_con_modelo(self, qtbot):
+        """Prueba que una QTableView muestra las filas del modelo."""
+        modelo = crear_modelo([(i, None) for i in range(10)], tamano_lote=4)
+        vista = QTableView()
+        qtbot.addWidget(vista)
+        vista.setModel(modelo)
+
+        assert vista.model().rowCount() >= 4
+        vista.selectRow(1)
+        assert vista.selectionModel().selectedRows()[0].row() == 1
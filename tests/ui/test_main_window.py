@@ -1,8 +1,9 @@
 import pytest
-from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton
+from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QWidget
 from PyQt6.QtCore import Qt
 from unittest.mock import patch, MagicMock
 from src.ui.main_window import MainWindow, BienvenidaDialog
+from src.database.oracle_connection import ESTADO_CONECTADO, ESTADO_ERROR
 
 @pytest.mark.ui
 class TestMainWindow:
@@ -14,6 +15,8 @@ class TestMainWindow:
         # Crear un mock para OracleConnection
         mock_instance = MagicMock()
         mock_instance.is_connected.return_value = True
+        mock_instance.estado_conexion = ESTADO_CONECTADO
+        mock_instance.error_conexion = ""
         
         # Parchear la clase OracleConnection para que _instance ya esté definido
         from src.database.oracle_connection import OracleConnection
@@ -24,8 +27,10 @@ class TestMainWindow:
     @pytest.fixture
     def main_window(self, qtbot, mock_oracle_connection):
         """Fixture que proporciona una instancia de MainWindow."""
-        # Crear la ventana principal
-        window = MainWindow()
+        # Evitar que el diálogo de bienvenida bloquee la prueba en la primera ejecución
+        with patch('src.ui.main_window.BienvenidaDialog.exec'):
+            # Crear la ventana principal
+            window = MainWindow()
         qtbot.addWidget(window)
         return window
     
@@ -95,6 +100,19 @@ class TestMainWindow:
             
             # Verificar que no se mostró el diálogo
             mock_exec.assert_not_called()
+    
+    def test_indicador_de_conexion(self, main_window, mock_oracle_connection):
+        """Prueba que la barra de estado muestre el estado de la conexión y permita reintentar."""
+        assert main_window.indicador_conexion.text() == "● Conectado"
+        assert main_window.boton_reintentar.isHidden()
+        
+        main_window._al_cambiar_estado_conexion(ESTADO_ERROR, "ORA-12170: TNS:Connect timeout occurred")
+        assert "Sin conexión" in main_window.indicador_conexion.text()
+        assert main_window.indicador_conexion.toolTip().startswith("ORA-12170")
+        assert not main_window.boton_reintentar.isHidden()
+        
+        main_window.boton_reintentar.click()
+        mock_oracle_connection.conectar_en_segundo_plano.assert_called_once()
 
 @pytest.mark.ui
 class TestBienvenidaDialog:
@@ -125,4 +143,54 @@ class TestBienvenidaDialog:
             dialog.accept()
             
             # Verificar que se llamó al método accept
-            mock_accept.assert_called_once() 
\ No newline at end of file
+            mock_accept.assert_called_once() 
+@pytest.mark.ui
+class TestPestanasDiferidas:
+    """Pruebas para la construcción diferida de los módulos."""
+    
+    @pytest.fixture
+    def ventana(self, qtbot, monkeypatch):
+        """Ventana cuyos módulos son widgets simples que registran su construcción."""
+        construidos = []
+        
+        def fabrica_falsa(paquete, clase):
+            def fabricar():
+                construidos.append(paquete)
+                return QWidget()
+            return fabricar
+        
+        monkeypatch.setattr(MainWindow, '_fabrica_modulo', staticmethod(fabrica_falsa))
+        monkeypatch.setattr(MainWindow, 'check_first_run', lambda self: None)
+        window = MainWindow(preconstruir=False)
+        qtbot.addWidget(window)
+        window.construidos = construidos
+        return window
+    
+    def test_ningun_modulo_al_crear(self, ventana):
+        """Prueba que crear la ventana no construye ningún módulo."""
+        assert ventana.construidos == []
+        assert ventana.crear_turno_tab is None
+        assert ventana.tab_widget.count() == 5
+    
+    def test_modulo_al_activar_pestana(self, ventana):
+        """Prueba que activar una pestaña construye solo su módulo, una vez."""
+        ventana.tab_widget.setCurrentIndex(2)
+        ventana.tab_widget.setCurrentIndex(0)
+        ventana.tab_widget.setCurrentIndex(2)
+        
+        assert ventana.construidos == ["horario_flexible", "crear_turno"]
+        assert isinstance(ventana.horario_flexible_tab, QWidget)
+        assert 'construccion.horario_flexible_tab' in ventana.tiempos_arranque
+    
+    def test_primer_pintado_y_preconstruccion(self, ventana, qtbot):
+        """Prueba que tras el primer pintado se construye la pestaña visible y luego el resto en orden."""
+        ventana.show()
+        qtbot.waitUntil(lambda: 'pestana_lista' in ventana.tiempos_arranque, timeout=2000)
+        assert ventana.construidos == ["crear_turno"]
+        
+        ventana.preconstruir = True
+        ventana._pendientes_preconstruccion = ["buscar_turno_tab", "crear_turno_tab", "consulta_turno_tab"]
+        ventana._preconstruir_siguiente()
+        ventana._preconstruir_siguiente()
+        assert ventana.construidos == ["crear_turno", "buscar_turno", "consulta_turno"]
+        assert 'todas_construidas' in ventana.tiempos_arranque
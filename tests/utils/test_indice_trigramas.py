@@ -0,0 +1,53 @@
+import pytest
+
+from src.utils.indice_trigramas import IndiceTrigramas, normalizar_texto, trigramas
+
+
+@pytest.fixture
+def indice():
+    """Índice con nombres de turnos representativos."""
+    indice = IndiceTrigramas()
+    indice.construir([
+        (1, "Turno Mañana Lunes a Viernes"),
+        (2, "Tarde Sábado"),
+        (3, "MAÑANA"),
+        (4, "Noche lunes"),
+        (5, "Mañana Sábado y Domingo"),
+    ])
+    return indice
+
+
+@pytest.mark.unit
+class TestIndiceTrigramas:
+    """Pruebas para el índice de trigramas de nombres."""
+
+    def test_normalizar_texto(self):
+        """Prueba que la normalización ignora acentos, mayúsculas y espacios repetidos."""
+        assert normalizar_texto("  Mañana  Miércoles ") == "MANANA MIERCOLES"
+        assert normalizar_texto(None) == ""
+        assert trigramas("ABCD") == {"ABC", "BCD"}
+        assert trigramas("AB") == set()
+
+    def test_busqueda_sin_acentos_ni_mayusculas(self, indice):
+        """Prueba que la búsqueda encuentra textos con acentos y mayúsculas distintos."""
+        assert set(indice.buscar("sabado")) == {2, 5}
+        assert set(indice.buscar("MANANA")) == {1, 3, 5}
+
+    def test_orden_por_relevancia(self, indice):
+        """Prueba que la coincidencia exacta va primero, luego al inicio y luego el resto."""
+        assert indice.buscar("mañana") == [3, 5, 1]
+
+    def test_varias_palabras_y_fragmentos_cortos(self, indice):
+        """Prueba que se exigen todas las palabras, incluidas las más cortas que un trigrama."""
+        assert indice.buscar("lunes manana") == [1]
+        assert indice.buscar("no") == [4, 1]
+        assert indice.buscar("xyz") == []
+        assert indice.buscar("   ") == []
+
+    def test_limite_y_reconstruccion(self, indice):
+        """Prueba el límite de resultados y que construir reemplaza el contenido."""
+        assert indice.buscar("a", limite=2) == [1, 2]
+        indice.construir([("x", "Único")])
+        assert len(indice) == 1
+        assert indice.buscar("unico") == ["x"]
+        assert indice.buscar("mañana") == []